@@ -9,10 +9,12 @@ Modules:
 - detectors: LLM-powered detection nodes (excuses, sentiment, promises, quotes)
 - analyzers: Analysis nodes (commitments, patterns, excuse callouts)
 - aggregator: Call summary aggregation
+- coalescer: Debouncing of fragmented utterances before analysis
 - events: Custom event types for agent communication
 """
 
 from agents.events import (
+    Insight,
     CallSummary,
     ExcuseDetected,
     ExcuseCallout,
@@ -38,9 +40,11 @@ from agents.analyzers import (
 )
 
 from agents.aggregator import CallSummaryAggregator
+from agents.coalescer import TranscriptCoalescer
 
 __all__ = [
     # Events
+    "Insight",
     "CallSummary",
     "ExcuseDetected",
     "ExcuseCallout",
@@ -61,4 +65,6 @@ __all__ = [
     "PatternAnalyzerNode",
     # Aggregator
     "CallSummaryAggregator",
+    # Coalescer
+    "TranscriptCoalescer",
 ]
@@ -7,6 +7,7 @@ Not a Node - this is a stateful aggregator that collects insights from
 all background agents.
 """
 
+from dataclasses import dataclass
 from typing import Optional
 from datetime import datetime
 
@@ -21,6 +22,31 @@ from agents.events import (
 )
 
 
+# Compact per-call records - only the fields finalize() and post-call use,
+# instead of holding every pydantic event for the life of the call.
+
+
+@dataclass(slots=True)
+class ExcuseRecord:
+    excuse_text: str
+    confidence: float
+
+
+@dataclass(slots=True)
+class CommitmentRecord:
+    commitment_text: str
+    action: Optional[str]
+    time: Optional[str]
+    is_specific: bool
+
+
+@dataclass(slots=True)
+class QuoteRecord:
+    quote_text: str
+    context: str
+    callback_potential: str
+
+
 class CallSummaryAggregator:
     """
     Aggregates events throughout the call to produce a CallSummary at the end.
@@ -49,12 +75,13 @@ class CallSummaryAggregator:
         self.start_time: Optional[datetime] = None
 
         # Collected data
-        self.sentiments: list[SentimentAnalysis] = []
-        self.excuses: list[ExcuseDetected] = []
-        self.promise_response: Optional[PromiseResponse] = None
-        self.commitment: Optional[CommitmentIdentified] = None
-        self.quotes: list[MemorableQuoteDetected] = []
-        self.patterns: list[PatternAlert] = []
+        self.sentiments: list[str] = []
+        self.excuses: list[ExcuseRecord] = []
+        self.promise_answered = False
+        self.promise_kept: Optional[bool] = None
+        self.commitment: Optional[CommitmentRecord] = None
+        self.quotes: list[QuoteRecord] = []
+        self.patterns: list[str] = []
 
     def start(self):
         """Mark call start time."""
@@ -62,15 +89,16 @@ class CallSummaryAggregator:
 
     def add_sentiment(self, event: SentimentAnalysis):
         """Track sentiment throughout call."""
-        self.sentiments.append(event)
+        self.sentiments.append(event.sentiment)
 
     def add_excuse(self, event: ExcuseDetected):
         """Track excuses detected."""
-        self.excuses.append(event)
+        self.excuses.append(ExcuseRecord(event.excuse_text, event.confidence))
 
     def add_promise(self, event: PromiseResponse):
         """Record promise response (typically only one per call)."""
-        self.promise_response = event
+        self.promise_answered = True
+        self.promise_kept = event.kept
 
     def add_commitment(self, event: CommitmentIdentified):
         """Record tomorrow's commitment (take the most specific one)."""
@@ -78,15 +106,19 @@ class CallSummaryAggregator:
         if self.commitment is None or (
             event.is_specific and not self.commitment.is_specific
         ):
-            self.commitment = event
+            self.commitment = CommitmentRecord(
+                event.commitment_text, event.action, event.time, event.is_specific
+            )
 
     def add_quote(self, event: MemorableQuoteDetected):
         """Track memorable quotes."""
-        self.quotes.append(event)
+        self.quotes.append(
+            QuoteRecord(event.quote_text, event.context, event.callback_potential)
+        )
 
     def add_pattern(self, event: PatternAlert):
         """Track pattern alerts."""
-        self.patterns.append(event)
+        self.patterns.append(event.pattern_type)
 
     def _calculate_quality_score(self) -> float:
         """
@@ -104,12 +136,8 @@ class CallSummaryAggregator:
 
         # Sentiment trajectory
         if self.sentiments:
-            positive_count = sum(
-                1 for s in self.sentiments if s.sentiment == "positive"
-            )
-            frustrated_count = sum(
-                1 for s in self.sentiments if s.sentiment == "frustrated"
-            )
+            positive_count = self.sentiments.count("positive")
+            frustrated_count = self.sentiments.count("frustrated")
             score += positive_count * 0.1
             score -= frustrated_count * 0.15
 
@@ -121,10 +149,10 @@ class CallSummaryAggregator:
                 score += 0.1
 
         # Promise kept
-        if self.promise_response:
-            if self.promise_response.kept is True:
+        if self.promise_answered:
+            if self.promise_kept is True:
                 score += 0.15
-            elif self.promise_response.kept is False:
+            elif self.promise_kept is False:
                 score -= 0.1
 
         # Memorable quotes indicate engagement
@@ -156,7 +184,7 @@ class CallSummaryAggregator:
             call_duration_seconds = 0
 
         # Extract sentiment trajectory
-        sentiment_trajectory = [s.sentiment for s in self.sentiments]
+        sentiment_trajectory = list(self.sentiments)
 
         # Extract excuse texts
         excuses_detected = [e.excuse_text for e in self.excuses]
@@ -175,15 +203,10 @@ class CallSummaryAggregator:
             commitment_time = self.commitment.time
             commitment_is_specific = self.commitment.is_specific
 
-        # Get promise status
-        promise_kept = None
-        if self.promise_response:
-            promise_kept = self.promise_response.kept
-
         return CallSummary(
             user_id=self.user_id,
             call_duration_seconds=call_duration_seconds,
-            promise_kept=promise_kept,
+            promise_kept=self.promise_kept,
             tomorrow_commitment=tomorrow_commitment,
             commitment_time=commitment_time,
             commitment_is_specific=commitment_is_specific,
@@ -196,4 +219,9 @@ class CallSummaryAggregator:
         )
 
 
-__all__ = ["CallSummaryAggregator"]
+__all__ = [
+    "CallSummaryAggregator",
+    "ExcuseRecord",
+    "CommitmentRecord",
+    "QuoteRecord",
+]
@@ -154,6 +154,8 @@ class ExcuseCalloutNode(Node):
             excuse_text=excuse.excuse_text,
             callout_type=callout_type,
             suggested_response=suggested_response,
+            turn_seq=excuse.turn_seq,
+            latency_ms=excuse.latency_ms,
         )
 
         logger.info(f"🎯 Excuse callout ({callout_type}): {suggested_response[:50]}...")
@@ -0,0 +1,194 @@
+"""
+Transcript Coalescer
+====================
+
+Debounces bursts of UserStoppedSpeaking before the background agents run.
+
+People answer in fragments ("I didn't..." pause "...because work ran
+late"), and every fragment ends with UserStoppedSpeaking. Without
+coalescing each background agent analyzes every partial utterance, and
+the early results describe a sentence the user hadn't finished.
+
+One TranscriptCoalescer per call sits in front of every background
+agent's generate:
+- each stop opens a quiet window; a new stop inside it supersedes the
+  pending one, so the merged utterance is analyzed once
+- the window adapts to the user: it tracks how long they pause between
+  fragments (stop -> started speaking again) and waits slightly longer
+- latest wins: a stop that arrives while analyses of the previous burst
+  are still running cancels them (their transcript is now stale)
+
+Background nodes merge consecutive transcriptions, so the run that
+survives sees the whole utterance via get_latest_user_transcript_message.
+
+Configuration via environment variables:
+- TRANSCRIPT_COALESCE: "true" (default) / "false"
+- TRANSCRIPT_COALESCE_MS: initial quiet window (default 400)
+- TRANSCRIPT_COALESCE_MIN_MS: lower bound for the adaptive window (default 250)
+- TRANSCRIPT_COALESCE_MAX_MS: upper bound; longer pauses are new turns (default 1200)
+
+Usage:
+    coalescer = TranscriptCoalescer()
+    bridge.on(UserStartedSpeaking).map(coalescer.on_started_speaking)
+    bridge.on(UserStoppedSpeaking).stream(coalescer.wrap(node.generate))
+
+    coalescer.stats.coalesced   # stops merged into a later one
+"""
+
+import asyncio
+import functools
+import os
+import time
+from dataclasses import dataclass, asdict
+from typing import Callable, Optional
+
+from loguru import logger
+
+TRANSCRIPT_COALESCE = os.getenv("TRANSCRIPT_COALESCE", "true").lower() == "true"
+TRANSCRIPT_COALESCE_MS = float(os.getenv("TRANSCRIPT_COALESCE_MS", "400"))
+TRANSCRIPT_COALESCE_MIN_MS = float(os.getenv("TRANSCRIPT_COALESCE_MIN_MS", "250"))
+TRANSCRIPT_COALESCE_MAX_MS = float(os.getenv("TRANSCRIPT_COALESCE_MAX_MS", "1200"))
+
+# Weight of the newest pause in the moving average
+PAUSE_SMOOTHING = 0.3
+# Window = typical fragment pause * margin
+PAUSE_MARGIN = 1.5
+
+
+@dataclass
+class CoalescerStats:
+    """Per-call coalescing counters (counted per stop, not per agent)."""
+
+    stops: int = 0  # UserStoppedSpeaking events seen
+    bursts: int = 0  # Utterances that reached the analyzers
+    coalesced: int = 0  # Stops merged into a later one
+    runs_cancelled: int = 0  # Agent runs aborted by a newer stop
+    window_ms: float = TRANSCRIPT_COALESCE_MS
+
+    def to_dict(self) -> dict:
+        data = asdict(self)
+        data["window_ms"] = round(self.window_ms, 1)
+        return data
+
+
+class TranscriptCoalescer:
+    """Debounces transcript bursts for every background agent of one call."""
+
+    def __init__(
+        self,
+        window_ms: float = TRANSCRIPT_COALESCE_MS,
+        min_ms: float = TRANSCRIPT_COALESCE_MIN_MS,
+        max_ms: float = TRANSCRIPT_COALESCE_MAX_MS,
+    ):
+        self.min_ms = min_ms
+        self.max_ms = max_ms
+        self.stats = CoalescerStats(window_ms=min(max(window_ms, min_ms), max_ms))
+
+        self.seq = 0  # Current stop
+        self._last_message_id: Optional[str] = None
+        self._stopped_at = 0.0
+        self._speaking = False
+        self._dispatched = 0  # Last seq that reached the analyzers
+        self._runs: dict[int, set[asyncio.Task]] = {}
+
+    @property
+    def window(self) -> float:
+        """Current quiet window in seconds."""
+        return self.stats.window_ms / 1000
+
+    def on_started_speaking(self, message=None) -> None:
+        """UserStartedSpeaking: learn the fragment pause, hold pending analyses."""
+        self._speaking = True
+        if not self._stopped_at:
+            return
+        pause_ms = (time.monotonic() - self._stopped_at) * 1000
+        if pause_ms <= self.max_ms:
+            # Continuation of the same utterance - adapt the window to it
+            smoothed = (
+                (1 - PAUSE_SMOOTHING) * self.stats.window_ms / PAUSE_MARGIN
+                + PAUSE_SMOOTHING * pause_ms
+            )
+            self.stats.window_ms = min(
+                max(smoothed * PAUSE_MARGIN, self.min_ms), self.max_ms
+            )
+
+    def _on_stop(self, message) -> int:
+        """Register a stop once, however many agents receive it. Returns its seq."""
+        message_id = getattr(message, "id", None) or id(message)
+        if message_id == self._last_message_id:
+            return self.seq
+
+        self._last_message_id = message_id
+        self._stopped_at = time.monotonic()
+        self._speaking = False
+        self.stats.stops += 1
+
+        previous = self.seq
+        self.seq += 1
+        if previous and self._dispatched != previous:
+            # Still waiting out its window
+            self.stats.coalesced += 1
+        else:
+            running = [t for t in self._runs.pop(previous, ()) if not t.done()]
+            if running:
+                # Analyses of the previous burst are stale - latest wins
+                for task in running:
+                    task.cancel()
+                self.stats.coalesced += 1
+                self.stats.runs_cancelled += len(running)
+        return self.seq
+
+    async def _settle(self, seq: int) -> bool:
+        """Wait out the quiet window. False if a newer stop superseded `seq`."""
+        deadline = self._stopped_at + self.max_ms / 1000
+        while True:
+            await asyncio.sleep(max(0.0, self._stopped_at + self.window - time.monotonic()))
+            if seq != self.seq:
+                return False
+            # User is talking again - hold until the next stop (bounded)
+            if not self._speaking or time.monotonic() >= deadline:
+                break
+            await asyncio.sleep(0.05)
+
+        if self._dispatched != seq:
+            self._dispatched = seq
+            self.stats.bursts += 1
+        return True
+
+    def wrap(self, generate: Callable) -> Callable:
+        """Wrap a background node's generate with the shared debounce."""
+        if not TRANSCRIPT_COALESCE:
+            return generate
+
+        @functools.wraps(generate)
+        async def coalesced(message):
+            seq = self._on_stop(message)
+            if not await self._settle(seq):
+                return
+
+            task = asyncio.current_task()
+            runs = self._runs.setdefault(seq, set())
+            if task is not None:
+                runs.add(task)
+            try:
+                async for event in generate(message):
+                    yield event
+            finally:
+                runs.discard(task)
+
+        return coalesced
+
+    def log_summary(self) -> None:
+        if self.stats.coalesced:
+            logger.info(
+                f"🧩 Coalesced {self.stats.coalesced}/{self.stats.stops} transcript stops "
+                f"into {self.stats.bursts} analyses (window {self.stats.window_ms:.0f}ms, "
+                f"{self.stats.runs_cancelled} stale runs cancelled)"
+            )
+
+
+__all__ = [
+    "CoalescerStats",
+    "TranscriptCoalescer",
+    "TRANSCRIPT_COALESCE",
+]
@@ -11,6 +11,7 @@ These nodes use LLM inference to detect patterns in user speech:
 Uses GPT-OSS-120B via Groq for fast, cheap LLM inference.
 """
 
+from collections import deque
 from typing import AsyncGenerator, Optional
 from loguru import logger
 
@@ -81,9 +82,14 @@ class SentimentAnalyzerNode(Node):
     Emits SentimentAnalysis and UserFrustrated events.
     """
 
+    # Recent sentiment readings kept per call
+    HISTORY_LIMIT = 20
+
     def __init__(self):
         super().__init__()
-        self.sentiment_history = []
+        self.sentiment_history: deque[SentimentAnalysis] = deque(
+            maxlen=self.HISTORY_LIMIT
+        )
 
     async def process_context(
         self, context: ConversationContext
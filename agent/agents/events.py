@@ -4,6 +4,12 @@ Custom Events for Multi-Agent Communication
 
 These events enable background agents to communicate insights
 to the main FutureYouNode speaking agent.
+
+Every insight carries the user utterance it was derived from (turn_seq,
+one per UserStoppedSpeaking) and how long after that utterance ended it
+was emitted (latency_ms), so the speaking node can tell fresh insights
+from ones about a turn the conversation has already moved past. Both are
+stamped by core.turns.TurnTracker when the analyzer yields the event.
 """
 
 from datetime import datetime
@@ -11,7 +17,14 @@ from typing import Optional
 from pydantic import BaseModel, Field
 
 
-class ExcuseDetected(BaseModel):
+class Insight(BaseModel):
+    """Base for background agent insights."""
+
+    turn_seq: Optional[int] = None  # User utterance this insight describes
+    latency_ms: Optional[float] = None  # Utterance end -> insight emitted
+
+
+class ExcuseDetected(Insight):
     """Emitted when user's response matches a known excuse pattern."""
 
     excuse_text: str  # The excuse they gave
@@ -20,7 +33,7 @@ class ExcuseDetected(BaseModel):
     confidence: float = 0.0  # 0.0 - 1.0
 
 
-class SentimentAnalysis(BaseModel):
+class SentimentAnalysis(Insight):
     """Emitted after analyzing user's emotional state."""
 
     sentiment: str  # positive, negative, neutral, frustrated, deflecting, defensive
@@ -31,7 +44,7 @@ class SentimentAnalysis(BaseModel):
     timestamp: datetime = Field(default_factory=datetime.now)
 
 
-class CommitmentIdentified(BaseModel):
+class CommitmentIdentified(Insight):
     """Emitted when user states a commitment for tomorrow."""
 
     commitment_text: str  # Raw text of what they said
@@ -41,7 +54,7 @@ class CommitmentIdentified(BaseModel):
     confidence: float = 0.0
 
 
-class PromiseResponse(BaseModel):
+class PromiseResponse(Insight):
     """Emitted when user responds to 'did you do it?' question."""
 
     kept: Optional[bool] = None  # True = yes, False = no, None = unclear
@@ -50,7 +63,7 @@ class PromiseResponse(BaseModel):
     confidence: float = 0.0
 
 
-class UserFrustrated(BaseModel):
+class UserFrustrated(Insight):
     """Emitted when user shows signs of frustration."""
 
     frustration_level: str  # low, medium, high
@@ -58,7 +71,7 @@ class UserFrustrated(BaseModel):
     suggested_action: str = "soften_tone"  # soften_tone, acknowledge, back_off
 
 
-class PatternAlert(BaseModel):
+class PatternAlert(Insight):
     """Emitted when user's behavior matches a concerning pattern."""
 
     pattern_type: str  # quit_pattern, excuse_spiral, disengagement
@@ -66,7 +79,7 @@ class PatternAlert(BaseModel):
     historical_context: Optional[str] = None  # e.g., "User usually quits around day 14"
 
 
-class MemorableQuoteDetected(BaseModel):
+class MemorableQuoteDetected(Insight):
     """Emitted when user says something worth remembering for future callbacks."""
 
     quote_text: str  # The memorable quote
@@ -79,7 +92,7 @@ class MemorableQuoteDetected(BaseModel):
     )
 
 
-class ExcuseCallout(BaseModel):
+class ExcuseCallout(Insight):
     """Emitted when excuse should be called out to the user."""
 
     excuse_text: str  # The excuse they gave
@@ -12,6 +12,7 @@ All the content that makes calls addictive:
 - EMOTIONAL_PEAKS: One moment per call that HITS
 - DIG_DEEPER: Follow-up questions after yes/no
 - TOMORROW_LOCK: Lock in tomorrow's commitment
+- CLOSINGS: Last line of the call, by how today went
 
 Templates use {placeholders} that get filled in at runtime:
 - {name}: User's name
@@ -333,6 +334,32 @@ TOMORROW_LOCK: list[str] = [
 ]
 
 
+# ═══════════════════════════════════════════════════════════════════════════════
+# CLOSINGS - Last line, commitment already locked
+# Every line ends with a sign-off ("talk tomorrow" / "take care") - it ends the call
+# ═══════════════════════════════════════════════════════════════════════════════
+
+CLOSINGS: dict[str, list[str]] = {
+    "kept": [
+        "Day {next_day} is waiting.<break time='1s'/>Talk tomorrow.",
+        "That's who you are now.<break time='1s'/>Talk tomorrow.",
+        "Keep stacking them.<break time='1s'/>Talk tomorrow.",
+        "Same time tomorrow.<break time='1s'/>Take care.",
+    ],
+    "broken": [
+        "Tomorrow you prove today wrong.<break time='1s'/>Talk tomorrow.",
+        "We'll see.<break time='1s'/>Talk tomorrow.",
+        "Don't make me wait.<break time='1s'/>Talk tomorrow.",
+        "One day doesn't define you. Tomorrow does.<break time='1s'/>Talk tomorrow.",
+    ],
+    "unknown": [
+        "Tomorrow.<break time='1s'/>Don't make me wait. Talk tomorrow.",
+        "There's something I want to tell you soon.<break time='1s'/>Talk tomorrow.",
+        "Show up tomorrow.<break time='1s'/>Take care.",
+    ],
+}
+
+
 # ═══════════════════════════════════════════════════════════════════════════════
 # HELPER FUNCTIONS
 # ═══════════════════════════════════════════════════════════════════════════════
@@ -387,6 +414,12 @@ def get_random_tomorrow_lock() -> str:
     return random.choice(TOMORROW_LOCK)
 
 
+def get_random_closing(outcome: str) -> str:
+    """Get a random closing line for "kept", "broken" or "unknown"."""
+    closings = CLOSINGS.get(outcome, CLOSINGS["unknown"])
+    return random.choice(closings)
+
+
 def fill_template(template: str, **kwargs) -> str:
     """
     Fill in template placeholders with actual values.
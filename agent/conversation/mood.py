@@ -206,30 +206,45 @@ def select_mood(
     return MOODS["warm_direct"]
 
 
-def _in_quit_zone(quit_pattern: str, current_streak: int) -> bool:
-    """Check if user is in their historical quit zone."""
+# Historical quit windows (streak day range) per quit-pattern shape
+QUIT_ZONES: dict[str, tuple[int, int]] = {
+    "week": (5, 10),
+    "two_weeks": (12, 16),
+    "month": (25, 35),
+    "two_months": (55, 65),
+}
+
+
+def quit_zone_kinds(quit_pattern: str) -> list[str]:
+    """Which QUIT_ZONES a free-text quit pattern refers to."""
     quit_lower = quit_pattern.lower()
+    kinds = []
 
     # First week quit pattern
     if "week" in quit_lower and "two" not in quit_lower:
-        if 5 <= current_streak <= 10:
-            return True
+        kinds.append("week")
 
     # Two week quit pattern
     if "two week" in quit_lower or "2 week" in quit_lower:
-        if 12 <= current_streak <= 16:
-            return True
+        kinds.append("two_weeks")
 
     # Month quit pattern
     if "month" in quit_lower and "two" not in quit_lower:
-        if 25 <= current_streak <= 35:
-            return True
+        kinds.append("month")
 
     # Two month quit pattern
     if "two month" in quit_lower or "2 month" in quit_lower:
-        if 55 <= current_streak <= 65:
-            return True
+        kinds.append("two_months")
+
+    return kinds
+
 
+def _in_quit_zone(quit_pattern: str, current_streak: int) -> bool:
+    """Check if user is in their historical quit zone."""
+    for kind in quit_zone_kinds(quit_pattern):
+        low, high = QUIT_ZONES[kind]
+        if low <= current_streak <= high:
+            return True
     return False
 
 
@@ -23,6 +23,8 @@ Integration with Future-Self System:
 - Identity-focused language based on pillar state
 """
 
+from array import array
+from collections import deque
 from enum import Enum
 from dataclasses import dataclass, field
 from typing import Optional, Dict, List, TYPE_CHECKING
@@ -53,6 +55,14 @@ class Persona(Enum):
     COMPASSIONATE_ALLY = "ally"
 
 
+# Blend weights are stored as array('d') indexed by persona position
+PERSONAS: List[Persona] = list(Persona)
+PERSONA_INDEX: Dict[Persona, int] = {p: i for i, p in enumerate(PERSONAS)}
+
+# Blend snapshots kept per call (one per _blend_toward)
+BLEND_HISTORY_LIMIT = 32
+
+
 @dataclass
 class PersonaConfig:
     """Configuration for each persona."""
@@ -162,7 +172,7 @@ You are in COMPASSIONATE ALLY mode. Support without enabling.
 }
 
 
-@dataclass
+@dataclass(slots=True)
 class UserState:
     """
     Real-time state aggregated from background agent insights.
@@ -282,7 +292,9 @@ class PersonaController:
     Manages persona blending during a call.
 
     Key concepts:
-    - current_blend: Dict mapping Persona -> weight (0.0-1.0)
+    - current_blend: Dict mapping Persona -> weight (0.0-1.0), backed by
+      a fixed-size array indexed by PERSONA_INDEX
+    - blend_history: last BLEND_HISTORY_LIMIT blend arrays
     - Blending is gradual, not instant
     - Fast blending for negative signals (catch problems)
     - Slow blending for positive signals (don't overreact)
@@ -297,7 +309,7 @@ class PersonaController:
     ):
         self.user_state = UserState(trust_score=initial_trust_score)
         self.future_self = future_self
-        self.current_blend: Dict[Persona, float] = {}
+        self._blend = array("d", [0.0] * len(PERSONAS))
 
         # If we have future-self data, initialize pillar context
         if future_self:
@@ -309,8 +321,21 @@ class PersonaController:
         self.primary_persona: Persona = self._select_starting_persona(
             initial_trust_score, yesterday_kept
         )
-        self.current_blend[self.primary_persona] = 1.0
-        self.blend_history: List[Dict[Persona, float]] = []
+        self._blend[PERSONA_INDEX[self.primary_persona]] = 1.0
+        self.blend_history: deque[array] = deque(maxlen=BLEND_HISTORY_LIMIT)
+
+    @property
+    def current_blend(self) -> Dict[Persona, float]:
+        """Non-zero blend weights as {Persona: weight}."""
+        return {p: w for p, w in zip(PERSONAS, self._blend) if w > 0.0}
+
+    @current_blend.setter
+    def current_blend(self, blend: Dict[Persona, float]) -> None:
+        self._blend = array("d", [blend.get(p, 0.0) for p in PERSONAS])
+
+    def get_weight(self, persona: Persona) -> float:
+        """Current blend weight for a persona."""
+        return self._blend[PERSONA_INDEX[persona]]
 
     def _select_starting_persona(
         self, trust_score: int, yesterday_kept: Optional[bool]
@@ -448,35 +473,38 @@ class PersonaController:
         speed_map = {"fast": 0.4, "medium": 0.25, "slow": 0.15}
         shift = speed_map.get(speed, 0.25)
 
-        # Reduce all current weights
-        new_blend = {}
+        # Reduce all current weights in place
+        blend = self._blend
         remaining = 1.0 - shift
 
-        for persona, weight in self.current_blend.items():
+        for i, weight in enumerate(blend):
             new_weight = weight * remaining
-            if new_weight > 0.05:  # Keep weights above threshold
-                new_blend[persona] = new_weight
+            # Keep weights above threshold
+            blend[i] = new_weight if new_weight > 0.05 else 0.0
 
         # Add/increase target persona
-        current_target_weight = new_blend.get(target, 0.0)
-        new_blend[target] = current_target_weight + shift
+        target_index = PERSONA_INDEX[target]
+        blend[target_index] += shift
 
         # Normalize to sum to 1.0
-        total = sum(new_blend.values())
-        self.current_blend = {p: w / total for p, w in new_blend.items()}
+        total = sum(blend)
+        for i in range(len(blend)):
+            blend[i] /= total
 
         # Update primary persona if target now dominates
-        if self.current_blend.get(target, 0) >= 0.5:
+        if blend[target_index] >= 0.5:
             self.primary_persona = target
 
         # Track history
-        self.blend_history.append(self.current_blend.copy())
+        self.blend_history.append(array("d", blend))
 
     def get_primary_persona(self) -> Persona:
         """Get the dominant persona in current blend."""
-        if not self.current_blend:
+        blend = self._blend
+        best = max(range(len(blend)), key=blend.__getitem__)
+        if blend[best] <= 0.0:
             return Persona.WISE_MENTOR
-        return max(self.current_blend.items(), key=lambda x: x[1])[0]
+        return PERSONAS[best]
 
     def get_persona_prompt(self) -> str:
         """
@@ -486,7 +514,6 @@ class PersonaController:
         If blend is mixed, combine key aspects.
         """
         primary = self.get_primary_persona()
-        primary_weight = self.current_blend.get(primary, 1.0)
 
         config = PERSONA_CONFIGS[primary]
 
@@ -508,7 +535,7 @@ Voice example: "{config.voice}"
 """
 
         if secondary and secondary_config:
-            secondary_weight = self.current_blend.get(secondary, 0)
+            secondary_weight = self.get_weight(secondary)
             prompt += f"""
 
 ## BLENDING WITH: {secondary_config.name} ({secondary_weight:.0%})
@@ -8,6 +8,7 @@ Each stage has:
 - A focused prompt (what to do in THIS stage)
 - Transition rules (AI decides when to move on)
 - Max turns (safety valve - don't get stuck)
+- An output budget (sentences + tokens per reply)
 - Mood modifiers (different moods affect pacing)
 
 Stages:
@@ -24,6 +25,7 @@ Stages:
 from .models import (
     CallStage,
     MoodModifiers,
+    StageBudget,
     StageConfig,
 )
 
@@ -34,6 +36,14 @@ from .config import (
     TRANSITION_DETECTOR_PROMPT,
 )
 
+# Output budgets
+from .budgets import (
+    CALL_TYPE_BUDGETS,
+    STAGE_BUDGETS,
+    SentenceLimiter,
+    get_stage_budget,
+)
+
 # Transitions & helpers
 from .transitions import (
     get_stage_prompt,
@@ -51,11 +61,17 @@ __all__ = [
     # Models
     "CallStage",
     "MoodModifiers",
+    "StageBudget",
     "StageConfig",
     # Config
     "MOOD_STAGE_MODIFIERS",
     "STAGE_PROMPTS",
     "TRANSITION_DETECTOR_PROMPT",
+    # Output budgets
+    "CALL_TYPE_BUDGETS",
+    "STAGE_BUDGETS",
+    "SentenceLimiter",
+    "get_stage_budget",
     # Transitions & helpers
     "get_stage_prompt",
     "get_stage_config",
@@ -0,0 +1,135 @@
+"""
+Stage Budgets - Output limits per stage and call type
+======================================================
+
+Every stage prompt asks for one or two sentences, but the speaking node
+used to request the same 150 tokens on every turn and stream whatever the
+model produced. Budgets make the limit real:
+- max_tokens caps the request per stage
+- max_sentences stops speaking at the stage's sentence limit and, unless a
+  tool marker could still follow, ends the stream (closing the HTTP
+  request) there - see SentenceLimiter
+
+Call types override individual stages where they need room (story and
+milestone calls deliver a longer "memory" or reveal at the peak).
+"""
+
+import re
+from typing import Optional
+
+from .models import CallStage, StageBudget
+
+
+DEFAULT_BUDGET = StageBudget(max_sentences=2, max_tokens=100)
+
+STAGE_BUDGETS: dict[CallStage, StageBudget] = {
+    CallStage.HOOK: StageBudget(max_sentences=2, max_tokens=80),
+    CallStage.ACKNOWLEDGE: StageBudget(max_sentences=2, max_tokens=100),
+    CallStage.ACCOUNTABILITY: StageBudget(max_sentences=2, max_tokens=80),
+    CallStage.DIG_DEEPER: StageBudget(max_sentences=2, max_tokens=120),
+    CallStage.PEAK: StageBudget(max_sentences=3, max_tokens=150),
+    CallStage.TOMORROW_LOCK: StageBudget(max_sentences=2, max_tokens=100),
+    CallStage.CLOSE: StageBudget(max_sentences=2, max_tokens=80),
+}
+
+# Per-call-type overrides (call type name -> stage -> budget)
+CALL_TYPE_BUDGETS: dict[str, dict[CallStage, StageBudget]] = {
+    "story": {
+        CallStage.PEAK: StageBudget(max_sentences=4, max_tokens=200),
+    },
+    "milestone": {
+        CallStage.PEAK: StageBudget(max_sentences=4, max_tokens=200),
+    },
+    "reflection": {
+        CallStage.DIG_DEEPER: StageBudget(max_sentences=3, max_tokens=150),
+    },
+}
+
+
+def get_stage_budget(
+    stage: CallStage, call_type_name: Optional[str] = None
+) -> StageBudget:
+    """Get the output budget for a stage, with call-type overrides applied."""
+    overrides = CALL_TYPE_BUDGETS.get(call_type_name or "", {})
+    if stage in overrides:
+        return overrides[stage]
+    return STAGE_BUDGETS.get(stage, DEFAULT_BUDGET)
+
+
+# Sentence end: a single "." (a run of dots is a spoken pause, not an end)
+# or "!"/"?", optional closing quote/bracket, confirmed by the whitespace
+# that follows it
+SENTENCE_END = re.compile(r"(?:(?<!\.)\.(?!\.)|[!?]+)[\"')]*(?=\s)")
+
+# Words whose trailing "." doesn't end a sentence ("Dr. Smith")
+ABBREVIATIONS = frozenset({"mr", "mrs", "ms", "dr", "prof", "st", "jr", "sr", "vs", "approx"})
+_LAST_WORD = re.compile(r"[\w.]+$")
+# Dotted initialisms: "e.g", "i.e", "a.m" (before their final ".")
+_INITIALISM = re.compile(r"(?:\w\.)+\w")
+
+
+def _ends_sentence(text: str, match: re.Match) -> bool:
+    """False for the "." of an abbreviation or initialism."""
+    if text[match.start()] != ".":
+        return True
+    word = _LAST_WORD.search(text, 0, match.start())
+    if word is None:
+        return True
+    word = word.group()
+    return word.lower() not in ABBREVIATIONS and not _INITIALISM.fullmatch(word)
+
+
+class SentenceLimiter:
+    """
+    Cuts a streamed reply after max_sentences sentences.
+
+    Feed chunks as they arrive; `feed` returns the part to speak, and
+    nothing more is released once the limit is reached (`limited`). A
+    terminator at the very end of a chunk is only counted when the next
+    chunk confirms it, so "3.5" isn't cut. Pauses ("So... day 12") and
+    abbreviations ("Dr.", "e.g.") don't count as sentence ends.
+
+    With `markers=True` (memory tools enabled) the model may put a
+    bracketed tool marker ([SEARCH_MEMORY: ...]) after its sentences, so
+    the stream has to be read to the end: past the limit the text is only
+    collected in `text` for tool detection, and `done` is never set.
+    Without markers `done` is set at the limit and the caller stops reading.
+    """
+
+    def __init__(self, max_sentences: int, markers: bool = False):
+        self.max_sentences = max_sentences
+        self.markers = markers
+        self.text = ""
+        self.limited = False
+        self.done = False
+        self._released = 0
+
+    def feed(self, chunk: str) -> str:
+        self.text += chunk
+        if self.limited:
+            return ""
+
+        cut = len(self.text)
+        count = 0
+        for match in SENTENCE_END.finditer(self.text):
+            if not _ends_sentence(self.text, match):
+                continue
+            count += 1
+            if count >= self.max_sentences:
+                cut = match.end()
+                self.limited = True
+                self.done = not self.markers
+                break
+
+        released = self.text[self._released : max(cut, self._released)]
+        self._released = max(cut, self._released)
+        return released
+
+
+__all__ = [
+    "DEFAULT_BUDGET",
+    "STAGE_BUDGETS",
+    "CALL_TYPE_BUDGETS",
+    "get_stage_budget",
+    "SentenceLimiter",
+]
@@ -38,3 +38,11 @@ class StageConfig:
     transition_hint: str  # What signals it's time to move on
     max_turns: int = 5  # Safety valve - force advance after this many turns
     next_stage: Optional[CallStage] = None
+
+
+@dataclass(frozen=True)
+class StageBudget:
+    """Output budget for one reply in a stage."""
+
+    max_sentences: int  # Early-stop the stream after this many sentences
+    max_tokens: int  # Hard cap passed to the LLM
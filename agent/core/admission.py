@@ -0,0 +1,350 @@
+"""
+Admission Control
+=================
+
+Decides whether this worker takes one more call, from live load signals.
+
+An overloaded worker doesn't fail one call - every live call gets slower
+replies at once. The calls already in progress come first, so the
+pre-call handler asks the AdmissionController before doing any work:
+
+Signals (per worker process):
+- active calls: call_registry, plus calls admitted in the last
+  ADMISSION_PENDING_S that haven't connected yet (a dispatch herd would
+  otherwise all see the same low count)
+- in-flight LLM requests: llm_stats.in_flight
+- event-loop lag: how long a callback waits for the loop right now, or the
+  worst lag core.loop_monitor sampled in the last second if that is higher
+- turn latency p95: reply latency of live calls (core.turns.turn_latency)
+
+Decisions:
+- ACCEPT
+- DEFER: soft overload (lag spike, LLM burst, calls near the cap) - wait up
+  to ADMISSION_DEFER_MAX_S re-checking, then accept, or reject if it persists
+- REJECT: hard overload - HTTP 503 with Retry-After
+- ROUTE_AWAY: hard overload with ADMISSION_ROUTE_AWAY_URL set - HTTP 307 to
+  that deployment instead of a 503
+
+Every decision carries its reason ("calls 20/20", "loop lag 240ms > 100ms"),
+returned in the HTTP error detail, logged, and counted in `stats`.
+
+Configuration via environment variables:
+- ADMISSION_CONTROL: "true" (default) / "false"
+- ADMISSION_MAX_CALLS: hard cap on calls per worker (default 20)
+- ADMISSION_SOFT_CALLS: defer at this many calls (default 80% of the cap)
+- ADMISSION_MAX_LLM_IN_FLIGHT: defer at this many open LLM requests (default 48)
+- ADMISSION_MAX_LOOP_LAG_MS: defer above this lag, reject above 3x (default 100)
+- ADMISSION_MAX_TURN_P95_MS: reject above this reply p95 over the last minute (default 2500)
+- ADMISSION_DEFER_MAX_S: longest a deferred request waits (default 2)
+- ADMISSION_RETRY_AFTER_S: Retry-After on rejections (default 30)
+- ADMISSION_ROUTE_AWAY_URL: where to send calls this worker can't take (default unset)
+
+Usage:
+    from core.admission import admission_controller
+
+    admission = await admission_controller.admit()
+    if not admission.accepted:
+        raise admission.http_error()
+
+    await admission_controller.snapshot()   # GET /admission
+"""
+
+import asyncio
+import os
+import time
+from collections import deque
+from dataclasses import dataclass, asdict, field
+from enum import Enum
+from typing import Optional
+
+from loguru import logger
+
+from core.call_registry import call_registry
+from core.llm_client import llm_stats
+from core.loop_monitor import loop_monitor
+from core.turns import turn_latency
+
+ADMISSION_CONTROL = os.getenv("ADMISSION_CONTROL", "true").lower() == "true"
+ADMISSION_MAX_CALLS = int(os.getenv("ADMISSION_MAX_CALLS", "20"))
+ADMISSION_SOFT_CALLS = int(
+    os.getenv("ADMISSION_SOFT_CALLS", str(max(1, int(ADMISSION_MAX_CALLS * 0.8))))
+)
+ADMISSION_MAX_LLM_IN_FLIGHT = int(os.getenv("ADMISSION_MAX_LLM_IN_FLIGHT", "48"))
+ADMISSION_MAX_LOOP_LAG_MS = float(os.getenv("ADMISSION_MAX_LOOP_LAG_MS", "100"))
+ADMISSION_MAX_TURN_P95_MS = float(os.getenv("ADMISSION_MAX_TURN_P95_MS", "2500"))
+ADMISSION_DEFER_MAX_S = float(os.getenv("ADMISSION_DEFER_MAX_S", "2"))
+ADMISSION_RETRY_AFTER_S = int(os.getenv("ADMISSION_RETRY_AFTER_S", "30"))
+ADMISSION_ROUTE_AWAY_URL = os.getenv("ADMISSION_ROUTE_AWAY_URL")
+
+# Admitted calls count as active until they connect, for at most this long
+ADMISSION_PENDING_S = 15.0
+# Lag above max * this is a hard overload, not a spike to wait out
+LAG_HARD_FACTOR = 3.0
+# Turn p95 window and the samples needed before it is trusted
+TURN_P95_WINDOW_S = 60.0
+TURN_P95_MIN_SAMPLES = 5
+# Re-check interval while deferring
+DEFER_STEP_S = 0.25
+
+
+class AdmissionDecision(str, Enum):
+    ACCEPT = "accept"
+    DEFER = "defer"
+    REJECT = "reject"
+    ROUTE_AWAY = "route_away"
+
+
+@dataclass
+class LoadSignals:
+    """Live load of this worker."""
+
+    active_calls: int
+    pending_calls: int  # Admitted, not yet connected
+    llm_in_flight: int
+    loop_lag_ms: float
+    turn_p95_ms: Optional[float]
+
+    @property
+    def calls(self) -> int:
+        return self.active_calls + self.pending_calls
+
+    def to_dict(self) -> dict:
+        data = asdict(self)
+        data["loop_lag_ms"] = round(self.loop_lag_ms, 1)
+        return data
+
+
+@dataclass
+class AdmissionResult:
+    """Outcome of one admission check."""
+
+    decision: AdmissionDecision
+    reason: str
+    signals: LoadSignals
+    waited_ms: float = 0.0  # Time spent deferred
+    retry_after_s: Optional[int] = None
+    location: Optional[str] = None  # ROUTE_AWAY target
+
+    @property
+    def accepted(self) -> bool:
+        return self.decision == AdmissionDecision.ACCEPT
+
+    def to_dict(self) -> dict:
+        return {
+            "decision": self.decision.value,
+            "reason": self.reason,
+            "waited_ms": round(self.waited_ms, 1),
+            "retry_after_s": self.retry_after_s,
+            "signals": self.signals.to_dict(),
+        }
+
+    def http_error(self):
+        """HTTPException for a refused call (the SDK passes it through to the dialer)."""
+        from fastapi import HTTPException
+
+        if self.decision == AdmissionDecision.ROUTE_AWAY:
+            return HTTPException(
+                status_code=307, detail=self.to_dict(), headers={"Location": self.location}
+            )
+        return HTTPException(
+            status_code=503,
+            detail=self.to_dict(),
+            headers={"Retry-After": str(self.retry_after_s or ADMISSION_RETRY_AFTER_S)},
+        )
+
+
+@dataclass
+class AdmissionStats:
+    """Process-wide admission counters."""
+
+    accepted: int = 0
+    deferred: int = 0  # Deferred, whatever the final decision
+    rejected: int = 0
+    routed_away: int = 0
+    last_decision: Optional[str] = None
+    last_reason: Optional[str] = None
+    reasons: dict[str, int] = field(default_factory=dict)  # Refusals by signal
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+
+async def probe_loop_lag() -> float:
+    """Milliseconds a callback scheduled now waits before it runs."""
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+    await asyncio.sleep(0)
+    return (loop.time() - start) * 1000
+
+
+class AdmissionController:
+    """Accept / defer / reject decisions for incoming calls on this worker."""
+
+    def __init__(
+        self,
+        max_calls: int = ADMISSION_MAX_CALLS,
+        soft_calls: int = ADMISSION_SOFT_CALLS,
+        max_llm_in_flight: int = ADMISSION_MAX_LLM_IN_FLIGHT,
+        max_loop_lag_ms: float = ADMISSION_MAX_LOOP_LAG_MS,
+        max_turn_p95_ms: float = ADMISSION_MAX_TURN_P95_MS,
+        defer_max_s: float = ADMISSION_DEFER_MAX_S,
+        route_away_url: Optional[str] = ADMISSION_ROUTE_AWAY_URL,
+    ):
+        self.max_calls = max_calls
+        self.soft_calls = min(soft_calls, max_calls)
+        self.max_llm_in_flight = max_llm_in_flight
+        self.max_loop_lag_ms = max_loop_lag_ms
+        self.max_turn_p95_ms = max_turn_p95_ms
+        self.defer_max_s = defer_max_s
+        self.route_away_url = route_away_url
+        self.stats = AdmissionStats()
+
+        self._admitted: deque[float] = deque()  # monotonic time of recent accepts
+        self._admitted_total = 0
+
+    def _pending_calls(self) -> int:
+        """Recently admitted calls that haven't registered yet."""
+        cutoff = time.monotonic() - ADMISSION_PENDING_S
+        while self._admitted and self._admitted[0] < cutoff:
+            self._admitted.popleft()
+        registered = len(call_registry) + call_registry.completed
+        return min(len(self._admitted), max(0, self._admitted_total - registered))
+
+    async def signals(self) -> LoadSignals:
+        loop_lag_ms = await probe_loop_lag()
+        if loop_monitor.running:
+            loop_lag_ms = max(loop_lag_ms, loop_monitor.recent_lag_ms())
+        return LoadSignals(
+            active_calls=len(call_registry),
+            pending_calls=self._pending_calls(),
+            llm_in_flight=llm_stats.in_flight,
+            loop_lag_ms=loop_lag_ms,
+            turn_p95_ms=turn_latency.percentile(
+                0.95, TURN_P95_WINDOW_S, min_samples=TURN_P95_MIN_SAMPLES
+            ),
+        )
+
+    def evaluate(self, signals: LoadSignals) -> tuple[AdmissionDecision, str, str]:
+        """(decision, reason, signal name) - DEFER means soft overload."""
+        hard = self._refuse_decision()
+        if signals.calls >= self.max_calls:
+            return hard, f"calls {signals.calls}/{self.max_calls}", "calls"
+        if signals.turn_p95_ms is not None and signals.turn_p95_ms > self.max_turn_p95_ms:
+            return (
+                hard,
+                f"turn p95 {signals.turn_p95_ms:.0f}ms > {self.max_turn_p95_ms:.0f}ms",
+                "turn_p95",
+            )
+        if signals.loop_lag_ms > self.max_loop_lag_ms * LAG_HARD_FACTOR:
+            return hard, f"loop lag {signals.loop_lag_ms:.0f}ms", "loop_lag"
+
+        if signals.loop_lag_ms > self.max_loop_lag_ms:
+            return (
+                AdmissionDecision.DEFER,
+                f"loop lag {signals.loop_lag_ms:.0f}ms > {self.max_loop_lag_ms:.0f}ms",
+                "loop_lag",
+            )
+        if signals.llm_in_flight >= self.max_llm_in_flight:
+            return (
+                AdmissionDecision.DEFER,
+                f"LLM in flight {signals.llm_in_flight}/{self.max_llm_in_flight}",
+                "llm_in_flight",
+            )
+        if signals.calls >= self.soft_calls:
+            return AdmissionDecision.DEFER, f"calls {signals.calls}/{self.max_calls}", "calls"
+        return AdmissionDecision.ACCEPT, "ok", ""
+
+    def _refuse_decision(self) -> AdmissionDecision:
+        return AdmissionDecision.ROUTE_AWAY if self.route_away_url else AdmissionDecision.REJECT
+
+    async def admit(self) -> AdmissionResult:
+        """Decide on one incoming call; deferral waits here."""
+        if not ADMISSION_CONTROL:
+            signals = await self.signals()
+            return self._record(AdmissionResult(AdmissionDecision.ACCEPT, "disabled", signals))
+
+        start = time.monotonic()
+        signals = await self.signals()
+        decision, reason, signal = self.evaluate(signals)
+
+        if decision == AdmissionDecision.DEFER:
+            self.stats.deferred += 1
+            first_reason = reason
+            deadline = start + self.defer_max_s
+            while decision == AdmissionDecision.DEFER and time.monotonic() < deadline:
+                await asyncio.sleep(DEFER_STEP_S)
+                signals = await self.signals()
+                decision, reason, signal = self.evaluate(signals)
+            if decision == AdmissionDecision.DEFER:
+                decision = self._refuse_decision()
+                reason = f"{reason} after {self.defer_max_s:.1f}s"
+            elif decision == AdmissionDecision.ACCEPT:
+                reason = f"deferred ({first_reason})"
+
+        result = AdmissionResult(
+            decision,
+            reason,
+            signals,
+            waited_ms=(time.monotonic() - start) * 1000,
+        )
+        if decision == AdmissionDecision.REJECT:
+            result.retry_after_s = ADMISSION_RETRY_AFTER_S
+        elif decision == AdmissionDecision.ROUTE_AWAY:
+            result.location = self.route_away_url
+        if not result.accepted:
+            self.stats.reasons[signal] = self.stats.reasons.get(signal, 0) + 1
+        return self._record(result)
+
+    def _record(self, result: AdmissionResult) -> AdmissionResult:
+        stats = self.stats
+        stats.last_decision = result.decision.value
+        stats.last_reason = result.reason
+        if result.accepted:
+            stats.accepted += 1
+            self._admitted.append(time.monotonic())
+            self._admitted_total += 1
+        elif result.decision == AdmissionDecision.ROUTE_AWAY:
+            stats.routed_away += 1
+        else:
+            stats.rejected += 1
+
+        if result.accepted and result.reason in ("ok", "disabled"):
+            logger.debug(f"Admission: accept ({result.signals.to_dict()})")
+        elif result.accepted:
+            logger.info(f"🚦 Admission: accept after {result.waited_ms:.0f}ms - {result.reason}")
+        else:
+            logger.warning(
+                f"🚦 Admission: {result.decision.value} - {result.reason} "
+                f"({result.signals.to_dict()})"
+            )
+        return result
+
+    async def snapshot(self) -> dict:
+        """Current signals, limits and counters (served at GET /admission)."""
+        return {
+            "signals": (await self.signals()).to_dict(),
+            "limits": {
+                "max_calls": self.max_calls,
+                "soft_calls": self.soft_calls,
+                "max_llm_in_flight": self.max_llm_in_flight,
+                "max_loop_lag_ms": self.max_loop_lag_ms,
+                "max_turn_p95_ms": self.max_turn_p95_ms,
+            },
+            "stats": self.stats.to_dict(),
+        }
+
+
+# Singleton instance
+admission_controller = AdmissionController()
+
+
+__all__ = [
+    "ADMISSION_CONTROL",
+    "AdmissionController",
+    "AdmissionDecision",
+    "AdmissionResult",
+    "AdmissionStats",
+    "LoadSignals",
+    "admission_controller",
+    "probe_loop_lag",
+]
@@ -0,0 +1,204 @@
+"""
+Analysis Cache
+==============
+
+Process-wide cache for background analyses of short utterances.
+
+Most user turns are short acknowledgements ("yes", "yeah I did", "not
+yet") and the analyzers return the same answer for them on every call for
+every user. Results are cached by:
+
+    analyzer + prompt version + normalized utterance + context
+
+- prompt version is a hash of the analyzer's system prompt and schema,
+  so editing a prompt invalidates its entries automatically
+- context carries anything else that changes the answer (e.g. the
+  user's favorite excuse)
+
+Only utterances up to ANALYSIS_CACHE_MAX_WORDS words are cached, failed
+analyses (None) are never cached, and concurrent misses for the same key
+share a single LLM call. If that call is cancelled, the callers waiting on
+it run their own.
+
+Configuration via environment variables:
+- ANALYSIS_CACHE_SIZE: max entries (default 4096, 0 disables)
+- ANALYSIS_CACHE_TTL: seconds an entry stays valid (default 3600)
+- ANALYSIS_CACHE_MAX_WORDS: longest utterance that is cached (default 6)
+"""
+
+import asyncio
+import hashlib
+import os
+import re
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, asdict
+from typing import Awaitable, Callable, Optional
+
+ANALYSIS_CACHE_SIZE = int(os.getenv("ANALYSIS_CACHE_SIZE", "4096"))
+ANALYSIS_CACHE_TTL = float(os.getenv("ANALYSIS_CACHE_TTL", "3600"))
+ANALYSIS_CACHE_MAX_WORDS = int(os.getenv("ANALYSIS_CACHE_MAX_WORDS", "6"))
+
+_PUNCTUATION = re.compile(r"[^\w\s']")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_utterance(text: str) -> str:
+    """
+    Normalize a transcript for cache lookup.
+
+    Examples:
+        "Yes!" -> "yes"
+        "  Yeah, I did. " -> "yeah i did"
+    """
+    text = _PUNCTUATION.sub(" ", text.lower())
+    return _WHITESPACE.sub(" ", text).strip()
+
+
+def prompt_version(*parts: object) -> str:
+    """Short stable hash of an analyzer's prompt (and schema)."""
+    digest = hashlib.sha1("\x00".join(str(p) for p in parts).encode())
+    return digest.hexdigest()[:12]
+
+
+@dataclass
+class AnalysisCacheStats:
+    """Hit/miss counters for the analysis cache."""
+
+    hits: int = 0
+    misses: int = 0
+    skipped: int = 0  # Utterance too long to cache
+    evictions: int = 0
+    expirations: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def to_dict(self) -> dict:
+        data = asdict(self)
+        data["hit_rate"] = round(self.hit_rate, 3)
+        return data
+
+
+class AnalysisCache:
+    """Bounded LRU cache with TTL for analyzer results."""
+
+    def __init__(
+        self,
+        max_entries: int = ANALYSIS_CACHE_SIZE,
+        ttl: float = ANALYSIS_CACHE_TTL,
+        max_words: int = ANALYSIS_CACHE_MAX_WORDS,
+    ):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.max_words = max_words
+        self.stats = AnalysisCacheStats()
+        self._entries: OrderedDict[tuple, tuple[float, dict]] = OrderedDict()
+        self._inflight: dict[tuple, asyncio.Future] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def make_key(
+        self, analyzer: str, version: str, text: str, context: Optional[str] = None
+    ) -> Optional[tuple]:
+        """Cache key for an utterance, or None if it shouldn't be cached."""
+        if self.max_entries <= 0:
+            return None
+        normalized = normalize_utterance(text)
+        if not normalized or len(normalized.split()) > self.max_words:
+            return None
+        context_key = prompt_version(normalize_utterance(context)) if context else ""
+        return (analyzer, version, normalized, context_key)
+
+    def get(self, key: tuple) -> Optional[dict]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        stored_at, result = entry
+        if time.monotonic() - stored_at > self.ttl:
+            del self._entries[key]
+            self.stats.expirations += 1
+            return None
+        self._entries.move_to_end(key)
+        return dict(result)
+
+    def put(self, key: tuple, result: dict) -> None:
+        self._entries[key] = (time.monotonic(), dict(result))
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.stats.evictions += 1
+
+    async def get_or_compute(
+        self,
+        analyzer: str,
+        version: str,
+        text: str,
+        compute: Callable[[], Awaitable[Optional[dict]]],
+        context: Optional[str] = None,
+    ) -> Optional[dict]:
+        """
+        Return a cached analysis or run `compute` and cache its result.
+
+        Callers get their own copy of the result dict.
+        """
+        key = self.make_key(analyzer, version, text, context)
+        if key is None:
+            self.stats.skipped += 1
+            return await compute()
+
+        cached = self.get(key)
+        if cached is not None:
+            self.stats.hits += 1
+            return cached
+
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            # Same utterance already being analyzed (e.g. another call)
+            try:
+                result = await asyncio.shield(inflight)
+            except asyncio.CancelledError:
+                if not inflight.cancelled():
+                    raise
+                # Its owner was cancelled (e.g. barge-in) - analyze it ourselves
+                return await self.get_or_compute(analyzer, version, text, compute, context)
+            self.stats.hits += 1
+            return dict(result) if result is not None else None
+
+        self.stats.misses += 1
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        result = None
+        try:
+            result = await compute()
+            if result is not None:
+                self.put(key, result)
+        except asyncio.CancelledError:
+            # No result is coming - waiters recompute instead of sharing None
+            future.cancel()
+            raise
+        finally:
+            if not future.done():
+                future.set_result(result)
+            del self._inflight[key]
+        return dict(result) if result is not None else None
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self.stats = AnalysisCacheStats()
+
+
+# Singleton instance
+analysis_cache = AnalysisCache()
+
+
+__all__ = [
+    "AnalysisCache",
+    "AnalysisCacheStats",
+    "analysis_cache",
+    "normalize_utterance",
+    "prompt_version",
+]
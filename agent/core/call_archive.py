@@ -0,0 +1,456 @@
+"""
+Call Archive
+============
+
+Append-only columnar archive of finished calls, partitioned by day, for
+offline analysis, replay testing and distillation without per-user API
+calls.
+
+Every call is written once, when it ends, as one part file per table:
+
+    <CALL_ARCHIVE_DIR>/<table>/day=YYYY-MM-DD/<call_id>.parquet
+
+Tables (columns in TABLES):
+- calls:  one row per call - type, mood, duration and outcomes
+- turns:  user and agent turns with the stage they happened in
+- events: insight events from agents.events (JSON payload)
+- stages: stage transitions and what triggered them (llm / rules)
+- spans:  latency spans (response time, time to first chunk, stage checks)
+
+Parts are Parquet when pyarrow is installed, otherwise JSON Lines with the
+same columns; readers handle both. `compact` merges a day's parts into one
+file per table. The day directories use hive-style names, so the archive
+can also be opened directly with pyarrow.dataset, DuckDB or Polars.
+
+Recording is enabled by setting CALL_ARCHIVE_DIR. Rows are buffered in
+memory during the call and written off the event loop when it ends.
+
+Usage:
+    from core.call_archive import CallArchive
+
+    archive = CallArchive("archive")
+    broken = archive.scan("calls", since="2026-01-01", where={"promise_kept": False})
+    turns = archive.scan("turns", where={"call_id": broken[0]["call_id"]})
+
+    # CLI
+    uv run python -m core.call_archive scan turns --since 2026-01-01 --where role=user
+    uv run python -m core.call_archive compact --day 2026-01-15
+    uv run python -m core.call_archive stats
+
+Configuration via environment variables:
+- CALL_ARCHIVE_DIR: archive root (unset = archiving disabled)
+"""
+
+import importlib.util
+import json
+import os
+import time
+import uuid
+from datetime import date, datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Optional, Union
+
+from loguru import logger
+
+CALL_ARCHIVE_DIR = os.getenv("CALL_ARCHIVE_DIR")
+
+HAS_PYARROW = importlib.util.find_spec("pyarrow") is not None
+
+# Column name -> type, per table
+TABLES: dict[str, dict[str, str]] = {
+    "calls": {
+        "call_id": "string",
+        "user_id": "string",
+        "started_at": "string",
+        "duration_s": "float",
+        "call_type": "string",
+        "mood": "string",
+        "turns": "int",
+        "final_stage": "string",
+        "promise_kept": "bool",
+        "tomorrow_commitment": "string",
+        "commitment_is_specific": "bool",
+        "excuses": "string",  # JSON list
+        "call_quality_score": "float",
+    },
+    "turns": {
+        "call_id": "string",
+        "user_id": "string",
+        "seq": "int",
+        "t": "float",
+        "role": "string",
+        "stage": "string",
+        "text": "string",
+    },
+    "events": {
+        "call_id": "string",
+        "user_id": "string",
+        "t": "float",
+        "type": "string",
+        "data": "string",  # JSON object
+    },
+    "stages": {
+        "call_id": "string",
+        "user_id": "string",
+        "t": "float",
+        "turn": "int",
+        "from_stage": "string",
+        "to_stage": "string",
+        "reason": "string",
+    },
+    "spans": {
+        "call_id": "string",
+        "user_id": "string",
+        "t": "float",
+        "name": "string",
+        "duration_ms": "float",
+        "attrs": "string",  # JSON object
+    },
+}
+
+DayLike = Union[str, date, None]
+
+
+def _schema(table: str):
+    import pyarrow as pa
+
+    types = {"string": pa.string(), "float": pa.float64(), "int": pa.int64(), "bool": pa.bool_()}
+    return pa.schema([(name, types[kind]) for name, kind in TABLES[table].items()])
+
+
+def _normalize(table: str, row: dict) -> dict:
+    """Row with exactly the table's columns (missing ones None)."""
+    return {column: row.get(column) for column in TABLES[table]}
+
+
+def _as_day(value: DayLike) -> Optional[str]:
+    if value is None:
+        return None
+    return value.isoformat() if isinstance(value, date) else str(value)[:10]
+
+
+# =============================================================================
+# READ / WRITE
+# =============================================================================
+
+
+class CallArchive:
+    """Day-partitioned archive on local disk."""
+
+    def __init__(self, root: Union[str, Path]):
+        self.root = Path(root)
+
+    def _partition(self, table: str, day: str) -> Path:
+        return self.root / table / f"day={day}"
+
+    def write_part(self, table: str, day: str, part: str, rows: list[dict]) -> Optional[Path]:
+        """Write one immutable part file. Returns its path (None if no rows)."""
+        if not rows:
+            return None
+        directory = self._partition(table, day)
+        directory.mkdir(parents=True, exist_ok=True)
+        rows = [_normalize(table, r) for r in rows]
+
+        if HAS_PYARROW:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+
+            path = directory / f"{part}.parquet"
+            tmp = directory / f".{part}.parquet.tmp"
+            pq.write_table(pa.Table.from_pylist(rows, schema=_schema(table)), tmp)
+        else:
+            path = directory / f"{part}.jsonl"
+            tmp = directory / f".{part}.jsonl.tmp"
+            with open(tmp, "w") as f:
+                for row in rows:
+                    f.write(json.dumps(row, default=str) + "\n")
+        os.replace(tmp, path)  # Readers never see a half-written part
+        return path
+
+    def days(self, table: str, since: DayLike = None, until: DayLike = None) -> list[str]:
+        """Partition days present for a table, within [since, until]."""
+        since, until = _as_day(since), _as_day(until)
+        base = self.root / table
+        if not base.is_dir():
+            return []
+        days = sorted(p.name[4:] for p in base.iterdir() if p.is_dir() and p.name.startswith("day="))
+        return [d for d in days if (not since or d >= since) and (not until or d <= until)]
+
+    def parts(self, table: str, day: str) -> list[Path]:
+        directory = self._partition(table, day)
+        return sorted(
+            p for p in directory.iterdir()
+            if p.suffix in (".parquet", ".jsonl") and not p.name.startswith(".")
+        )
+
+    @staticmethod
+    def _read_part(path: Path, columns: Optional[list[str]]) -> list[dict]:
+        if path.suffix == ".parquet":
+            if not HAS_PYARROW:
+                raise ImportError(f"pyarrow is required to read {path}")
+            import pyarrow.parquet as pq
+
+            return pq.read_table(path, columns=columns).to_pylist()
+        with open(path) as f:
+            rows = [json.loads(line) for line in f if line.strip()]
+        if columns:
+            rows = [{c: r.get(c) for c in columns} for r in rows]
+        return rows
+
+    def scan(
+        self,
+        table: str,
+        since: DayLike = None,
+        until: DayLike = None,
+        where: Union[dict, Callable[[dict], bool], None] = None,
+        columns: Optional[list[str]] = None,
+        limit: Optional[int] = None,
+    ) -> list[dict]:
+        """
+        Rows of a table for days in [since, until], in day order.
+
+        `where` is either {column: value} (all must match) or a predicate.
+        Each row also gets a `day` column from its partition.
+        """
+        if table not in TABLES:
+            raise ValueError(f"Unknown table {table!r} (expected one of {list(TABLES)})")
+        if isinstance(where, dict):
+            expected = where
+            where = lambda row: all(row.get(k) == v for k, v in expected.items())  # noqa: E731
+            # Filter columns must be read even if not requested
+            if columns:
+                columns = list(dict.fromkeys([*columns, *expected]))
+
+        rows: list[dict] = []
+        for day in self.days(table, since, until):
+            for path in self.parts(table, day):
+                for row in self._read_part(path, columns):
+                    if where is None or where(row):
+                        row["day"] = day
+                        rows.append(row)
+                        if limit and len(rows) >= limit:
+                            return rows
+        return rows
+
+    def call(self, call_id: str, day: DayLike = None) -> dict:
+        """Everything archived for one call: {table: rows}."""
+        return {
+            table: self.scan(table, since=day, until=day, where={"call_id": call_id})
+            for table in TABLES
+        }
+
+    def to_arrow(self, table: str, since: DayLike = None, until: DayLike = None):
+        """The table (day range) as one pyarrow.Table, with a `day` column."""
+        import pyarrow as pa
+
+        rows = self.scan(table, since, until)
+        schema = _schema(table).append(pa.field("day", pa.string()))
+        return pa.Table.from_pylist(rows, schema=schema)
+
+    def compact(self, day: DayLike) -> dict[str, int]:
+        """Merge each table's parts for a day into one file. Returns parts merged."""
+        day = _as_day(day)
+        merged = {}
+        for table in TABLES:
+            if day not in self.days(table, day, day):
+                continue
+            parts = self.parts(table, day)
+            if len(parts) < 2:
+                continue
+            rows = []
+            for path in parts:
+                rows.extend(self._read_part(path, None))
+            self.write_part(table, day, f"compacted-{int(time.time())}", rows)
+            for path in parts:
+                path.unlink()
+            merged[table] = len(parts)
+        return merged
+
+    def stats(self) -> dict[str, dict]:
+        """Days, part files and bytes per table."""
+        out = {}
+        for table in TABLES:
+            days = self.days(table)
+            parts = [p for d in days for p in self.parts(table, d)]
+            out[table] = {
+                "days": len(days),
+                "parts": len(parts),
+                "bytes": sum(p.stat().st_size for p in parts),
+            }
+        return out
+
+
+# =============================================================================
+# PER-CALL RECORDING
+# =============================================================================
+
+
+class CallTrace:
+    """
+    Buffers one call's turns, insight events, stage transitions and latency
+    spans, and writes them to the archive when the call ends.
+
+    Timestamps (`t`) are seconds since the call started.
+    """
+
+    def __init__(
+        self,
+        user_id: str,
+        call_type: str,
+        mood: str,
+        archive: CallArchive,
+        initial_stage: Optional[str] = None,
+    ):
+        self.call_id = uuid.uuid4().hex
+        self.user_id = user_id
+        self.call_type = call_type
+        self.mood = mood
+        self.archive = archive
+        self.started_at = datetime.now(timezone.utc)
+        self.stage = initial_stage
+        self._t0 = time.monotonic()
+        self._rows: dict[str, list[dict]] = {table: [] for table in TABLES if table != "calls"}
+        self._closed = False
+
+    def elapsed(self, at: Optional[float] = None) -> float:
+        """Seconds since call start for a time.monotonic() value (default now)."""
+        return round((time.monotonic() if at is None else at) - self._t0, 3)
+
+    def _append(self, table: str, **row: Any) -> None:
+        if self._closed:
+            return
+        row.setdefault("t", self.elapsed())
+        self._rows[table].append({"call_id": self.call_id, "user_id": self.user_id, **row})
+
+    def turn(self, role: str, text: str, stage: Optional[str] = None) -> None:
+        self._append(
+            "turns",
+            seq=len(self._rows["turns"]),
+            role=role,
+            stage=stage or self.stage,
+            text=text,
+        )
+
+    def on_event(self, event) -> None:
+        """Bridge route handler for agents.events insights."""
+        self._append("events", type=type(event).__name__, data=event.model_dump_json())
+
+    def stage_change(self, from_stage: str, to_stage: str, reason: str, turn: int = 0) -> None:
+        self.stage = to_stage
+        self._append("stages", from_stage=from_stage, to_stage=to_stage, reason=reason, turn=turn)
+
+    def span(self, name: str, start: float, end: Optional[float] = None, **attrs: Any) -> None:
+        """Record a span from time.monotonic() start (and end, default now)."""
+        end = time.monotonic() if end is None else end
+        self._append(
+            "spans",
+            t=self.elapsed(start),
+            name=name,
+            duration_ms=round((end - start) * 1000, 1),
+            attrs=json.dumps(attrs, default=str),
+        )
+
+    def write(self, call_summary=None) -> list[Path]:
+        """Write this call's parts (sync - run via asyncio.to_thread)."""
+        if self._closed:
+            return []
+        self._closed = True
+
+        day = self.started_at.date().isoformat()
+        summary = call_summary
+        call_row = {
+            "call_id": self.call_id,
+            "user_id": self.user_id,
+            "started_at": self.started_at.isoformat(),
+            "duration_s": self.elapsed(),
+            "call_type": self.call_type,
+            "mood": self.mood,
+            "turns": len(self._rows["turns"]),
+            "final_stage": self.stage,
+        }
+        if summary is not None:
+            call_row.update(
+                promise_kept=summary.promise_kept,
+                tomorrow_commitment=summary.tomorrow_commitment,
+                commitment_is_specific=summary.commitment_is_specific,
+                excuses=json.dumps(summary.excuses_detected),
+                call_quality_score=summary.call_quality_score,
+            )
+
+        paths = []
+        try:
+            for table, rows in [("calls", [call_row]), *self._rows.items()]:
+                path = self.archive.write_part(table, day, self.call_id, rows)
+                if path:
+                    paths.append(path)
+            logger.info(
+                f"🗄️ Call archived: {self.call_id} "
+                f"({', '.join(f'{len(r)} {t}' for t, r in self._rows.items())})"
+            )
+        except Exception as e:
+            logger.error(f"Failed to archive call {self.call_id}: {e}")
+        return paths
+
+
+def create_call_trace(
+    user_id: str, call_type: str, mood: str, initial_stage: Optional[str] = None
+) -> Optional[CallTrace]:
+    """Create a trace if CALL_ARCHIVE_DIR is set, else None."""
+    if not CALL_ARCHIVE_DIR:
+        return None
+    return CallTrace(user_id, call_type, mood, CallArchive(CALL_ARCHIVE_DIR), initial_stage)
+
+
+__all__ = [
+    "CALL_ARCHIVE_DIR",
+    "HAS_PYARROW",
+    "TABLES",
+    "CallArchive",
+    "CallTrace",
+    "create_call_trace",
+]
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Query the call archive")
+    parser.add_argument("--root", default=CALL_ARCHIVE_DIR or "archive")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    scan_cmd = sub.add_parser("scan", help="Print rows of a table as JSON Lines")
+    scan_cmd.add_argument("table", choices=list(TABLES))
+    scan_cmd.add_argument("--since")
+    scan_cmd.add_argument("--until")
+    scan_cmd.add_argument("--where", action="append", default=[], help="column=value")
+    scan_cmd.add_argument("--columns", help="Comma-separated columns")
+    scan_cmd.add_argument("--limit", type=int)
+
+    compact_cmd = sub.add_parser("compact", help="Merge a day's parts")
+    compact_cmd.add_argument("--day", required=True)
+
+    sub.add_parser("stats", help="Days, parts and size per table")
+    args = parser.parse_args()
+
+    archive = CallArchive(args.root)
+    if args.command == "scan":
+        filters = {}
+        for clause in args.where:
+            column, _, raw = clause.partition("=")
+            try:
+                filters[column] = json.loads(raw)  # numbers, true/false, null
+            except ValueError:
+                filters[column] = raw
+        for row in archive.scan(
+            args.table,
+            since=args.since,
+            until=args.until,
+            where=filters or None,
+            columns=args.columns.split(",") if args.columns else None,
+            limit=args.limit,
+        ):
+            print(json.dumps(row, default=str))
+    elif args.command == "compact":
+        print(json.dumps(archive.compact(args.day), indent=2))
+    else:
+        print(json.dumps(archive.stats(), indent=2))
@@ -0,0 +1,267 @@
+"""
+Call Registry
+=============
+
+Tracks the state objects held by each active call and measures how many
+bytes they keep resident, so container sizing (calls per instance) can
+be based on numbers instead of guesses.
+
+Footprints are deep sizes (sys.getsizeof over the reachable object
+graph). Process-wide tables every call shares (CALL_TYPES, MOODS,
+PERSONA_CONFIGS, PILLAR_CONFIGS), classes, functions, modules and the
+event loop are excluded, so the number is what one more call costs.
+
+Configuration via environment variables:
+- CALL_MEMORY_BUDGET_KB: per-call budget; calls over it are logged (default 512)
+
+Usage:
+    entry = call_registry.register(user_id, node=node, aggregator=aggregator)
+    ...
+    call_registry.unregister(entry)  # logs the call's final footprint
+
+    # Synthetic report (bytes per call after N turns)
+    cd agent
+    uv run python -m core.call_registry --calls 50 --turns 20
+"""
+
+import asyncio
+import enum
+import os
+import sys
+import time
+import types
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Optional
+
+from loguru import logger
+
+CALL_MEMORY_BUDGET_KB = int(os.getenv("CALL_MEMORY_BUDGET_KB", "512"))
+
+# Never descend into these - shared by every call or not call state at all
+_OPAQUE_TYPES = (
+    type,
+    types.ModuleType,
+    types.FunctionType,
+    types.BuiltinFunctionType,
+    types.MethodType,
+    types.CodeType,
+    types.FrameType,
+    asyncio.AbstractEventLoop,
+    enum.Enum,
+)
+
+_shared_ids: Optional[set[int]] = None
+
+
+def _walk(obj: object, seen: set[int]) -> int:
+    """Deep size of obj, skipping (and recording) everything in seen."""
+    total = 0
+    stack = [obj]
+    while stack:
+        current = stack.pop()
+        oid = id(current)
+        if oid in seen or isinstance(current, _OPAQUE_TYPES):
+            continue
+        seen.add(oid)
+        total += sys.getsizeof(current)
+
+        if isinstance(current, dict):
+            stack.extend(current.keys())
+            stack.extend(current.values())
+        elif isinstance(current, (list, tuple, set, frozenset, deque)):
+            stack.extend(current)
+        elif isinstance(current, (str, bytes, int, float, bool)):
+            continue
+
+        attrs = getattr(current, "__dict__", None)
+        if attrs is not None:
+            stack.append(attrs)
+        for cls in type(current).__mro__:
+            for slot in getattr(cls, "__slots__", ()):
+                if slot in ("__dict__", "__weakref__"):
+                    continue
+                value = getattr(current, slot, None)
+                if value is not None:
+                    stack.append(value)
+    return total
+
+
+def _shared() -> set[int]:
+    """Ids of objects reachable from process-wide tables (computed once)."""
+    global _shared_ids
+    if _shared_ids is None:
+        from conversation.call_types import CALL_TYPES
+        from conversation.mood import MOODS
+        from conversation.persona import PERSONA_CONFIGS
+        from conversation.future_self import PILLAR_CONFIGS
+
+        _shared_ids = set()
+        for table in (CALL_TYPES, MOODS, PERSONA_CONFIGS, PILLAR_CONFIGS):
+            _walk(table, _shared_ids)
+    return _shared_ids
+
+
+def deep_sizeof(obj: object, seen: Optional[set[int]] = None) -> int:
+    """
+    Bytes held by obj, excluding shared process-wide data.
+
+    Pass the same `seen` set across calls to avoid double counting
+    objects referenced from several components.
+    """
+    if seen is None:
+        seen = set()
+    seen |= _shared()
+    return _walk(obj, seen)
+
+
+@dataclass(slots=True)
+class CallEntry:
+    """One active call and the state objects it owns."""
+
+    user_id: str
+    started_at: float
+    components: dict = field(default_factory=dict)
+
+
+class CallRegistry:
+    """Registry of active calls with per-call memory measurement."""
+
+    def __init__(self, budget_kb: int = CALL_MEMORY_BUDGET_KB):
+        self.budget_bytes = budget_kb * 1024
+        self._calls: dict[int, CallEntry] = {}
+        self.completed = 0
+
+    def __len__(self) -> int:
+        return len(self._calls)
+
+    def register(self, user_id: str, **components) -> CallEntry:
+        """Track a call's state objects (node, aggregator, persona, agents...)."""
+        entry = CallEntry(user_id, time.monotonic(), components)
+        self._calls[id(entry)] = entry
+        return entry
+
+    def unregister(self, entry: CallEntry) -> dict:
+        """Stop tracking a call; logs and returns its final footprint."""
+        self._calls.pop(id(entry), None)
+        self.completed += 1
+        sizes = self.measure(entry)
+        over = " ⚠️ over budget" if sizes["total"] > self.budget_bytes else ""
+        logger.info(
+            f"🧮 Call footprint for {entry.user_id}: {sizes['total'] / 1024:.1f} KB "
+            f"(budget {self.budget_bytes / 1024:.0f} KB){over}"
+        )
+        return sizes
+
+    def measure(self, entry: CallEntry) -> dict:
+        """Bytes per component for one call, plus "total"."""
+        seen: set[int] = set()
+        sizes = {name: deep_sizeof(obj, seen) for name, obj in entry.components.items()}
+        sizes["total"] = sum(sizes.values())
+        return sizes
+
+    def footprint(self) -> dict:
+        """Bytes per active call, averaged across all registered calls."""
+        calls = list(self._calls.values())
+        if not calls:
+            return {"active_calls": 0, "total_bytes": 0, "bytes_per_call": 0, "components": {}}
+
+        per_call = [self.measure(entry) for entry in calls]
+        components: dict[str, int] = {}
+        for sizes in per_call:
+            for name, size in sizes.items():
+                if name != "total":
+                    components[name] = components.get(name, 0) + size
+
+        total = sum(s["total"] for s in per_call)
+        return {
+            "active_calls": len(calls),
+            "total_bytes": total,
+            "bytes_per_call": total // len(calls),
+            "components": {k: v // len(calls) for k, v in components.items()},
+        }
+
+
+# Singleton instance
+call_registry = CallRegistry()
+
+
+def _simulate(calls: int, turns: int) -> dict:
+    """Build synthetic calls with `turns` turns of state each and measure them."""
+    from agents.aggregator import CallSummaryAggregator
+    from agents.detectors import SentimentAnalyzerNode
+    from agents.events import (
+        CommitmentIdentified,
+        ExcuseDetected,
+        MemorableQuoteDetected,
+        PromiseResponse,
+        SentimentAnalysis,
+    )
+    from conversation.persona import Persona, PersonaController
+    from core.chat_node import FutureYouNode
+
+    registry = CallRegistry()
+    personas = list(Persona)
+    system_prompt = "You are their future self. " * 400
+
+    for n in range(calls):
+        node = FutureYouNode(
+            system_prompt=system_prompt, user_id=f"sim-{n}", enable_memory_tools=False
+        )
+        aggregator = CallSummaryAggregator(f"sim-{n}")
+        persona = PersonaController(50, None)
+        sentiment = SentimentAnalyzerNode()
+
+        for turn in range(turns):
+            node._append_message({"role": "user", "content": f"turn {turn}: I was too tired"})
+            node._append_message(
+                {"role": "assistant", "content": "Tired today. Tired tomorrow. What's the real reason?"}
+            )
+            event = SentimentAnalysis(sentiment="defensive", confidence=0.8, indicators=["low"])
+            sentiment.sentiment_history.append(event)
+            aggregator.add_sentiment(event)
+            aggregator.add_excuse(
+                ExcuseDetected(excuse_text="too tired", matches_favorite=True, confidence=0.9)
+            )
+            persona.update_from_insight("excuse_detected", {"excuse_text": "too tired"})
+            persona._blend_toward(personas[turn % len(personas)])
+        aggregator.add_promise(PromiseResponse(kept=False, response_text="no"))
+        aggregator.add_commitment(
+            CommitmentIdentified(commitment_text="gym at 7am", action="gym", time="7am", is_specific=True)
+        )
+        aggregator.add_quote(
+            MemorableQuoteDetected(quote_text="I'm scared I'll never change", context="fear")
+        )
+
+        registry.register(
+            f"sim-{n}", node=node, aggregator=aggregator, persona=persona, sentiment=sentiment
+        )
+
+    return registry.footprint()
+
+
+__all__ = [
+    "CallEntry",
+    "CallRegistry",
+    "call_registry",
+    "deep_sizeof",
+    "CALL_MEMORY_BUDGET_KB",
+]
+
+
+if __name__ == "__main__":
+    import argparse
+    import json
+    from pathlib import Path
+
+    AGENT_DIR = Path(__file__).parent.parent
+    if str(AGENT_DIR) not in sys.path:
+        sys.path.insert(0, str(AGENT_DIR))
+
+    parser = argparse.ArgumentParser(description="Report bytes per active call")
+    parser.add_argument("--calls", type=int, default=20)
+    parser.add_argument("--turns", type=int, default=20)
+    args = parser.parse_args()
+
+    print(json.dumps(_simulate(args.calls, args.turns), indent=2))
+
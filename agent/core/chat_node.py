@@ -16,6 +16,9 @@ MEMORY TOOLS:
 import os
 import re
 import sys
+import time
+from contextlib import aclosing
+from dataclasses import dataclass
 from pathlib import Path
 from typing import AsyncGenerator, Optional, Union
 
@@ -27,7 +30,13 @@ if str(AGENT_DIR) not in sys.path:
 import aiohttp
 from loguru import logger
 
-from line.events import AgentResponse, EndCall, ToolCall, ToolResult
+from line.events import (
+    AgentResponse,
+    EndCall,
+    ToolCall,
+    ToolResult,
+    UserTranscriptionReceived,
+)
 from line.nodes.conversation_context import ConversationContext
 from line.nodes.reasoning import ReasoningNode
 from line.tools.system_tools import EndCallArgs, end_call
@@ -44,7 +53,8 @@ from agents.events import (
 )
 from conversation.call_types import CallType
 from conversation.mood import Mood
-from conversation.stages.models import CallStage
+from conversation.stages.budgets import SentenceLimiter, get_stage_budget
+from conversation.stages.models import CallStage, StageBudget
 from conversation.stages.transitions import (
     get_stage_prompt,
     get_next_stage,
@@ -52,9 +62,13 @@ from conversation.stages.transitions import (
     build_transition_check_prompt,
 )
 from core.llm import llm_analyze
+from core.turns import InsightStats, TurnTracker, turn_latency
 from core.llm_client import (
     stream_response,
     BEDROCK_API_KEY,
+    RequestClass,
+    Route,
+    route_request,
 )
 
 # Memory tools for during-call context retrieval
@@ -88,6 +102,45 @@ except ImportError:
 DEFAULT_TEMPERATURE = 0.7
 BACKEND_URL = os.getenv("BACKEND_URL", "https://youplus-backend.workers.dev")
 
+# Insights about utterances more than this many turns old are dropped
+# (1 = the usual lag: analysis of answer N informs the reply to answer N+1)
+INSIGHT_MAX_TURNS = int(os.getenv("INSIGHT_MAX_TURNS", "1"))
+# ...as are insights about utterances that ended longer ago than this
+INSIGHT_MAX_AGE_S = float(os.getenv("INSIGHT_MAX_AGE_S", "30"))
+
+# Template replies go to TTS a sentence at a time, like a streamed reply, so
+# a barge-in keeps only the sentences already handed over
+TEMPLATE_CHUNK = re.compile(r".+?(?:[.!?]+(?:\s+|<break[^>]*/>)|$)", re.S)
+
+# Word-boundary patterns so "yesterday" doesn't match "yes"
+YES_PATTERNS = [
+    r"\byes\b",
+    r"\byeah\b",
+    r"\byep\b",
+    r"\byup\b",
+    r"\bdid it\b",
+    r"\bi did\b",
+    r"\bcompleted\b",
+]
+NO_PATTERNS = [
+    r"\bno\b",
+    r"\bnope\b",
+    r"\bdidn\'?t\b",
+    r"\bnah\b",
+    r"\bnot yet\b",
+    r"\bcouldn\'?t\b",
+]
+
+
+@dataclass(slots=True)
+class PendingInsight:
+    """Prompt text from an insight, waiting for the next reply."""
+
+    kind: str
+    text: str
+    turn_seq: Optional[int]
+    ended_at: float  # Wall-clock end of the utterance it describes
+
 
 class FutureYouNode(ReasoningNode):
     """
@@ -110,7 +163,7 @@ class FutureYouNode(ReasoningNode):
         persona_controller=None,
         temperature: float = DEFAULT_TEMPERATURE,
         max_context_length: int = 100,
-        max_output_tokens: int = 150,
+        max_output_tokens: int = 200,  # Ceiling - per-stage budgets are lower
         enable_memory_tools: bool = True,
     ):
         super().__init__(
@@ -131,6 +184,8 @@ class FutureYouNode(ReasoningNode):
         self.container_tag = f"user_{user_id}"  # For memory isolation
 
         # Conversation history for Groq (OpenAI format)
+        # System prompt + at most max_context_length recent messages
+        self.max_context_length = max_context_length
         self.messages: list[dict] = [{"role": "system", "content": system_prompt}]
 
         # Stage tracking
@@ -144,11 +199,22 @@ class FutureYouNode(ReasoningNode):
         self.commitment_is_specific: bool = False
         self.call_ended = False
 
-        # Interruption support
-        self.stop_generation_event = None
+        # Interruption support: reply in flight + analyzer runs (see core/turns.py)
+        self.turns = TurnTracker()
+
+        # First-turn speculation (set by create_first_turn_speculator)
+        self.speculator = None
+        # Replies started from partial transcripts (set by create_partial_speculator)
+        self.partial_speculator = None
+        # Formulaic replies without an LLM call (set by create_template_responder)
+        self.template_responder = None
+
+        # Call archive recording (set by handle_new_call if CALL_ARCHIVE_DIR is set)
+        self.trace = None
 
         # Insights from background agents
-        self._pending_insights: list = []
+        self.insight_stats = InsightStats()
+        self._pending_insights: list[PendingInsight] = []
         self._current_sentiment: Optional[str] = None
         self._excuse_detected: Optional[ExcuseDetected] = None
         self._frustration_level: Optional[str] = None
@@ -172,6 +238,21 @@ class FutureYouNode(ReasoningNode):
             primary = self.persona_controller.get_primary_persona()
             logger.info(f"Starting persona: {primary.value}")
 
+    def add_event(self, event) -> None:
+        """Record the event; feed the growing user transcript to partial speculation."""
+        super().add_event(event)
+        if self.partial_speculator is None or self.turns.active:
+            return
+        latest = self.conversation_events[-1] if self.conversation_events else None
+        if isinstance(latest, UserTranscriptionReceived):
+            self.partial_speculator.on_partial(latest.content)
+
+    async def generate(self, message):
+        """Number the utterance this reply answers, then run the normal flow."""
+        self.turns.utterance(message)
+        async for event in super().generate(message):
+            yield event
+
     async def process_context(
         self, context: ConversationContext
     ) -> AsyncGenerator[Union[AgentResponse, EndCall, ToolCall], None]:
@@ -201,13 +282,46 @@ class FutureYouNode(ReasoningNode):
 
         self.total_turns += 1
         self.turns_in_stage += 1
+        turn_start = time.monotonic()
 
         # Process user message
         user_message = context.get_latest_user_transcript_message()
         if user_message:
             logger.info(f'Processing: "{user_message}"')
-            self.messages.append({"role": "user", "content": user_message})
+            self._append_message({"role": "user", "content": user_message})
             self._detect_promise_response(user_message)
+            if self.trace:
+                self.trace.turn("user", user_message, self.current_stage.value)
+
+        # Formulaic turn: serve a template, no LLM round trip
+        if self.template_responder and user_message:
+            reply = self.template_responder.respond(user_message)
+            if reply:
+                if self.partial_speculator:
+                    self.partial_speculator.cancel()
+                # Not in turn_latency: ~0ms template replies would hide a slow
+                # LLM from admission control's reply p95
+                reply_ms = (time.monotonic() - turn_start) * 1000
+                seq = self.turns.begin()
+                try:
+                    for chunk in TEMPLATE_CHUNK.findall(reply):
+                        self.turns.spoke(chunk)
+                        yield AgentResponse(content=chunk)
+                    self.turns.finish(seq)
+                finally:
+                    # Cancelled mid-reply: keep only what was spoken
+                    self._record_interrupted_reply(seq)
+                if self.trace:
+                    self.trace.span(
+                        "response",
+                        turn_start,
+                        first_chunk_ms=round(reply_ms, 1),
+                        chars=len(reply),
+                        template=True,
+                        stage=self.current_stage.value,
+                    )
+                await self._finish_reply(reply, user_message)
+                return
 
         # Build context-aware messages
         stage_context = self._build_stage_context()
@@ -220,34 +334,170 @@ class FutureYouNode(ReasoningNode):
 
         logger.info(f"Stage: {self.current_stage.value} (turn {self.turns_in_stage})")
 
-        # Stream response from LLM
-        full_response = ""
-        try:
-            async for chunk in stream_response(
+        # First turn: use a pre-generated reply if the answer was predicted
+        speculative = None
+        if self.speculator:
+            speculative = self.speculator.take(user_message)
+            self.speculator = None
+            if speculative and combined != stage_context:
+                # Insights arrived that the candidate didn't see
+                speculative.cancel()
+                speculative = None
+        elif self.partial_speculator and user_message:
+            # Reply started before end of speech - used if the final transcript
+            # and the prompt still match what it was generated from
+            speculative = self.partial_speculator.take(user_message, request_messages)
+
+        budget = self._stage_budget()
+        if speculative:
+            source = speculative.stream()
+        else:
+            source = stream_response(
                 messages=request_messages,
                 temperature=self.temperature,
-                max_tokens=self.max_output_tokens,
-            ):
-                full_response += chunk
-                yield AgentResponse(content=chunk)
+                max_tokens=budget.max_tokens,
+                route=self._route(),
+            )
+
+        # Stream response from LLM. A barge-in cancels this generator
+        # mid-stream; aclosing (or on_interrupt_generate) closes the source
+        # so the provider stops generating. Same on reaching the stage's
+        # sentence limit, unless a memory tool marker could still follow
+        full_response = ""
+        first_chunk_at = None
+        limiter = SentenceLimiter(budget.max_sentences, markers=self.enable_memory_tools)
+        seq = self.turns.begin(source)
+        try:
+            async with aclosing(source) as chunks:
+                async for chunk in chunks:
+                    if first_chunk_at is None:
+                        first_chunk_at = time.monotonic()
+                        turn_latency.record((first_chunk_at - turn_start) * 1000)
+                    chunk = limiter.feed(chunk)
+                    if chunk:
+                        full_response += chunk
+                        self.turns.spoke(chunk)
+                        yield AgentResponse(content=chunk)
+                    if limiter.done:
+                        break
+            self.turns.finish(seq)
         except Exception as e:
+            self.turns.finish(seq)
             logger.error(f"LLM API call failed: {e}")
+            if self.trace:
+                self.trace.span("response", turn_start, error=str(e))
             yield AgentResponse(
                 content="I'm having trouble connecting. Let's try again tomorrow."
             )
             return
+        finally:
+            # Cancelled or closed mid-stream: keep only what was spoken
+            self._record_interrupted_reply(seq)
+
+        if limiter.limited:
+            self.turns.stats.early_stops += 1
+            logger.info(
+                f"Early stop at {budget.max_sentences} sentence(s) "
+                f"({self.current_stage.value})"
+            )
+        if self.trace:
+            self.trace.span(
+                "response",
+                turn_start,
+                first_chunk_ms=round((first_chunk_at - turn_start) * 1000, 1)
+                if first_chunk_at
+                else None,
+                chars=len(full_response),
+                speculative=bool(speculative),
+                stage=self.current_stage.value,
+                early_stop=limiter.limited,
+            )
 
         # Process response and check for tool call requests
         if full_response:
-            self.messages.append({"role": "assistant", "content": full_response})
-            logger.info(f'Agent: "{full_response}" ({len(full_response)} chars)')
-
-            # Check if LLM wants to call a memory tool
-            tool_call = self._detect_tool_call_request(full_response)
+            # Check if LLM wants to call a memory tool (the marker may come
+            # after the spoken sentences)
+            tool_call = self._detect_tool_call_request(limiter.text)
             if tool_call:
                 yield tool_call
 
-            await self._handle_response_end(full_response, user_message)
+            await self._finish_reply(full_response, user_message)
+
+    async def _finish_reply(self, response: str, user_message: Optional[str]) -> None:
+        """Record a delivered reply, then check for call end and stage advance."""
+        self._append_message({"role": "assistant", "content": response})
+        logger.info(f'Agent: "{response}" ({len(response)} chars)')
+        if self.trace:
+            self.trace.turn("assistant", response, self.current_stage.value)
+
+        await self._handle_response_end(response, user_message)
+
+    def _stage_budget(self) -> StageBudget:
+        """Output budget for the current stage, capped by max_output_tokens."""
+        budget = get_stage_budget(
+            self.current_stage, self.call_type.name if self.call_type else None
+        )
+        if budget.max_tokens > self.max_output_tokens:
+            return StageBudget(budget.max_sentences, self.max_output_tokens)
+        return budget
+
+    def _speculative_messages(self, user_text: str) -> list[dict]:
+        """Request messages process_context would build if `user_text` were final."""
+        kept_promise = self.kept_promise
+        answer = self._promise_answer(user_text)
+        if answer is not None:
+            self.kept_promise = answer
+        try:
+            stage_context = self._build_stage_context()
+        finally:
+            self.kept_promise = kept_promise
+        insight_context = self._build_insight_context(peek=True)
+        combined = stage_context + ("\n" + insight_context if insight_context else "")
+
+        messages = [*self.messages, {"role": "user", "content": user_text}]
+        overflow = len(messages) - 1 - self.max_context_length
+        if overflow > 0:
+            del messages[1 : 1 + overflow]
+        if combined:
+            messages.append({"role": "system", "content": combined})
+        return messages
+
+    def _route(self) -> Route:
+        """Model route for a reply in the current stage."""
+        return route_request(
+            RequestClass.SPEAK,
+            self.current_stage,
+            self.call_type.name if self.call_type else None,
+        )
+
+    def on_interrupt_generate(self, message) -> None:
+        """Barge-in: stop the reply, keep only spoken text, drop stale analyses.
+
+        Runs after the SDK has cancelled the generate task.
+        """
+        super().on_interrupt_generate(message)
+        self._record_interrupted_reply()
+        cancelled = self.turns.cancel_analyzers()
+        if cancelled:
+            logger.info(f"Cancelled {cancelled} stale analyzer run(s)")
+
+    def _record_interrupted_reply(self, seq: Optional[int] = None) -> None:
+        """Close the reply in flight and record its spoken prefix, if any."""
+        spoken = self.turns.interrupt(seq)
+        if spoken is None:
+            return
+        logger.info(f"✋ Interrupted after {len(spoken)} chars")
+        if self.trace:
+            self.trace.span(
+                "interrupted",
+                self.turns.started_at,
+                chars=len(spoken),
+                stage=self.current_stage.value,
+            )
+        if spoken:
+            self._append_message({"role": "assistant", "content": spoken})
+            if self.trace:
+                self.trace.turn("assistant", spoken, self.current_stage.value)
 
     def _add_tool_result_to_messages(self, result: ToolResult) -> None:
         """Add tool result to message history for context."""
@@ -257,13 +507,21 @@ class FutureYouNode(ReasoningNode):
             content = f"[Memory tool error: {result.error}]"
 
         # Add as system message so LLM can use the context
-        self.messages.append(
+        self._append_message(
             {
                 "role": "system",
                 "content": content,
             }
         )
 
+    def _append_message(self, message: dict) -> None:
+        """Append to history, dropping the oldest turns past max_context_length."""
+        self.messages.append(message)
+        overflow = len(self.messages) - 1 - self.max_context_length
+        if overflow > 0:
+            # Index 0 is the system prompt - always kept
+            del self.messages[1 : 1 + overflow]
+
     def _detect_tool_call_request(self, response: str) -> Optional[ToolCall]:
         """
         Detect if LLM output contains a tool call request.
@@ -303,33 +561,23 @@ class FutureYouNode(ReasoningNode):
 
         return None
 
-    def _detect_promise_response(self, message: str) -> None:
-        """Detect YES/NO for promise tracking using word boundaries."""
+    @staticmethod
+    def _promise_answer(message: str) -> Optional[bool]:
+        """YES/NO answer in a message (word boundaries), or None."""
         lower = message.lower().strip()
+        if any(re.search(pattern, lower) for pattern in YES_PATTERNS):
+            return True
+        if any(re.search(pattern, lower) for pattern in NO_PATTERNS):
+            return False
+        return None
 
-        # Use word boundary regex to avoid false positives like "yesterday" matching "yes"
-        yes_patterns = [
-            r"\byes\b",
-            r"\byeah\b",
-            r"\byep\b",
-            r"\byup\b",
-            r"\bdid it\b",
-            r"\bi did\b",
-            r"\bcompleted\b",
-        ]
-        no_patterns = [
-            r"\bno\b",
-            r"\bnope\b",
-            r"\bdidn\'?t\b",
-            r"\bnah\b",
-            r"\bnot yet\b",
-            r"\bcouldn\'?t\b",
-        ]
-
-        if any(re.search(pattern, lower) for pattern in yes_patterns):
+    def _detect_promise_response(self, message: str) -> None:
+        """Detect YES/NO for promise tracking."""
+        answer = self._promise_answer(message)
+        if answer is True:
             self.kept_promise = True
             logger.info("Promise KEPT detected")
-        elif any(re.search(pattern, lower) for pattern in no_patterns):
+        elif answer is False:
             self.kept_promise = False
             logger.info("Promise BROKEN detected")
 
@@ -361,7 +609,18 @@ class FutureYouNode(ReasoningNode):
 
     def add_insight(self, insight) -> None:
         """Receive and process insights from background agents."""
-        logger.info(f"Received insight: {type(insight).__name__}")
+        kind = type(insight).__name__
+        latency_ms = getattr(insight, "latency_ms", None)
+        if latency_ms is None:
+            logger.info(f"Received insight: {kind}")
+        else:
+            logger.info(f"Received insight: {kind} (turn {insight.turn_seq}, {latency_ms:.0f}ms)")
+        self.insight_stats.received(kind, latency_ms)
+        if self._insight_age(insight) > INSIGHT_MAX_TURNS:
+            # Facts (promise, commitment, quotes) still apply below; prompt
+            # text and persona shifts are skipped
+            self.insight_stats.stale(kind)
+            logger.info(f"Stale insight: {kind} is about turn {insight.turn_seq}")
 
         if isinstance(insight, ExcuseDetected):
             self._handle_excuse_insight(insight)
@@ -383,42 +642,43 @@ class FutureYouNode(ReasoningNode):
     def _handle_excuse_insight(self, insight: ExcuseDetected) -> None:
         self._excuse_detected = insight
         label = "(MATCHES FAVORITE!)" if insight.matches_favorite else ""
-        self._pending_insights.append(
-            f"[EXCUSE DETECTED: '{insight.excuse_text}' {label}]"
+        self._queue_insight(insight, f"[EXCUSE DETECTED: '{insight.excuse_text}' {label}]")
+        self._update_persona(
+            insight,
+            "excuse_detected",
+            {
+                "excuse_text": insight.excuse_text,
+                "matches_favorite": insight.matches_favorite,
+            },
         )
-        if self.persona_controller and PERSONA_AVAILABLE:
-            self.persona_controller.update_from_insight(
-                "excuse_detected",
-                {
-                    "excuse_text": insight.excuse_text,
-                    "matches_favorite": insight.matches_favorite,
-                },
-            )
 
     def _handle_sentiment_insight(self, insight: SentimentAnalysis) -> None:
         self._current_sentiment = insight.sentiment
         if insight.sentiment in ("frustrated", "defensive", "deflecting"):
-            self._pending_insights.append(
+            self._queue_insight(
+                insight,
                 f"[SENTIMENT: User seems {insight.sentiment}. "
-                f"Indicators: {', '.join(insight.indicators[:3])}]"
-            )
-        if self.persona_controller and PERSONA_AVAILABLE:
-            energy = insight.indicators[0] if insight.indicators else "medium"
-            self.persona_controller.update_from_insight(
-                "sentiment_analysis", {"sentiment": insight.sentiment, "energy": energy}
+                f"Indicators: {', '.join(insight.indicators[:3])}]",
             )
+        energy = insight.indicators[0] if insight.indicators else "medium"
+        self._update_persona(
+            insight,
+            "sentiment_analysis",
+            {"sentiment": insight.sentiment, "energy": energy},
+        )
 
     def _handle_commitment_insight(self, insight: CommitmentIdentified) -> None:
         if insight.is_specific:
             self.tomorrow_commitment = f"{insight.action} at {insight.time}"
             self.commitment_is_specific = True
-            self._pending_insights.append(
-                f"[COMMITMENT: {insight.action} at {insight.time} - SPECIFIC!]"
+            self._queue_insight(
+                insight, f"[COMMITMENT: {insight.action} at {insight.time} - SPECIFIC!]"
             )
         elif insight.action:
             self.tomorrow_commitment = insight.action
-            self._pending_insights.append(
-                f"[VAGUE COMMITMENT: {insight.action} (no time - push for details)]"
+            self._queue_insight(
+                insight,
+                f"[VAGUE COMMITMENT: {insight.action} (no time - push for details)]",
             )
 
     def _handle_promise_insight(self, insight: PromiseResponse) -> None:
@@ -427,27 +687,23 @@ class FutureYouNode(ReasoningNode):
             logger.info(
                 f"{'✅' if insight.kept else '❌'} Promise kept: {insight.kept}"
             )
-        if self.persona_controller and PERSONA_AVAILABLE:
-            self.persona_controller.update_from_insight(
-                "promise_response", {"kept": insight.kept}
-            )
+        self._update_persona(insight, "promise_response", {"kept": insight.kept})
 
     def _handle_frustration_insight(self, insight: UserFrustrated) -> None:
         self._frustration_level = insight.frustration_level
-        self._pending_insights.append(
-            f"[USER FRUSTRATED ({insight.frustration_level}): {insight.suggested_action}]"
+        self._queue_insight(
+            insight,
+            f"[USER FRUSTRATED ({insight.frustration_level}): {insight.suggested_action}]",
         )
 
     def _handle_pattern_insight(self, insight: PatternAlert) -> None:
-        self._pending_insights.append(
-            f"[PATTERN: {insight.pattern_type} - {insight.description}]"
-        )
+        text = f"[PATTERN: {insight.pattern_type} - {insight.description}]"
         if insight.historical_context:
-            self._pending_insights.append(f"[HISTORY: {insight.historical_context}]")
-        if self.persona_controller and PERSONA_AVAILABLE:
-            self.persona_controller.update_from_insight(
-                "pattern_alert", {"pattern_type": insight.pattern_type}
-            )
+            text += f"\n[HISTORY: {insight.historical_context}]"
+        self._queue_insight(insight, text)
+        self._update_persona(
+            insight, "pattern_alert", {"pattern_type": insight.pattern_type}
+        )
 
     def _handle_quote_insight(self, insight: MemorableQuoteDetected) -> None:
         streak = self.user_context.get("status", {}).get("current_streak_days", 0)
@@ -462,16 +718,70 @@ class FutureYouNode(ReasoningNode):
         logger.info(f'Stored quote ({insight.context}): "{insight.quote_text[:50]}..."')
 
     def _handle_callout_insight(self, insight: ExcuseCallout) -> None:
+        self._queue_insight(
+            insight,
+            f"[CALLOUT ({insight.callout_type}): '{insight.suggested_response}']",
+        )
+
+    def _insight_age(self, insight, ended_at: Optional[float] = None) -> int:
+        """Turns between the insight's utterance and the latest one (0 if unstamped)."""
+        turn_seq = getattr(insight, "turn_seq", None)
+        if turn_seq is None:
+            return 0
+        if ended_at is not None and time.time() - ended_at > INSIGHT_MAX_AGE_S:
+            return INSIGHT_MAX_TURNS + 1
+        return self.turns.utterance_seq - turn_seq
+
+    def _queue_insight(self, insight, text: str) -> None:
+        """Queue prompt text for the next reply (skipped if already stale)."""
+        if self._insight_age(insight) > INSIGHT_MAX_TURNS:
+            return
+        latency_ms = getattr(insight, "latency_ms", None) or 0.0
         self._pending_insights.append(
-            f"[CALLOUT ({insight.callout_type}): '{insight.suggested_response}']"
+            PendingInsight(
+                kind=type(insight).__name__,
+                text=text,
+                turn_seq=getattr(insight, "turn_seq", None),
+                ended_at=time.time() - latency_ms / 1000,
+            )
         )
 
-    def _build_insight_context(self) -> str:
-        """Build context from pending insights."""
+    def _update_persona(self, insight, insight_type: str, data: dict) -> None:
+        """Forward an insight to the persona controller unless it's stale."""
+        if not self.persona_controller or not PERSONA_AVAILABLE:
+            return
+        if self._insight_age(insight) > INSIGHT_MAX_TURNS:
+            return
+        self.persona_controller.update_from_insight(insight_type, data)
+
+    def _build_insight_context(self, peek: bool = False) -> str:
+        """Build context from pending insights, dropping stale ones.
+
+        Insights about the latest utterance are used as-is; ones about an
+        earlier answer are marked so the model doesn't pin them on what the
+        user just said.
+
+        With `peek`, builds the context the next utterance's reply would get
+        (the user is still speaking) without consuming the insights.
+        """
         if not self._pending_insights:
             return ""
-        text = "\n".join(self._pending_insights)
-        self._pending_insights = []
+        lines = []
+        for pending in self._pending_insights:
+            age = self._insight_age(pending, pending.ended_at) + int(peek)
+            if age > INSIGHT_MAX_TURNS:
+                if not peek:
+                    self.insight_stats.stale(pending.kind)
+                    logger.info(f"Dropped stale insight: {pending.kind} (turn {pending.turn_seq})")
+                continue
+            if not peek:
+                self.insight_stats.used(pending.kind)
+            lines.append(pending.text if age <= 0 else f"(earlier answer) {pending.text}")
+        if not peek:
+            self._pending_insights = []
+        if not lines:
+            return ""
+        text = "\n".join(lines)
         return f"\n[BACKGROUND INSIGHTS - use to inform response:]\n{text}\n"
 
     def _build_stage_context(self) -> str:
@@ -546,13 +856,18 @@ class FutureYouNode(ReasoningNode):
             self._maybe_advance_stage()
             return
 
+        check_start = time.monotonic()
         try:
             response = await llm_analyze(prompt=prompt, temperature=0.0, max_tokens=10)
+            if self.trace:
+                self.trace.span("stage_check", check_start, stage=self.current_stage.value)
             if response and "YES" in response.upper():
                 old = self.current_stage.value
                 self.current_stage = next_stage
                 self.turns_in_stage = 0
                 logger.info(f"LLM transition: {old} → {next_stage.value}")
+                if self.trace:
+                    self.trace.stage_change(old, next_stage.value, "llm", self.total_turns)
         except Exception as e:
             logger.warning(f"LLM check failed, using rules: {e}")
             self._maybe_advance_stage()
@@ -574,6 +889,8 @@ class FutureYouNode(ReasoningNode):
                 self.current_stage = next_stage
                 self.turns_in_stage = 0
                 logger.info(f"Stage transition: {old} → {next_stage.value}")
+                if self.trace:
+                    self.trace.stage_change(old, next_stage.value, "rules", self.total_turns)
 
     async def report_call_result(self):
         """Report call result to backend."""
@@ -22,6 +22,7 @@ import os
 import sys
 import random
 import aiohttp
+from functools import lru_cache
 from typing import Optional
 from pathlib import Path
 
@@ -128,10 +129,13 @@ SUPABASE_SERVICE_KEY = os.getenv("SUPABASE_SERVICE_KEY")
 SKILLS_DIR = Path(__file__).parent.parent / "skills"
 
 
+@lru_cache(maxsize=1)
 def load_voice_skill() -> str:
     """
     Load the voice conversation skill from markdown file.
     This skill teaches the agent to have natural voice conversations.
+
+    Read from disk once per process (the file only changes on deploy).
     """
     skill_path = SKILLS_DIR / "voice_conversation.md"
     try:
@@ -5,8 +5,11 @@ Call Handler
 Main call handler that sets up the multi-agent Future Self system.
 """
 
+import asyncio
 import sys
+from dataclasses import dataclass
 from pathlib import Path
+from typing import Any, Optional
 
 AGENT_DIR = Path(__file__).parent.parent.parent
 if str(AGENT_DIR) not in sys.path:
@@ -30,6 +33,16 @@ from core.config import (
     build_first_message,
 )
 from core.handlers.post_call import handle_call_end
+from core.replay.capture import CallRecorder, create_recorder
+from core.call_archive import CallTrace, create_call_trace
+from core.speculation import (
+    FirstTurnSpeculator,
+    PartialSpeculator,
+    create_first_turn_speculator,
+    create_partial_speculator,
+)
+from core.template_responder import TemplateResponder, create_template_responder
+from core.call_registry import call_registry
 
 # Persona system integration
 try:
@@ -63,6 +76,7 @@ from agents.analyzers import (
     PatternAnalyzerNode,
 )
 from agents.aggregator import CallSummaryAggregator
+from agents.coalescer import TranscriptCoalescer
 from agents.events import (
     ExcuseDetected,
     ExcuseCallout,
@@ -98,32 +112,18 @@ async def handle_new_call(system: VoiceAgentSystem, call_request: CallRequest):
     logger.info(f"Incoming call for user: {user_id}")
     logger.info(f"📞 Call type: {call_type.name} | 🎭 Mood: {mood.name}")
 
-    # Initialize persona controller
-    persona_controller = await _init_persona(
-        user_id, user_context, call_memory, yesterday_promise_kept
-    )
-
-    # Build system prompt
-    system_prompt = await _build_prompt(
+    # Speaking node with its templates and reply helpers
+    call_nodes = await build_call_nodes(
         user_id,
         user_context,
         call_type,
         mood,
         call_memory,
         excuse_data,
-        persona_controller,
-    )
-
-    # Create main speaking agent
-    conversation_node = FutureYouNode(
-        system_prompt=system_prompt,
-        user_id=user_id,
-        user_context=user_context,
-        call_type=call_type,
-        mood=mood,
-        call_memory=call_memory,
-        persona_controller=persona_controller,
+        yesterday_promise_kept,
     )
+    conversation_node = call_nodes.node
+    persona_controller = call_nodes.persona_controller
     conversation_bridge = Bridge(conversation_node)
     system.with_speaking_node(conversation_node, conversation_bridge)
 
@@ -134,18 +134,62 @@ async def handle_new_call(system: VoiceAgentSystem, call_request: CallRequest):
     call_aggregator = CallSummaryAggregator(user_id, call_type.name, mood.name)
     call_aggregator.start()
 
-    # Setup event routing
-    _setup_routing(
-        conversation_node, conversation_bridge, agents, call_aggregator, user_id
+    # Track per-call state for memory accounting
+    call_entry = call_registry.register(
+        user_id,
+        node=conversation_node,
+        aggregator=call_aggregator,
+        persona=persona_controller,
+        agents={k: v for k, v in agents.items() if not k.endswith("_bridge")},
     )
 
-    # Start call
-    await system.start()
-    logger.info("Multi-agent system started")
+    recorder = None
+    # Always release the call - a leaked entry counts against admission's call cap
+    try:
+        # Capture the inbound event stream if CALL_CAPTURE_DIR is configured
+        recorder = create_recorder(user_id, metadata)
 
-    first_message = build_first_message(user_context, mood, call_type)
-    await system.send_initial_message(first_message)
-    await system.wait_for_shutdown()
+        # Archive turns, events, stages and timings if CALL_ARCHIVE_DIR is configured
+        call_trace = create_call_trace(
+            user_id, call_type.name, mood.name, conversation_node.current_stage.value
+        )
+        conversation_node.trace = call_trace
+
+        # Setup event routing
+        _setup_routing(
+            conversation_node,
+            conversation_bridge,
+            agents,
+            call_aggregator,
+            user_id,
+            recorder=recorder,
+            call_trace=call_trace,
+            coalescer=call_nodes.coalescer,
+        )
+
+        # Start call
+        await system.start()
+        logger.info("Multi-agent system started")
+
+        first_message = build_first_message(user_context, mood, call_type)
+        if recorder:
+            recorder.on_first_message(first_message)
+        if call_trace:
+            call_trace.turn("assistant", first_message)
+
+        # Pre-generate likely turn-2 replies while the hook is being spoken,
+        # and start every later reply from the stable partial transcript
+        call_nodes.start_speculation(user_context)
+
+        await system.send_initial_message(first_message)
+        await system.wait_for_shutdown()
+    finally:
+        call_nodes.close()
+        call_registry.unregister(call_entry)
+
+        if recorder:
+            # Writes the capture JSONL; keep it off the event loop
+            await asyncio.to_thread(recorder.close)
 
     # End of call processing
     await handle_call_end(
@@ -158,6 +202,84 @@ async def handle_new_call(system: VoiceAgentSystem, call_request: CallRequest):
         conversation_node,
         call_aggregator,
         persona_controller,
+        call_trace=call_trace,
+    )
+
+
+@dataclass
+class CallNodes:
+    """The speaking node of one call and the reply helpers attached to it."""
+
+    node: FutureYouNode
+    persona_controller: Any
+    template_responder: Optional[TemplateResponder]
+    coalescer: TranscriptCoalescer
+    speculator: Optional[FirstTurnSpeculator] = None
+    partial_speculator: Optional[PartialSpeculator] = None
+
+    def start_speculation(self, user_context: dict) -> None:
+        """Speculate the first turn now, every later one from partial transcripts."""
+        self.speculator = create_first_turn_speculator(self.node, user_context)
+        self.partial_speculator = create_partial_speculator(self.node)
+
+    def close(self) -> None:
+        """Cancel pending speculation and log the per-call helper summaries."""
+        if self.speculator:
+            self.speculator.cancel()
+        if self.partial_speculator:
+            self.partial_speculator.cancel()
+            self.partial_speculator.log_summary()
+        if self.template_responder:
+            self.template_responder.log_summary()
+        self.coalescer.log_summary()
+
+
+async def build_call_nodes(
+    user_id: str,
+    user_context: dict,
+    call_type,
+    mood,
+    call_memory: dict,
+    excuse_data: dict,
+    yesterday_promise_kept: Optional[bool] = None,
+    enable_memory_tools: bool = True,
+) -> CallNodes:
+    """
+    Build the speaking node and its per-call helpers.
+
+    Shared by handle_new_call and the replayer, so a replay runs the same
+    templates, speculation and transcript coalescing as a live call.
+    """
+    persona_controller = await _init_persona(
+        user_id, user_context, call_memory, yesterday_promise_kept
+    )
+    system_prompt = await _build_prompt(
+        user_id,
+        user_context,
+        call_type,
+        mood,
+        call_memory,
+        excuse_data,
+        persona_controller,
+    )
+
+    node = FutureYouNode(
+        system_prompt=system_prompt,
+        user_id=user_id,
+        user_context=user_context,
+        call_type=call_type,
+        mood=mood,
+        call_memory=call_memory,
+        persona_controller=persona_controller,
+        enable_memory_tools=enable_memory_tools,
+    )
+    return CallNodes(
+        node=node,
+        persona_controller=persona_controller,
+        # Formulaic turns (accountability question, lock-in, close) from templates
+        template_responder=create_template_responder(node, user_context),
+        # Debounce fragmented utterances before the background agents run
+        coalescer=TranscriptCoalescer(),
     )
 
 
@@ -192,68 +314,89 @@ async def _build_prompt(
     )
 
 
-def _setup_agents(system: VoiceAgentSystem, user_context: dict) -> dict:
-    """Set up background agents."""
-    agents = {}
-
-    agents["excuse"] = ExcuseDetectorNode(user_context)
-    agents["excuse_bridge"] = Bridge(agents["excuse"])
-    system.with_node(agents["excuse"], agents["excuse_bridge"])
-
-    agents["excuse_callout"] = ExcuseCalloutNode(user_context)
-    agents["excuse_callout_bridge"] = Bridge(agents["excuse_callout"])
-    system.with_node(agents["excuse_callout"], agents["excuse_callout_bridge"])
+# Background agents that analyze every user utterance
+BACKGROUND_AGENTS = ["excuse", "sentiment", "commitment", "promise", "pattern", "quote"]
 
-    agents["sentiment"] = SentimentAnalyzerNode()
-    agents["sentiment_bridge"] = Bridge(agents["sentiment"])
-    system.with_node(agents["sentiment"], agents["sentiment_bridge"])
-
-    agents["commitment"] = CommitmentExtractorNode()
-    agents["commitment_bridge"] = Bridge(agents["commitment"])
-    system.with_node(agents["commitment"], agents["commitment_bridge"])
+# Insight events forwarded from background agents to the speaking node
+INSIGHT_EVENTS = [
+    ExcuseDetected,
+    SentimentAnalysis,
+    CommitmentIdentified,
+    PromiseResponse,
+    UserFrustrated,
+    PatternAlert,
+    MemorableQuoteDetected,
+    ExcuseCallout,
+]
+
+# Insight events collected by the CallSummaryAggregator (event -> method name)
+AGGREGATOR_ROUTES = {
+    SentimentAnalysis: "add_sentiment",
+    ExcuseDetected: "add_excuse",
+    PromiseResponse: "add_promise",
+    CommitmentIdentified: "add_commitment",
+    MemorableQuoteDetected: "add_quote",
+    PatternAlert: "add_pattern",
+}
+
+
+def create_background_agents(user_context: dict) -> dict:
+    """Create the background agent nodes (no bridges, no system wiring)."""
+    return {
+        "excuse": ExcuseDetectorNode(user_context),
+        "excuse_callout": ExcuseCalloutNode(user_context),
+        "sentiment": SentimentAnalyzerNode(),
+        "commitment": CommitmentExtractorNode(),
+        "promise": PromiseDetectorNode(user_context),
+        "pattern": PatternAnalyzerNode(user_context),
+        "quote": QuoteExtractorNode(),
+    }
 
-    agents["promise"] = PromiseDetectorNode(user_context)
-    agents["promise_bridge"] = Bridge(agents["promise"])
-    system.with_node(agents["promise"], agents["promise_bridge"])
 
-    agents["pattern"] = PatternAnalyzerNode(user_context)
-    agents["pattern_bridge"] = Bridge(agents["pattern"])
-    system.with_node(agents["pattern"], agents["pattern_bridge"])
+def _setup_agents(system: VoiceAgentSystem, user_context: dict) -> dict:
+    """Set up background agents."""
+    agents = {}
 
-    agents["quote"] = QuoteExtractorNode()
-    agents["quote_bridge"] = Bridge(agents["quote"])
-    system.with_node(agents["quote"], agents["quote_bridge"])
+    for name, node in create_background_agents(user_context).items():
+        agents[name] = node
+        agents[f"{name}_bridge"] = Bridge(node)
+        system.with_node(node, agents[f"{name}_bridge"])
 
     return agents
 
 
 def _setup_routing(
-    conversation_node, conversation_bridge, agents, call_aggregator, user_id: str
+    conversation_node,
+    conversation_bridge,
+    agents,
+    call_aggregator,
+    user_id: str,
+    recorder: Optional[CallRecorder] = None,
+    call_trace: Optional[CallTrace] = None,
+    coalescer: Optional[TranscriptCoalescer] = None,
 ):
     """Set up event routing between agents."""
     # Main agent receives transcriptions
     conversation_bridge.on(UserTranscriptionReceived).map(conversation_node.add_event)
 
-    # Background agents receive transcriptions
-    for name in ["excuse", "sentiment", "commitment", "promise", "pattern", "quote"]:
+    # Background agents receive transcriptions. Bursts of stops are
+    # coalesced into one analysis, and runs are tracked so a barge-in can
+    # cancel analyses of the superseded transcript
+    if coalescer:
+        conversation_bridge.on(UserStartedSpeaking).map(coalescer.on_started_speaking)
+    for name in BACKGROUND_AGENTS:
+        generate = agents[name].generate
+        if coalescer:
+            generate = coalescer.wrap(generate)
         agents[f"{name}_bridge"].on(UserTranscriptionReceived).map(
             agents[name].add_event
         )
         agents[f"{name}_bridge"].on(UserStoppedSpeaking).stream(
-            agents[name].generate
+            conversation_node.turns.track(generate)
         ).broadcast()
 
     # Main agent receives insights
-    for event in [
-        ExcuseDetected,
-        SentimentAnalysis,
-        CommitmentIdentified,
-        PromiseResponse,
-        UserFrustrated,
-        PatternAlert,
-        MemorableQuoteDetected,
-        ExcuseCallout,
-    ]:
+    for event in INSIGHT_EVENTS:
         conversation_bridge.on(event).map(conversation_node.add_insight)
 
     # Excuse chaining
@@ -262,12 +405,21 @@ def _setup_routing(
     ).filter(lambda x: x is not None).broadcast()
 
     # Aggregator feeds
-    conversation_bridge.on(SentimentAnalysis).map(call_aggregator.add_sentiment)
-    conversation_bridge.on(ExcuseDetected).map(call_aggregator.add_excuse)
-    conversation_bridge.on(PromiseResponse).map(call_aggregator.add_promise)
-    conversation_bridge.on(CommitmentIdentified).map(call_aggregator.add_commitment)
-    conversation_bridge.on(MemorableQuoteDetected).map(call_aggregator.add_quote)
-    conversation_bridge.on(PatternAlert).map(call_aggregator.add_pattern)
+    for event, method in AGGREGATOR_ROUTES.items():
+        conversation_bridge.on(event).map(getattr(call_aggregator, method))
+
+    # Capture inbound event stream for replay testing
+    if recorder:
+        conversation_bridge.on(UserStartedSpeaking).map(recorder.on_started_speaking)
+        conversation_bridge.on(UserStoppedSpeaking).map(recorder.on_stopped_speaking)
+        conversation_bridge.on(UserTranscriptionReceived).map(recorder.on_transcription)
+        for event in INSIGHT_EVENTS:
+            conversation_bridge.on(event).map(recorder.on_insight)
+
+    # Insight events for the call archive
+    if call_trace:
+        for event in INSIGHT_EVENTS:
+            conversation_bridge.on(event).map(call_trace.on_event)
 
     # Memory tool execution routes
     if MEMORY_TOOLS_AVAILABLE and execute_memory_tool:
@@ -314,4 +466,12 @@ def _setup_routing(
     )
 
 
-__all__ = ["handle_new_call"]
+__all__ = [
+    "handle_new_call",
+    "build_call_nodes",
+    "CallNodes",
+    "create_background_agents",
+    "BACKGROUND_AGENTS",
+    "INSIGHT_EVENTS",
+    "AGGREGATOR_ROUTES",
+]
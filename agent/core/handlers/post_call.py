@@ -5,6 +5,7 @@ Post-Call Processing
 End-of-call analytics, memory updates, trust scores, and Supermemory sync.
 """
 
+import asyncio
 import sys
 from pathlib import Path
 
@@ -20,7 +21,14 @@ from core.config import (
     save_excuse_pattern,
 )
 from core.llm import generate_call_summary
+from core.analysis_cache import analysis_cache
+from core.llm_client import llm_stats, transport_stats
 from services.supermemory import supermemory_service
+from services.memory_queue import memory_queue
+from services.accountability_stats import (
+    get_accountability_stats,
+    update_accountability_stats,
+)
 
 # Persona system integration
 try:
@@ -42,6 +50,7 @@ async def handle_call_end(
     conversation_node,
     call_aggregator,
     persona_controller,
+    call_trace=None,
 ):
     """Handle all end-of-call processing."""
     call_summary = call_aggregator.finalize()
@@ -50,6 +59,43 @@ async def handle_call_end(
         f"promise_kept={call_summary.promise_kept}, "
         f"commitment={'specific' if call_summary.commitment_is_specific else 'vague' if call_summary.tomorrow_commitment else 'none'}"
     )
+    if call_trace:
+        await asyncio.to_thread(call_trace.write, call_summary)
+    cache_stats = analysis_cache.stats
+    logger.info(
+        f"🗃️ Analysis cache: {len(analysis_cache)} entries, "
+        f"hit_rate={cache_stats.hit_rate:.0%} ({cache_stats.hits} hits, {cache_stats.misses} misses)"
+    )
+    logger.info(
+        f"🔌 LLM transport: reuse_rate={transport_stats.reuse_rate:.0%} "
+        f"({transport_stats.new_connections} new connections / {transport_stats.requests} requests)"
+    )
+    route_stats = llm_stats.route_stats()
+    if route_stats:
+        logger.info(
+            "🧭 LLM routes since start (requests, p95 latency, tokens): "
+            + ", ".join(
+                f"{name} {r['requests']} {r['latency_p95_ms'] or 0:.0f}ms "
+                f"{r['prompt_tokens'] + r['completion_tokens']}"
+                for name, r in route_stats.items()
+            )
+        )
+    turn_stats = conversation_node.turns.stats
+    if turn_stats.interruptions or turn_stats.early_stops:
+        logger.info(
+            f"✋ Replies: {turn_stats.replies}, barge-ins: {turn_stats.interruptions} "
+            f"({turn_stats.analyzers_cancelled} stale analyzer runs cancelled), "
+            f"early stops: {turn_stats.early_stops}"
+        )
+    insight_stats = conversation_node.insight_stats
+    if insight_stats.by_type:
+        logger.info(
+            "⏱️ Insights (stale/received, p95 latency): "
+            + ", ".join(
+                f"{kind} {t['stale']}/{t['received']} {t['latency_p95_ms'] or 0:.0f}ms"
+                for kind, t in insight_stats.to_dict().items()
+            )
+        )
 
     await conversation_node.report_call_result()
 
@@ -85,6 +131,13 @@ async def handle_call_end(
 
     await save_call_analytics(call_summary, transcript_summary)
 
+    if await update_accountability_stats(user_id, user_context, call_summary):
+        stats = get_accountability_stats(user_context)
+        logger.info(
+            f"📈 Stats: {stats.calls} calls, keep_rate={stats.rolling_keep_rate}, "
+            f"specific={stats.specificity_rate}, on_time={stats.adherence_rate}"
+        )
+
     await _update_trust_scores(
         user_id,
         user_context,
@@ -212,20 +265,15 @@ async def _save_to_supermemory(
     conversation_node,
     call_summary,
 ):
-    """Save call transcript to Supermemory."""
-    if not supermemory_service.enabled:
-        return
-
-    logger.info("📝 Sending call transcript to Supermemory...")
-
+    """Index the call transcript locally and queue it for Supermemory."""
     transcript = [
         {"role": msg["role"], "content": msg["content"]}
         for msg in conversation_node.messages
         if msg["role"] in ("user", "assistant")
     ]
 
-    call_history = user_context.get("call_history", [])
-    call_number = len(call_history) + 1
+    # Stats already include this call
+    call_number = get_accountability_stats(user_context).calls
 
     outcomes = {
         "promise_kept": call_summary.promise_kept,
@@ -242,8 +290,7 @@ async def _save_to_supermemory(
         "call_quality_score": call_summary.call_quality_score,
     }
 
-    success = await supermemory_service.add_call_transcript(
-        user_id=user_id,
+    content, metadata = supermemory_service.format_call_transcript(
         call_number=call_number,
         streak_day=current_streak,
         call_type=call_type.name,
@@ -252,10 +299,13 @@ async def _save_to_supermemory(
         outcomes=outcomes,
     )
 
-    if success:
-        logger.info(f"✅ Call #{call_number} saved to Supermemory")
-    else:
-        logger.warning("⚠️ Failed to save call transcript to Supermemory")
+    if not await supermemory_service.queue_memory(user_id, content, metadata):
+        logger.warning("⚠️ Failed to queue call transcript for Supermemory")
+    elif supermemory_service.enabled:
+        logger.info(
+            f"📝 Call #{call_number} queued for Supermemory "
+            f"(queue: {memory_queue.snapshot()['depth']} pending)"
+        )
 
 
 __all__ = ["handle_call_end"]
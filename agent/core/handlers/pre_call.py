@@ -2,10 +2,11 @@
 Pre-Call Handler
 =================
 
-Handles call validation, user context fetching, call type/mood selection,
-and TTS configuration before a call is accepted.
+Handles call validation, admission control, user context fetching, call
+type/mood selection, and TTS configuration before a call is accepted.
 """
 
+import os
 import sys
 from pathlib import Path
 
@@ -21,15 +22,20 @@ from line import CallRequest, PreCallResult
 from core.config import (
     fetch_user_context,
     fetch_call_memory,
-    get_yesterday_promise_status,
     fetch_excuse_patterns,
 )
-from conversation.call_types import select_call_type
-from conversation.mood import select_mood
+from conversation.call_types import CALL_TYPES, select_call_type
+from conversation.mood import MOODS, select_mood
+from core.admission import admission_controller
+from core.llm_client import schedule_warm_up
+from services.accountability_stats import get_accountability_stats
 
 # Default voice (fallback if user has no clone)
 DEFAULT_VOICE_ID = "a0e99841-438c-4a64-b679-ae501e7d6091"
 
+# Batch call plan (see services/call_planner.py); unset = select per call
+CALL_PLAN_PATH = os.getenv("CALL_PLAN_PATH")
+
 
 async def handle_call_request(call_request: CallRequest):
     """
@@ -37,6 +43,10 @@ async def handle_call_request(call_request: CallRequest):
 
     Returns:
         PreCallResult if call is accepted, None if rejected
+
+    Raises:
+        HTTPException: 503 (Retry-After) or 307 (route away) when this worker
+            is over capacity - the detail carries the admission reason
     """
     logger.info(f"Handling call request: {call_request}")
 
@@ -50,6 +60,12 @@ async def handle_call_request(call_request: CallRequest):
         logger.warning("Rejecting call: no user_id provided")
         return None
 
+    # Over capacity: the calls already in progress come first. Decided before
+    # the context fetch so a refused or deferred call costs no DB round trip
+    admission = await admission_controller.admit()
+    if not admission.accepted:
+        raise admission.http_error()
+
     # Fetch user's context from database
     user_context = await fetch_user_context(user_id)
     future_self = user_context.get("future_self", {})
@@ -72,6 +88,9 @@ async def handle_call_request(call_request: CallRequest):
         logger.warning(f"Rejecting call: user {user_id} has paused calls")
         return None
 
+    # Call accepted - make sure the LLM connection is open before turn 1
+    schedule_warm_up()
+
     # === FETCH CALL MEMORY ===
     call_memory = await fetch_call_memory(user_id)
 
@@ -79,26 +98,31 @@ async def handle_call_request(call_request: CallRequest):
     excuse_data = await fetch_excuse_patterns(user_id)
 
     # === DETERMINE YESTERDAY'S PROMISE STATUS ===
-    call_history = user_context.get("call_history", [])
-    yesterday_promise_kept = get_yesterday_promise_status(call_history)
+    stats = get_accountability_stats(user_context)
+    yesterday_promise_kept = stats.last_promise_kept
 
-    # === SELECT CALL TYPE ===
+    # === SELECT CALL TYPE + MOOD ===
     current_streak = status.get("current_streak_days", 0)
-    call_type = select_call_type(
-        user_context=user_context,
-        call_memory=call_memory,
-        current_streak=current_streak,
-    )
-    logger.info(f"📞 Selected call type: {call_type.name} ({call_type.energy})")
-
-    # === SELECT MOOD ===
-    mood = select_mood(
-        user_context=user_context,
-        call_memory=call_memory,
-        call_type=call_type.name,
-        kept_promise_yesterday=yesterday_promise_kept,
-    )
-    logger.info(f"🎭 Selected mood: {mood.name}")
+    planned = _get_planned_call(user_id, current_streak, yesterday_promise_kept)
+    if planned:
+        call_type = CALL_TYPES[planned.call_type]
+        mood = MOODS[planned.mood]
+        logger.info(f"🗓️ Planned call: {call_type.name} ({call_type.energy}), mood {mood.name}")
+    else:
+        call_type = select_call_type(
+            user_context=user_context,
+            call_memory=call_memory,
+            current_streak=current_streak,
+        )
+        logger.info(f"📞 Selected call type: {call_type.name} ({call_type.energy})")
+
+        mood = select_mood(
+            user_context=user_context,
+            call_memory=call_memory,
+            call_type=call_type.name,
+            kept_promise_yesterday=yesterday_promise_kept,
+        )
+        logger.info(f"🎭 Selected mood: {mood.name}")
 
     # === CONFIGURE CALL ===
 
@@ -132,6 +156,7 @@ async def handle_call_request(call_request: CallRequest):
             "call_type": call_type.name,  # Serialize to string for metadata
             "mood": mood.name,  # Serialize to string for metadata
             "yesterday_promise_kept": yesterday_promise_kept,
+            "admission": admission.to_dict(),
         },
         config={
             "tts": {
@@ -143,6 +168,22 @@ async def handle_call_request(call_request: CallRequest):
     )
 
 
+def _get_planned_call(user_id: str, current_streak: int, kept_promise_yesterday):
+    """Batch-planned call for this user, if the plan still matches their state."""
+    if not CALL_PLAN_PATH:
+        return None
+
+    # Imported only when planning is enabled (pulls in NumPy)
+    from services.call_planner import get_planned_call
+
+    planned = get_planned_call(user_id)
+    if planned is None:
+        return None
+    if planned.streak != current_streak or planned.kept_promise != kept_promise_yesterday:
+        return None  # State changed since planning - select fresh
+    return planned
+
+
 def _get_speed_control(speed_ratio: float) -> str:
     """Map speed_ratio to Cartesia speed control string."""
     if speed_ratio <= 0.8:
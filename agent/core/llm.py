@@ -12,23 +12,72 @@ Background analysis functions for:
 Uses the shared LLM client from core.llm_client.
 """
 
-import json
+import os
+import re
+from contextlib import aclosing
 from typing import Optional
 
 from loguru import logger
 
 # Import the shared LLM client
-from core.llm_client import call
+from core.llm_client import (
+    call,
+    stream_response,
+    IncrementalJSONParser,
+    RequestClass,
+    route_request,
+)
+from core.analysis_cache import analysis_cache, prompt_version
 
 # Default max tokens - enough for most JSON responses
 DEFAULT_MAX_TOKENS = 512
 
+# Constrained output mode for analyzer calls:
+#   json_schema - send each analyzer's JSON schema (strict, smallest outputs)
+#   json_object - ask for any JSON object (for providers without schema support)
+#   off         - free-form text, JSON pulled out of the response
+STRUCTURED_OUTPUT = os.getenv("LLM_STRUCTURED_OUTPUT", "json_schema").lower()
+
+_STRUCTURED_OUTPUT_ENABLED = STRUCTURED_OUTPUT in ("json_schema", "json_object")
+# Models whose provider rejected response_format (plain JSON from then on)
+_structured_output_rejected: set[str] = set()
+# A 400 only means "no response_format support" if it names it
+_RESPONSE_FORMAT_ERROR = re.compile(r"response_format|json_schema|schema", re.IGNORECASE)
+
+
+def _response_format(schema: Optional[dict], model: str) -> Optional[dict]:
+    """Build the response_format for the configured structured output mode."""
+    if not _STRUCTURED_OUTPUT_ENABLED or model in _structured_output_rejected:
+        return None
+    if STRUCTURED_OUTPUT == "json_schema" and schema:
+        return {
+            "type": "json_schema",
+            "json_schema": {
+                "name": schema.get("title", "analysis"),
+                "schema": schema,
+                "strict": True,
+            },
+        }
+    return {"type": "json_object"}
+
+
+def _schema(title: str, properties: dict) -> dict:
+    """Strict object schema: every key required, nothing extra."""
+    return {
+        "title": title,
+        "type": "object",
+        "properties": properties,
+        "required": list(properties),
+        "additionalProperties": False,
+    }
+
 
 async def llm_analyze(
     prompt: str,
     system_prompt: Optional[str] = None,
     temperature: float = 0.0,
     max_tokens: int = DEFAULT_MAX_TOKENS,
+    request_class: RequestClass = RequestClass.CLASSIFY,
 ) -> Optional[str]:
     """
     Quick LLM call for analysis tasks.
@@ -38,6 +87,7 @@ async def llm_analyze(
         system_prompt: Optional system instructions
         temperature: 0.0 for deterministic, higher for creative
         max_tokens: Max response length
+        request_class: Routing class (picks the model tier)
 
     Returns:
         LLM response text or None on error
@@ -53,6 +103,7 @@ async def llm_analyze(
             temperature=temperature,
             max_tokens=max_tokens,
             timeout=10,
+            route=route_request(request_class),
         )
         return result.strip() if result else None
     except Exception as e:
@@ -65,43 +116,67 @@ async def llm_json(
     system_prompt: Optional[str] = None,
     temperature: float = 0.0,
     max_tokens: int = DEFAULT_MAX_TOKENS,
+    schema: Optional[dict] = None,
+    request_class: RequestClass = RequestClass.CLASSIFY,
 ) -> Optional[dict]:
     """
     LLM call that expects JSON response.
 
+    The response is streamed through an incremental parser and returned as
+    soon as the first JSON object closes; the stream is then closed so the
+    model stops generating.
+
     Args:
         prompt: The user message/query (should ask for JSON)
         system_prompt: Optional system instructions
         temperature: 0.0 for deterministic
         max_tokens: Max response length
+        schema: Optional JSON schema used to constrain the output
+        request_class: Routing class (picks the model tier)
 
     Returns:
         Parsed JSON dict or None on error
     """
-    response = await llm_analyze(
-        prompt=prompt,
-        system_prompt=system_prompt,
-        temperature=temperature,
-        max_tokens=max_tokens,
-    )
+    messages = []
+    if system_prompt:
+        messages.append({"role": "system", "content": system_prompt})
+    messages.append({"role": "user", "content": prompt})
 
-    if not response:
-        return None
+    route = route_request(request_class)
+    response_format = _response_format(schema, route.model)
+    parser = IncrementalJSONParser()
 
-    # Try to parse JSON from response
     try:
-        # Handle markdown code blocks
-        if "```json" in response:
-            response = response.split("```json")[1].split("```")[0]
-        elif "```" in response:
-            response = response.split("```")[1].split("```")[0]
-
-        return json.loads(response.strip())
-    except json.JSONDecodeError as e:
-        logger.warning(f"Failed to parse LLM JSON response: {e}")
-        logger.debug(f"Raw response: {response}")
+        async with aclosing(
+            stream_response(
+                messages=messages,
+                temperature=temperature,
+                max_tokens=max_tokens,
+                timeout=10,
+                response_format=response_format,
+                route=route,
+            )
+        ) as stream:
+            async for chunk in stream:
+                objects = parser.feed(chunk)
+                if objects:
+                    return objects[0]
+    except Exception as e:
+        rejected = getattr(e, "status_code", None) == 400
+        if response_format is not None and rejected and _RESPONSE_FORMAT_ERROR.search(str(e)):
+            # This model doesn't accept response_format - fall back to plain JSON
+            logger.warning(f"Structured output rejected by {route.model}, disabling for it: {e}")
+            _structured_output_rejected.add(route.model)
+            return await llm_json(
+                prompt, system_prompt, temperature, max_tokens, schema, request_class
+            )
+        logger.error(f"LLM call failed: {e}")
         return None
 
+    logger.warning("No complete JSON object in LLM response")
+    logger.debug(f"Partial response: {parser.partial}")
+    return None
+
 
 # ═══════════════════════════════════════════════════════════════════════════════
 # SPECIALIZED ANALYSIS FUNCTIONS
@@ -113,13 +188,23 @@ Respond with JSON only:
 {
   "has_excuse": true/false,
   "excuse_text": "the excuse they gave" or null,
-  "excuse_type": "too_tired|no_time|busy|forgot|sick|work|tomorrow|stressed|family|weather|traffic|other" or null,
   "confidence": 0.0-1.0
 }
 
 An excuse is when someone explains why they DIDN'T do something they committed to.
 NOT an excuse: positive responses, questions, or unrelated statements."""
 
+EXCUSE_SCHEMA = _schema(
+    "excuse",
+    {
+        "has_excuse": {"type": "boolean"},
+        "excuse_text": {"type": ["string", "null"]},
+        "confidence": {"type": "number"},
+    },
+)
+EXCUSE_MAX_TOKENS = 80
+EXCUSE_VERSION = prompt_version(EXCUSE_SYSTEM, EXCUSE_SCHEMA)
+
 
 async def analyze_excuse(
     user_text: str, favorite_excuse: Optional[str] = None
@@ -128,13 +213,21 @@ async def analyze_excuse(
     Detect if user is making an excuse.
 
     Returns:
-        {has_excuse, excuse_text, excuse_type, confidence, matches_favorite}
+        {has_excuse, excuse_text, confidence, matches_favorite}
     """
     prompt = f'User said: "{user_text}"'
     if favorite_excuse:
         prompt += f'\n\nNote: Their known favorite excuse is: "{favorite_excuse}"'
 
-    result = await llm_json(prompt, EXCUSE_SYSTEM)
+    result = await analysis_cache.get_or_compute(
+        "excuse",
+        EXCUSE_VERSION,
+        user_text,
+        lambda: llm_json(
+            prompt, EXCUSE_SYSTEM, max_tokens=EXCUSE_MAX_TOKENS, schema=EXCUSE_SCHEMA
+        ),
+        context=favorite_excuse,
+    )
 
     if result and result.get("has_excuse"):
         # Check if matches favorite
@@ -168,6 +261,28 @@ Sentiment meanings:
 - vulnerable: opening up, being honest about struggles
 - breakthrough: having a realization, moment of clarity"""
 
+SENTIMENT_SCHEMA = _schema(
+    "sentiment",
+    {
+        "sentiment": {
+            "type": "string",
+            "enum": [
+                "positive",
+                "negative",
+                "neutral",
+                "frustrated",
+                "defensive",
+                "vulnerable",
+                "breakthrough",
+            ],
+        },
+        "confidence": {"type": "number"},
+        "energy": {"type": "string", "enum": ["high", "medium", "low"]},
+    },
+)
+SENTIMENT_MAX_TOKENS = 40
+SENTIMENT_VERSION = prompt_version(SENTIMENT_SYSTEM, SENTIMENT_SCHEMA)
+
 
 async def analyze_sentiment(user_text: str) -> Optional[dict]:
     """
@@ -177,7 +292,14 @@ async def analyze_sentiment(user_text: str) -> Optional[dict]:
         {sentiment, confidence, energy}
     """
     prompt = f'User said: "{user_text}"'
-    return await llm_json(prompt, SENTIMENT_SYSTEM)
+    return await analysis_cache.get_or_compute(
+        "sentiment",
+        SENTIMENT_VERSION,
+        user_text,
+        lambda: llm_json(
+            prompt, SENTIMENT_SYSTEM, max_tokens=SENTIMENT_MAX_TOKENS, schema=SENTIMENT_SCHEMA
+        ),
+    )
 
 
 COMMITMENT_SYSTEM = """You extract commitments from user responses in an accountability call.
@@ -194,6 +316,18 @@ Respond with JSON only:
 A commitment is a promise to do something in the future.
 Look for: "I will", "I'll", "I promise", "tomorrow", specific times like "7am", "at night"."""
 
+COMMITMENT_SCHEMA = _schema(
+    "commitment",
+    {
+        "has_commitment": {"type": "boolean"},
+        "commitment_text": {"type": ["string", "null"]},
+        "action": {"type": ["string", "null"]},
+        "time": {"type": ["string", "null"]},
+        "is_specific": {"type": "boolean"},
+    },
+)
+COMMITMENT_MAX_TOKENS = 100
+
 
 async def analyze_commitment(user_text: str) -> Optional[dict]:
     """
@@ -203,7 +337,9 @@ async def analyze_commitment(user_text: str) -> Optional[dict]:
         {has_commitment, commitment_text, action, time, is_specific}
     """
     prompt = f'User said: "{user_text}"'
-    return await llm_json(prompt, COMMITMENT_SYSTEM)
+    return await llm_json(
+        prompt, COMMITMENT_SYSTEM, max_tokens=COMMITMENT_MAX_TOKENS, schema=COMMITMENT_SCHEMA
+    )
 
 
 PROMISE_SYSTEM = """You detect if user answered YES or NO to "did you do it?" in an accountability call.
@@ -211,7 +347,6 @@ PROMISE_SYSTEM = """You detect if user answered YES or NO to "did you do it?" in
 Respond with JSON only:
 {
   "answered": true/false,
-  "kept_promise": true/false/null,
   "response_type": "yes|no|dodge|unclear",
   "excuse": "if no, what excuse did they give" or null,
   "confidence": 0.0-1.0
@@ -221,6 +356,18 @@ YES indicators: "yes", "yeah", "I did", "done", "completed", "absolutely"
 NO indicators: "no", "didn't", "couldn't", "not yet", "failed"
 DODGE: avoiding the question, changing subject, vague answers like "kind of", "sort of"."""
 
+PROMISE_SCHEMA = _schema(
+    "promise",
+    {
+        "answered": {"type": "boolean"},
+        "response_type": {"type": "string", "enum": ["yes", "no", "dodge", "unclear"]},
+        "excuse": {"type": ["string", "null"]},
+        "confidence": {"type": "number"},
+    },
+)
+PROMISE_MAX_TOKENS = 80
+PROMISE_VERSION = prompt_version(PROMISE_SYSTEM, PROMISE_SCHEMA)
+
 
 async def analyze_promise(
     user_text: str, conversation_context: Optional[str] = None
@@ -229,12 +376,20 @@ async def analyze_promise(
     Detect if user kept their promise (yes/no to accountability question).
 
     Returns:
-        {answered, kept_promise, response_type, excuse, confidence}
+        {answered, response_type, excuse, confidence}
     """
     prompt = f'User said: "{user_text}"'
     if conversation_context:
         prompt = f"Context: {conversation_context}\n\n{prompt}"
-    return await llm_json(prompt, PROMISE_SYSTEM)
+    return await analysis_cache.get_or_compute(
+        "promise",
+        PROMISE_VERSION,
+        user_text,
+        lambda: llm_json(
+            prompt, PROMISE_SYSTEM, max_tokens=PROMISE_MAX_TOKENS, schema=PROMISE_SCHEMA
+        ),
+        context=conversation_context,
+    )
 
 
 QUOTE_SYSTEM = """You identify memorable/powerful quotes from user responses in an accountability call.
@@ -255,6 +410,20 @@ Memorable quotes are:
 
 Short "yes/no" responses are NOT memorable."""
 
+QUOTE_SCHEMA = _schema(
+    "quote",
+    {
+        "is_memorable": {"type": "boolean"},
+        "quote_type": {
+            "type": "string",
+            "enum": ["vulnerability", "breakthrough", "commitment", "fear", "none"],
+        },
+        "quote_text": {"type": ["string", "null"]},
+        "callback_potential": {"type": "string", "enum": ["high", "medium", "low"]},
+    },
+)
+QUOTE_MAX_TOKENS = 120
+
 
 async def analyze_quote(user_text: str) -> Optional[dict]:
     """
@@ -272,7 +441,9 @@ async def analyze_quote(user_text: str) -> Optional[dict]:
         }
 
     prompt = f'User said: "{user_text}"'
-    return await llm_json(prompt, QUOTE_SYSTEM)
+    return await llm_json(
+        prompt, QUOTE_SYSTEM, max_tokens=QUOTE_MAX_TOKENS, schema=QUOTE_SCHEMA
+    )
 
 
 STAGE_SYSTEM = """You track conversation stage in an accountability call.
@@ -289,10 +460,21 @@ Respond with JSON only:
 {
   "current_stage": "hook|accountability|dig_deeper|emotional_peak|tomorrow_lock|close",
   "should_advance": true/false,
-  "next_stage": "the next stage" or null,
-  "reason": "why advance or stay"
+  "next_stage": "the next stage" or null
 }"""
 
+_STAGES = ["hook", "accountability", "dig_deeper", "emotional_peak", "tomorrow_lock", "close"]
+
+STAGE_SCHEMA = _schema(
+    "stage",
+    {
+        "current_stage": {"type": "string", "enum": _STAGES},
+        "should_advance": {"type": "boolean"},
+        "next_stage": {"type": ["string", "null"], "enum": [*_STAGES, None]},
+    },
+)
+STAGE_MAX_TOKENS = 60
+
 
 async def analyze_stage(
     user_text: str,
@@ -305,7 +487,7 @@ async def analyze_stage(
     Determine if conversation should advance to next stage.
 
     Returns:
-        {current_stage, should_advance, next_stage, reason}
+        {current_stage, should_advance, next_stage}
     """
     prompt = f"""Current stage: {current_stage}
 Turn count in this stage: {turn_count}
@@ -316,7 +498,9 @@ User just said: "{user_text}"
 
 Should we advance to the next stage?"""
 
-    return await llm_json(prompt, STAGE_SYSTEM)
+    return await llm_json(
+        prompt, STAGE_SYSTEM, max_tokens=STAGE_MAX_TOKENS, schema=STAGE_SCHEMA
+    )
 
 
 # ═══════════════════════════════════════════════════════════════════════════════
@@ -409,6 +593,7 @@ Write a 2-3 sentence summary for the user to see in their call history."""
         system_prompt=SUMMARY_SYSTEM,
         temperature=0.7,  # Slightly creative for natural language
         max_tokens=200,
+        request_class=RequestClass.SUMMARY,
     )
 
     if result:
@@ -2,7 +2,8 @@
 LLM Client Package
 ==================
 
-OpenAI-compatible LLM client for AWS Bedrock.
+OpenAI-compatible LLM client for AWS Bedrock, with per-request model
+routing (routing.py).
 """
 
 from core.llm_client.client import (
@@ -13,6 +14,10 @@ from core.llm_client.client import (
     BEDROCK_MODEL,
     get_bedrock_endpoint,
 )
+from core.llm_client.metrics import llm_stats, LLMStatsSnapshot
+from core.llm_client.routing import RequestClass, Route, route_request
+from core.llm_client.json_stream import IncrementalJSONParser, parse_json_object
+from core.llm_client.transport import transport_stats, warm_up, schedule_warm_up
 
 __all__ = [
     "stream_response",
@@ -21,4 +26,14 @@ __all__ = [
     "BEDROCK_REGION",
     "BEDROCK_MODEL",
     "get_bedrock_endpoint",
+    "llm_stats",
+    "LLMStatsSnapshot",
+    "RequestClass",
+    "Route",
+    "route_request",
+    "IncrementalJSONParser",
+    "parse_json_object",
+    "transport_stats",
+    "warm_up",
+    "schedule_warm_up",
 ]
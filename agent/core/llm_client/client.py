@@ -15,10 +15,18 @@ https://bedrock-runtime.{region}.amazonaws.com/openai/v1
 """
 
 import os
-from typing import AsyncGenerator, Optional
+import time
+from typing import TYPE_CHECKING, AsyncGenerator, Optional
 
 from loguru import logger
-from openai import AsyncOpenAI
+
+from core.llm_client.metrics import llm_stats
+from core.llm_client.transport import get_http_client, set_endpoint
+
+if TYPE_CHECKING:
+    from openai import AsyncOpenAI
+
+    from core.llm_client.routing import Route
 
 
 # Configuration from environment variables
@@ -47,16 +55,25 @@ def get_bedrock_endpoint(region: str) -> str:
     """Get the Bedrock OpenAI-compatible endpoint URL for the given region."""
     return f"https://bedrock-runtime.{region}.amazonaws.com/openai/v1"
 
+
+# Transport warm-ups and keep-alive pings target the same endpoint
+if BEDROCK_API_KEY:
+    set_endpoint(get_bedrock_endpoint(BEDROCK_REGION))
+
 # Initialize async client
-_client: Optional[AsyncOpenAI] = None
+_client: Optional["AsyncOpenAI"] = None
 
 
-def _get_client() -> AsyncOpenAI:
+def _get_client() -> "AsyncOpenAI":
     """Get or create the async OpenAI client configured for AWS Bedrock."""
     global _client
     if _client is None:
         if not BEDROCK_API_KEY:
             raise ValueError("BEDROCK_API_KEY environment variable is required")
+
+        # Imported on first use - the SDK is slow to import and cold start
+        # shouldn't pay for it
+        from openai import AsyncOpenAI
         
         endpoint = get_bedrock_endpoint(BEDROCK_REGION)
         logger.info(f"Initializing Bedrock client: endpoint={endpoint}, model={BEDROCK_MODEL}")
@@ -64,6 +81,7 @@ def _get_client() -> AsyncOpenAI:
         _client = AsyncOpenAI(
             api_key=BEDROCK_API_KEY,
             base_url=endpoint,
+            http_client=get_http_client(),
         )
     return _client
 
@@ -73,6 +91,8 @@ async def stream_response(
     temperature: float = 0.7,
     max_tokens: int = 150,
     timeout: int = 30,
+    response_format: Optional[dict] = None,
+    route: Optional["Route"] = None,
 ) -> AsyncGenerator[str, None]:
     """
     Stream a response from the LLM API.
@@ -82,42 +102,83 @@ async def stream_response(
         temperature: Sampling temperature (0.0-1.0)
         max_tokens: Maximum tokens to generate
         timeout: Request timeout in seconds
+        response_format: Optional OpenAI response_format (json_object / json_schema)
+        route: Model route from routing.route_request (default: BEDROCK_MODEL)
 
     Yields:
         Response content chunks as strings
 
     Raises:
         ValueError: If API key is not set
+
+    Closing the generator early (e.g. via contextlib.aclosing) closes the
+    underlying HTTP stream so the provider stops generating.
     """
     if not BEDROCK_API_KEY:
         raise ValueError("BEDROCK_API_KEY not set")
 
     client = _get_client()
+    model = route.model if route else BEDROCK_MODEL
+    completion_text = ""
+    usage = None
+    stream = None
+    error = False
+    start = time.monotonic()
+    first_token_ms = None
 
+    extra = {"response_format": response_format} if response_format else {}
+
+    llm_stats.in_flight += 1
     try:
         stream = await client.chat.completions.create(
-            model=BEDROCK_MODEL,
+            model=model,
             messages=messages,
             temperature=temperature,
             max_tokens=max_tokens,
             stream=True,
             timeout=timeout,
+            **extra,
         )
 
         async for chunk in stream:
+            if getattr(chunk, "usage", None):
+                usage = chunk.usage
             if chunk.choices and chunk.choices[0].delta.content:
+                if first_token_ms is None:
+                    first_token_ms = (time.monotonic() - start) * 1000
+                completion_text += chunk.choices[0].delta.content
                 yield chunk.choices[0].delta.content
 
     except Exception as e:
         logger.error(f"LLM API call failed: {e}")
+        error = True
         raise
 
+    finally:
+        llm_stats.in_flight -= 1
+        if stream is not None:
+            await stream.close()
+        llm_stats.record(
+            usage.prompt_tokens if usage else None,
+            usage.completion_tokens if usage else None,
+            messages,
+            completion_text,
+            stream=True,
+            error=error,
+            route=route.name if route else "default",
+            model=model,
+            latency_ms=(time.monotonic() - start) * 1000,
+            first_token_ms=first_token_ms,
+        )
+
 
 async def call(
     messages: list[dict],
     temperature: float = 0.7,
     max_tokens: int = 150,
     timeout: int = 30,
+    response_format: Optional[dict] = None,
+    route: Optional["Route"] = None,
 ) -> Optional[str]:
     """
     Call LLM API and return full response (non-streaming).
@@ -127,6 +188,8 @@ async def call(
         temperature: Sampling temperature
         max_tokens: Maximum tokens to generate
         timeout: Request timeout in seconds
+        response_format: Optional OpenAI response_format (json_object / json_schema)
+        route: Model route from routing.route_request (default: BEDROCK_MODEL)
 
     Returns:
         Full response content or None on error
@@ -136,19 +199,40 @@ async def call(
         return None
 
     client = _get_client()
+    model = route.model if route else BEDROCK_MODEL
+    route_name = route.name if route else "default"
+    extra = {"response_format": response_format} if response_format else {}
+    start = time.monotonic()
 
+    llm_stats.in_flight += 1
     try:
         response = await client.chat.completions.create(
-            model=BEDROCK_MODEL,
+            model=model,
             messages=messages,
             temperature=temperature,
             max_tokens=max_tokens,
             stream=False,
             timeout=timeout,
+            **extra,
         )
 
-        return response.choices[0].message.content if response.choices else None
+        content = response.choices[0].message.content if response.choices else None
+        usage = getattr(response, "usage", None)
+        llm_stats.record(
+            usage.prompt_tokens if usage else None,
+            usage.completion_tokens if usage else None,
+            messages,
+            content or "",
+            route=route_name,
+            model=model,
+            latency_ms=(time.monotonic() - start) * 1000,
+        )
+        return content
 
     except Exception as e:
         logger.error(f"LLM API call failed: {e}")
+        llm_stats.record(None, None, messages, error=True, route=route_name, model=model)
         return None
+
+    finally:
+        llm_stats.in_flight -= 1
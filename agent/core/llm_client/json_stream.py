@@ -0,0 +1,99 @@
+"""
+Incremental JSON Parsing
+========================
+
+Pulls complete JSON objects out of streamed LLM output as soon as their
+closing brace arrives, so callers can act on an analysis (and stop the
+stream) without waiting for trailing text.
+
+Text outside objects is skipped, which also takes care of markdown code
+fences and any preamble the model adds. Braces inside strings and escaped
+quotes are handled.
+
+Usage:
+    parser = IncrementalJSONParser()
+    async for chunk in stream_response(...):
+        for obj in parser.feed(chunk):
+            ...
+"""
+
+import json
+from typing import Optional
+
+from loguru import logger
+
+
+class IncrementalJSONParser:
+    """Streaming extractor for top-level JSON objects."""
+
+    def __init__(self):
+        self._buffer: list[str] = []
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+
+    def feed(self, text: str) -> list[dict]:
+        """Consume a chunk and return any objects it completed."""
+        completed = []
+
+        for char in text:
+            if self._depth == 0:
+                # Outside an object: skip fences, prose, whitespace
+                if char == "{":
+                    self._buffer = [char]
+                    self._depth = 1
+                continue
+
+            self._buffer.append(char)
+
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif char == "\\":
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+                continue
+
+            if char == '"':
+                self._in_string = True
+            elif char == "{":
+                self._depth += 1
+            elif char == "}":
+                self._depth -= 1
+                if self._depth == 0:
+                    obj = self._decode("".join(self._buffer))
+                    self._buffer = []
+                    if obj is not None:
+                        completed.append(obj)
+
+        return completed
+
+    @property
+    def partial(self) -> str:
+        """Text of the object currently being received (for debugging)."""
+        return "".join(self._buffer)
+
+    @staticmethod
+    def _decode(raw: str) -> Optional[dict]:
+        try:
+            obj = json.loads(raw)
+        except json.JSONDecodeError as e:
+            logger.warning(f"Failed to parse LLM JSON object: {e}")
+            logger.debug(f"Raw object: {raw}")
+            return None
+        return obj if isinstance(obj, dict) else None
+
+
+def parse_json_object(text: str) -> Optional[dict]:
+    """Return the first complete JSON object in a full response, or None."""
+    if not text:
+        return None
+    objects = IncrementalJSONParser().feed(text)
+    return objects[0] if objects else None
+
+
+__all__ = [
+    "IncrementalJSONParser",
+    "parse_json_object",
+]
@@ -0,0 +1,194 @@
+"""
+LLM Usage Metrics
+=================
+
+Process-wide counters for LLM traffic: request counts, errors and token
+usage. Token counts come from the provider's `usage` block when it is
+returned; streamed responses usually omit it, so those are estimated
+from character counts and flagged as estimated.
+
+Requests are also broken down by model route (see routing.py): count,
+tokens, and latency / time-to-first-token percentiles per route.
+`in_flight` counts requests currently open (admission control reads it).
+
+Usage:
+    from core.llm_client.metrics import llm_stats
+
+    before = llm_stats.snapshot()
+    ...  # run a call
+    delta = llm_stats.snapshot().diff(before)
+
+    llm_stats.route_stats()  # {"speak:fast": {...}, "classify:fast": {...}}
+"""
+
+from collections import deque
+from dataclasses import dataclass, asdict, field
+from typing import Optional
+
+# Rough chars-per-token ratio used when the provider doesn't report usage
+CHARS_PER_TOKEN = 4
+
+# Latency samples kept per route for percentiles
+ROUTE_SAMPLES = 500
+
+
+def estimate_tokens(text: str) -> int:
+    """Estimate token count for a piece of text."""
+    if not text:
+        return 0
+    return max(1, len(text) // CHARS_PER_TOKEN)
+
+
+def estimate_message_tokens(messages: list[dict]) -> int:
+    """Estimate prompt tokens for an OpenAI-format messages list."""
+    return sum(estimate_tokens(str(m.get("content", ""))) for m in messages)
+
+
+@dataclass
+class LLMStatsSnapshot:
+    """Point-in-time copy of the LLM counters."""
+
+    requests: int = 0
+    stream_requests: int = 0
+    errors: int = 0
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    estimated_requests: int = 0  # Requests whose tokens were estimated
+
+    @property
+    def total_tokens(self) -> int:
+        return self.prompt_tokens + self.completion_tokens
+
+    def diff(self, earlier: "LLMStatsSnapshot") -> "LLMStatsSnapshot":
+        """Counters accumulated since an earlier snapshot."""
+        return LLMStatsSnapshot(
+            requests=self.requests - earlier.requests,
+            stream_requests=self.stream_requests - earlier.stream_requests,
+            errors=self.errors - earlier.errors,
+            prompt_tokens=self.prompt_tokens - earlier.prompt_tokens,
+            completion_tokens=self.completion_tokens - earlier.completion_tokens,
+            estimated_requests=self.estimated_requests - earlier.estimated_requests,
+        )
+
+    def to_dict(self) -> dict:
+        data = asdict(self)
+        data["total_tokens"] = self.total_tokens
+        return data
+
+
+def _percentile(samples, p: float) -> Optional[float]:
+    if not samples:
+        return None
+    ordered = sorted(samples)
+    return round(ordered[min(len(ordered) - 1, int(p * len(ordered)))], 1)
+
+
+@dataclass
+class RouteMetrics:
+    """Requests, tokens and latency for one model route."""
+
+    model: str = ""
+    requests: int = 0
+    errors: int = 0
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    latencies_ms: deque = field(default_factory=lambda: deque(maxlen=ROUTE_SAMPLES))
+    first_token_ms: deque = field(default_factory=lambda: deque(maxlen=ROUTE_SAMPLES))
+
+    def to_dict(self) -> dict:
+        return {
+            "model": self.model,
+            "requests": self.requests,
+            "errors": self.errors,
+            "prompt_tokens": self.prompt_tokens,
+            "completion_tokens": self.completion_tokens,
+            "latency_p50_ms": _percentile(self.latencies_ms, 0.5),
+            "latency_p95_ms": _percentile(self.latencies_ms, 0.95),
+            "first_token_p50_ms": _percentile(self.first_token_ms, 0.5),
+        }
+
+
+class LLMStats:
+    """Mutable process-wide LLM counters."""
+
+    def __init__(self):
+        self._current = LLMStatsSnapshot()
+        self._routes: dict[str, RouteMetrics] = {}
+        self.in_flight = 0  # Requests started and not yet finished (a load signal)
+
+    def record(
+        self,
+        prompt_tokens: Optional[int],
+        completion_tokens: Optional[int],
+        messages: list[dict],
+        completion_text: str = "",
+        stream: bool = False,
+        error: bool = False,
+        route: Optional[str] = None,
+        model: Optional[str] = None,
+        latency_ms: Optional[float] = None,
+        first_token_ms: Optional[float] = None,
+    ) -> None:
+        """
+        Record one finished request.
+
+        Missing provider usage is filled in with estimates from the
+        request messages and the completion text.
+        """
+        stats = self._current
+        stats.requests += 1
+        if stream:
+            stats.stream_requests += 1
+        if error:
+            stats.errors += 1
+
+        estimated = False
+        if prompt_tokens is None:
+            prompt_tokens = estimate_message_tokens(messages)
+            estimated = True
+        if completion_tokens is None:
+            completion_tokens = estimate_tokens(completion_text)
+            estimated = True
+
+        stats.prompt_tokens += prompt_tokens
+        stats.completion_tokens += completion_tokens
+        if estimated:
+            stats.estimated_requests += 1
+
+        if route:
+            metrics = self._routes.setdefault(route, RouteMetrics())
+            metrics.model = model or metrics.model
+            metrics.requests += 1
+            metrics.errors += int(error)
+            metrics.prompt_tokens += prompt_tokens
+            metrics.completion_tokens += completion_tokens
+            if latency_ms is not None and not error:
+                metrics.latencies_ms.append(latency_ms)
+            if first_token_ms is not None:
+                metrics.first_token_ms.append(first_token_ms)
+
+    def route_stats(self) -> dict[str, dict]:
+        """Per-route counters and latency percentiles."""
+        return {name: m.to_dict() for name, m in sorted(self._routes.items())}
+
+    def snapshot(self) -> LLMStatsSnapshot:
+        """Copy of the current counters."""
+        return LLMStatsSnapshot(**asdict(self._current))
+
+    def reset(self) -> None:
+        self._current = LLMStatsSnapshot()
+        self._routes = {}
+
+
+# Singleton instance
+llm_stats = LLMStats()
+
+
+__all__ = [
+    "LLMStats",
+    "LLMStatsSnapshot",
+    "RouteMetrics",
+    "llm_stats",
+    "estimate_tokens",
+    "estimate_message_tokens",
+]
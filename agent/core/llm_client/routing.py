@@ -0,0 +1,149 @@
+"""
+LLM Model Routing
+=================
+
+Picks the model for each request instead of sending everything to
+BEDROCK_MODEL. Most requests don't need the large model: background
+classifiers return a few JSON fields, and the formulaic stages (hook,
+accountability question, tomorrow lock, close) are one or two scripted
+sentences. The stages that carry the call (dig deeper, the emotional
+peak) stay on the large model.
+
+The policy is an ordered list of RoutingRules keyed on request class,
+call stage and call type; the first matching rule picks the tier
+("fast" or "large"), and the tier maps to a model. Every request is
+recorded under its route name ("speak:fast", "classify:fast", ...) in
+llm_stats, with latency and token counts per route.
+
+Configuration via environment variables:
+- LLM_ROUTING: "true" (default) / "false" - false sends everything to BEDROCK_MODEL
+- LLM_MODEL_FAST: model for the fast tier (default BEDROCK_MODEL)
+- LLM_MODEL_LARGE: model for the large tier (default BEDROCK_MODEL)
+
+Usage:
+    from core.llm_client import RequestClass, route_request, stream_response
+
+    route = route_request(RequestClass.SPEAK, stage="dig_deeper", call_type="audit")
+    async for chunk in stream_response(messages, route=route):
+        ...
+
+    llm_stats.route_stats()
+"""
+
+import os
+from dataclasses import dataclass
+from enum import Enum
+from typing import Optional
+
+from core.llm_client.client import BEDROCK_MODEL
+
+LLM_ROUTING = os.getenv("LLM_ROUTING", "true").lower() == "true"
+LLM_MODEL_FAST = os.getenv("LLM_MODEL_FAST") or BEDROCK_MODEL
+LLM_MODEL_LARGE = os.getenv("LLM_MODEL_LARGE") or BEDROCK_MODEL
+
+TIER_MODELS = {
+    "fast": LLM_MODEL_FAST,
+    "large": LLM_MODEL_LARGE,
+}
+
+# Tier for requests no rule matches
+DEFAULT_TIER = "large"
+
+
+class RequestClass(str, Enum):
+    """What a request is for."""
+
+    SPEAK = "speak"  # Speaking-node reply (the user hears it)
+    CLASSIFY = "classify"  # Background analyzers, stage checks
+    SUMMARY = "summary"  # Post-call summary
+
+
+@dataclass(frozen=True)
+class Route:
+    """Routing decision for one request."""
+
+    name: str  # Metrics key, e.g. "speak:fast"
+    tier: str
+    model: str
+
+
+@dataclass(frozen=True)
+class RoutingRule:
+    """Send matching requests to `tier`. Empty stages / call_types match any."""
+
+    tier: str
+    request_class: RequestClass
+    stages: frozenset[str] = frozenset()
+    call_types: frozenset[str] = frozenset()
+
+    def matches(
+        self, request_class: RequestClass, stage: Optional[str], call_type: Optional[str]
+    ) -> bool:
+        if request_class != self.request_class:
+            return False
+        if self.stages and stage not in self.stages:
+            return False
+        if self.call_types and call_type not in self.call_types:
+            return False
+        return True
+
+
+# First match wins. Stages are CallStage values, call types CALL_TYPES keys
+ROUTING_POLICY: list[RoutingRule] = [
+    RoutingRule("fast", RequestClass.CLASSIFY),
+    RoutingRule("fast", RequestClass.SUMMARY),
+    # Story and milestone calls build to a reveal - keep the build-up on the large model
+    RoutingRule(
+        "large",
+        RequestClass.SPEAK,
+        stages=frozenset({"acknowledge", "dig_deeper", "peak"}),
+        call_types=frozenset({"story", "milestone"}),
+    ),
+    RoutingRule("large", RequestClass.SPEAK, stages=frozenset({"dig_deeper", "peak"})),
+    RoutingRule(
+        "fast",
+        RequestClass.SPEAK,
+        stages=frozenset({"hook", "acknowledge", "accountability", "tomorrow_lock", "close"}),
+    ),
+]
+
+
+def route_request(
+    request_class: RequestClass,
+    stage=None,
+    call_type: Optional[str] = None,
+    policy: Optional[list[RoutingRule]] = None,
+) -> Route:
+    """
+    Pick the route for a request.
+
+    Args:
+        request_class: What the request is for
+        stage: CallStage (or its value) for speaking turns
+        call_type: Call type name (e.g. "audit", "story")
+        policy: Rules to use instead of ROUTING_POLICY
+
+    Returns:
+        Route with the model to call and the metrics name
+    """
+    stage = getattr(stage, "value", stage)
+    tier = DEFAULT_TIER
+    for rule in ROUTING_POLICY if policy is None else policy:
+        if rule.matches(request_class, stage, call_type):
+            tier = rule.tier
+            break
+
+    model = TIER_MODELS.get(tier, BEDROCK_MODEL) if LLM_ROUTING else BEDROCK_MODEL
+    return Route(name=f"{request_class.value}:{tier}", tier=tier, model=model)
+
+
+__all__ = [
+    "RequestClass",
+    "Route",
+    "RoutingRule",
+    "ROUTING_POLICY",
+    "route_request",
+    "LLM_ROUTING",
+    "LLM_MODEL_FAST",
+    "LLM_MODEL_LARGE",
+]
@@ -0,0 +1,225 @@
+"""
+LLM HTTP Transport
+==================
+
+Tuned httpx transport shared by the Bedrock client:
+- HTTP/2 multiplexing (when the `h2` package is installed), so concurrent
+  analyzer and speaking-agent requests share one TLS connection
+- keep-alive pool sizing and expiry
+- warm-up: open the connection before a call needs it (app startup and
+  pre-call accept), so the first turn doesn't pay DNS + TCP + TLS
+- idle pings: a cheap request every LLM_PING_INTERVAL seconds of idleness
+  keeps the pooled connection from expiring between calls
+
+Connection reuse is measured with httpcore's trace extension: every
+request is counted, and every TCP connect is a new connection. Warm-up and
+ping requests are left out (they'd inflate the reuse rate).
+
+Configuration via environment variables:
+- LLM_HTTP2: "true" (default) / "false"
+- LLM_MAX_CONNECTIONS: pool size (default 100)
+- LLM_MAX_KEEPALIVE: idle connections kept open (default 20)
+- LLM_KEEPALIVE_EXPIRY: seconds an idle connection is kept (default 120)
+- LLM_PING_INTERVAL: idle seconds before a keep-alive ping (default 30, 0 disables)
+- LLM_CONNECT_TIMEOUT: connect timeout in seconds (default 5)
+- LLM_WARM_CONNECTIONS: connections opened by warm_up on HTTP/1.1 (default 2)
+"""
+
+import asyncio
+import os
+import time
+from dataclasses import dataclass, asdict
+from typing import Optional
+
+import httpx
+from loguru import logger
+
+LLM_HTTP2 = os.getenv("LLM_HTTP2", "true").lower() == "true"
+LLM_MAX_CONNECTIONS = int(os.getenv("LLM_MAX_CONNECTIONS", "100"))
+LLM_MAX_KEEPALIVE = int(os.getenv("LLM_MAX_KEEPALIVE", "20"))
+LLM_KEEPALIVE_EXPIRY = float(os.getenv("LLM_KEEPALIVE_EXPIRY", "120"))
+LLM_PING_INTERVAL = float(os.getenv("LLM_PING_INTERVAL", "30"))
+LLM_CONNECT_TIMEOUT = float(os.getenv("LLM_CONNECT_TIMEOUT", "5"))
+LLM_WARM_CONNECTIONS = int(os.getenv("LLM_WARM_CONNECTIONS", "2"))
+
+try:
+    import h2  # noqa: F401
+
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+
+@dataclass
+class TransportStats:
+    """Connection reuse counters for the LLM transport."""
+
+    requests: int = 0
+    new_connections: int = 0
+    warmups: int = 0
+    pings: int = 0
+    ping_failures: int = 0
+
+    @property
+    def reuse_rate(self) -> float:
+        """Share of requests served on an already-open connection."""
+        if not self.requests:
+            return 0.0
+        return max(0.0, 1 - self.new_connections / self.requests)
+
+    def to_dict(self) -> dict:
+        data = asdict(self)
+        data["reuse_rate"] = round(self.reuse_rate, 3)
+        return data
+
+
+transport_stats = TransportStats()
+
+_http_client: Optional[httpx.AsyncClient] = None
+_endpoint: Optional[str] = None
+_last_activity = 0.0
+_warm_task: Optional[asyncio.Task] = None
+_ping_task: Optional[asyncio.Task] = None
+
+
+async def _trace(event_name: str, info: dict) -> None:
+    """httpcore trace callback - counts fresh TCP connections."""
+    if event_name == "connection.connect_tcp.complete":
+        transport_stats.new_connections += 1
+
+
+# Request extension marking warm-up / keep-alive pings
+_TOUCH = "llm_touch"
+
+
+async def _on_request(request: httpx.Request) -> None:
+    global _last_activity
+    _last_activity = time.monotonic()
+    if request.extensions.get(_TOUCH):
+        return
+    transport_stats.requests += 1
+    request.extensions["trace"] = _trace
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """Get or create the shared httpx client for LLM requests."""
+    global _http_client
+    if _http_client is None:
+        http2 = LLM_HTTP2 and HTTP2_AVAILABLE
+        if LLM_HTTP2 and not HTTP2_AVAILABLE:
+            logger.warning("LLM_HTTP2 enabled but h2 not installed - using HTTP/1.1")
+
+        _http_client = httpx.AsyncClient(
+            http2=http2,
+            limits=httpx.Limits(
+                max_connections=LLM_MAX_CONNECTIONS,
+                max_keepalive_connections=LLM_MAX_KEEPALIVE,
+                keepalive_expiry=LLM_KEEPALIVE_EXPIRY,
+            ),
+            timeout=httpx.Timeout(30.0, connect=LLM_CONNECT_TIMEOUT),
+            event_hooks={"request": [_on_request]},
+        )
+        logger.info(
+            f"LLM transport: http2={http2}, max_connections={LLM_MAX_CONNECTIONS}, "
+            f"keepalive={LLM_MAX_KEEPALIVE}/{LLM_KEEPALIVE_EXPIRY:.0f}s"
+        )
+    return _http_client
+
+
+def set_endpoint(endpoint: str) -> None:
+    """Register the base URL that warm-ups and pings should hit."""
+    global _endpoint
+    _endpoint = endpoint
+
+
+async def _touch(timeout: float) -> bool:
+    """Cheap request to open or keep alive a connection. Any response counts."""
+    if not _endpoint:
+        return False
+    try:
+        await get_http_client().head(_endpoint, timeout=timeout, extensions={_TOUCH: True})
+        return True
+    except httpx.HTTPError as e:
+        logger.debug(f"LLM transport touch failed: {e}")
+        return False
+
+
+async def _warm(connections: int) -> None:
+    transport_stats.warmups += 1
+    start = time.monotonic()
+    results = await asyncio.gather(
+        *(_touch(timeout=LLM_CONNECT_TIMEOUT + 5) for _ in range(connections))
+    )
+    elapsed = (time.monotonic() - start) * 1000
+    logger.info(
+        f"🔥 LLM transport warmed ({sum(results)}/{connections} ok, {elapsed:.0f}ms)"
+    )
+
+
+async def warm_up(connections: Optional[int] = None) -> None:
+    """
+    Open pooled connections to the LLM endpoint ahead of need.
+
+    Concurrent callers share one warm-up. Also starts the idle pinger.
+    """
+    global _warm_task
+    if not _endpoint:
+        return
+
+    if connections is None:
+        # One HTTP/2 connection multiplexes every request
+        connections = 1 if LLM_HTTP2 and HTTP2_AVAILABLE else LLM_WARM_CONNECTIONS
+
+    if _warm_task is None or _warm_task.done():
+        _warm_task = asyncio.create_task(_warm(connections))
+    start_keepalive()
+    await asyncio.shield(_warm_task)
+
+
+def schedule_warm_up() -> None:
+    """Fire-and-forget warm_up (for handlers that shouldn't wait on it)."""
+    if not _endpoint:
+        return
+    task = asyncio.create_task(warm_up())
+    task.add_done_callback(lambda t: t.cancelled() or t.exception())
+
+
+async def _keepalive_loop() -> None:
+    while True:
+        await asyncio.sleep(LLM_PING_INTERVAL)
+        if time.monotonic() - _last_activity < LLM_PING_INTERVAL:
+            continue  # Real traffic is keeping the connection warm
+        transport_stats.pings += 1
+        if not await _touch(timeout=LLM_CONNECT_TIMEOUT + 5):
+            transport_stats.ping_failures += 1
+
+
+def start_keepalive() -> None:
+    """Start the idle pinger (no-op if disabled or already running)."""
+    global _ping_task
+    if LLM_PING_INTERVAL <= 0 or (_ping_task and not _ping_task.done()):
+        return
+    _ping_task = asyncio.create_task(_keepalive_loop())
+
+
+async def close() -> None:
+    """Stop the pinger and close pooled connections."""
+    global _http_client, _ping_task
+    if _ping_task:
+        _ping_task.cancel()
+        _ping_task = None
+    if _http_client is not None:
+        await _http_client.aclose()
+        _http_client = None
+
+
+__all__ = [
+    "TransportStats",
+    "transport_stats",
+    "get_http_client",
+    "set_endpoint",
+    "warm_up",
+    "schedule_warm_up",
+    "start_keepalive",
+    "close",
+]
@@ -0,0 +1,302 @@
+"""
+Event Loop Monitor
+==================
+
+Samples event-loop lag continuously and captures the code that blocks the loop.
+
+Every call in a worker shares one event loop. A coroutine that blocks it
+(a synchronous supabase-py `.execute()`, a file read, a long parse) stalls
+every concurrent call while it runs, and nothing in the logs says so.
+The monitor has two parts:
+
+- a sampler task that sleeps LOOP_MONITOR_INTERVAL_MS at a time and records
+  how late it wakes up into a lag histogram
+- a watchdog thread that checks the sampler's heartbeat. When the loop
+  hasn't run it for LOOP_BLOCK_THRESHOLD_MS, the watchdog reads the loop
+  thread's stack with sys._current_frames() and logs it once per stall.
+  When the loop comes back, it logs how long the stall lasted.
+
+Stalls are grouped by site, the innermost agent frame on the stack.
+
+Per-process lag histograms, recent stalls and the active-call count are
+served at GET /loop. Lag p99 / max and the stall count also go into the
+worker load table (GET /workers). The scenario engine runs its own
+monitor and puts the same numbers in each report, so a load test run shows
+when a change blocks the loop.
+
+Configuration via environment variables:
+- LOOP_MONITOR: "true" (default) / "false"
+- LOOP_MONITOR_INTERVAL_MS: sampling interval (default 100)
+- LOOP_BLOCK_THRESHOLD_MS: stall length that captures a stack (default 250)
+
+Usage:
+    from core.loop_monitor import loop_monitor
+
+    loop_monitor.start()              # on the loop to watch (app startup)
+    loop_monitor.lag.to_dict()        # histogram + percentiles
+    loop_monitor.recent_lag_ms()      # worst lag over the last second
+    await loop_monitor.snapshot()     # GET /loop
+    await loop_monitor.stop()
+"""
+
+import asyncio
+import os
+import sys
+import threading
+import time
+import traceback
+from bisect import bisect_left
+from collections import deque
+from dataclasses import dataclass, asdict, field
+from pathlib import Path
+from typing import Optional
+
+from loguru import logger
+
+LOOP_MONITOR = os.getenv("LOOP_MONITOR", "true").lower() == "true"
+LOOP_MONITOR_INTERVAL_MS = float(os.getenv("LOOP_MONITOR_INTERVAL_MS", "100"))
+LOOP_BLOCK_THRESHOLD_MS = float(os.getenv("LOOP_BLOCK_THRESHOLD_MS", "250"))
+
+# Histogram upper bounds (ms); one overflow bucket above the last
+LAG_BUCKETS_MS = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500)
+# Samples kept for percentiles (~1 minute at the default interval)
+RECENT_SAMPLES = 600
+# Stalls kept with their stacks
+MAX_BLOCK_EVENTS = 20
+# Innermost frames captured per stall
+STACK_DEPTH = 12
+
+AGENT_DIR = str(Path(__file__).parent.parent)
+
+
+class LagHistogram:
+    """Bucketed lag counts since start, plus recent samples for percentiles."""
+
+    def __init__(self, buckets: tuple = LAG_BUCKETS_MS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self._recent: deque[tuple[float, float]] = deque(maxlen=RECENT_SAMPLES)
+
+    def record(self, lag_ms: float) -> None:
+        self.counts[bisect_left(self.buckets, lag_ms)] += 1
+        self.count += 1
+        self.total_ms += lag_ms
+        self.max_ms = max(self.max_ms, lag_ms)
+        self._recent.append((time.monotonic(), lag_ms))
+
+    def percentile(self, p: float) -> Optional[float]:
+        """Percentile over the recent samples."""
+        recent = list(self._recent)  # Atomic copy; the sampler keeps appending
+        if not recent:
+            return None
+        ordered = sorted(lag for _, lag in recent)
+        return round(ordered[min(len(ordered) - 1, int(p * len(ordered)))], 1)
+
+    def recent_max(self, window_s: float) -> float:
+        """Worst lag sampled in the last `window_s` seconds."""
+        cutoff = time.monotonic() - window_s
+        return max((lag for at, lag in list(self._recent) if at >= cutoff), default=0.0)
+
+    def to_dict(self) -> dict:
+        labels = [f"<={b}ms" for b in self.buckets] + [f">{self.buckets[-1]}ms"]
+        return {
+            "count": self.count,
+            "mean_ms": round(self.total_ms / self.count, 2) if self.count else None,
+            "max_ms": round(self.max_ms, 1),
+            "p50_ms": self.percentile(0.5),
+            "p99_ms": self.percentile(0.99),
+            "buckets": dict(zip(labels, self.counts)),
+        }
+
+
+@dataclass
+class BlockEvent:
+    """One stall of the event loop."""
+
+    started_at: float  # Wall clock
+    site: str  # Innermost agent frame: "path:line function"
+    stack: list[str] = field(default_factory=list)
+    duration_ms: Optional[float] = None  # Set when the loop runs again
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+
+def _site(frames: traceback.StackSummary) -> str:
+    """Innermost frame in agent code (falls back to the innermost frame)."""
+    for frame in reversed(frames):
+        if frame.filename.startswith(AGENT_DIR) and frame.filename != __file__:
+            return f"{os.path.relpath(frame.filename, AGENT_DIR)}:{frame.lineno} {frame.name}"
+    if frames:
+        frame = frames[-1]
+        return f"{frame.filename}:{frame.lineno} {frame.name}"
+    return "unknown"
+
+
+class LoopMonitor:
+    """Lag sampler + blocking-call watchdog for one event loop."""
+
+    def __init__(
+        self,
+        interval_ms: float = LOOP_MONITOR_INTERVAL_MS,
+        threshold_ms: float = LOOP_BLOCK_THRESHOLD_MS,
+    ):
+        self.interval = interval_ms / 1000
+        # The heartbeat is normally up to one interval old
+        self.threshold = max(threshold_ms / 1000, 2 * self.interval)
+        self.lag = LagHistogram()
+        self.blocks: deque[BlockEvent] = deque(maxlen=MAX_BLOCK_EVENTS)
+        self.block_count = 0
+        self.sites: dict[str, int] = {}
+        # Guards blocks / sites / block_count: the watchdog thread writes them
+        self._lock = threading.Lock()
+
+        self._heartbeat = 0.0
+        self._loop_thread_id: Optional[int] = None
+        self._task: Optional[asyncio.Task] = None
+        self._thread: Optional[threading.Thread] = None
+        self._stopping = threading.Event()
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self) -> None:
+        """Start sampling the running loop (call from the loop's thread)."""
+        if self.running:
+            return
+        self._loop_thread_id = threading.get_ident()
+        self._heartbeat = time.monotonic()
+        self._stopping.clear()
+        self._task = asyncio.get_running_loop().create_task(self._sample())
+        self._thread = threading.Thread(target=self._watch, name="loop-watchdog", daemon=True)
+        self._thread.start()
+        logger.info(
+            f"🩺 Loop monitor started (every {self.interval * 1000:.0f}ms, "
+            f"stall threshold {self.threshold * 1000:.0f}ms)"
+        )
+
+    async def stop(self) -> None:
+        self._stopping.set()
+        task, self._task = self._task, None
+        if task is not None:
+            # A stall right before stop() hasn't woken the sampler yet
+            overdue = time.monotonic() - self._heartbeat - self.interval
+            if overdue > 0:
+                self.lag.record(overdue * 1000)
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        thread, self._thread = self._thread, None
+        if thread is not None:
+            await asyncio.to_thread(thread.join, 1.0)
+
+    async def _sample(self) -> None:
+        while True:
+            start = time.monotonic()
+            await asyncio.sleep(self.interval)
+            now = time.monotonic()
+            self._heartbeat = now
+            self.lag.record(max(0.0, (now - start - self.interval) * 1000))
+
+    def _watch(self) -> None:
+        """Watchdog thread: capture the loop thread's stack during stalls."""
+        event: Optional[BlockEvent] = None
+        stalled_beat = 0.0
+        while not self._stopping.wait(self.threshold / 4):
+            beat = self._heartbeat
+            if event is None:
+                if time.monotonic() - beat >= self.threshold:
+                    event = self._capture()
+                    stalled_beat = beat
+            elif beat != stalled_beat:
+                # Loop is running again
+                event.duration_ms = round((beat - stalled_beat - self.interval) * 1000, 1)
+                logger.warning(f"🐢 Event loop stall ended after {event.duration_ms:.0f}ms ({event.site})")
+                event = None
+        if event is not None:
+            event.duration_ms = round((time.monotonic() - stalled_beat - self.interval) * 1000, 1)
+
+    def _capture(self) -> BlockEvent:
+        frame = sys._current_frames().get(self._loop_thread_id)
+        frames = traceback.extract_stack(frame, limit=STACK_DEPTH) if frame else traceback.StackSummary()
+        event = BlockEvent(
+            started_at=time.time() - self.threshold,
+            site=_site(frames),
+            stack=[line.rstrip() for line in frames.format()],
+        )
+        with self._lock:
+            self.blocks.append(event)
+            self.block_count += 1
+            self.sites[event.site] = self.sites.get(event.site, 0) + 1
+        logger.warning(
+            f"🐢 Event loop blocked >{self.threshold * 1000:.0f}ms at {event.site}\n"
+            + "\n".join(event.stack)
+        )
+        return event
+
+    def recent_lag_ms(self, window_s: float = 1.0) -> float:
+        """Worst lag over the last `window_s` seconds."""
+        return self.lag.recent_max(window_s)
+
+    def _stalls(self) -> tuple[int, dict[str, int], list[BlockEvent]]:
+        """Consistent copy of the stall count, sites (most frequent first) and events."""
+        with self._lock:
+            sites = sorted(self.sites.items(), key=lambda kv: -kv[1])
+            return self.block_count, dict(sites), list(self.blocks)
+
+    def summary(self) -> dict:
+        """Lag and stall numbers without stacks (for reports)."""
+        lag = self.lag.to_dict()
+        stalls, sites, _ = self._stalls()
+        return {
+            "lag_p50_ms": lag["p50_ms"],
+            "lag_p99_ms": lag["p99_ms"],
+            "lag_max_ms": lag["max_ms"],
+            "stalls": stalls,
+            "stall_sites": sites,
+        }
+
+    async def snapshot(self) -> dict:
+        """
+        Lag histogram, stalls and active calls for this process (GET /loop).
+
+        Async so FastAPI runs it on the monitored loop, not in its threadpool.
+        """
+        from core.call_registry import call_registry
+
+        stalls, sites, events = self._stalls()
+        return {
+            "pid": os.getpid(),
+            "running": self.running,
+            "active_calls": len(call_registry),
+            "lag": self.lag.to_dict(),
+            "stalls": stalls,
+            "stall_sites": sites,
+            "recent_stalls": [event.to_dict() for event in events],
+        }
+
+
+# Singleton instance
+loop_monitor = LoopMonitor()
+
+
+def start_loop_monitor() -> None:
+    """App startup hook: monitor this process's loop, if enabled."""
+    if LOOP_MONITOR:
+        loop_monitor.start()
+
+
+__all__ = [
+    "LOOP_MONITOR",
+    "BlockEvent",
+    "LagHistogram",
+    "LoopMonitor",
+    "loop_monitor",
+    "start_loop_monitor",
+]
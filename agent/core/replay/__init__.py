@@ -0,0 +1,34 @@
+"""
+Call Replay Package
+===================
+
+Capture live calls and replay them for performance regression testing.
+
+- capture: CallRecorder (wired into _setup_routing when CALL_CAPTURE_DIR is set)
+  and load_capture for reading capture files
+- replayer: CallReplayer feeds a capture back through FutureYouNode and the
+  background agents, reporting turn latency and LLM usage
+
+CLI:
+    cd agent
+    uv run python -m core.replay run captures/*.jsonl --speed 4 --out new.json
+    uv run python -m core.replay compare old.json new.json
+"""
+
+from core.replay.capture import (
+    CAPTURE_VERSION,
+    CapturedEvent,
+    CallCapture,
+    CallRecorder,
+    create_recorder,
+    load_capture,
+)
+
+__all__ = [
+    "CAPTURE_VERSION",
+    "CapturedEvent",
+    "CallCapture",
+    "CallRecorder",
+    "create_recorder",
+    "load_capture",
+]
@@ -0,0 +1,129 @@
+"""
+Replay CLI
+==========
+
+Usage:
+    cd agent
+    uv run python -m core.replay run captures/*.jsonl --speed 4 --out new.json
+    uv run python -m core.replay run captures/*.jsonl --speed max --recorded-insights
+    uv run python -m core.replay compare old.json new.json
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+from pathlib import Path
+
+AGENT_DIR = Path(__file__).parent.parent.parent
+if str(AGENT_DIR) not in sys.path:
+    sys.path.insert(0, str(AGENT_DIR))
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+from core.replay.capture import load_capture
+from core.replay.replayer import _percentile, compare_reports, replay_capture
+
+
+def _parse_speed(value: str):
+    if value.lower() in ("max", "0"):
+        return None
+    return float(value)
+
+
+async def _run(args) -> None:
+    reports = []
+    for path in args.captures:
+        capture = load_capture(path)
+        print(f"▶ Replaying {path} ({capture.user_turns} turns, {capture.duration:.0f}s)")
+        report = await replay_capture(
+            capture,
+            speed=args.speed,
+            use_recorded_insights=args.recorded_insights,
+        )
+        data = report.to_dict()
+        reports.append(data)
+        latency = data["latency"]
+        llm = data["llm"]
+        print(
+            f"  turns={len(report.turns)} ttft_p50={latency['ttft_p50_ms']}ms "
+            f"turn_p95={latency['turn_p95_ms']}ms requests={llm['requests']} "
+            f"tokens={llm['total_tokens']}"
+        )
+
+    combined = {
+        "reports": reports,
+        "latency": _merge_latency(reports),
+        "llm": _sum_llm(reports),
+    }
+    if args.out:
+        Path(args.out).write_text(json.dumps(combined, indent=2, default=str))
+        print(f"Report saved to {args.out}")
+
+
+def _merge_latency(reports: list[dict]) -> dict:
+    ttft = [t["ttft_ms"] for r in reports for t in r["turns"] if t["ttft_ms"] is not None]
+    total = [t["total_ms"] for r in reports for t in r["turns"] if not t["interrupted"]]
+    return {
+        "ttft_p50_ms": _percentile(ttft, 50),
+        "ttft_p95_ms": _percentile(ttft, 95),
+        "turn_p50_ms": _percentile(total, 50),
+        "turn_p95_ms": _percentile(total, 95),
+    }
+
+
+def _sum_llm(reports: list[dict]) -> dict:
+    totals: dict = {}
+    for report in reports:
+        for key, value in report["llm"].items():
+            totals[key] = totals.get(key, 0) + value
+    return totals
+
+
+def _compare(args) -> None:
+    baseline = json.loads(Path(args.baseline).read_text())
+    candidate = json.loads(Path(args.candidate).read_text())
+    rows = compare_reports(baseline, candidate)
+
+    print(f"{'metric':<20} {'baseline':>12} {'candidate':>12} {'delta':>10}")
+    for metric, row in rows.items():
+        print(
+            f"{metric:<20} {str(row['baseline']):>12} {str(row['candidate']):>12} "
+            f"{str(row['delta']):>10}"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Replay captured calls")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    run = sub.add_parser("run", help="Replay capture files")
+    run.add_argument("captures", nargs="+", help="Capture .jsonl files")
+    run.add_argument(
+        "--speed",
+        type=_parse_speed,
+        default=1.0,
+        help="Playback speed (1 = original, 4 = 4x, max = no waiting)",
+    )
+    run.add_argument(
+        "--recorded-insights",
+        action="store_true",
+        help="Inject captured insights instead of running background agents live",
+    )
+    run.add_argument("--out", help="Write combined JSON report here")
+
+    compare = sub.add_parser("compare", help="Diff two JSON reports")
+    compare.add_argument("baseline")
+    compare.add_argument("candidate")
+
+    args = parser.parse_args()
+    if args.command == "run":
+        asyncio.run(_run(args))
+    else:
+        _compare(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,193 @@
+"""
+Call Capture
+============
+
+Records a live call's inbound event stream so it can be replayed later
+against a different build.
+
+Capture format (JSON Lines, one file per call):
+- Line 1 is a header: {"type": "header", "version": 1, "user_id", "started_at", "metadata"}
+- Every following line is an event with `t` = seconds since call start:
+    {"t": 0.0, "type": "first_message", "text": "..."}
+    {"t": 3.2, "type": "started_speaking"}
+    {"t": 4.1, "type": "transcript", "text": "yeah I did it"}
+    {"t": 4.3, "type": "stopped_speaking"}
+    {"t": 5.0, "type": "insight", "event": "SentimentAnalysis", "data": {...}}
+
+Capturing is enabled by setting CALL_CAPTURE_DIR. Events are buffered in
+memory and written once when the call ends, so the live call never
+waits on disk I/O.
+"""
+
+import json
+import os
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Optional
+
+from loguru import logger
+
+CAPTURE_VERSION = 1
+CALL_CAPTURE_DIR = os.getenv("CALL_CAPTURE_DIR")
+
+
+@dataclass
+class CapturedEvent:
+    """One event from a captured call."""
+
+    t: float  # Seconds since call start
+    type: str  # first_message, started_speaking, stopped_speaking, transcript, insight
+    data: dict = field(default_factory=dict)
+
+
+@dataclass
+class CallCapture:
+    """A loaded call capture."""
+
+    user_id: str
+    started_at: str
+    metadata: dict
+    events: list[CapturedEvent]
+    path: Optional[Path] = None
+
+    @property
+    def duration(self) -> float:
+        return self.events[-1].t if self.events else 0.0
+
+    @property
+    def first_message(self) -> Optional[str]:
+        for event in self.events:
+            if event.type == "first_message":
+                return event.data.get("text")
+        return None
+
+    @property
+    def user_turns(self) -> int:
+        return sum(1 for e in self.events if e.type == "stopped_speaking")
+
+
+class CallRecorder:
+    """
+    Buffers a call's inbound events and writes them as a capture file.
+
+    Methods are plain callables so they can be mapped onto Bridge routes.
+    """
+
+    def __init__(self, user_id: str, metadata: dict, capture_dir: str | Path):
+        self.user_id = user_id
+        self.metadata = metadata
+        self.capture_dir = Path(capture_dir)
+        self.started_at = datetime.now()
+        self._t0 = time.monotonic()
+        self._events: list[dict] = []
+        self._closed = False
+
+    def _elapsed(self) -> float:
+        return round(time.monotonic() - self._t0, 3)
+
+    def _append(self, event_type: str, **data: Any) -> None:
+        if self._closed:
+            return
+        self._events.append({"t": self._elapsed(), "type": event_type, **data})
+
+    # Bridge route handlers ----------------------------------------------------
+
+    def on_first_message(self, text: str) -> None:
+        self._append("first_message", text=text)
+
+    def on_started_speaking(self, _event=None) -> None:
+        self._append("started_speaking")
+
+    def on_stopped_speaking(self, _event=None) -> None:
+        self._append("stopped_speaking")
+
+    def on_transcription(self, event) -> None:
+        self._append("transcript", text=getattr(event, "content", "") or "")
+
+    def on_insight(self, event) -> None:
+        self._append(
+            "insight",
+            event=type(event).__name__,
+            data=event.model_dump(mode="json"),
+        )
+
+    # Output -------------------------------------------------------------------
+
+    @property
+    def path(self) -> Path:
+        stamp = self.started_at.strftime("%Y%m%d_%H%M%S")
+        return self.capture_dir / f"call_{stamp}_{self.user_id}.jsonl"
+
+    def close(self) -> Optional[Path]:
+        """Write the capture file. Returns its path, or None on failure."""
+        if self._closed:
+            return None
+        self._closed = True
+
+        header = {
+            "type": "header",
+            "version": CAPTURE_VERSION,
+            "user_id": self.user_id,
+            "started_at": self.started_at.isoformat(),
+            "metadata": self.metadata,
+        }
+        try:
+            self.capture_dir.mkdir(parents=True, exist_ok=True)
+            with open(self.path, "w") as f:
+                f.write(json.dumps(header, default=str) + "\n")
+                for event in self._events:
+                    f.write(json.dumps(event, default=str) + "\n")
+            logger.info(f"📼 Call capture saved: {self.path} ({len(self._events)} events)")
+            return self.path
+        except Exception as e:
+            logger.error(f"Failed to write call capture: {e}")
+            return None
+
+
+def create_recorder(user_id: str, metadata: dict) -> Optional[CallRecorder]:
+    """Create a recorder if CALL_CAPTURE_DIR is set, else None."""
+    if not CALL_CAPTURE_DIR:
+        return None
+    return CallRecorder(user_id, metadata, CALL_CAPTURE_DIR)
+
+
+def load_capture(path: str | Path) -> CallCapture:
+    """Load a capture file written by CallRecorder."""
+    path = Path(path)
+    with open(path) as f:
+        lines = [json.loads(line) for line in f if line.strip()]
+
+    if not lines or lines[0].get("type") != "header":
+        raise ValueError(f"Not a call capture (missing header): {path}")
+
+    header = lines[0]
+    if header.get("version") != CAPTURE_VERSION:
+        raise ValueError(
+            f"Unsupported capture version {header.get('version')} in {path}"
+        )
+
+    events = []
+    for raw in lines[1:]:
+        t = float(raw.pop("t", 0.0))
+        event_type = raw.pop("type")
+        events.append(CapturedEvent(t=t, type=event_type, data=raw))
+
+    return CallCapture(
+        user_id=header.get("user_id", "unknown"),
+        started_at=header.get("started_at", ""),
+        metadata=header.get("metadata", {}),
+        events=events,
+        path=path,
+    )
+
+
+__all__ = [
+    "CAPTURE_VERSION",
+    "CapturedEvent",
+    "CallCapture",
+    "CallRecorder",
+    "create_recorder",
+    "load_capture",
+]
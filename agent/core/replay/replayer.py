@@ -0,0 +1,432 @@
+"""
+Call Replayer
+=============
+
+Feeds a captured call back through FutureYouNode and the background agents,
+routed the same way `_setup_routing` wires them in a live call, and reports
+turn latency plus LLM request/token usage for the run.
+
+The speaking node comes from `build_call_nodes`, like a live call's, so the
+replay runs template replies, first-turn and partial-transcript speculation,
+and transcript coalescing for the background agents. Their per-call
+counters are part of the report.
+
+Speed:
+- speed=1.0 replays with the original gaps between events
+- speed=4.0 replays 4x faster (barge-ins still interrupt in-flight turns)
+- speed=None replays as fast as possible; each turn finishes before the
+  next user event is delivered, so no interruptions are replayed
+
+By default the background agents run live (their LLM cost is part of the
+measurement). With use_recorded_insights=True the captured insights are
+injected at their original timestamps instead.
+"""
+
+import asyncio
+import math
+import time
+from dataclasses import dataclass, field, asdict
+from typing import Optional
+
+from loguru import logger
+
+from line import Message
+from line.events import (
+    AgentResponse,
+    EndCall,
+    ToolCall,
+    UserStartedSpeaking,
+    UserTranscriptionReceived,
+)
+
+import agents.events as agent_events
+from agents.aggregator import CallSummaryAggregator
+from agents.events import ExcuseDetected
+from conversation.call_types import CALL_TYPES
+from conversation.mood import MOODS
+from core.chat_node import FutureYouNode
+from core.config import build_first_message
+from core.handlers.call import (
+    AGGREGATOR_ROUTES,
+    BACKGROUND_AGENTS,
+    INSIGHT_EVENTS,
+    CallNodes,
+    build_call_nodes,
+    create_background_agents,
+)
+from core.llm_client.metrics import llm_stats
+from core.replay.capture import CallCapture, CapturedEvent
+
+
+class ReplayContext:
+    """
+    Minimal stand-in for Line's ConversationContext.
+
+    Holds the replayed user fragments and agent responses so nodes see the
+    same "latest user transcript" they saw in the live call.
+    """
+
+    def __init__(self):
+        self.events: list = []
+        self._pending_fragments: list[str] = []
+
+    def add_transcript(self, text: str) -> None:
+        if text:
+            self._pending_fragments.append(text)
+            self.events.append(text)
+
+    def add_agent_response(self, text: str) -> None:
+        self._pending_fragments = []
+        if text:
+            self.events.append(AgentResponse(content=text))
+
+    def get_latest_user_transcript_message(self) -> Optional[str]:
+        if not self._pending_fragments:
+            return None
+        # ReasoningNode.add_event merges consecutive transcriptions as-is
+        return "".join(self._pending_fragments)
+
+    def snapshot(self) -> "ReplayContext":
+        """Copy of the context as of now (what a stopped utterance carried)."""
+        copy = ReplayContext()
+        copy.events = list(self.events)
+        copy._pending_fragments = list(self._pending_fragments)
+        return copy
+
+
+@dataclass
+class _Stop:
+    """One replayed UserStoppedSpeaking, as handed to the background agents."""
+
+    seq: int
+    ended_at: float
+    context: ReplayContext
+
+
+@dataclass
+class TurnTiming:
+    """Latency for one replayed speaking turn."""
+
+    index: int
+    user_text: str
+    ttft_ms: Optional[float]  # Time to first streamed chunk
+    total_ms: float
+    response_chars: int
+    interrupted: bool = False
+
+
+def _percentile(values: list[float], pct: float) -> Optional[float]:
+    """Nearest-rank percentile (None for an empty list)."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(0, min(len(ordered) - 1, math.ceil(pct / 100 * len(ordered)) - 1))
+    return round(ordered[rank], 1)
+
+
+@dataclass
+class ReplayReport:
+    """Result of replaying one capture."""
+
+    capture: str
+    speed: Optional[float]
+    wall_time_s: float
+    turns: list[TurnTiming] = field(default_factory=list)
+    llm: dict = field(default_factory=dict)
+    tool_calls: int = 0
+    interruptions: int = 0
+    final_stage: str = ""
+    summary: dict = field(default_factory=dict)
+    templates: dict = field(default_factory=dict)  # TemplateStats
+    speculation: dict = field(default_factory=dict)  # SpeculationStats (partial)
+    coalescer: dict = field(default_factory=dict)  # CoalescerStats
+
+    def latency(self) -> dict:
+        ttft = [t.ttft_ms for t in self.turns if t.ttft_ms is not None]
+        total = [t.total_ms for t in self.turns if not t.interrupted]
+        return {
+            "ttft_p50_ms": _percentile(ttft, 50),
+            "ttft_p95_ms": _percentile(ttft, 95),
+            "turn_p50_ms": _percentile(total, 50),
+            "turn_p95_ms": _percentile(total, 95),
+        }
+
+    def to_dict(self) -> dict:
+        data = asdict(self)
+        data["latency"] = self.latency()
+        return data
+
+
+class CallReplayer:
+    """Replays one CallCapture through the multi-agent pipeline."""
+
+    def __init__(
+        self,
+        capture: CallCapture,
+        speed: Optional[float] = 1.0,
+        use_recorded_insights: bool = False,
+    ):
+        self.capture = capture
+        self.speed = speed if speed and speed > 0 else None
+        self.use_recorded_insights = use_recorded_insights
+
+        self.context = ReplayContext()
+        self.call_nodes: Optional[CallNodes] = None
+        self.node: Optional[FutureYouNode] = None
+        self.agents: dict = {}
+        self.aggregator: Optional[CallSummaryAggregator] = None
+
+        self._analyzers: dict = {}
+        self._last_stop: Optional[_Stop] = None
+        self._turn_task: Optional[asyncio.Task] = None
+        self._agent_tasks: list[asyncio.Task] = []
+        self._report: Optional[ReplayReport] = None
+
+    async def _build(self) -> None:
+        """Build the node graph the same way handle_new_call does."""
+        metadata = self.capture.metadata
+        user_id = metadata.get("user_id", self.capture.user_id)
+        user_context = metadata.get("user_context", {})
+        call_memory = metadata.get("call_memory", {})
+        call_type = CALL_TYPES.get(metadata.get("call_type", "audit"), CALL_TYPES["audit"])
+        mood = MOODS.get(metadata.get("mood", "warm_direct"), MOODS["warm_direct"])
+
+        # Memory tools are not executed during replay (they'd hit Supermemory)
+        self.call_nodes = await build_call_nodes(
+            user_id,
+            user_context,
+            call_type,
+            mood,
+            call_memory,
+            metadata.get("excuse_data", {}),
+            metadata.get("yesterday_promise_kept"),
+            enable_memory_tools=False,
+        )
+        self.node = self.call_nodes.node
+        self.agents = create_background_agents(user_context)
+        # Same debounce as _setup_routing's coalescer.wrap(generate)
+        self._analyzers = {
+            name: self.call_nodes.coalescer.wrap(self._analyze(name))
+            for name in BACKGROUND_AGENTS
+        }
+        self.aggregator = CallSummaryAggregator(user_id, call_type.name, mood.name)
+        self.aggregator.start()
+
+        first_message = self.capture.first_message or build_first_message(
+            user_context, mood, call_type
+        )
+        self._add_agent_response(first_message)
+        self.call_nodes.start_speculation(user_context)
+
+    def _add_transcript(self, text: str) -> None:
+        assert self.node is not None
+        self.context.add_transcript(text)
+        if text:
+            # Growing transcript for partial speculation, as the bridge delivers it
+            self.node.add_event(UserTranscriptionReceived(content=text))
+
+    def _add_agent_response(self, text: str) -> None:
+        assert self.node is not None
+        self.context.add_agent_response(text)
+        if text:
+            self.node.add_event(AgentResponse(content=text))
+
+    # Routing (mirrors _setup_routing) ------------------------------------------
+
+    def _route_insight(self, event) -> None:
+        assert self.node is not None and self.aggregator is not None
+        if isinstance(event, tuple(INSIGHT_EVENTS)):
+            self.node.add_insight(event)
+        method = AGGREGATOR_ROUTES.get(type(event))
+        if method:
+            getattr(self.aggregator, method)(event)
+        if isinstance(event, ExcuseDetected):
+            callout = self.agents["excuse_callout"].receive_excuse(event)
+            if callout is not None:
+                self.node.add_insight(callout)
+
+    def _analyze(self, name: str):
+        """Background agent run over the utterance its stop carried."""
+
+        async def generate(stop: _Stop):
+            assert self.node is not None
+            async for event in self.agents[name].process_context(stop.context):
+                self.node.turns.stamp(event, stop.seq, stop.ended_at)
+                yield event
+
+        return generate
+
+    async def _run_agent(self, name: str, stop: _Stop) -> None:
+        try:
+            async for event in self._analyzers[name](stop):
+                self._route_insight(event)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.warning(f"Replay agent {name} failed: {e}")
+
+    def _start_agents(self, stop: _Stop) -> None:
+        # Held until the next stop, so the coalescer never sees a reused id()
+        self._last_stop = stop
+        for name in BACKGROUND_AGENTS:
+            self._agent_tasks.append(asyncio.create_task(self._run_agent(name, stop)))
+
+    async def _run_turn(self, index: int) -> None:
+        assert self.node is not None and self._report is not None
+        user_text = self.context.get_latest_user_transcript_message() or ""
+        start = time.monotonic()
+        ttft = None
+        response = ""
+        interrupted = False
+
+        try:
+            async for event in self.node.process_context(self.context):
+                if isinstance(event, AgentResponse):
+                    if ttft is None:
+                        ttft = (time.monotonic() - start) * 1000
+                    response += event.content
+                elif isinstance(event, ToolCall):
+                    self._report.tool_calls += 1
+                elif isinstance(event, EndCall):
+                    break
+        except asyncio.CancelledError:
+            interrupted = True
+            self._report.interruptions += 1
+
+        self._report.turns.append(
+            TurnTiming(
+                index=index,
+                user_text=user_text,
+                ttft_ms=round(ttft, 1) if ttft is not None else None,
+                total_ms=round((time.monotonic() - start) * 1000, 1),
+                response_chars=len(response),
+                interrupted=interrupted,
+            )
+        )
+        self._add_agent_response(response)
+
+    # Event loop --------------------------------------------------------------
+
+    async def _deliver(self, event: CapturedEvent, turn_index: int) -> int:
+        assert self.node is not None and self.call_nodes is not None
+        if event.type == "transcript":
+            self._add_transcript(event.data.get("text", ""))
+
+        elif event.type == "started_speaking":
+            self.call_nodes.coalescer.on_started_speaking()
+            if self._turn_task and not self._turn_task.done():
+                self._turn_task.cancel()
+                await asyncio.gather(self._turn_task, return_exceptions=True)
+                # Like interrupt_on(UserStartedSpeaking, handler=...): only
+                # runs when a reply was in flight
+                self.node.on_interrupt_generate(
+                    Message(source="replay", event=UserStartedSpeaking())
+                )
+
+        elif event.type == "stopped_speaking":
+            turn_index += 1
+            seq, ended_at = self.node.turns.utterance()
+            if not self.use_recorded_insights:
+                self._start_agents(_Stop(seq, ended_at, self.context.snapshot()))
+            self._turn_task = asyncio.create_task(self._run_turn(turn_index))
+            if self.speed is None:
+                await self._turn_task
+
+        elif event.type == "insight" and self.use_recorded_insights:
+            event_cls = getattr(agent_events, event.data.get("event", ""), None)
+            if event_cls is not None:
+                self._route_insight(event_cls(**event.data.get("data", {})))
+
+        return turn_index
+
+    async def run(self) -> ReplayReport:
+        """Replay the capture and return the report."""
+        await self._build()
+        assert self.node is not None and self.call_nodes is not None
+        assert self.aggregator is not None
+        report = self._report = ReplayReport(
+            capture=str(self.capture.path or self.capture.user_id),
+            speed=self.speed,
+            wall_time_s=0.0,
+        )
+
+        before = llm_stats.snapshot()
+        wall_start = time.monotonic()
+        turn_index = 0
+
+        for event in self.capture.events:
+            if self.speed is not None:
+                target = wall_start + event.t / self.speed
+                await asyncio.sleep(max(0.0, target - time.monotonic()))
+            turn_index = await self._deliver(event, turn_index)
+
+        pending = [t for t in [self._turn_task, *self._agent_tasks] if t]
+        await asyncio.gather(*pending, return_exceptions=True)
+
+        report.wall_time_s = round(time.monotonic() - wall_start, 2)
+        report.llm = llm_stats.snapshot().diff(before).to_dict()
+        report.final_stage = self.node.current_stage.value
+        report.summary = self.aggregator.finalize().model_dump(mode="json")
+
+        call_nodes = self.call_nodes
+        call_nodes.close()
+        if call_nodes.template_responder:
+            report.templates = call_nodes.template_responder.stats.to_dict()
+        if call_nodes.partial_speculator:
+            report.speculation = call_nodes.partial_speculator.stats.to_dict()
+        report.coalescer = call_nodes.coalescer.stats.to_dict()
+        return report
+
+
+async def replay_capture(
+    capture: CallCapture,
+    speed: Optional[float] = 1.0,
+    use_recorded_insights: bool = False,
+) -> ReplayReport:
+    """Convenience wrapper around CallReplayer."""
+    replayer = CallReplayer(capture, speed, use_recorded_insights)
+    return await replayer.run()
+
+
+def compare_reports(baseline: dict, candidate: dict) -> dict:
+    """
+    Diff two report dicts (as produced by ReplayReport.to_dict or the CLI).
+
+    Returns {metric: {"baseline", "candidate", "delta"}} for latency
+    percentiles, LLM usage and the template / speculation / coalescing
+    counters.
+    """
+    rows = {}
+
+    def add(metric: str, base, cand) -> None:
+        delta = None
+        if base is not None and cand is not None:
+            delta = round(cand - base, 1)
+        rows[metric] = {"baseline": base, "candidate": cand, "delta": delta}
+
+    for key in ("ttft_p50_ms", "ttft_p95_ms", "turn_p50_ms", "turn_p95_ms"):
+        add(key, baseline.get("latency", {}).get(key), candidate.get("latency", {}).get(key))
+    for key in ("requests", "prompt_tokens", "completion_tokens", "total_tokens"):
+        add(key, baseline.get("llm", {}).get(key), candidate.get("llm", {}).get(key))
+    for section, key in (
+        ("templates", "served"),
+        ("speculation", "hits"),
+        ("speculation", "misses"),
+        ("coalescer", "coalesced"),
+    ):
+        add(
+            f"{section}_{key}",
+            baseline.get(section, {}).get(key),
+            candidate.get(section, {}).get(key),
+        )
+    return rows
+
+
+__all__ = [
+    "ReplayContext",
+    "TurnTiming",
+    "ReplayReport",
+    "CallReplayer",
+    "replay_capture",
+    "compare_reports",
+]
@@ -0,0 +1,428 @@
+"""
+Speculative Replies
+===================
+
+Pre-generates the agent's reply to a predicted user utterance so it can be
+streamed the moment the real transcript matches the prediction.
+
+The first turn is the most predictable point of every call: the hook from
+`build_first_message` is answered with a short yes / no / excuse / greeting
+in the vast majority of calls, and it is where dead air feels worst. While
+the first message is being spoken, FirstTurnSpeculator generates one
+candidate reply per predicted answer. When the user's first transcript
+arrives the speaking node asks the speculator for a match; on a hit the
+buffered candidate is streamed (and the rest cancelled), on a miss the
+node falls back to a normal LLM request.
+
+Every later turn can start early too. UserTranscriptionReceived arrives
+while the user is still talking; once the transcript has stopped changing
+for a moment, PartialSpeculator starts the reply from it, hiding the LLM's
+time-to-first-token behind end-of-speech detection. When the final
+transcript arrives the candidate is committed if the text is close enough
+(difflib ratio) and the prompt is otherwise identical - same history,
+stage and insights. Otherwise it is cancelled and the node makes a normal
+request. A candidate whose partial drifts too far while the user is still
+talking is cancelled and restarted from the newer text.
+
+Configuration via environment variables:
+- SPECULATIVE_FIRST_TURN: "true" (default) / "false"
+- SPECULATIVE_PARTIAL: "true" (default) / "false"
+- SPECULATIVE_PARTIAL_STABLE_MS: quiet time before a partial is used (default 300)
+- SPECULATIVE_PARTIAL_MIN_WORDS: shorter partials are not speculated on (default 3)
+- SPECULATIVE_MATCH_RATIO: similarity needed to commit a candidate (default 0.9)
+"""
+
+import asyncio
+import os
+import re
+from dataclasses import dataclass, asdict
+from difflib import SequenceMatcher
+from typing import AsyncGenerator, Optional
+
+from loguru import logger
+
+from core.analysis_cache import normalize_utterance
+from core.chat_node import NO_PATTERNS, YES_PATTERNS
+from core.llm_client import Route, stream_response
+from core.llm_client.metrics import estimate_message_tokens, estimate_tokens
+from services.excuse_patterns import normalize_excuse_pattern
+
+SPECULATIVE_FIRST_TURN = os.getenv("SPECULATIVE_FIRST_TURN", "true").lower() == "true"
+SPECULATIVE_PARTIAL = os.getenv("SPECULATIVE_PARTIAL", "true").lower() == "true"
+SPECULATIVE_PARTIAL_STABLE_MS = float(os.getenv("SPECULATIVE_PARTIAL_STABLE_MS", "300"))
+SPECULATIVE_PARTIAL_MIN_WORDS = int(os.getenv("SPECULATIVE_PARTIAL_MIN_WORDS", "3"))
+SPECULATIVE_MATCH_RATIO = float(os.getenv("SPECULATIVE_MATCH_RATIO", "0.9"))
+
+# Longer first answers carry content a canned prediction can't cover
+MAX_PREDICTABLE_WORDS = 8
+
+GREETING_PATTERNS = [
+    r"^(hey|hi|hello|yo)\b",
+    r"\bwhat'?s up\b",
+    r"\bi'?m here\b",
+]
+
+
+class SpeculativeReply:
+    """
+    A reply generated ahead of time for a predicted user utterance.
+
+    Chunks are buffered as they arrive, so `stream()` can be called before,
+    during or after generation and always yields the full reply in order.
+    """
+
+    def __init__(
+        self,
+        label: str,
+        user_text: str,
+        messages: list[dict],
+        temperature: float,
+        max_tokens: int,
+        route: Optional[Route] = None,
+    ):
+        self.label = label
+        self.user_text = user_text
+        self.messages = messages
+        self.temperature = temperature
+        self.max_tokens = max_tokens
+        self.route = route
+
+        self.chunks: list[str] = []
+        self.error: Optional[Exception] = None
+        self._updated = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def done(self) -> bool:
+        return self._task is not None and self._task.done()
+
+    @property
+    def failed(self) -> bool:
+        return self.error is not None
+
+    @property
+    def text(self) -> str:
+        return "".join(self.chunks)
+
+    def start(self) -> "SpeculativeReply":
+        self._task = asyncio.create_task(self._generate())
+        return self
+
+    async def _generate(self) -> None:
+        try:
+            async for chunk in stream_response(
+                messages=self.messages,
+                temperature=self.temperature,
+                max_tokens=self.max_tokens,
+                route=self.route,
+            ):
+                self.chunks.append(chunk)
+                self._updated.set()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            self.error = e
+            logger.warning(f"Speculative reply ({self.label}) failed: {e}")
+        finally:
+            self._updated.set()
+
+    async def stream(self) -> AsyncGenerator[str, None]:
+        """Yield the buffered chunks, then live ones until generation ends."""
+        index = 0
+        try:
+            while True:
+                while index < len(self.chunks):
+                    yield self.chunks[index]
+                    index += 1
+                if self.done:
+                    break
+                self._updated.clear()
+                await self._updated.wait()
+            if self.error:
+                raise self.error
+        finally:
+            # Consumer stopped early (interrupted) - stop generating
+            if not self.done:
+                self.cancel()
+
+    def cancel(self) -> None:
+        if self._task and not self._task.done():
+            self._task.cancel()
+
+
+def classify_first_reply(
+    text: str, favorite_excuse: Optional[str] = None
+) -> Optional[str]:
+    """
+    Map a first-turn transcript to a predicted reply class.
+
+    Returns "yes", "no", "excuse", "greeting", or None when the answer
+    isn't one of the predictable shapes.
+    """
+    normalized = normalize_utterance(text or "")
+    if not normalized or len(normalized.split()) > MAX_PREDICTABLE_WORDS:
+        return None
+
+    # Any recognizable excuse must be *their* excuse, else it's unpredictable
+    pattern = normalize_excuse_pattern(normalized)
+    if pattern != "other":
+        if favorite_excuse and pattern == normalize_excuse_pattern(favorite_excuse):
+            return "excuse"
+        return None
+
+    said_yes = any(re.search(p, normalized) for p in YES_PATTERNS)
+    said_no = any(re.search(p, normalized) for p in NO_PATTERNS)
+    if said_yes and not said_no:
+        return "yes"
+    if said_no and not said_yes:
+        return "no"
+    if any(re.search(p, normalized) for p in GREETING_PATTERNS):
+        return "greeting"
+    return None
+
+
+def predict_first_replies(favorite_excuse: Optional[str] = None) -> dict[str, str]:
+    """Top predicted answers to the hook: {class: representative utterance}."""
+    predictions = {
+        "yes": "Yeah, I did it.",
+        "no": "No, I didn't.",
+    }
+    if favorite_excuse:
+        predictions["excuse"] = f"No. {favorite_excuse}"
+    else:
+        predictions["greeting"] = "Hey."
+    return predictions
+
+
+class FirstTurnSpeculator:
+    """Generates and matches candidate replies for the first user turn."""
+
+    def __init__(self, node, favorite_excuse: Optional[str] = None):
+        self.node = node
+        self.favorite_excuse = favorite_excuse
+        self.candidates: dict[str, SpeculativeReply] = {}
+
+    def start(self) -> None:
+        """Kick off one candidate per predicted answer (call while the hook plays)."""
+        stage_context = self.node._build_stage_context()
+        budget = self.node._stage_budget()
+        route = self.node._route()
+        for label, user_text in predict_first_replies(self.favorite_excuse).items():
+            messages = [
+                *self.node.messages,
+                {"role": "user", "content": user_text},
+                {"role": "system", "content": stage_context},
+            ]
+            self.candidates[label] = SpeculativeReply(
+                label,
+                user_text,
+                messages,
+                temperature=self.node.temperature,
+                max_tokens=budget.max_tokens,
+                route=route,
+            ).start()
+        logger.info(f"🔮 Speculating first turn: {', '.join(self.candidates)}")
+
+    def take(self, transcript: Optional[str]) -> Optional[SpeculativeReply]:
+        """
+        Resolve the first turn: return the matching candidate (if usable)
+        and cancel the others. Only the first call can return a candidate.
+        """
+        label = classify_first_reply(transcript or "", self.favorite_excuse)
+        match = self.candidates.pop(label, None) if label else None
+        self.cancel()
+
+        if match is None or match.failed:
+            logger.info(f"🔮 Speculation miss ({label or 'unpredicted'}): \"{transcript}\"")
+            return None
+        logger.info(f"🔮 Speculation hit: {label}")
+        return match
+
+    def cancel(self) -> None:
+        for candidate in self.candidates.values():
+            candidate.cancel()
+        self.candidates.clear()
+
+
+@dataclass
+class SpeculationStats:
+    """Per-call partial-transcript speculation counters."""
+
+    started: int = 0  # Candidates started from a stable partial
+    hits: int = 0  # Committed: streamed as the reply
+    misses: int = 0  # Final transcript or prompt differed
+    restarts: int = 0  # Cancelled while the user was still talking
+    wasted_tokens: int = 0  # Estimated prompt + completion of discarded candidates
+
+    @property
+    def hit_rate(self) -> float:
+        resolved = self.hits + self.misses
+        return self.hits / resolved if resolved else 0.0
+
+    def to_dict(self) -> dict:
+        data = asdict(self)
+        data["hit_rate"] = round(self.hit_rate, 3)
+        return data
+
+
+def transcript_similarity(a: str, b: str) -> float:
+    """Similarity of two transcripts (0-1), ignoring case and punctuation."""
+    return SequenceMatcher(None, normalize_utterance(a), normalize_utterance(b)).ratio()
+
+
+class PartialSpeculator:
+    """Starts each reply from a stable partial transcript, before end of speech."""
+
+    def __init__(
+        self,
+        node,
+        stable_ms: float = SPECULATIVE_PARTIAL_STABLE_MS,
+        min_words: int = SPECULATIVE_PARTIAL_MIN_WORDS,
+        match_ratio: float = SPECULATIVE_MATCH_RATIO,
+    ):
+        self.node = node
+        self.stable_s = stable_ms / 1000
+        self.min_words = min_words
+        self.match_ratio = match_ratio
+        self.stats = SpeculationStats()
+
+        self.candidate: Optional[SpeculativeReply] = None
+        self._partial = ""
+        self._timer: Optional[asyncio.TimerHandle] = None
+
+    def on_partial(self, text: str) -> None:
+        """Transcript grew: drop a candidate it no longer matches, re-arm the timer."""
+        text = text.strip()
+        if not text or text == self._partial:
+            return
+        self._partial = text
+
+        if self.candidate and not self._matches(self.candidate.user_text, text):
+            self._discard(self.candidate)
+            self.candidate = None
+            self.stats.restarts += 1
+
+        if self._timer:
+            self._timer.cancel()
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        self._timer = loop.call_later(self.stable_s, self._on_stable)
+
+    def _on_stable(self) -> None:
+        """Partial unchanged for stable_ms: start the reply from it."""
+        self._timer = None
+        text = self._partial
+        if (
+            self.candidate is not None
+            or self.node.speculator is not None  # First turn has its own
+            or self.node.turns.active
+            or len(text.split()) < self.min_words
+        ):
+            return
+
+        self.candidate = SpeculativeReply(
+            "partial",
+            text,
+            self.node._speculative_messages(text),
+            temperature=self.node.temperature,
+            max_tokens=self.node._stage_budget().max_tokens,
+            route=self.node._route(),
+        ).start()
+        self.stats.started += 1
+        logger.debug(f"🔮 Speculating on partial: \"{text}\"")
+
+    def _matches(self, speculated: str, transcript: str) -> bool:
+        return transcript_similarity(speculated, transcript) >= self.match_ratio
+
+    def take(
+        self, transcript: str, request_messages: list[dict]
+    ) -> Optional[SpeculativeReply]:
+        """
+        Resolve the turn: return the candidate if it can stand in for a
+        request with `request_messages`, else cancel it.
+        """
+        if self._timer:
+            self._timer.cancel()
+            self._timer = None
+        self._partial = ""
+        candidate, self.candidate = self.candidate, None
+        if candidate is None:
+            return None
+
+        # Same history and system context; only the user's words may differ
+        prompt_matches = (
+            len(candidate.messages) == len(request_messages)
+            and candidate.messages[-1] == request_messages[-1]
+            and candidate.messages[:-2] == request_messages[:-2]
+        )
+        if candidate.failed or not prompt_matches or not self._matches(
+            candidate.user_text, transcript
+        ):
+            self._discard(candidate)
+            self.stats.misses += 1
+            reason = "prompt changed" if not prompt_matches else "transcript changed"
+            logger.info(f"🔮 Partial speculation miss ({reason}): \"{candidate.user_text}\"")
+            return None
+
+        self.stats.hits += 1
+        logger.info(f"🔮 Partial speculation hit: \"{candidate.user_text}\"")
+        return candidate
+
+    def _discard(self, candidate: SpeculativeReply) -> None:
+        candidate.cancel()
+        self.stats.wasted_tokens += estimate_message_tokens(
+            candidate.messages
+        ) + estimate_tokens(candidate.text)
+
+    def cancel(self) -> None:
+        if self._timer:
+            self._timer.cancel()
+            self._timer = None
+        if self.candidate:
+            self._discard(self.candidate)
+            self.candidate = None
+
+    def log_summary(self) -> None:
+        if self.stats.started:
+            logger.info(
+                f"🔮 Partial speculation: {self.stats.hits}/{self.stats.hits + self.stats.misses} "
+                f"hits ({self.stats.hit_rate:.0%}), {self.stats.restarts} restarts, "
+                f"~{self.stats.wasted_tokens} tokens wasted"
+            )
+
+
+def create_first_turn_speculator(
+    node, user_context: dict
+) -> Optional[FirstTurnSpeculator]:
+    """Attach and start a first-turn speculator, if enabled."""
+    if not SPECULATIVE_FIRST_TURN:
+        return None
+    favorite_excuse = user_context.get("future_self", {}).get("favorite_excuse")
+    speculator = FirstTurnSpeculator(node, favorite_excuse)
+    node.speculator = speculator
+    speculator.start()
+    return speculator
+
+
+def create_partial_speculator(node) -> Optional[PartialSpeculator]:
+    """Attach a partial-transcript speculator, if enabled."""
+    if not SPECULATIVE_PARTIAL:
+        return None
+    speculator = PartialSpeculator(node)
+    node.partial_speculator = speculator
+    return speculator
+
+
+__all__ = [
+    "SpeculativeReply",
+    "FirstTurnSpeculator",
+    "PartialSpeculator",
+    "SpeculationStats",
+    "transcript_similarity",
+    "create_partial_speculator",
+    "classify_first_reply",
+    "predict_first_replies",
+    "create_first_turn_speculator",
+]
@@ -0,0 +1,91 @@
+"""
+Startup
+=======
+
+Cold-start control for the agent process.
+
+Importing main.py only loads what answering a call needs. The slow
+third-party SDKs (openai, supabase, supermemory) are imported lazily by
+the modules that use them, so a fresh instance is ready to accept calls
+sooner when `cartesia deploy` scales out.
+
+Once the server is up, preload() finishes the job off the critical path:
+- assets: the voice skill and prompt tables are read/built once and cached
+- optional subsystems: the SDKs are imported in a background thread, so
+  the first call on a new instance doesn't pay for them either
+
+Configuration via environment variables:
+- AGENT_PRELOAD: "background" (default) / "eager" (block startup) / "off"
+"""
+
+import asyncio
+import importlib
+import os
+import time
+
+from loguru import logger
+
+AGENT_PRELOAD = os.getenv("AGENT_PRELOAD", "background").lower()
+
+# Imported lazily by their owners; preloaded after startup
+OPTIONAL_SUBSYSTEMS = ("openai", "supabase", "supermemory")
+
+
+def preload_assets() -> dict[str, int]:
+    """Load and cache the skill/template assets every prompt build reads."""
+    from content import templates
+    from conversation.call_types import CALL_TYPES
+    from conversation.mood import MOODS
+    from conversation.stages.config import STAGE_PROMPTS
+    from core.config import load_voice_skill
+
+    return {
+        "voice_skill_chars": len(load_voice_skill()),
+        "call_types": len(CALL_TYPES),
+        "moods": len(MOODS),
+        "stage_prompts": len(STAGE_PROMPTS),
+        "hooks": sum(len(v) for v in templates.HOOKS.values()),
+    }
+
+
+def preload_optional_subsystems() -> dict[str, float]:
+    """Import the lazily-loaded SDKs. Returns import time (ms) per module."""
+    timings = {}
+    for name in OPTIONAL_SUBSYSTEMS:
+        start = time.perf_counter()
+        try:
+            importlib.import_module(name)
+        except ImportError:
+            continue  # Not installed - its owner already runs without it
+        timings[name] = round((time.perf_counter() - start) * 1000, 1)
+    return timings
+
+
+def preload() -> None:
+    """Preload assets and optional subsystems (blocking)."""
+    start = time.perf_counter()
+    assets = preload_assets()
+    subsystems = preload_optional_subsystems()
+    elapsed = (time.perf_counter() - start) * 1000
+    logger.info(f"📦 Preloaded {assets} and {subsystems} in {elapsed:.0f}ms")
+
+
+async def on_startup() -> None:
+    """App startup hook: preload according to AGENT_PRELOAD."""
+    if AGENT_PRELOAD == "off":
+        return
+    if AGENT_PRELOAD == "eager":
+        preload()
+        return
+    task = asyncio.create_task(asyncio.to_thread(preload))
+    task.add_done_callback(lambda t: t.cancelled() or t.exception())
+
+
+__all__ = [
+    "AGENT_PRELOAD",
+    "OPTIONAL_SUBSYSTEMS",
+    "on_startup",
+    "preload",
+    "preload_assets",
+    "preload_optional_subsystems",
+]
@@ -0,0 +1,233 @@
+"""
+Template Responder
+==================
+
+Serves formulaic replies from content templates instead of an LLM round
+trip.
+
+Some turns say the same thing in every call: the persona's accountability
+question, the tomorrow lock-in question, and the closing line once the
+commitment is locked. content/templates.py and identity_questions already
+hold that material (build_first_message uses it for the opener). When a
+turn matches the policy, the speaking node streams a filled template
+immediately. Every other turn falls back to the LLM.
+
+A rule matches on stage, first turn in the stage, persona, whether the
+promise was answered and whether a specific commitment is locked. A turn
+is never templated when:
+- the user has said enough that a canned line would ignore it
+  (TEMPLATE_MAX_USER_WORDS)
+- the user asked a question (a canned line would talk past it)
+- an insight is waiting that the reply should address (excuse, callout,
+  pattern, frustration, negative sentiment)
+- the user is frustrated
+- the mood has its own delivery for the stage (MOOD_STAGE_MODIFIERS extra_prompt)
+
+Configuration via environment variables:
+- TEMPLATE_RESPONSES: "true" (default) / "false"
+- TEMPLATE_MAX_USER_WORDS: longer user turns go to the LLM (default 12)
+
+Usage:
+    responder = create_template_responder(node, user_context)
+
+    reply = responder.respond(user_message)  # str, or None -> use the LLM
+    responder.stats.served
+"""
+
+import os
+from dataclasses import dataclass, asdict, field
+from typing import Optional
+
+from loguru import logger
+
+from content.templates import fill_template, get_random_closing, get_random_tomorrow_lock
+from conversation.stages import CallStage, get_mood_extra_prompt
+
+try:
+    from conversation.persona import Persona
+    from conversation.identity_questions import get_accountability_question
+except ImportError:
+    Persona = None
+    get_accountability_question = None
+
+TEMPLATE_RESPONSES = os.getenv("TEMPLATE_RESPONSES", "true").lower() == "true"
+TEMPLATE_MAX_USER_WORDS = int(os.getenv("TEMPLATE_MAX_USER_WORDS", "12"))
+
+# Pending insights the reply has to respond to
+BLOCKING_INSIGHTS = frozenset(
+    {
+        "ExcuseDetected",
+        "ExcuseCallout",
+        "PatternAlert",
+        "UserFrustrated",
+        "SentimentAnalysis",  # Only queued when negative
+    }
+)
+
+
+@dataclass(frozen=True)
+class TemplateRule:
+    """When a stage's reply can come from a template. None / empty = any."""
+
+    stage: CallStage
+    first_turn_only: bool = True
+    promise_answered: Optional[bool] = None
+    commitment_locked: Optional[bool] = None
+    personas: frozenset[str] = frozenset()  # Persona values allowed
+
+
+# Ordered; first match wins
+TEMPLATE_POLICY: list[TemplateRule] = [
+    # Ask the persona's accountability question - unless they already answered it
+    TemplateRule(CallStage.ACCOUNTABILITY, promise_answered=False),
+    # Ask for tomorrow's commitment. The lock-in lines are blunt - not the ally's voice
+    TemplateRule(
+        CallStage.TOMORROW_LOCK,
+        commitment_locked=False,
+        personas=frozenset(
+            {"drill_sergeant", "disappointed", "mentor", "strategist", "champion"}
+        ),
+    ),
+    # Commitment is locked - sign off. The closing lines end the call, so only
+    # on entering CLOSE; anything the user says after that goes to the LLM
+    TemplateRule(CallStage.CLOSE, commitment_locked=True),
+]
+
+
+@dataclass
+class TemplateStats:
+    """Per-call template fast-path counters."""
+
+    turns: int = 0  # Replies considered
+    served: int = 0  # Replies served from a template (no LLM call)
+    by_stage: dict[str, int] = field(default_factory=dict)
+
+    @property
+    def served_rate(self) -> float:
+        return self.served / self.turns if self.turns else 0.0
+
+    def to_dict(self) -> dict:
+        data = asdict(self)
+        data["served_rate"] = round(self.served_rate, 3)
+        return data
+
+
+class TemplateResponder:
+    """Picks a template reply for the speaking node's turn, when policy allows."""
+
+    def __init__(self, node, user_context: Optional[dict] = None):
+        self.node = node
+        self.user_context = user_context or {}
+        self.stats = TemplateStats()
+
+    def _persona(self) -> Optional[str]:
+        controller = self.node.persona_controller
+        if controller is None or Persona is None:
+            return None
+        return controller.get_primary_persona().value
+
+    def _blocked(self, user_message: str) -> Optional[str]:
+        """Why this turn needs the LLM regardless of stage, or None."""
+        if len(user_message.split()) > TEMPLATE_MAX_USER_WORDS:
+            return "long answer"
+        if user_message.rstrip().endswith("?"):
+            return "question"
+        if self.node._frustration_level:
+            return "frustrated"
+        if any(p.kind in BLOCKING_INSIGHTS for p in self.node._pending_insights):
+            return "insight pending"
+        mood = self.node.mood.name if self.node.mood else None
+        if mood and get_mood_extra_prompt(self.node.current_stage, mood):
+            return "mood"
+        return None
+
+    def _match(self) -> Optional[TemplateRule]:
+        node = self.node
+        locked = bool(node.tomorrow_commitment and node.commitment_is_specific)
+        persona = self._persona()
+        for rule in TEMPLATE_POLICY:
+            if rule.stage != node.current_stage:
+                continue
+            if rule.first_turn_only and node.turns_in_stage > 1:
+                continue
+            if rule.promise_answered is not None and rule.promise_answered != (
+                node.kept_promise is not None
+            ):
+                continue
+            if rule.commitment_locked is not None and rule.commitment_locked != locked:
+                continue
+            if rule.personas and persona not in rule.personas:
+                continue
+            return rule
+        return None
+
+    def _render(self, stage: CallStage) -> Optional[str]:
+        status = self.user_context.get("status", {})
+        streak = status.get("current_streak_days", 0) or 0
+
+        if stage == CallStage.ACCOUNTABILITY:
+            if get_accountability_question is None or self.node.persona_controller is None:
+                return None
+            return get_accountability_question(
+                self.node.persona_controller.get_primary_persona()
+            )
+        if stage == CallStage.TOMORROW_LOCK:
+            return get_random_tomorrow_lock()
+        if stage == CallStage.CLOSE:
+            kept = self.node.kept_promise
+            outcome = "kept" if kept is True else "broken" if kept is False else "unknown"
+            return fill_template(get_random_closing(outcome), next_day=streak + 1)
+        return None
+
+    def respond(self, user_message: str) -> Optional[str]:
+        """
+        Template reply for the current turn.
+
+        Returns:
+            The reply text, or None if the turn should go to the LLM
+        """
+        self.stats.turns += 1
+        rule = self._match()
+        if rule is None:
+            return None
+        blocked = self._blocked(user_message)
+        if blocked:
+            logger.debug(f"Template skipped ({rule.stage.value}): {blocked}")
+            return None
+
+        reply = self._render(rule.stage)
+        if not reply:
+            return None
+
+        stage = rule.stage.value
+        self.stats.served += 1
+        self.stats.by_stage[stage] = self.stats.by_stage.get(stage, 0) + 1
+        logger.info(f"📋 Template reply ({stage}): \"{reply}\"")
+        return reply
+
+    def log_summary(self) -> None:
+        if self.stats.served:
+            logger.info(
+                f"📋 Template replies: {self.stats.served}/{self.stats.turns} turns served "
+                f"without the LLM ({self.stats.served_rate:.0%}) - "
+                + ", ".join(f"{s} {n}" for s, n in sorted(self.stats.by_stage.items()))
+            )
+
+
+def create_template_responder(node, user_context: dict) -> Optional[TemplateResponder]:
+    """Attach a template responder to the speaking node, if enabled."""
+    if not TEMPLATE_RESPONSES:
+        return None
+    responder = TemplateResponder(node, user_context)
+    node.template_responder = responder
+    return responder
+
+
+__all__ = [
+    "TemplateResponder",
+    "TemplateRule",
+    "TemplateStats",
+    "TEMPLATE_POLICY",
+    "TEMPLATE_RESPONSES",
+    "create_template_responder",
+]
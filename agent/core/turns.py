@@ -0,0 +1,315 @@
+"""
+Turn Tracking
+=============
+
+Per-call bookkeeping for barge-in: the user starting to speak while the
+agent is still replying.
+
+The line SDK interrupts the speaking route on UserStartedSpeaking by
+cancelling its task, which leaves three things behind:
+- the LLM stream, still generating tokens nobody will hear (a generator
+  parked at a `yield` is only closed when it is garbage collected)
+- background analyzer runs on the transcript the user is now extending
+- no record of how much of the reply was actually spoken
+
+TurnTracker numbers each reply, owns its LLM source and the text handed to
+TTS so far, and tracks in-flight analyzer tasks. `interrupt()` closes the
+source and returns the spoken prefix; `cancel_analyzers()` aborts the
+analyzer runs for the superseded transcript (the next UserStoppedSpeaking
+re-runs them on the full utterance).
+
+It also numbers user utterances (one per UserStoppedSpeaking, however
+many routes receive it) and stamps every insight a tracked analyzer
+yields with that number and its latency. InsightStats records, per
+insight type, how late insights arrive and how many were too stale to use.
+
+`turn_latency` keeps recent LLM reply latencies (turn start -> first chunk)
+across every call in the process - a load signal for admission control.
+
+Usage:
+    turns = TurnTracker()
+
+    seq = turns.begin(source)        # speaking node starts a reply (no source: template)
+    turns.spoke(chunk)               # each chunk yielded to TTS
+    turns.finish(seq)                # reply streamed to the end
+
+    spoken = turns.interrupt()       # barge-in -> spoken prefix, or None
+    turns.cancel_analyzers()
+
+    bridge.on(UserStoppedSpeaking).stream(turns.track(node.generate))
+    seq, ended_at = turns.utterance(message)    # speaking node, same stop
+
+    turn_latency.record(420.0)
+    turn_latency.percentile(0.95, window_s=60)
+"""
+
+import asyncio
+import functools
+import time
+from collections import OrderedDict, deque
+from dataclasses import dataclass, asdict, field
+from typing import AsyncGenerator, Callable, Optional
+
+from loguru import logger
+
+from agents.events import Insight
+
+# Stop message ids remembered for de-duplicating utterance registration
+RECENT_UTTERANCES = 8
+
+# Process-wide reply latency samples kept
+TURN_LATENCY_SAMPLES = 200
+
+
+@dataclass
+class TurnStats:
+    """Per-call reply counters."""
+
+    replies: int = 0
+    interruptions: int = 0
+    spoken_chars: int = 0  # Kept from interrupted replies
+    analyzers_cancelled: int = 0
+    early_stops: int = 0  # Replies cut at the stage's sentence limit
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+
+@dataclass
+class InsightTiming:
+    """Arrival and use of one insight type."""
+
+    received: int = 0
+    used: int = 0  # Made it into a prompt
+    stale: int = 0  # Dropped: arrived too late to matter
+    latencies_ms: list[float] = field(default_factory=list)
+
+    def to_dict(self) -> dict:
+        ordered = sorted(self.latencies_ms)
+
+        def pct(p: float) -> Optional[float]:
+            if not ordered:
+                return None
+            return ordered[min(len(ordered) - 1, int(p * len(ordered)))]
+
+        return {
+            "received": self.received,
+            "used": self.used,
+            "stale": self.stale,
+            "latency_p50_ms": pct(0.5),
+            "latency_p95_ms": pct(0.95),
+        }
+
+
+class InsightStats:
+    """Per-type insight timing for one call."""
+
+    def __init__(self):
+        self.by_type: dict[str, InsightTiming] = {}
+
+    def _get(self, kind: str) -> InsightTiming:
+        if kind not in self.by_type:
+            self.by_type[kind] = InsightTiming()
+        return self.by_type[kind]
+
+    def received(self, kind: str, latency_ms: Optional[float]) -> None:
+        timing = self._get(kind)
+        timing.received += 1
+        if latency_ms is not None:
+            timing.latencies_ms.append(latency_ms)
+
+    def used(self, kind: str) -> None:
+        self._get(kind).used += 1
+
+    def stale(self, kind: str) -> None:
+        self._get(kind).stale += 1
+
+    @property
+    def stale_count(self) -> int:
+        return sum(t.stale for t in self.by_type.values())
+
+    def to_dict(self) -> dict:
+        return {kind: timing.to_dict() for kind, timing in sorted(self.by_type.items())}
+
+
+class TurnLatencyWindow:
+    """Recent reply latencies across every call in the process."""
+
+    def __init__(self, maxlen: int = TURN_LATENCY_SAMPLES):
+        self._samples: deque[tuple[float, float]] = deque(maxlen=maxlen)
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+    def record(self, latency_ms: float) -> None:
+        self._samples.append((time.monotonic(), latency_ms))
+
+    def percentile(
+        self, p: float, window_s: float = 60.0, min_samples: int = 1
+    ) -> Optional[float]:
+        """Latency percentile over the last `window_s` seconds (None if too few samples)."""
+        cutoff = time.monotonic() - window_s
+        recent = sorted(ms for at, ms in self._samples if at >= cutoff)
+        if not recent or len(recent) < min_samples:
+            return None
+        return recent[min(len(recent) - 1, int(p * len(recent)))]
+
+
+class TurnTracker:
+    """Tracks the reply in flight and analyzer runs for one call."""
+
+    def __init__(self):
+        self.seq = 0
+        self.stats = TurnStats()
+        self._source: Optional[AsyncGenerator] = None
+        self._spoken: list[str] = []
+        self._active = False
+        self.started_at = 0.0  # time.monotonic() of the current reply
+        self._analyzers: set[asyncio.Task] = set()
+
+        # User utterances: stop message id -> (seq, ended_at wall clock)
+        self.utterance_seq = 0
+        self._utterances: OrderedDict[str, tuple[int, float]] = OrderedDict()
+
+    @property
+    def active(self) -> bool:
+        """True while a reply is streaming."""
+        return self._active
+
+    @property
+    def spoken_text(self) -> str:
+        return "".join(self._spoken)
+
+    def begin(self, source: Optional[AsyncGenerator] = None) -> int:
+        """Register a new reply and its LLM source, if any. Returns its sequence number."""
+        self.seq += 1
+        self.stats.replies += 1
+        self._source = source
+        self._spoken = []
+        self._active = True
+        self.started_at = time.monotonic()
+        return self.seq
+
+    def spoke(self, chunk: str) -> None:
+        """Record a chunk handed to TTS."""
+        self._spoken.append(chunk)
+
+    def finish(self, seq: int) -> None:
+        """Mark reply `seq` as streamed to the end."""
+        if seq == self.seq:
+            self._active = False
+            self._source = None
+
+    def interrupt(self, seq: Optional[int] = None) -> Optional[str]:
+        """
+        Stop the reply in flight and close its LLM stream.
+
+        Args:
+            seq: Only interrupt if this reply is still the current one
+                (a late cleanup of an old reply must not cut a new one)
+
+        Returns:
+            The spoken prefix, or None if no reply was streaming
+        """
+        if not self._active or (seq is not None and seq != self.seq):
+            return None
+
+        self._active = False
+        source, self._source = self._source, None
+        if source is not None:
+            _close_later(source)
+
+        spoken = self.spoken_text
+        self.stats.interruptions += 1
+        self.stats.spoken_chars += len(spoken)
+        return spoken
+
+    def utterance(self, message=None) -> tuple[int, float]:
+        """
+        Register the UserStoppedSpeaking `message` (once per message id).
+
+        Returns:
+            (seq, ended_at) - utterance number and its wall-clock end time
+        """
+        key = getattr(message, "id", None)
+        if key is not None and key in self._utterances:
+            return self._utterances[key]
+
+        self.utterance_seq += 1
+        entry = (self.utterance_seq, getattr(message, "timestamp", None) or time.time())
+        if key is not None:
+            self._utterances[key] = entry
+            while len(self._utterances) > RECENT_UTTERANCES:
+                self._utterances.popitem(last=False)
+        return entry
+
+    @staticmethod
+    def stamp(event, seq: int, ended_at: float) -> None:
+        """Stamp an insight with its utterance and latency."""
+        if isinstance(event, Insight) and event.turn_seq is None:
+            event.turn_seq = seq
+            event.latency_ms = round((time.time() - ended_at) * 1000, 1)
+
+    def cancel_analyzers(self) -> int:
+        """Cancel in-flight analyzer runs. Returns how many were cancelled."""
+        running = [task for task in self._analyzers if not task.done()]
+        for task in running:
+            task.cancel()
+        self._analyzers.clear()
+        self.stats.analyzers_cancelled += len(running)
+        return len(running)
+
+    def track(self, generate: Callable) -> Callable:
+        """Wrap a background node's generate: cancellable runs, stamped insights."""
+
+        @functools.wraps(generate)
+        async def tracked(message):
+            seq, ended_at = self.utterance(message)
+            task = asyncio.current_task()
+            if task is not None:
+                self._analyzers.add(task)
+            try:
+                async for event in generate(message):
+                    self.stamp(event, seq, ended_at)
+                    yield event
+            finally:
+                self._analyzers.discard(task)
+
+        return tracked
+
+
+# Strong refs to pending close tasks (the loop only keeps weak ones)
+_closing: set[asyncio.Task] = set()
+
+
+def _close_later(source: AsyncGenerator) -> None:
+    """Close an async generator from sync code (interrupt handlers are sync)."""
+
+    async def close() -> None:
+        try:
+            await source.aclose()
+        except RuntimeError:
+            pass  # Already closing from its own frame
+        except Exception as e:
+            logger.debug(f"Closing interrupted stream failed: {e}")
+
+    try:
+        task = asyncio.get_running_loop().create_task(close())
+    except RuntimeError:
+        return  # No loop (call already shut down)
+    _closing.add(task)
+    task.add_done_callback(_closing.discard)
+
+
+# Singleton instance
+turn_latency = TurnLatencyWindow()
+
+
+__all__ = [
+    "InsightStats",
+    "InsightTiming",
+    "TurnLatencyWindow",
+    "TurnStats",
+    "TurnTracker",
+    "turn_latency",
+]
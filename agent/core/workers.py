@@ -0,0 +1,333 @@
+"""
+Multi-Process Call Workers
+==========================
+
+Runs the voice agent as N worker processes sharing one listening socket,
+so every core in the container serves calls. A single event loop spends
+all its CPU on JSON parsing, prompt building, regex matching and pydantic
+validation for every live call; sharding calls across processes removes
+that ceiling.
+
+Start-up order (supervisor process):
+1. preload_shared_data() imports the read-only tables every call reads
+   (CALL_TYPES, MOODS, STAGE_PROMPTS, content.templates, persona and
+   pillar configs, the voice skill) and the lazily-imported SDKs
+2. gc.freeze() moves them into the permanent generation, so the garbage
+   collector never writes to their pages and they stay shared
+   copy-on-write after fork
+3. the socket is bound once and N workers are forked, each running its
+   own uvicorn server (and event loop) on the inherited socket
+4. the supervisor restarts workers that die and logs per-worker load
+
+Nothing that owns a connection or an event loop (LLM HTTP client,
+Supabase, Supermemory) is created before fork - those stay lazy and are
+opened per worker.
+
+Per-worker load (active calls, completed calls, event-loop lag p99 / max
+and stall count from core.loop_monitor, heartbeat) lives in a shared array
+each worker updates for its own row. It is logged by the supervisor and
+served at GET /workers, so a stall that slows every call on one worker
+shows up next to that worker's call count.
+
+Configuration via environment variables:
+- AGENT_WORKERS: worker processes (default 1 = single process, 0 = one per core)
+- AGENT_HOST: listen host (default 0.0.0.0)
+- AGENT_PORT: listen port (default PORT, as app.run() uses, else 8000)
+- WORKER_LOAD_INTERVAL: seconds between load reports (default 5)
+- WORKER_RESTART_DELAY: seconds before restarting a dead worker (default 1)
+"""
+
+import asyncio
+import gc
+import multiprocessing
+import os
+import signal
+import socket
+import time
+from typing import Optional
+
+from loguru import logger
+
+AGENT_WORKERS = int(os.getenv("AGENT_WORKERS", "1"))
+AGENT_HOST = os.getenv("AGENT_HOST", "0.0.0.0")
+# Same port app.run() listens on when AGENT_PORT isn't set
+AGENT_PORT = int(os.getenv("AGENT_PORT") or os.getenv("PORT") or "8000")
+WORKER_LOAD_INTERVAL = float(os.getenv("WORKER_LOAD_INTERVAL", "5"))
+WORKER_RESTART_DELAY = float(os.getenv("WORKER_RESTART_DELAY", "1"))
+
+# Row layout of the shared load table
+_PID, _ACTIVE, _COMPLETED, _LAG_P99, _LAG_MAX, _STALLS, _UPDATED_AT = range(7)
+_FIELDS = 7
+
+
+def worker_count(configured: int = AGENT_WORKERS) -> int:
+    """Resolve AGENT_WORKERS (0 = one worker per available core)."""
+    if configured > 0:
+        return configured
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+def preload_shared_data() -> dict[str, int]:
+    """
+    Import every read-only table calls use, so workers inherit them.
+
+    Returns entry counts per table (for the start-up log).
+    """
+    from conversation.future_self import PILLAR_CONFIGS
+    from conversation.persona import PERSONA_CONFIGS
+    from conversation.stages.config import MOOD_STAGE_MODIFIERS
+    from core.startup import preload_assets, preload_optional_subsystems
+
+    # SDK modules are code, not connections - safe to share before fork
+    preload_optional_subsystems()
+    return {
+        **preload_assets(),
+        "stage_modifiers": len(MOOD_STAGE_MODIFIERS),
+        "personas": len(PERSONA_CONFIGS),
+        "pillars": len(PILLAR_CONFIGS),
+    }
+
+
+def freeze_shared_data() -> int:
+    """Collect garbage, then freeze everything alive into the permanent generation."""
+    gc.collect()
+    gc.freeze()
+    return gc.get_freeze_count()
+
+
+class WorkerLoadTable:
+    """
+    Per-worker load counters in shared memory.
+
+    Each worker writes only its own row, so no lock is needed.
+    """
+
+    def __init__(self, workers: int):
+        self.workers = workers
+        ctx = multiprocessing.get_context("fork")
+        self._data = ctx.Array("d", workers * _FIELDS, lock=False)
+
+    def update(
+        self,
+        index: int,
+        active: int,
+        completed: int,
+        lag_p99_ms: float = 0.0,
+        lag_max_ms: float = 0.0,
+        stalls: int = 0,
+    ) -> None:
+        base = index * _FIELDS
+        self._data[base + _PID] = os.getpid()
+        self._data[base + _ACTIVE] = active
+        self._data[base + _COMPLETED] = completed
+        self._data[base + _LAG_P99] = lag_p99_ms
+        self._data[base + _LAG_MAX] = lag_max_ms
+        self._data[base + _STALLS] = stalls
+        self._data[base + _UPDATED_AT] = time.time()
+
+    def reset(self, index: int) -> None:
+        base = index * _FIELDS
+        for offset in range(_FIELDS):
+            self._data[base + offset] = 0
+
+    def snapshot(self) -> list[dict]:
+        now = time.time()
+        rows = []
+        for index in range(self.workers):
+            base = index * _FIELDS
+            updated_at = self._data[base + _UPDATED_AT]
+            rows.append(
+                {
+                    "worker": index,
+                    "pid": int(self._data[base + _PID]),
+                    "active_calls": int(self._data[base + _ACTIVE]),
+                    "completed_calls": int(self._data[base + _COMPLETED]),
+                    "loop_lag_p99_ms": round(self._data[base + _LAG_P99], 1),
+                    "loop_lag_max_ms": round(self._data[base + _LAG_MAX], 1),
+                    "loop_stalls": int(self._data[base + _STALLS]),
+                    "heartbeat_age_s": round(now - updated_at, 1) if updated_at else None,
+                }
+            )
+        return rows
+
+    def summary(self) -> str:
+        rows = self.snapshot()
+        active = sum(r["active_calls"] for r in rows)
+        per_worker = " ".join(
+            f"w{r['worker']}={r['active_calls']} lag p99 {r['loop_lag_p99_ms']:.0f}ms"
+            + (f" stalls {r['loop_stalls']}" if r["loop_stalls"] else "")
+            for r in rows
+        )
+        return f"{active} active calls ({per_worker})"
+
+
+def _bind_socket(host: str, port: int) -> socket.socket:
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(2048)
+    sock.set_inheritable(True)
+    return sock
+
+
+async def _report_load(index: int, table: WorkerLoadTable) -> None:
+    from core.call_registry import call_registry
+    from core.loop_monitor import loop_monitor
+
+    while True:
+        table.update(
+            index,
+            len(call_registry),
+            call_registry.completed,
+            lag_p99_ms=loop_monitor.lag.percentile(0.99) or 0.0,
+            lag_max_ms=loop_monitor.recent_lag_ms(WORKER_LOAD_INTERVAL),
+            stalls=loop_monitor.block_count,
+        )
+        await asyncio.sleep(WORKER_LOAD_INTERVAL)
+
+
+def _worker_main(index: int, fastapi_app, sock: socket.socket, table: WorkerLoadTable) -> None:
+    """Entry point of a forked worker: serve the app on the shared socket."""
+    import uvicorn
+
+    # Default signal handling - uvicorn installs its own graceful shutdown
+    signal.signal(signal.SIGINT, signal.SIG_DFL)
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+
+    reporter: Optional[asyncio.Task] = None
+
+    async def start_reporter() -> None:
+        nonlocal reporter
+        reporter = asyncio.create_task(_report_load(index, table))
+
+    fastapi_app.add_event_handler("startup", start_reporter)
+
+    logger.info(f"👷 Worker {index} started (pid {os.getpid()})")
+    server = uvicorn.Server(uvicorn.Config(fastapi_app, lifespan="on", log_level="info"))
+    server.run(sockets=[sock])
+
+
+class WorkerSupervisor:
+    """Forks workers on a shared socket, restarts them and reports load."""
+
+    def __init__(
+        self,
+        fastapi_app,
+        workers: int,
+        host: str = AGENT_HOST,
+        port: int = AGENT_PORT,
+    ):
+        self.fastapi_app = fastapi_app
+        self.workers = workers
+        self.host = host
+        self.port = port
+        self.table = WorkerLoadTable(workers)
+        self.restarts = 0
+
+        self._ctx = multiprocessing.get_context("fork")
+        self._procs: list[Optional[multiprocessing.process.BaseProcess]] = [None] * workers
+        self._sock: Optional[socket.socket] = None
+        self._stopping = False
+
+    def _spawn(self, index: int) -> None:
+        self.table.reset(index)
+        proc = self._ctx.Process(
+            target=_worker_main,
+            args=(index, self.fastapi_app, self._sock, self.table),
+            name=f"future-self-worker-{index}",
+            daemon=False,
+        )
+        proc.start()
+        self._procs[index] = proc
+
+    def _stop(self, signum, frame) -> None:
+        self._stopping = True
+
+    def run(self) -> None:
+        # Serve the load table from every worker
+        if hasattr(self.fastapi_app, "add_api_route"):
+            self.fastapi_app.add_api_route("/workers", self.table.snapshot, methods=["GET"])
+
+        tables = preload_shared_data()
+        frozen = freeze_shared_data()
+        logger.info(f"📦 Preloaded shared tables {tables}, froze {frozen} objects")
+
+        self._sock = _bind_socket(self.host, self.port)
+        logger.info(f"Listening on {self.host}:{self.port} with {self.workers} workers")
+
+        signal.signal(signal.SIGINT, self._stop)
+        signal.signal(signal.SIGTERM, self._stop)
+
+        for index in range(self.workers):
+            self._spawn(index)
+
+        last_report = time.monotonic()
+        try:
+            while not self._stopping:
+                time.sleep(0.5)
+                for index, proc in enumerate(self._procs):
+                    if proc is None or proc.is_alive() or self._stopping:
+                        continue
+                    logger.warning(
+                        f"💀 Worker {index} (pid {proc.pid}) exited with {proc.exitcode} - restarting"
+                    )
+                    self.restarts += 1
+                    time.sleep(WORKER_RESTART_DELAY)
+                    self._spawn(index)
+
+                if time.monotonic() - last_report >= WORKER_LOAD_INTERVAL:
+                    last_report = time.monotonic()
+                    logger.info(f"📊 Worker load: {self.table.summary()}")
+        finally:
+            self.shutdown()
+
+    def shutdown(self, timeout: float = 30.0) -> None:
+        """Ask workers to finish (SIGTERM lets uvicorn drain), then kill stragglers."""
+        logger.info("Stopping workers...")
+        for proc in self._procs:
+            if proc is not None and proc.is_alive():
+                proc.terminate()
+        deadline = time.monotonic() + timeout
+        for proc in self._procs:
+            if proc is None:
+                continue
+            proc.join(max(0.0, deadline - time.monotonic()))
+            if proc.is_alive():
+                proc.kill()
+                proc.join()
+        if self._sock is not None:
+            self._sock.close()
+            self._sock = None
+
+
+def run_workers(app, workers: Optional[int] = None) -> bool:
+    """
+    Serve `app` (a VoiceAgentApp) with multiple worker processes.
+
+    Returns False without doing anything when one worker is configured or
+    the app exposes no ASGI app - the caller should fall back to app.run().
+    """
+    workers = worker_count() if workers is None else workers
+    fastapi_app = getattr(app, "fastapi_app", None)
+    if workers <= 1:
+        return False
+    if fastapi_app is None:
+        logger.warning("AGENT_WORKERS set but app has no fastapi_app - running single process")
+        return False
+
+    WorkerSupervisor(fastapi_app, workers).run()
+    return True
+
+
+__all__ = [
+    "AGENT_WORKERS",
+    "WorkerLoadTable",
+    "WorkerSupervisor",
+    "freeze_shared_data",
+    "preload_shared_data",
+    "run_workers",
+    "worker_count",
+]
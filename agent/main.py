@@ -42,15 +42,40 @@ from line import VoiceAgentApp
 
 from core.handlers.pre_call import handle_call_request
 from core.handlers.call import handle_new_call
+from core.admission import admission_controller
+from core.llm_client import schedule_warm_up
+from core.loop_monitor import loop_monitor, start_loop_monitor
+from core.startup import on_startup
+from core.workers import run_workers
+from services.memory_queue import memory_queue
 
 
 # Create the Voice Agent App
 app = VoiceAgentApp(call_handler=handle_new_call, pre_call_handler=handle_call_request)
 
+# Open the LLM connection before the first call needs it (in the background,
+# so a slow endpoint doesn't hold up startup), and finish
+# loading lazily-imported subsystems once the server is up. The memory
+# queue picks up writes spooled before a restart and flushes in the background.
+# GET /admission shows the load signals behind accept / defer / reject.
+# The loop monitor samples event-loop lag in each worker (GET /loop)
+fastapi_app = getattr(app, "fastapi_app", None)
+if fastapi_app is not None:
+    fastapi_app.add_api_route("/admission", admission_controller.snapshot, methods=["GET"])
+    fastapi_app.add_api_route("/loop", loop_monitor.snapshot, methods=["GET"])
+    fastapi_app.add_event_handler("startup", start_loop_monitor)
+    fastapi_app.add_event_handler("startup", schedule_warm_up)
+    fastapi_app.add_event_handler("startup", on_startup)
+    fastapi_app.add_event_handler("startup", memory_queue.start)
+    fastapi_app.add_event_handler("shutdown", memory_queue.drain)
+    fastapi_app.add_event_handler("shutdown", loop_monitor.stop)
+
 
 if __name__ == "__main__":
     logger.info("Starting Future Self Agent (Multi-Agent Mode)...")
     logger.info(
         "Agents: FutureYou (speaking) + Excuse, ExcuseCallout, Sentiment, Commitment, Promise, Pattern, Quote (background)"
     )
-    app.run()
+    # AGENT_WORKERS > 1 shards calls across processes; otherwise run in-process
+    if not run_workers(app):
+        app.run()
@@ -13,6 +13,7 @@ from .supermemory import (
     execute_memory_tool,
     MEMORY_TOOLS,
 )
+from .memory_queue import memory_queue, MemoryWriteQueue
 from .trust_score import trust_score_service, TrustScoreService
 
 # Future self service (replaces goals)
@@ -48,6 +49,14 @@ from .excuse_patterns import (
 # Call analytics
 from .call_analytics import save_call_analytics
 
+# Rolling per-user accountability stats
+from .accountability_stats import (
+    AccountabilityStats,
+    get_accountability_stats,
+    fetch_accountability_stats,
+    update_accountability_stats,
+)
+
 __all__ = [
     # Supermemory
     "supermemory_service",
@@ -56,6 +65,8 @@ __all__ = [
     "get_memory_tools",
     "execute_memory_tool",
     "MEMORY_TOOLS",
+    "memory_queue",
+    "MemoryWriteQueue",
     # Trust score
     "trust_score_service",
     "TrustScoreService",
@@ -82,4 +93,9 @@ __all__ = [
     "build_excuse_callout_section",
     # Call analytics
     "save_call_analytics",
+    # Accountability stats
+    "AccountabilityStats",
+    "get_accountability_stats",
+    "fetch_accountability_stats",
+    "update_accountability_stats",
 ]
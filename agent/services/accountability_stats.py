@@ -0,0 +1,232 @@
+"""
+Rolling accountability stats per user.
+
+One compact, fixed-size record per user (table accountability_stats,
+migration 016), updated incrementally at the end of every call:
+- lifetime and rolling keep-rate
+- last RECENT_OUTCOMES promise outcomes, bit-packed into one integer
+- commitment-specificity rate
+- time-of-day adherence (did the call connect near their call_time?)
+
+Pre-call reads this one row instead of scanning call_analytics history.
+Users without a row yet are backfilled from the history scan once.
+"""
+
+import os
+from dataclasses import asdict, dataclass, fields
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+from zoneinfo import ZoneInfo
+
+import aiohttp
+
+SUPABASE_URL = os.getenv("SUPABASE_URL")
+SUPABASE_SERVICE_KEY = os.getenv("SUPABASE_SERVICE_KEY")
+
+# Outcomes kept in the rolling window (2 bits each; 14 fit in an INTEGER)
+RECENT_OUTCOMES = 14
+# A call within this many minutes of call_time counts as on time
+ON_TIME_MINUTES = int(os.getenv("STATS_ON_TIME_MINUTES", "15"))
+
+_UNKNOWN, _KEPT, _BROKEN = 0, 1, 2
+_WINDOW_MASK = (1 << (2 * RECENT_OUTCOMES)) - 1
+
+
+@dataclass(slots=True)
+class AccountabilityStats:
+    """Fixed-size rolling stats for one user."""
+
+    calls: int = 0
+    kept: int = 0
+    broken: int = 0
+    recent_outcomes: int = 0  # 2 bits per call, newest in the low bits
+    recent_count: int = 0
+    commitments: int = 0
+    specific_commitments: int = 0
+    timed_calls: int = 0
+    on_time_calls: int = 0
+    last_promise_kept: Optional[bool] = None
+    last_call_at: Optional[str] = None
+
+    def record_call(
+        self,
+        promise_kept: Optional[bool],
+        has_commitment: bool = False,
+        commitment_specific: bool = False,
+        on_time: Optional[bool] = None,
+        at: Optional[datetime] = None,
+    ) -> None:
+        """Fold one finished call into the stats (O(1))."""
+        self.calls += 1
+        outcome = _UNKNOWN
+        if promise_kept is True:
+            self.kept += 1
+            outcome = _KEPT
+        elif promise_kept is False:
+            self.broken += 1
+            outcome = _BROKEN
+        self.recent_outcomes = ((self.recent_outcomes << 2) | outcome) & _WINDOW_MASK
+        self.recent_count = min(self.recent_count + 1, RECENT_OUTCOMES)
+
+        if has_commitment:
+            self.commitments += 1
+            if commitment_specific:
+                self.specific_commitments += 1
+
+        if on_time is not None:
+            self.timed_calls += 1
+            if on_time:
+                self.on_time_calls += 1
+
+        self.last_promise_kept = promise_kept
+        self.last_call_at = (at or datetime.now(timezone.utc)).isoformat()
+
+    def last_outcomes(self, n: int = RECENT_OUTCOMES) -> list[Optional[bool]]:
+        """Most recent first: True kept, False broken, None unknown."""
+        decoded = {_UNKNOWN: None, _KEPT: True, _BROKEN: False}
+        return [
+            decoded[(self.recent_outcomes >> (2 * i)) & 0b11]
+            for i in range(min(n, self.recent_count))
+        ]
+
+    @property
+    def keep_rate(self) -> Optional[float]:
+        """Lifetime keep-rate over calls with a known outcome."""
+        known = self.kept + self.broken
+        return self.kept / known if known else None
+
+    @property
+    def rolling_keep_rate(self) -> Optional[float]:
+        """Keep-rate over the last RECENT_OUTCOMES calls."""
+        recent = [o for o in self.last_outcomes() if o is not None]
+        return sum(recent) / len(recent) if recent else None
+
+    @property
+    def specificity_rate(self) -> Optional[float]:
+        return self.specific_commitments / self.commitments if self.commitments else None
+
+    @property
+    def adherence_rate(self) -> Optional[float]:
+        return self.on_time_calls / self.timed_calls if self.timed_calls else None
+
+    def to_row(self) -> dict:
+        return asdict(self)
+
+    @classmethod
+    def from_row(cls, row: dict) -> "AccountabilityStats":
+        names = {f.name for f in fields(cls)}
+        return cls(**{k: v for k, v in row.items() if k in names and v is not None})
+
+    @classmethod
+    def from_history(cls, call_history: list) -> "AccountabilityStats":
+        """Backfill from call_analytics rows (ordered created_at desc)."""
+        stats = cls()
+        for call in reversed(call_history or []):
+            stats.record_call(
+                promise_kept=call.get("promise_kept"),
+                has_commitment=bool(call.get("tomorrow_commitment")),
+                commitment_specific=bool(call.get("commitment_is_specific")),
+            )
+            stats.last_call_at = call.get("created_at") or stats.last_call_at
+        return stats
+
+
+def get_accountability_stats(user_context: dict) -> AccountabilityStats:
+    """Stats from fetch_user_context: the stored row, else the history backfill."""
+    row = user_context.get("accountability_stats")
+    if row:
+        return AccountabilityStats.from_row(row)
+    return AccountabilityStats.from_history(user_context.get("call_history", []))
+
+
+def was_on_time(user_context: dict, started_at: datetime) -> Optional[bool]:
+    """Whether a call started within ON_TIME_MINUTES of the user's call_time."""
+    users = user_context.get("users", {})
+    call_time = users.get("call_time")
+    if not call_time:
+        return None
+    try:
+        tz = ZoneInfo(users.get("timezone") or "UTC")
+        hour, minute = (int(p) for p in call_time.split(":")[:2])
+    except (ValueError, KeyError):
+        return None
+
+    local = started_at.astimezone(tz)
+    scheduled = local.replace(hour=hour, minute=minute, second=0, microsecond=0)
+    # Nearest occurrence (handles calls just after local midnight)
+    offset = min(
+        abs(local - (scheduled + timedelta(days=d))) for d in (-1, 0, 1)
+    )
+    return offset <= timedelta(minutes=ON_TIME_MINUTES)
+
+
+async def fetch_accountability_stats(user_id: str) -> Optional[dict]:
+    """Fetch the user's stats row, or None if they don't have one yet."""
+    if not SUPABASE_URL or not SUPABASE_SERVICE_KEY:
+        return None
+
+    try:
+        async with aiohttp.ClientSession() as session:
+            async with session.get(
+                f"{SUPABASE_URL}/rest/v1/accountability_stats",
+                params={"user_id": f"eq.{user_id}", "select": "*"},
+                headers={
+                    "apikey": SUPABASE_SERVICE_KEY,
+                    "Authorization": f"Bearer {SUPABASE_SERVICE_KEY}",
+                },
+            ) as resp:
+                if resp.status == 200:
+                    data = await resp.json()
+                    return data[0] if data else None
+                return None
+    except Exception as e:
+        print(f"❌ Failed to fetch accountability stats: {e}")
+        return None
+
+
+async def upsert_accountability_stats(user_id: str, stats: AccountabilityStats) -> bool:
+    """Write the user's stats row."""
+    if not SUPABASE_URL or not SUPABASE_SERVICE_KEY:
+        print("⚠️ Supabase not configured, cannot save accountability stats")
+        return False
+
+    try:
+        async with aiohttp.ClientSession() as session:
+            async with session.post(
+                f"{SUPABASE_URL}/rest/v1/accountability_stats",
+                json={
+                    "user_id": user_id,
+                    **stats.to_row(),
+                    "updated_at": datetime.now(timezone.utc).isoformat(),
+                },
+                headers={
+                    "apikey": SUPABASE_SERVICE_KEY,
+                    "Authorization": f"Bearer {SUPABASE_SERVICE_KEY}",
+                    "Content-Type": "application/json",
+                    "Prefer": "resolution=merge-duplicates",
+                },
+            ) as resp:
+                if resp.status in (200, 201):
+                    return True
+                print(f"⚠️ Failed to save accountability stats: {resp.status}")
+                return False
+    except Exception as e:
+        print(f"❌ Failed to save accountability stats: {e}")
+        return False
+
+
+async def update_accountability_stats(user_id: str, user_context: dict, call_summary) -> bool:
+    """Fold a finished call into the user's stats row (called from handle_call_end)."""
+    stats = get_accountability_stats(user_context)
+    now = datetime.now(timezone.utc)
+    started_at = now - timedelta(seconds=call_summary.call_duration_seconds or 0)
+    stats.record_call(
+        promise_kept=call_summary.promise_kept,
+        has_commitment=bool(call_summary.tomorrow_commitment),
+        commitment_specific=call_summary.commitment_is_specific,
+        on_time=was_on_time(user_context, started_at),
+        at=now,
+    )
+    # Keep the in-memory context current for anything later in post-call
+    user_context["accountability_stats"] = stats.to_row()
+    return await upsert_accountability_stats(user_id, stats)
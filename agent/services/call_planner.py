@@ -0,0 +1,608 @@
+"""
+Batch Call Planner
+==================
+
+Plans call type, mood, milestone and quit-zone status for every user due
+in the next scheduling window in one vectorized pass, instead of running
+select_call_type / select_mood one user at a time in the pre-call path.
+
+User state is held as columns (NumPy arrays, one row per user):
+
+    streak | last_call_type | last_mood | kept_promise | quit_zone_mask
+
+and every rule of select_call_type / select_mood becomes an array
+operation (np.isin, masked weighted sampling, np.select in rule
+priority order). Random draws come from one np.random.Generator, so a
+plan is reproducible from its seed.
+
+The plan is saved as an .npz file. Pre-call loads it once (CallPlanStore)
+and looks users up in O(1); if the user isn't in the plan, the plan is
+stale, or their streak / promise status changed since planning, pre-call
+falls back to the per-user selection.
+
+Usage:
+    cd agent
+
+    # Plan the next hour of calls
+    uv run python -m services.call_planner plan --window-minutes 60 --seed 42 --out plans/next.npz
+
+    # Benchmark against the per-user path
+    uv run python -m services.call_planner bench --users 100000 --seed 1
+
+Configuration via environment variables:
+- CALL_PLAN_PATH: plan file pre-call reads (unset = planning disabled)
+"""
+
+import asyncio
+import os
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+from zoneinfo import ZoneInfo
+
+import aiohttp
+import numpy as np
+
+from conversation.call_types import CALL_TYPES, MILESTONE_DAYS
+from conversation.mood import MOODS, QUIT_ZONES, quit_zone_kinds
+
+SUPABASE_URL = os.getenv("SUPABASE_URL")
+SUPABASE_SERVICE_KEY = os.getenv("SUPABASE_SERVICE_KEY")
+CALL_PLAN_PATH = os.getenv("CALL_PLAN_PATH")
+
+# Stable integer codes (index into these tuples)
+CALL_TYPE_NAMES = tuple(CALL_TYPES)
+MOOD_NAMES = tuple(MOODS)
+QUIT_ZONE_NAMES = tuple(QUIT_ZONES)
+
+_CALL_TYPE_CODE = {name: i for i, name in enumerate(CALL_TYPE_NAMES)}
+_MOOD_CODE = {name: i for i, name in enumerate(MOOD_NAMES)}
+
+# kept_promise column: 1 kept, 0 broken, -1 unknown
+_UNKNOWN = -1
+
+# Same probabilities as select_mood
+RANDOM_MOOD_CHANCE = 0.20
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# COLUMNAR USER STATE
+# ═══════════════════════════════════════════════════════════════════════════════
+
+
+@dataclass
+class Cohort:
+    """Planning inputs for a batch of users, one array element per user."""
+
+    user_ids: np.ndarray  # str
+    streak: np.ndarray  # int32
+    last_call_type: np.ndarray  # int8 code, -1 = none
+    last_mood: np.ndarray  # int8 code, -1 = none
+    kept_promise: np.ndarray  # int8: 1 / 0 / -1
+    quit_zone_mask: np.ndarray  # uint8 bit per QUIT_ZONE_NAMES entry
+
+    def __len__(self) -> int:
+        return len(self.user_ids)
+
+    @classmethod
+    def from_rows(cls, rows: list[dict]) -> "Cohort":
+        """
+        Build columns from per-user rows with keys: user_id, current_streak,
+        last_call_type, last_mood, kept_promise_yesterday, quit_pattern.
+        """
+        zone_bit = {name: 1 << i for i, name in enumerate(QUIT_ZONE_NAMES)}
+
+        def kept(value: Optional[bool]) -> int:
+            return _UNKNOWN if value is None else int(bool(value))
+
+        def zone_mask(pattern: Optional[str]) -> int:
+            return sum(zone_bit[k] for k in quit_zone_kinds(pattern or ""))
+
+        return cls(
+            user_ids=np.array([r["user_id"] for r in rows], dtype=str),
+            streak=np.array([r.get("current_streak") or 0 for r in rows], dtype=np.int32),
+            last_call_type=np.array(
+                [_CALL_TYPE_CODE.get(r.get("last_call_type") or "", _UNKNOWN) for r in rows],
+                dtype=np.int8,
+            ),
+            last_mood=np.array(
+                [_MOOD_CODE.get(r.get("last_mood") or "", _UNKNOWN) for r in rows], dtype=np.int8
+            ),
+            kept_promise=np.array(
+                [kept(r.get("kept_promise_yesterday")) for r in rows], dtype=np.int8
+            ),
+            quit_zone_mask=np.array(
+                [zone_mask(r.get("quit_pattern")) for r in rows], dtype=np.uint8
+            ),
+        )
+
+    @classmethod
+    def synthetic(cls, users: int, seed: int = 0) -> "Cohort":
+        """Random cohort with realistic value ranges (benchmarks and tests)."""
+        rng = np.random.default_rng(seed)
+        return cls(
+            user_ids=np.array([f"user-{i}" for i in range(users)], dtype=str),
+            streak=rng.integers(0, 120, users, dtype=np.int32),
+            last_call_type=rng.integers(-1, len(CALL_TYPE_NAMES), users, dtype=np.int8),
+            last_mood=rng.integers(-1, len(MOOD_NAMES), users, dtype=np.int8),
+            kept_promise=rng.integers(-1, 2, users, dtype=np.int8),
+            quit_zone_mask=rng.integers(0, 1 << len(QUIT_ZONE_NAMES), users, dtype=np.uint8),
+        )
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# VECTORIZED SELECTION
+# ═══════════════════════════════════════════════════════════════════════════════
+
+
+def _weighted_choice(weights: np.ndarray, uniform: np.ndarray) -> np.ndarray:
+    """Row-wise weighted sampling: weights is (n, k), returns (n,) column indices."""
+    cumulative = np.cumsum(weights, axis=1)
+    targets = uniform * cumulative[:, -1]
+    choice = (cumulative <= targets[:, None]).sum(axis=1)
+    return np.minimum(choice, weights.shape[1] - 1)
+
+
+def _exclude(weights: np.ndarray, codes: np.ndarray) -> np.ndarray:
+    """Zero each row's weight at its code (codes < 0 leave the row untouched)."""
+    rows = np.flatnonzero(codes >= 0)
+    weights[rows, codes[rows]] = 0
+    return weights
+
+
+def in_quit_zone(cohort: Cohort) -> np.ndarray:
+    """Vectorized _in_quit_zone."""
+    result = np.zeros(len(cohort), dtype=bool)
+    for bit, name in enumerate(QUIT_ZONE_NAMES):
+        low, high = QUIT_ZONES[name]
+        has_zone = (cohort.quit_zone_mask >> bit) & 1
+        result |= has_zone.astype(bool) & (cohort.streak >= low) & (cohort.streak <= high)
+    return result
+
+
+def select_call_types(cohort: Cohort, rng: np.random.Generator) -> tuple[np.ndarray, np.ndarray]:
+    """Vectorized select_call_type. Returns (call type codes, is_milestone)."""
+    n = len(cohort)
+    milestone_code = _CALL_TYPE_CODE["milestone"]
+    is_milestone = np.isin(cohort.streak, MILESTONE_DAYS)
+
+    base = np.array([CALL_TYPES[name].weight for name in CALL_TYPE_NAMES], dtype=np.float64)
+    base[milestone_code] = 0
+    weights = _exclude(np.tile(base, (n, 1)), cohort.last_call_type)
+
+    # Every non-milestone type excluded (can't happen with >2 types) -> allow all
+    empty = weights.sum(axis=1) == 0
+    weights[empty] = base
+
+    chosen = _weighted_choice(weights, rng.random(n))
+    codes = np.where(is_milestone, milestone_code, chosen).astype(np.int8)
+    return codes, is_milestone
+
+
+def select_moods(
+    cohort: Cohort,
+    call_types: np.ndarray,
+    quit_zone: np.ndarray,
+    rng: np.random.Generator,
+) -> np.ndarray:
+    """Vectorized select_mood, rules applied in the same priority order."""
+    n = len(cohort)
+    mood = _MOOD_CODE
+
+    # Draw everything up front so results depend only on the seed
+    random_roll = rng.random(n)
+    random_pick = _weighted_choice(
+        _exclude(np.ones((n, len(MOOD_NAMES))), cohort.last_mood), rng.random(n)
+    )
+    coin = rng.random(n) < 0.5
+
+    broken_pick = np.where(coin, mood["cold_intense"], mood["dark_prophetic"])
+    story_pick = np.where(
+        cohort.streak < 14,
+        mood["reflective_intimate"],
+        np.where(coin, mood["reflective_intimate"], mood["proud_serious"]),
+    )
+
+    conditions = [
+        random_roll < RANDOM_MOOD_CHANCE,
+        cohort.kept_promise == 0,
+        quit_zone,
+        call_types == _CALL_TYPE_CODE["milestone"],
+        call_types == _CALL_TYPE_CODE["reflection"],
+        call_types == _CALL_TYPE_CODE["challenge"],
+        call_types == _CALL_TYPE_CODE["story"],
+    ]
+    choices = [
+        random_pick,
+        broken_pick,
+        mood["dark_prophetic"],
+        mood["proud_serious"],
+        mood["reflective_intimate"],
+        mood["playful_challenging"],
+        story_pick,
+    ]
+    return np.select(conditions, choices, default=mood["warm_direct"]).astype(np.int8)
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# PLAN
+# ═══════════════════════════════════════════════════════════════════════════════
+
+
+@dataclass(slots=True)
+class PlannedCall:
+    """One user's planned call."""
+
+    call_type: str
+    mood: str
+    is_milestone: bool
+    in_quit_zone: bool
+    streak: int
+    kept_promise: Optional[bool]
+
+
+@dataclass
+class CallPlan:
+    """Planned calls for one scheduling window (columnar)."""
+
+    window_start: float  # epoch seconds
+    window_end: float
+    seed: int
+    user_ids: np.ndarray
+    call_type: np.ndarray
+    mood: np.ndarray
+    is_milestone: np.ndarray
+    in_quit_zone: np.ndarray
+    streak: np.ndarray
+    kept_promise: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.user_ids)
+
+    def row(self, index: int) -> PlannedCall:
+        kept = int(self.kept_promise[index])
+        return PlannedCall(
+            call_type=CALL_TYPE_NAMES[self.call_type[index]],
+            mood=MOOD_NAMES[self.mood[index]],
+            is_milestone=bool(self.is_milestone[index]),
+            in_quit_zone=bool(self.in_quit_zone[index]),
+            streak=int(self.streak[index]),
+            kept_promise=None if kept == _UNKNOWN else bool(kept),
+        )
+
+    def save(self, path: str) -> None:
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        tmp = f"{path}.tmp.npz"
+        np.savez(
+            tmp,
+            window=np.array([self.window_start, self.window_end]),
+            seed=np.array([self.seed]),
+            call_type_names=np.array(CALL_TYPE_NAMES),
+            mood_names=np.array(MOOD_NAMES),
+            user_ids=self.user_ids,
+            call_type=self.call_type,
+            mood=self.mood,
+            is_milestone=self.is_milestone,
+            in_quit_zone=self.in_quit_zone,
+            streak=self.streak,
+            kept_promise=self.kept_promise,
+        )
+        os.replace(tmp, path)  # Readers never see a half-written plan
+
+    @classmethod
+    def load(cls, path: str) -> "CallPlan":
+        with np.load(path) as data:
+            if tuple(data["call_type_names"]) != CALL_TYPE_NAMES or tuple(
+                data["mood_names"]
+            ) != MOOD_NAMES:
+                raise ValueError("Plan was built with different call types/moods")
+            window_start, window_end = data["window"].tolist()
+            return cls(
+                window_start=window_start,
+                window_end=window_end,
+                seed=int(data["seed"][0]),
+                user_ids=data["user_ids"],
+                call_type=data["call_type"],
+                mood=data["mood"],
+                is_milestone=data["is_milestone"],
+                in_quit_zone=data["in_quit_zone"],
+                streak=data["streak"],
+                kept_promise=data["kept_promise"],
+            )
+
+
+def plan_calls(
+    cohort: Cohort,
+    seed: int,
+    window_start: float = 0.0,
+    window_end: float = float("inf"),
+) -> CallPlan:
+    """Plan every call in the cohort. Same cohort + seed = same plan."""
+    rng = np.random.default_rng(seed)
+    call_types, is_milestone = select_call_types(cohort, rng)
+    quit_zone = in_quit_zone(cohort)
+    moods = select_moods(cohort, call_types, quit_zone, rng)
+    return CallPlan(
+        window_start=window_start,
+        window_end=window_end,
+        seed=seed,
+        user_ids=cohort.user_ids,
+        call_type=call_types,
+        mood=moods,
+        is_milestone=is_milestone,
+        in_quit_zone=quit_zone,
+        streak=cohort.streak,
+        kept_promise=cohort.kept_promise,
+    )
+
+
+class CallPlanStore:
+    """
+    O(1) plan lookups for pre-call.
+
+    The plan file is reloaded when it changes on disk (checked at most
+    every `check_interval` seconds).
+    """
+
+    def __init__(self, path: str, check_interval: float = 30.0):
+        self.path = path
+        self.check_interval = check_interval
+        self._plan: Optional[CallPlan] = None
+        self._index: dict[str, int] = {}
+        self._mtime = 0.0
+        self._checked_at = 0.0
+
+    def _refresh(self) -> None:
+        now = time.monotonic()
+        if now - self._checked_at < self.check_interval and self._plan is not None:
+            return
+        self._checked_at = now
+        try:
+            mtime = os.stat(self.path).st_mtime
+        except FileNotFoundError:
+            self._plan, self._index = None, {}
+            return
+        if mtime == self._mtime and self._plan is not None:
+            return
+        try:
+            plan = CallPlan.load(self.path)
+        except (OSError, ValueError, KeyError) as e:
+            print(f"⚠️ Could not load call plan {self.path}: {e}")
+            self._plan, self._index = None, {}
+            return
+        self._plan = plan
+        self._index = {str(uid): i for i, uid in enumerate(plan.user_ids.tolist())}
+        self._mtime = mtime
+        print(f"🗓️ Loaded call plan: {len(plan)} users, seed {plan.seed}")
+
+    def get(self, user_id: str, now: Optional[float] = None) -> Optional[PlannedCall]:
+        """Planned call for user_id, or None if unplanned or the plan has expired."""
+        self._refresh()
+        plan = self._plan
+        if plan is None:
+            return None
+        now = time.time() if now is None else now
+        if now > plan.window_end:
+            return None
+        index = self._index.get(user_id)
+        return plan.row(index) if index is not None else None
+
+
+_store: Optional[CallPlanStore] = None
+
+
+def get_planned_call(user_id: str) -> Optional[PlannedCall]:
+    """Look up user_id in the plan at CALL_PLAN_PATH (None when disabled)."""
+    global _store
+    if not CALL_PLAN_PATH:
+        return None
+    if _store is None:
+        _store = CallPlanStore(CALL_PLAN_PATH)
+    return _store.get(user_id)
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# COHORT FETCHING
+# ═══════════════════════════════════════════════════════════════════════════════
+
+
+def is_due(
+    call_time: Optional[str],
+    tz_name: Optional[str],
+    window_start: datetime,
+    window_end: datetime,
+) -> bool:
+    """Whether a user's local daily call_time falls in [window_start, window_end)."""
+    if not call_time:
+        return False
+    try:
+        tz = ZoneInfo(tz_name or "UTC")
+        hour, minute = (int(p) for p in call_time.split(":")[:2])
+    except (ValueError, KeyError):
+        return False
+
+    local_day = window_start.astimezone(tz).date()
+    for day in (local_day, local_day + timedelta(days=1)):
+        scheduled = datetime(day.year, day.month, day.day, hour, minute, tzinfo=tz)
+        if window_start <= scheduled < window_end:
+            return True
+    return False
+
+
+async def _get_all(session: aiohttp.ClientSession, table: str, params: dict) -> list[dict]:
+    """Page through a Supabase REST table."""
+    headers = {
+        "apikey": SUPABASE_SERVICE_KEY,
+        "Authorization": f"Bearer {SUPABASE_SERVICE_KEY}",
+    }
+    rows: list[dict] = []
+    page = 1000
+    while True:
+        async with session.get(
+            f"{SUPABASE_URL}/rest/v1/{table}",
+            params={**params, "limit": str(page), "offset": str(len(rows))},
+            headers=headers,
+        ) as resp:
+            batch = await resp.json() if resp.status == 200 else []
+        rows.extend(batch)
+        if len(batch) < page:
+            return rows
+
+
+async def fetch_due_cohort(
+    window_start: datetime, window_end: datetime, chunk_size: int = 200
+) -> list[dict]:
+    """Fetch planning inputs for every user due in the window."""
+    if not SUPABASE_URL or not SUPABASE_SERVICE_KEY:
+        print("⚠️ Supabase not configured, cannot fetch cohort")
+        return []
+
+    async with aiohttp.ClientSession() as session:
+        users = await _get_all(session, "users", {"select": "id,timezone,call_time"})
+        due = [
+            u["id"]
+            for u in users
+            if is_due(u.get("call_time"), u.get("timezone"), window_start, window_end)
+        ]
+
+        rows = {uid: {"user_id": uid} for uid in due}
+        for offset in range(0, len(due), chunk_size):
+            ids = f"in.({','.join(due[offset : offset + chunk_size])})"
+            status, future_self, memory, stats = await asyncio.gather(
+                _get_all(session, "status", {"user_id": ids, "select": "user_id,current_streak_days"}),
+                _get_all(session, "future_self", {"user_id": ids, "select": "user_id,quit_pattern"}),
+                _get_all(
+                    session,
+                    "call_memory",
+                    {"user_id": ids, "select": "user_id,last_call_type,last_mood"},
+                ),
+                _get_all(
+                    session,
+                    "accountability_stats",
+                    {"user_id": ids, "select": "user_id,last_promise_kept"},
+                ),
+            )
+            for r in status:
+                rows[r["user_id"]]["current_streak"] = r.get("current_streak_days") or 0
+            for r in future_self:
+                rows[r["user_id"]]["quit_pattern"] = r.get("quit_pattern")
+            for r in memory:
+                rows[r["user_id"]]["last_call_type"] = r.get("last_call_type")
+                rows[r["user_id"]]["last_mood"] = r.get("last_mood")
+            for r in stats:
+                rows[r["user_id"]]["kept_promise_yesterday"] = r.get("last_promise_kept")
+
+    print(f"🗓️ {len(due)}/{len(users)} users due {window_start:%H:%M}-{window_end:%H:%M} UTC")
+    return list(rows.values())
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# BENCHMARK
+# ═══════════════════════════════════════════════════════════════════════════════
+
+
+def benchmark(users: int, seed: int, scalar_sample: int = 10000) -> dict:
+    """Time the vectorized planner against per-user select_call_type/select_mood."""
+    from conversation.call_types import select_call_type
+    from conversation.mood import select_mood
+
+    cohort = Cohort.synthetic(users, seed)
+
+    start = time.perf_counter()
+    plan = plan_calls(cohort, seed)
+    vectorized = time.perf_counter() - start
+
+    # Per-user path on a sample (rows rebuilt as the dicts pre-call passes)
+    sample = min(scalar_sample, users)
+    inverse_zone = {name: name.replace("_", " ") for name in QUIT_ZONE_NAMES}
+    start = time.perf_counter()
+    for i in range(sample):
+        streak = int(cohort.streak[i])
+        kept = int(cohort.kept_promise[i])
+        zones = [
+            inverse_zone[name]
+            for bit, name in enumerate(QUIT_ZONE_NAMES)
+            if cohort.quit_zone_mask[i] >> bit & 1
+        ][:1]
+        last_type = int(cohort.last_call_type[i])
+        last_mood = int(cohort.last_mood[i])
+        user_context = {
+            "status": {"current_streak_days": streak},
+            "future_self": {"quit_pattern": zones[0] if zones else ""},
+        }
+        call_memory = {
+            "last_call_type": CALL_TYPE_NAMES[last_type] if last_type >= 0 else None,
+            "last_mood": MOOD_NAMES[last_mood] if last_mood >= 0 else None,
+        }
+        call_type = select_call_type(user_context, call_memory, streak)
+        select_mood(user_context, call_memory, call_type.name, None if kept < 0 else bool(kept))
+    scalar = (time.perf_counter() - start) * users / sample
+
+    type_share = np.bincount(plan.call_type, minlength=len(CALL_TYPE_NAMES)) / users
+    mood_share = np.bincount(plan.mood, minlength=len(MOOD_NAMES)) / users
+    return {
+        "users": users,
+        "seed": seed,
+        "vectorized_ms": round(vectorized * 1000, 1),
+        "per_user_ms_extrapolated": round(scalar * 1000, 1),
+        "speedup": round(scalar / vectorized, 1) if vectorized else None,
+        "call_type_share": {n: round(float(s), 3) for n, s in zip(CALL_TYPE_NAMES, type_share)},
+        "mood_share": {n: round(float(s), 3) for n, s in zip(MOOD_NAMES, mood_share)},
+        "milestones": int(plan.is_milestone.sum()),
+        "in_quit_zone": int(plan.in_quit_zone.sum()),
+    }
+
+
+__all__ = [
+    "Cohort",
+    "CallPlan",
+    "CallPlanStore",
+    "PlannedCall",
+    "plan_calls",
+    "select_call_types",
+    "select_moods",
+    "in_quit_zone",
+    "get_planned_call",
+    "fetch_due_cohort",
+    "is_due",
+    "benchmark",
+    "CALL_PLAN_PATH",
+]
+
+
+if __name__ == "__main__":
+    import argparse
+    import json
+    import sys
+    from pathlib import Path
+
+    AGENT_DIR = Path(__file__).parent.parent
+    if str(AGENT_DIR) not in sys.path:
+        sys.path.insert(0, str(AGENT_DIR))
+
+    parser = argparse.ArgumentParser(description="Batch call planner")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    plan_cmd = sub.add_parser("plan", help="Plan calls for the next window")
+    plan_cmd.add_argument("--window-minutes", type=int, default=60)
+    plan_cmd.add_argument("--seed", type=int, default=None)
+    plan_cmd.add_argument("--out", default=CALL_PLAN_PATH or "plans/next.npz")
+
+    bench_cmd = sub.add_parser("bench", help="Benchmark on a synthetic cohort")
+    bench_cmd.add_argument("--users", type=int, default=100_000)
+    bench_cmd.add_argument("--seed", type=int, default=1)
+
+    args = parser.parse_args()
+
+    if args.command == "bench":
+        print(json.dumps(benchmark(args.users, args.seed), indent=2))
+    else:
+        start_at = datetime.now(timezone.utc).replace(second=0, microsecond=0)
+        end_at = start_at + timedelta(minutes=args.window_minutes)
+        seed = args.seed if args.seed is not None else int(start_at.timestamp())
+
+        rows = asyncio.run(fetch_due_cohort(start_at, end_at))
+        plan = plan_calls(Cohort.from_rows(rows), seed, start_at.timestamp(), end_at.timestamp())
+        plan.save(args.out)
+        print(f"🗓️ Planned {len(plan)} calls (seed {seed}) -> {args.out}")
@@ -0,0 +1,336 @@
+"""
+Dispatch Planner
+================
+
+Builds the outbound call schedule for a day and smooths its bursts.
+
+Every user is called at `users.call_time` in their `timezone`. Popular
+times (7:00, 21:00) line up across users in the same timezone, so each
+of those minutes starts a herd of simultaneous handle_call_request and
+fetch_user_context calls, and LLM and Supabase load spikes with it.
+
+The planner:
+1. converts each user's local call_time to a UTC minute (zoneinfo, DST-aware)
+   and buckets requests by minute
+2. lets each call move within a tolerance window around its requested
+   minute (DISPATCH_TOLERANCE_EARLY before, DISPATCH_TOLERANCE_LATE after)
+3. finds the lowest per-minute dispatch rate that still fits every call in
+   its window (binary search over an earliest-deadline-first assignment,
+   which is optimal for unit-length jobs), unless DISPATCH_MAX_PER_MINUTE
+   fixes the rate
+4. exposes the planned per-minute dispatches and concurrent calls, so
+   downstream load follows a predictable curve
+
+Assignment is deterministic: ties are broken by requested minute and
+user_id, so the same users produce the same schedule.
+
+Usage:
+    cd agent
+
+    # Plan tomorrow (UTC) from Supabase, write the schedule as JSON
+    uv run python -m services.dispatch_planner --date 2026-01-15 --out schedule.json
+
+    # Synthetic cohort
+    uv run python -m services.dispatch_planner --synthetic 20000
+
+Configuration via environment variables:
+- DISPATCH_TOLERANCE_EARLY: minutes a call may move earlier (default 2)
+- DISPATCH_TOLERANCE_LATE: minutes a call may move later (default 5)
+- DISPATCH_MAX_PER_MINUTE: fixed dispatch rate (default 0 = lowest feasible)
+- DISPATCH_CALL_MINUTES: average call length for concurrency (default 3)
+"""
+
+import heapq
+import os
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta, timezone
+from typing import Optional
+from zoneinfo import ZoneInfo
+
+import aiohttp
+
+SUPABASE_URL = os.getenv("SUPABASE_URL")
+SUPABASE_SERVICE_KEY = os.getenv("SUPABASE_SERVICE_KEY")
+
+DISPATCH_TOLERANCE_EARLY = int(os.getenv("DISPATCH_TOLERANCE_EARLY", "2"))
+DISPATCH_TOLERANCE_LATE = int(os.getenv("DISPATCH_TOLERANCE_LATE", "5"))
+DISPATCH_MAX_PER_MINUTE = int(os.getenv("DISPATCH_MAX_PER_MINUTE", "0"))
+DISPATCH_CALL_MINUTES = int(os.getenv("DISPATCH_CALL_MINUTES", "3"))
+
+
+def requested_minute(
+    call_time: Optional[str], tz_name: Optional[str], day: date
+) -> Optional[datetime]:
+    """UTC minute of a user's local call_time on `day` (their local date), or None."""
+    if not call_time:
+        return None
+    try:
+        tz = ZoneInfo(tz_name or "UTC")
+        hour, minute = (int(p) for p in call_time.split(":")[:2])
+    except (ValueError, KeyError):
+        return None
+    local = datetime(day.year, day.month, day.day, hour, minute, tzinfo=tz)
+    return local.astimezone(timezone.utc)
+
+
+@dataclass(slots=True)
+class Dispatch:
+    """One planned outbound call."""
+
+    user_id: str
+    requested_at: datetime
+    dispatch_at: datetime
+
+    @property
+    def shift_minutes(self) -> int:
+        return int((self.dispatch_at - self.requested_at).total_seconds() // 60)
+
+
+@dataclass
+class DispatchSchedule:
+    """A day's dispatches plus the per-minute curves they produce."""
+
+    dispatches: list[Dispatch]
+    rate: int  # Max dispatches per minute
+    call_minutes: int = DISPATCH_CALL_MINUTES
+    unscheduled: list[str] = field(default_factory=list)  # Missing/invalid call_time
+
+    def requested_per_minute(self) -> Counter:
+        return Counter(d.requested_at for d in self.dispatches)
+
+    def planned_per_minute(self) -> Counter:
+        return Counter(d.dispatch_at for d in self.dispatches)
+
+    def concurrency(self, per_minute: Optional[Counter] = None) -> dict[datetime, int]:
+        """Expected calls in progress each minute (each call lasts call_minutes)."""
+        per_minute = self.planned_per_minute() if per_minute is None else per_minute
+        curve: Counter = Counter()
+        for minute, count in per_minute.items():
+            for offset in range(self.call_minutes):
+                curve[minute + timedelta(minutes=offset)] += count
+        return dict(sorted(curve.items()))
+
+    def curve(self) -> list[dict]:
+        """Per-minute requested vs planned dispatches and concurrency."""
+        requested = self.requested_per_minute()
+        planned = self.planned_per_minute()
+        concurrency = self.concurrency(planned)
+        minutes = sorted(set(requested) | set(planned) | set(concurrency))
+        return [
+            {
+                "minute": m.isoformat(),
+                "requested": requested.get(m, 0),
+                "dispatched": planned.get(m, 0),
+                "concurrent": concurrency.get(m, 0),
+            }
+            for m in minutes
+        ]
+
+    def summary(self) -> dict:
+        requested = self.requested_per_minute()
+        planned = self.planned_per_minute()
+        shifts = [abs(d.shift_minutes) for d in self.dispatches]
+        return {
+            "calls": len(self.dispatches),
+            "unscheduled": len(self.unscheduled),
+            "rate_per_minute": self.rate,
+            "peak_requested_per_minute": max(requested.values(), default=0),
+            "peak_dispatched_per_minute": max(planned.values(), default=0),
+            "peak_concurrency_unsmoothed": max(self.concurrency(requested).values(), default=0),
+            "peak_concurrency": max(self.concurrency(planned).values(), default=0),
+            "moved_calls": sum(1 for s in shifts if s),
+            "max_shift_minutes": max(shifts, default=0),
+        }
+
+    def to_json(self) -> list[dict]:
+        return [
+            {
+                "user_id": d.user_id,
+                "requested_at": d.requested_at.isoformat(),
+                "dispatch_at": d.dispatch_at.isoformat(),
+            }
+            for d in sorted(self.dispatches, key=lambda d: (d.dispatch_at, d.user_id))
+        ]
+
+
+def _assign(
+    requests: list[tuple[datetime, str]], rate: int, early: int, late: int
+) -> Optional[list[Dispatch]]:
+    """
+    Earliest-deadline-first: walk the minutes in order, each minute dispatch
+    up to `rate` released calls with the soonest deadlines. None if any call
+    would miss its window.
+    """
+    if not requests:
+        return []
+    one = timedelta(minutes=1)
+    # (release, deadline, requested, user_id), sorted by release
+    jobs = sorted(
+        (requested - early * one, requested + late * one, requested, user_id)
+        for requested, user_id in requests
+    )
+    dispatches: list[Dispatch] = []
+    ready: list[tuple[datetime, datetime, str]] = []
+    minute = jobs[0][0]
+    index = 0
+
+    while index < len(jobs) or ready:
+        if not ready and index < len(jobs) and jobs[index][0] > minute:
+            minute = jobs[index][0]  # Skip idle minutes
+        while index < len(jobs) and jobs[index][0] <= minute:
+            _, deadline, requested, user_id = jobs[index]
+            heapq.heappush(ready, (deadline, requested, user_id))
+            index += 1
+        for _ in range(rate):
+            if not ready:
+                break
+            deadline, requested, user_id = heapq.heappop(ready)
+            if deadline < minute:
+                return None
+            dispatches.append(Dispatch(user_id, requested, minute))
+        minute += one
+
+    return dispatches
+
+
+def plan_dispatch(
+    users: list[dict],
+    day: date,
+    early: int = DISPATCH_TOLERANCE_EARLY,
+    late: int = DISPATCH_TOLERANCE_LATE,
+    max_per_minute: int = DISPATCH_MAX_PER_MINUTE,
+    call_minutes: int = DISPATCH_CALL_MINUTES,
+) -> DispatchSchedule:
+    """
+    Plan the day's calls for users with keys id/user_id, timezone, call_time.
+
+    With max_per_minute=0 the lowest rate that keeps every call within its
+    tolerance window is used. A fixed rate that can't fit every call is
+    raised until it does (calls are never dropped).
+    """
+    requests: list[tuple[datetime, str]] = []
+    unscheduled: list[str] = []
+    for user in users:
+        user_id = user.get("user_id") or user.get("id")
+        minute = requested_minute(user.get("call_time"), user.get("timezone"), day)
+        if minute is None:
+            unscheduled.append(user_id)
+        else:
+            requests.append((minute, user_id))
+
+    peak = max(Counter(m for m, _ in requests).values(), default=0)
+    if max_per_minute > 0:
+        low = max_per_minute
+    else:
+        # Can't beat spreading the biggest bucket over its whole window
+        low = max(1, -(-peak // (early + late + 1)))
+    high = max(low, peak)
+
+    # Binary search the lowest feasible rate in [low, high]
+    best = _assign(requests, high, early, late)
+    while low < high:
+        rate = (low + high) // 2
+        attempt = _assign(requests, rate, early, late)
+        if attempt is None:
+            low = rate + 1
+        else:
+            high, best = rate, attempt
+
+    return DispatchSchedule(
+        dispatches=best or [],
+        rate=low,
+        call_minutes=call_minutes,
+        unscheduled=unscheduled,
+    )
+
+
+async def fetch_scheduled_users() -> list[dict]:
+    """Fetch id, timezone and call_time for every user from Supabase."""
+    if not SUPABASE_URL or not SUPABASE_SERVICE_KEY:
+        print("⚠️ Supabase not configured, cannot fetch users")
+        return []
+
+    headers = {
+        "apikey": SUPABASE_SERVICE_KEY,
+        "Authorization": f"Bearer {SUPABASE_SERVICE_KEY}",
+    }
+    users: list[dict] = []
+    page = 1000
+    async with aiohttp.ClientSession() as session:
+        while True:
+            async with session.get(
+                f"{SUPABASE_URL}/rest/v1/users",
+                params={
+                    "select": "id,timezone,call_time",
+                    "limit": str(page),
+                    "offset": str(len(users)),
+                },
+                headers=headers,
+            ) as resp:
+                batch = await resp.json() if resp.status == 200 else []
+            users.extend(batch)
+            if len(batch) < page:
+                return users
+
+
+def synthetic_users(count: int, seed: int = 0) -> list[dict]:
+    """Users clustered on popular call times across a few timezones."""
+    import random
+
+    rng = random.Random(seed)
+    zones = ["America/New_York", "America/Chicago", "America/Los_Angeles", "Europe/London"]
+    popular = ["07:00", "07:30", "08:00", "21:00", "21:30"]
+    users = []
+    for i in range(count):
+        if rng.random() < 0.7:
+            call_time = rng.choice(popular)
+        else:
+            call_time = f"{rng.randint(6, 22):02d}:{rng.choice([0, 15, 30, 45]):02d}"
+        users.append({"id": f"user-{i}", "timezone": rng.choice(zones), "call_time": call_time})
+    return users
+
+
+__all__ = [
+    "Dispatch",
+    "DispatchSchedule",
+    "plan_dispatch",
+    "requested_minute",
+    "fetch_scheduled_users",
+    "synthetic_users",
+]
+
+
+if __name__ == "__main__":
+    import argparse
+    import asyncio
+    import json
+    import sys
+    from pathlib import Path
+
+    AGENT_DIR = Path(__file__).parent.parent
+    if str(AGENT_DIR) not in sys.path:
+        sys.path.insert(0, str(AGENT_DIR))
+
+    parser = argparse.ArgumentParser(description="Plan smoothed outbound call dispatch")
+    parser.add_argument("--date", help="Local call date (default: tomorrow, UTC)")
+    parser.add_argument("--synthetic", type=int, default=0, help="Plan N synthetic users")
+    parser.add_argument("--early", type=int, default=DISPATCH_TOLERANCE_EARLY)
+    parser.add_argument("--late", type=int, default=DISPATCH_TOLERANCE_LATE)
+    parser.add_argument("--rate", type=int, default=DISPATCH_MAX_PER_MINUTE)
+    parser.add_argument("--out", help="Write schedule + curve JSON here")
+    args = parser.parse_args()
+
+    plan_day = (
+        date.fromisoformat(args.date)
+        if args.date
+        else (datetime.now(timezone.utc) + timedelta(days=1)).date()
+    )
+    users = synthetic_users(args.synthetic) if args.synthetic else asyncio.run(fetch_scheduled_users())
+    schedule = plan_dispatch(users, plan_day, args.early, args.late, args.rate)
+
+    print(json.dumps(schedule.summary(), indent=2))
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump({"schedule": schedule.to_json(), "curve": schedule.curve()}, f, indent=2)
+        print(f"Wrote {len(schedule.dispatches)} dispatches to {args.out}")
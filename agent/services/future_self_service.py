@@ -6,18 +6,14 @@ Service for managing future_self, future_self_pillars, and pillar_checkins.
 Integrates with Supermemory for rich narrative context.
 """
 
+import importlib.util
 import os
 from typing import Optional, List, Dict, Any
-from datetime import datetime
+from datetime import datetime, timedelta, timezone
 import logging
 
-try:
-    from supabase import create_client
-
-    HAS_SUPABASE = True
-except ImportError:
-    create_client = None  # type: ignore
-    HAS_SUPABASE = False
+# supabase is imported when the first client is created (slow import)
+HAS_SUPABASE = importlib.util.find_spec("supabase") is not None
 
 from conversation.future_self import (
     Pillar,
@@ -39,8 +35,10 @@ def get_supabase_client() -> Any:
     """Get or create Supabase client."""
     global _supabase_client
     if _supabase_client is None:
-        if SUPABASE_URL and SUPABASE_SERVICE_KEY and create_client:
+        if SUPABASE_URL and SUPABASE_SERVICE_KEY and HAS_SUPABASE:
             try:
+                from supabase import create_client
+
                 _supabase_client = create_client(SUPABASE_URL, SUPABASE_SERVICE_KEY)
             except Exception as e:
                 logger.error(f"Failed to create Supabase client: {e}")
@@ -658,19 +656,36 @@ async def create_complete_future_self(
 async def get_user_checkin_summary(user_id: str, days: int = 7) -> Dict[str, Any]:
     """
     Get check-in summary for prompt context.
-    Returns aggregated data across all pillars.
+    Returns aggregated data across all pillars, plus identity alignment.
+
+    Aggregated server-side (get_checkin_summary over pillar_checkin_daily),
+    so the cost doesn't grow with the user's check-in history.
     """
     client = get_supabase_client()
     if not client:
         return {}
 
     try:
-        # Get recent checkins across all pillars
+        result = client.rpc(
+            "get_checkin_summary", {"p_user_id": user_id, "p_days": days}
+        ).execute()
+        summary = result.data or {}
+        return summary if summary.get("total_checkins") else {}
+
+    except Exception as e:
+        logger.warning(f"get_checkin_summary RPC failed, scanning check-ins: {e}")
+        return _scan_checkin_summary(client, user_id, days)
+
+
+def _scan_checkin_summary(client: Any, user_id: str, days: int) -> Dict[str, Any]:
+    """Client-side fallback for databases without migration 017."""
+    since = (datetime.now(timezone.utc) - timedelta(days=days)).isoformat()
+    try:
         result = (
             client.table("pillar_checkins")
-            .select("showed_up, excuse_used, pillar_id")
+            .select("showed_up, excuse_used")
             .eq("user_id", user_id)
-            .gte("checked_at", f"now() - interval '{days} days'")
+            .gte("checked_at", since)
             .execute()
         )
 
@@ -680,7 +695,6 @@ async def get_user_checkin_summary(user_id: str, days: int = 7) -> Dict[str, Any
         checkins = result.data
         total = len(checkins)
         kept = sum(1 for c in checkins if c.get("showed_up"))
-        broken = total - kept
 
         # Count excuse patterns
         excuses: Dict[str, int] = {}
@@ -696,7 +710,7 @@ async def get_user_checkin_summary(user_id: str, days: int = 7) -> Dict[str, Any
         return {
             "total_checkins": total,
             "kept": kept,
-            "broken": broken,
+            "broken": total - kept,
             "kept_rate": round(kept / total * 100) if total > 0 else 0,
             "most_common_excuse": most_common_excuse,
             "excuse_count": len(excuses),
@@ -0,0 +1,439 @@
+"""
+Local Memory Index
+==================
+
+Per-user vector index mirroring what SupermemoryService ingests
+(onboarding profile, voice transcripts, call transcripts, live memories),
+so in-call searchMemories is answered in-process in milliseconds and only
+falls back to Supermemory on a miss. It needs no network, so memory search
+still works offline or without a SUPERMEMORY_API_KEY.
+
+- Embeddings are computed locally by feature hashing: lowercase word
+  unigrams and bigrams, sublinear term weights, hashed (crc32, stable
+  across processes) into MEMORY_INDEX_DIM signed buckets, L2-normalised.
+  Lexical rather than semantic, but deterministic and dependency-free
+  beyond NumPy.
+- Each memory is split into chunks (lines merged up to CHUNK_WORDS words),
+  so a long transcript matches on the part that's relevant.
+- Search is one matrix-vector product (cosine similarity) over the user's
+  chunk matrix; results under MEMORY_INDEX_MIN_SCORE are a miss.
+- Each user's index is an append-only file in MEMORY_INDEX_DIR: one record
+  (text, metadata, embedding) per chunk, so adding a memory appends its
+  chunks instead of rewriting the index. The file is rewritten (atomically)
+  only when old chunks are dropped. It is reloaded when another worker
+  changes it. Recently used users are kept in memory (LRU).
+- add() does disk I/O - call it off the event loop (asyncio.to_thread),
+  as SupermemoryService.index_locally does. search() may run on the loop.
+
+Container tags "user_<id>" (live-call tools) and "<id>" (post-call) refer
+to the same user and share one index.
+
+Usage:
+    from services.memory_index import memory_index
+
+    await asyncio.to_thread(memory_index.add, user_id, content, metadata)
+    hits = memory_index.search(user_id, "excuses about work", limit=5)
+
+    # Search a user's index from the command line
+    uv run python -m services.memory_index search <user_id> "why did they quit"
+
+Configuration via environment variables:
+- MEMORY_INDEX_DIR: index directory (default ./memory_index)
+- MEMORY_INDEX_DIM: embedding dimensions (default 1024)
+- MEMORY_INDEX_MIN_SCORE: minimum cosine similarity for a hit (default 0.15)
+- MEMORY_INDEX_MAX_CHUNKS: chunks kept per user (default 4000). The oldest
+  are dropped in batches, once a user is TRIM_SLACK over the limit
+- MEMORY_INDEX_CACHE_USERS: user indexes kept in memory (default 256)
+"""
+
+import json
+import math
+import os
+import re
+import struct
+import threading
+import time
+import zlib
+from collections import Counter, OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+MEMORY_INDEX_DIR = os.getenv("MEMORY_INDEX_DIR", "./memory_index")
+MEMORY_INDEX_DIM = int(os.getenv("MEMORY_INDEX_DIM", "1024"))
+MEMORY_INDEX_MIN_SCORE = float(os.getenv("MEMORY_INDEX_MIN_SCORE", "0.15"))
+MEMORY_INDEX_MAX_CHUNKS = int(os.getenv("MEMORY_INDEX_MAX_CHUNKS", "4000"))
+MEMORY_INDEX_CACHE_USERS = int(os.getenv("MEMORY_INDEX_CACHE_USERS", "256"))
+
+# Max words per chunk (consecutive short lines are merged up to this)
+CHUNK_WORDS = 25
+# Fraction over MEMORY_INDEX_MAX_CHUNKS before the oldest chunks are dropped
+# (and the file rewritten), so trimming is amortised over many adds
+TRIM_SLACK = 0.25
+
+# Index file: header (magic, dim), then per chunk a u32 length, JSON
+# {"text", "metadata"} and the float32 embedding
+_FILE_HEADER = struct.Struct("<4sI")
+_MAGIC = b"MIX1"
+_RECORD_HEADER = struct.Struct("<I")
+
+_TOKEN = re.compile(r"[a-z0-9']+")
+_RULE = re.compile(r"^[=\-_*#\s]*$")  # Separator lines like "=====" carry nothing
+_STOPWORDS = frozenset(
+    "a an and are as at be but by do for from had has have he her his i if in "
+    "is it its me my no not of on or our she so that the their them they this "
+    "to was we were what when which who will with you your".split()
+)
+
+
+# =============================================================================
+# EMBEDDING
+# =============================================================================
+
+
+def _features(text: str) -> Counter:
+    words = [w for w in _TOKEN.findall(text.lower()) if w not in _STOPWORDS]
+    features = Counter(words)
+    features.update(f"{a} {b}" for a, b in zip(words, words[1:]))
+    return features
+
+
+def embed(texts: List[str], dim: int = MEMORY_INDEX_DIM) -> np.ndarray:
+    """Hashed bag-of-words embeddings, one L2-normalised row per text."""
+    vectors = np.zeros((len(texts), dim), dtype=np.float32)
+    for row, text in enumerate(texts):
+        for feature, count in _features(text).items():
+            h = zlib.crc32(feature.encode())
+            sign = 1.0 if h & 0x80000000 else -1.0
+            vectors[row, h % dim] += sign * (1.0 + math.log(count))
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    np.divide(vectors, norms, out=vectors, where=norms > 0)
+    return vectors
+
+
+def chunk_text(content: str, max_words: int = CHUNK_WORDS) -> List[str]:
+    """Split a memory into chunks of whole lines, up to max_words each."""
+    chunks: List[str] = []
+    current: List[str] = []
+    words = 0
+    for raw in content.splitlines():
+        if not raw.strip() or _RULE.match(raw):
+            continue
+        line_words = raw.split()
+        # Lines longer than a chunk are cut into max_words pieces
+        for start in range(0, len(line_words), max_words):
+            piece = line_words[start : start + max_words]
+            if current and words + len(piece) > max_words:
+                chunks.append(" ".join(current))
+                current, words = [], 0
+            current.append(" ".join(piece))
+            words += len(piece)
+    if current:
+        chunks.append(" ".join(current))
+    return chunks
+
+
+def user_key(container_tag: str) -> str:
+    """Index key for a container tag ("user_<id>" and "<id>" are the same user)."""
+    return container_tag[len("user_") :] if container_tag.startswith("user_") else container_tag
+
+
+# =============================================================================
+# PER-USER INDEX
+# =============================================================================
+
+
+@dataclass
+class MemoryHit:
+    """One search result."""
+
+    content: str
+    score: float
+    metadata: Dict[str, Any]
+
+
+class UserMemoryIndex:
+    """Chunk texts, their embeddings and per-chunk metadata for one user."""
+
+    def __init__(self, dim: int = MEMORY_INDEX_DIM):
+        self.dim = dim
+        self.texts: List[str] = []
+        self.metadata: List[str] = []  # JSON per chunk
+        self._rows = np.zeros((0, dim), dtype=np.float32)  # Grows by doubling
+        self._seen: set[str] = set()
+        self._saved: Optional[int] = 0  # Chunks on disk; None = rewrite the file
+        self._lock = threading.Lock()  # add() runs in a worker thread
+
+    def __len__(self) -> int:
+        return len(self.texts)
+
+    @property
+    def vectors(self) -> np.ndarray:
+        return self._rows[: len(self.texts)]
+
+    def add(self, content: str, metadata: Dict[str, Any], max_chunks: int) -> int:
+        """Add a memory's chunks (duplicates skipped). Returns chunks added."""
+        chunks = [c for c in chunk_text(content) if c not in self._seen]
+        if not chunks:
+            return 0
+        vectors = embed(chunks, self.dim)
+        meta = json.dumps(metadata, default=str)
+
+        with self._lock:
+            size = len(self.texts)
+            if size + len(chunks) > len(self._rows):
+                capacity = max(2 * len(self._rows), size + len(chunks), 64)
+                rows = np.zeros((capacity, self.dim), dtype=np.float32)
+                rows[:size] = self._rows[:size]
+                self._rows = rows
+            self._rows[size : size + len(chunks)] = vectors
+            # New lists, so a search holding the old ones stays consistent
+            self.texts = self.texts + chunks
+            self.metadata = self.metadata + [meta] * len(chunks)
+            self._seen.update(chunks)
+
+            overflow = len(self.texts) - max_chunks
+            if overflow > max_chunks * TRIM_SLACK:
+                self._seen.difference_update(self.texts[:overflow])
+                self._rows = self._rows[overflow : len(self.texts)].copy()
+                self.texts = self.texts[overflow:]
+                self.metadata = self.metadata[overflow:]
+                self._saved = None
+        return len(chunks)
+
+    def search(self, query: str, limit: int, min_score: float) -> List[MemoryHit]:
+        with self._lock:
+            texts, metadata = self.texts, self.metadata
+            vectors = self._rows[: len(texts)]
+        if not texts:
+            return []
+        scores = vectors @ embed([query], self.dim)[0]
+        k = min(limit, len(scores))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return [
+            MemoryHit(texts[i], float(scores[i]), json.loads(metadata[i]))
+            for i in top
+            if scores[i] >= min_score
+        ]
+
+    def _records(self, start: int, end: int) -> bytes:
+        parts = []
+        for i in range(start, end):
+            head = json.dumps({"text": self.texts[i], "metadata": self.metadata[i]}).encode()
+            parts += [_RECORD_HEADER.pack(len(head)), head, self._rows[i].tobytes()]
+        return b"".join(parts)
+
+    def save(self, path: Path) -> None:
+        """Append the chunks added since the last save (rewrite after a trim)."""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with self._lock:
+            size = len(self.texts)
+            rewrite = self._saved is None or not path.exists()
+            records = self._records(0 if rewrite else self._saved, size)
+            self._saved = size
+
+        if rewrite:
+            tmp = path.with_name(f"{path.name}.tmp")
+            with open(tmp, "wb") as f:
+                f.write(_FILE_HEADER.pack(_MAGIC, self.dim) + records)
+            os.replace(tmp, path)  # Readers never see a half-written index
+        else:
+            with open(path, "ab") as f:
+                f.write(records)
+
+    @classmethod
+    def load(cls, path: Path, dim: int = MEMORY_INDEX_DIM) -> "UserMemoryIndex":
+        data = path.read_bytes()
+        if len(data) < _FILE_HEADER.size:
+            raise ValueError("Truncated index header")
+        magic, file_dim = _FILE_HEADER.unpack_from(data)
+        if magic != _MAGIC:
+            raise ValueError("Not a memory index file")
+        if file_dim != dim:
+            raise ValueError(f"Index has {file_dim} dims, expected {dim}")
+
+        index = cls(dim)
+        heads: List[bytes] = []
+        offsets: List[int] = []
+        row_bytes = dim * 4
+        offset = _FILE_HEADER.size
+        while offset + _RECORD_HEADER.size <= len(data):
+            (length,) = _RECORD_HEADER.unpack_from(data, offset)
+            start = offset + _RECORD_HEADER.size
+            end = start + length + row_bytes
+            if end > len(data):
+                break  # Record still being appended by another worker
+            heads.append(data[start : start + length])
+            offsets.append(start + length)
+            offset = end
+
+        # One JSON parse for all records
+        records = json.loads(b"[" + b",".join(heads) + b"]")
+        texts = [r["text"] for r in records]
+        index._rows = np.zeros((len(texts), dim), dtype=np.float32)
+        for row, at in enumerate(offsets):
+            index._rows[row] = np.frombuffer(data, dtype=np.float32, count=dim, offset=at)
+        index.texts = texts
+        index.metadata = [r["metadata"] for r in records]
+        index._seen = set(texts)
+        index._saved = len(texts)
+        return index
+
+
+# =============================================================================
+# INDEX STORE
+# =============================================================================
+
+
+class MemoryIndex:
+    """On-disk per-user indexes with an in-memory LRU in front."""
+
+    def __init__(
+        self,
+        directory: str = MEMORY_INDEX_DIR,
+        dim: int = MEMORY_INDEX_DIM,
+        min_score: float = MEMORY_INDEX_MIN_SCORE,
+        max_chunks: int = MEMORY_INDEX_MAX_CHUNKS,
+        cache_users: int = MEMORY_INDEX_CACHE_USERS,
+    ):
+        self.directory = Path(directory)
+        self.dim = dim
+        self.min_score = min_score
+        self.max_chunks = max_chunks
+        self.cache_users = cache_users
+        self.hits = 0
+        self.misses = 0
+        self._cache: OrderedDict[str, tuple[float, UserMemoryIndex]] = OrderedDict()
+        self._lock = threading.Lock()  # Cache is shared with add() threads
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{key}.idx"
+
+    def _get(self, container_tag: str) -> UserMemoryIndex:
+        key = user_key(container_tag)
+        path = self._path(key)
+        try:
+            mtime = os.stat(path).st_mtime
+        except FileNotFoundError:
+            mtime = 0.0
+
+        with self._lock:
+            cached = self._cache.get(key)
+            if cached is not None and cached[0] == mtime:
+                self._cache.move_to_end(key)
+                return cached[1]
+
+        index = UserMemoryIndex(self.dim)
+        if mtime:
+            try:
+                index = UserMemoryIndex.load(path, self.dim)
+            except (OSError, ValueError, KeyError) as e:
+                print(f"⚠️ Could not load memory index {path}: {e}")
+        self._remember(key, mtime, index)
+        return index
+
+    def _remember(self, key: str, mtime: float, index: UserMemoryIndex) -> None:
+        with self._lock:
+            self._cache[key] = (mtime, index)
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.cache_users:
+                self._cache.popitem(last=False)
+
+    def add(
+        self,
+        container_tag: str,
+        content: str,
+        metadata: Optional[Dict[str, Any]] = None,
+    ) -> int:
+        """
+        Index a memory for a user and persist it. Returns chunks added.
+
+        Blocking (embedding + file append) - run it in a thread from async code.
+        """
+        index = self._get(container_tag)
+        added = index.add(content, metadata or {}, self.max_chunks)
+        if not added:
+            return 0
+
+        key = user_key(container_tag)
+        path = self._path(key)
+        try:
+            index.save(path)
+            mtime = os.stat(path).st_mtime
+        except OSError as e:
+            print(f"⚠️ Could not save memory index for {key}: {e}")
+            mtime = -1.0  # Keep it in memory; reload if the file changes
+        self._remember(key, mtime, index)
+        return added
+
+    def search(
+        self,
+        container_tag: str,
+        query: str,
+        limit: int = 5,
+        min_score: Optional[float] = None,
+    ) -> List[MemoryHit]:
+        """Top chunks by cosine similarity (empty list on a miss)."""
+        hits = self._get(container_tag).search(
+            query, limit, self.min_score if min_score is None else min_score
+        )
+        if hits:
+            self.hits += 1
+        else:
+            self.misses += 1
+        return hits
+
+    def count(self, container_tag: str) -> int:
+        return len(self._get(container_tag))
+
+    @property
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "users_cached": len(self._cache),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+        }
+
+
+# Singleton instance
+memory_index = MemoryIndex()
+
+
+__all__ = [
+    "MemoryHit",
+    "MemoryIndex",
+    "UserMemoryIndex",
+    "chunk_text",
+    "embed",
+    "user_key",
+    "memory_index",
+]
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Local per-user memory index")
+    sub = parser.add_subparsers(dest="command", required=True)
+    search_cmd = sub.add_parser("search", help="Search a user's index")
+    search_cmd.add_argument("user_id")
+    search_cmd.add_argument("query")
+    search_cmd.add_argument("--limit", type=int, default=5)
+    stats_cmd = sub.add_parser("stats", help="Chunks per user")
+    args = parser.parse_args()
+
+    if args.command == "search":
+        start = time.perf_counter()
+        results = memory_index.search(args.user_id, args.query, args.limit)
+        elapsed = (time.perf_counter() - start) * 1000
+        for hit in results:
+            print(f"{hit.score:.3f}  [{hit.metadata.get('type', '?')}]  {hit.content[:120]}")
+        print(f"{len(results)} hits in {elapsed:.1f}ms ({memory_index.count(args.user_id)} chunks)")
+    else:
+        for path in sorted(memory_index.directory.glob("*.idx")):
+            print(f"{path.stem}: {memory_index.count(path.stem)} chunks")
@@ -0,0 +1,502 @@
+"""
+Memory Write Queue
+==================
+
+Write-behind queue for Supermemory ingestion.
+
+Call transcripts (post-call) and addMemory tool calls (live call) used to
+await a Supermemory round trip before the call could move on. They now go
+through this queue instead:
+
+1. enqueue() writes the memory to a local spool file and returns at once
+2. a background flusher picks up due entries in batches, coalesces
+   live-call facts for the same user into one memory, and sends the batch
+   with bounded concurrency
+3. failed writes are retried with exponential backoff; entries that keep
+   failing are moved to the spool's dead/ directory
+4. entries left on disk by a crash or restart are picked up on the next
+   start (spool files of a still-running worker are left alone). Spool
+   files are owned by pid plus a per-run nonce, since a restarted
+   container usually gets the same pid as the process that crashed
+
+When more than MEMORY_QUEUE_MAX_PENDING entries are waiting, new writes are
+rejected (enqueue returns False) so a Supermemory outage can't grow the
+spool without bound. stats reports depth, lag and outcomes.
+
+Usage:
+    from services.memory_queue import memory_queue
+
+    memory_queue.enqueue(container_tag, content, metadata)
+
+    # Inspect a spool directory
+    uv run python -m services.memory_queue --dir ./memory_queue
+
+Configuration via environment variables:
+- MEMORY_QUEUE_DIR: spool directory (default ./memory_queue)
+- MEMORY_QUEUE_BATCH: max entries sent per flush (default 20)
+- MEMORY_QUEUE_CONCURRENCY: max concurrent Supermemory writes (default 4)
+- MEMORY_QUEUE_INTERVAL: seconds between flushes when idle (default 2)
+- MEMORY_QUEUE_RETRIES: attempts before an entry is dead-lettered (default 5)
+- MEMORY_QUEUE_MAX_PENDING: back-pressure limit (default 1000)
+"""
+
+import asyncio
+import itertools
+import json
+import os
+import secrets
+import time
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+MEMORY_QUEUE_DIR = os.getenv("MEMORY_QUEUE_DIR", "./memory_queue")
+MEMORY_QUEUE_BATCH = int(os.getenv("MEMORY_QUEUE_BATCH", "20"))
+MEMORY_QUEUE_CONCURRENCY = int(os.getenv("MEMORY_QUEUE_CONCURRENCY", "4"))
+MEMORY_QUEUE_INTERVAL = float(os.getenv("MEMORY_QUEUE_INTERVAL", "2"))
+MEMORY_QUEUE_RETRIES = int(os.getenv("MEMORY_QUEUE_RETRIES", "5"))
+MEMORY_QUEUE_MAX_PENDING = int(os.getenv("MEMORY_QUEUE_MAX_PENDING", "1000"))
+
+# Backoff after the nth failure: RETRY_BASE * 2**(n-1), capped at RETRY_MAX
+RETRY_BASE = 2.0
+RETRY_MAX = 300.0
+
+# (container_tag, content, metadata) -> memory id or None on failure
+MemoryWriter = Callable[[str, str, Dict[str, Any]], Awaitable[Optional[str]]]
+
+
+@dataclass
+class QueuedMemory:
+    """One pending Supermemory write."""
+
+    id: str
+    container_tag: str
+    content: str
+    metadata: Dict[str, Any]
+    coalesce: bool = False  # Merge with other coalescible writes for this user
+    enqueued_at: float = field(default_factory=time.time)
+    attempts: int = 0
+    next_attempt_at: float = 0.0
+
+    def to_json(self) -> str:
+        return json.dumps(asdict(self))
+
+    @classmethod
+    def from_json(cls, text: str) -> "QueuedMemory":
+        return cls(**json.loads(text))
+
+
+@dataclass
+class MemoryQueueStats:
+    """Counters for the memory write queue."""
+
+    enqueued: int = 0
+    flushed: int = 0  # Entries written (coalesced entries count individually)
+    writes: int = 0  # Supermemory add calls made
+    coalesced: int = 0  # Entries merged into another entry's write
+    failures: int = 0  # Failed write attempts (will be retried)
+    dead: int = 0  # Entries given up on
+    rejected: int = 0  # Refused by back-pressure
+    recovered: int = 0  # Picked up from disk on start
+    depth: int = 0
+    oldest_lag_seconds: float = 0.0
+    last_flush_lag_seconds: float = 0.0  # Enqueue -> written, last flushed entry
+
+    def to_dict(self) -> dict:
+        data = asdict(self)
+        data["oldest_lag_seconds"] = round(self.oldest_lag_seconds, 1)
+        data["last_flush_lag_seconds"] = round(self.last_flush_lag_seconds, 1)
+        return data
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def coalesce_entries(entries: List[QueuedMemory]) -> List[List[QueuedMemory]]:
+    """
+    Group entries into writes: coalescible entries for the same container
+    become one write (duplicates dropped), everything else is written alone.
+    """
+    groups: Dict[str, List[QueuedMemory]] = {}
+    writes: List[List[QueuedMemory]] = []
+    for entry in entries:
+        if not entry.coalesce:
+            writes.append([entry])
+            continue
+        group = groups.get(entry.container_tag)
+        if group is None:
+            group = groups[entry.container_tag] = []
+            writes.append(group)
+        group.append(entry)
+    return writes
+
+
+def merge_entries(group: List[QueuedMemory]) -> tuple[str, Dict[str, Any]]:
+    """Content and metadata for one write covering a group of entries."""
+    if len(group) == 1:
+        return group[0].content, group[0].metadata
+
+    contents: List[str] = []
+    for entry in group:
+        if entry.content not in contents:
+            contents.append(entry.content)
+    types = sorted({str(e.metadata.get("type", "memory")) for e in group})
+    metadata = dict(group[0].metadata)
+    metadata.update(
+        {
+            "type": types[0] if len(types) == 1 else "coalesced",
+            "memory_types": ",".join(types),
+            "coalesced_count": len(group),
+            "timestamp": group[-1].metadata.get("timestamp", metadata.get("timestamp")),
+        }
+    )
+    return "\n".join(f"- {c}" for c in contents), metadata
+
+
+class MemoryWriteQueue:
+    """Disk-backed write-behind queue in front of Supermemory."""
+
+    def __init__(
+        self,
+        directory: str = MEMORY_QUEUE_DIR,
+        writer: Optional[MemoryWriter] = None,
+        batch_size: int = MEMORY_QUEUE_BATCH,
+        concurrency: int = MEMORY_QUEUE_CONCURRENCY,
+        interval: float = MEMORY_QUEUE_INTERVAL,
+        max_attempts: int = MEMORY_QUEUE_RETRIES,
+        max_pending: int = MEMORY_QUEUE_MAX_PENDING,
+    ):
+        self.directory = Path(directory)
+        self.batch_size = batch_size
+        self.concurrency = max(1, concurrency)
+        self.interval = interval
+        self.max_attempts = max_attempts
+        self.max_pending = max_pending
+        self.stats = MemoryQueueStats()
+        self._writer = writer
+        self._pending: Dict[str, QueuedMemory] = {}  # Insertion (enqueue) order
+        self._inflight: set[str] = set()
+        self._seq = itertools.count()
+        self._wake: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self._recovered = False
+        self._run_id: Optional[tuple[int, str]] = None  # (pid, nonce)
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    @property
+    def owner(self) -> str:
+        """Spool owner of this process run: "<pid>_<nonce>" (new nonce after fork)."""
+        pid = os.getpid()
+        if self._run_id is None or self._run_id[0] != pid:
+            self._run_id = (pid, secrets.token_hex(4))
+        return f"{pid}_{self._run_id[1]}"
+
+    # =========================================================================
+    # PRODUCER SIDE
+    # =========================================================================
+
+    def enqueue(
+        self,
+        container_tag: str,
+        content: str,
+        metadata: Optional[Dict[str, Any]] = None,
+        coalesce: bool = False,
+    ) -> bool:
+        """
+        Spool a memory write and return immediately.
+
+        Returns False if the queue is full (back-pressure) or the entry
+        couldn't be written to disk.
+        """
+        if len(self._pending) >= self.max_pending:
+            self.stats.rejected += 1
+            print(f"⚠️ Memory queue full ({len(self._pending)}), dropping write for {container_tag}")
+            return False
+
+        entry = QueuedMemory(
+            id=f"{self.owner}-{time.time_ns()}-{next(self._seq)}",
+            container_tag=container_tag,
+            content=content,
+            metadata=metadata or {},
+            coalesce=coalesce,
+        )
+        try:
+            self._spool(entry)
+        except OSError as e:
+            print(f"❌ Memory queue spool failed: {e}")
+            return False
+
+        self._pending[entry.id] = entry
+        self.stats.enqueued += 1
+        self._ensure_started()
+        if self._wake and len(self._pending) - len(self._inflight) >= self.batch_size:
+            self._wake.set()
+        return True
+
+    # =========================================================================
+    # SPOOL
+    # =========================================================================
+
+    def _path(self, entry_id: str) -> Path:
+        return self.directory / f"{entry_id}.json"
+
+    def _spool(self, entry: QueuedMemory) -> None:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        path = self._path(entry.id)
+        tmp = path.with_suffix(".tmp")
+        tmp.write_text(entry.to_json())
+        os.replace(tmp, path)
+
+    def _unspool(self, entry: QueuedMemory) -> None:
+        try:
+            self._path(entry.id).unlink()
+        except FileNotFoundError:
+            pass
+
+    def _dead_letter(self, entry: QueuedMemory) -> None:
+        dead_dir = self.directory / "dead"
+        try:
+            dead_dir.mkdir(parents=True, exist_ok=True)
+            os.replace(self._path(entry.id), dead_dir / f"{entry.id}.json")
+        except OSError as e:
+            print(f"❌ Memory queue dead-letter failed: {e}")
+
+    def recover(self) -> int:
+        """
+        Load entries left on disk by processes that are no longer running.
+
+        Each file is claimed by renaming it to this process's owner id
+        first, so two workers starting together never both send it. A file
+        with this pid but another run's nonce is left over from a previous
+        process that had the same pid.
+        """
+        if not self.directory.is_dir():
+            return 0
+
+        pid = os.getpid()
+        me = self.owner
+        recovered = 0
+        for path in sorted(self.directory.glob("*.json")):
+            owner, _, rest = path.stem.partition("-")
+            owner_pid = owner.partition("_")[0]
+            if not owner_pid.isdigit() or owner == me:
+                continue
+            if int(owner_pid) != pid and _pid_alive(int(owner_pid)):
+                continue
+
+            claimed = path.with_name(f"{me}-{owner}.{rest}.json")
+            try:
+                os.rename(path, claimed)
+                entry = QueuedMemory.from_json(claimed.read_text())
+            except FileNotFoundError:
+                continue  # Claimed by another worker
+            except (OSError, ValueError, TypeError) as e:
+                print(f"⚠️ Skipping unreadable memory queue entry {path.name}: {e}")
+                continue
+
+            entry.id = claimed.stem
+            self._pending[entry.id] = entry
+            recovered += 1
+
+        if recovered:
+            self.stats.recovered += recovered
+            print(f"📥 Recovered {recovered} pending memory writes from {self.directory}")
+        return recovered
+
+    # =========================================================================
+    # FLUSHER
+    # =========================================================================
+
+    def start(self) -> None:
+        """Recover spooled entries and start the background flusher."""
+        if not self._recovered:
+            self._recovered = True
+            self.recover()
+        self._ensure_started()
+
+    def _ensure_started(self) -> None:
+        if self._task is not None and not self._task.done():
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return  # No loop yet - entries stay spooled until start()
+        if not self._recovered:
+            self._recovered = True
+            self.recover()
+        self._wake = asyncio.Event()
+        self._task = loop.create_task(self._run())
+
+    def _due(self, now: float) -> List[QueuedMemory]:
+        due = []
+        for entry in self._pending.values():
+            if entry.id in self._inflight or entry.next_attempt_at > now:
+                continue
+            due.append(entry)
+            if len(due) >= self.batch_size:
+                break
+        return due
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=self.interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+            try:
+                await self.flush()
+            except Exception as e:
+                print(f"❌ Memory queue flush error: {e}")
+
+    async def flush(self) -> int:
+        """Send due entries in batches until none are due. Returns entries written."""
+        written = 0
+        semaphore = asyncio.Semaphore(self.concurrency)
+        while True:
+            batch = self._due(time.time())
+            if not batch:
+                break
+            self._inflight.update(e.id for e in batch)
+            try:
+                results = await asyncio.gather(
+                    *(self._write(group, semaphore) for group in coalesce_entries(batch))
+                )
+            finally:
+                self._inflight.difference_update(e.id for e in batch)
+            written += sum(results)
+        self._update_depth()
+        return written
+
+    async def _write(self, group: List[QueuedMemory], semaphore: asyncio.Semaphore) -> int:
+        content, metadata = merge_entries(group)
+        container_tag = group[0].container_tag
+        async with semaphore:
+            try:
+                memory_id = await self._get_writer()(container_tag, content, metadata)
+            except Exception as e:
+                print(f"Memory queue write error: {e}")
+                memory_id = None
+
+        now = time.time()
+        if memory_id is None:
+            for entry in group:
+                self._retry_later(entry, now)
+            return 0
+
+        self.stats.writes += 1
+        self.stats.coalesced += len(group) - 1
+        for entry in group:
+            self._pending.pop(entry.id, None)
+            self._unspool(entry)
+            self.stats.flushed += 1
+            self.stats.last_flush_lag_seconds = now - entry.enqueued_at
+        return len(group)
+
+    def _retry_later(self, entry: QueuedMemory, now: float) -> None:
+        entry.attempts += 1
+        self.stats.failures += 1
+        if entry.attempts >= self.max_attempts:
+            self._pending.pop(entry.id, None)
+            self._dead_letter(entry)
+            self.stats.dead += 1
+            print(f"❌ Memory write for {entry.container_tag} failed {entry.attempts}x, moved to dead/")
+            return
+        entry.next_attempt_at = now + min(RETRY_BASE * 2 ** (entry.attempts - 1), RETRY_MAX)
+        try:
+            self._spool(entry)  # Persist the attempt count
+        except OSError:
+            pass
+
+    def _get_writer(self) -> MemoryWriter:
+        if self._writer is None:
+            from services.supermemory import supermemory_service
+
+            async def write(container_tag: str, content: str, metadata: Dict[str, Any]):
+                return await supermemory_service.add_memory(
+                    container_tag=container_tag, content=content, metadata=metadata
+                )
+
+            self._writer = write
+        return self._writer
+
+    def _update_depth(self) -> None:
+        self.stats.depth = len(self._pending)
+        oldest = next(iter(self._pending.values()), None)
+        self.stats.oldest_lag_seconds = time.time() - oldest.enqueued_at if oldest else 0.0
+
+    def snapshot(self) -> dict:
+        """Current stats with live depth and lag."""
+        self._update_depth()
+        return self.stats.to_dict()
+
+    async def drain(self, timeout: float = 10.0) -> bool:
+        """Flush everything that's due now (e.g. on shutdown). True if empty."""
+        try:
+            await asyncio.wait_for(self.flush(), timeout=timeout)
+        except asyncio.TimeoutError:
+            pass
+        return not self._pending
+
+    async def stop(self) -> None:
+        """Stop the flusher. Unsent entries stay spooled for the next start."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+# Singleton instance
+memory_queue = MemoryWriteQueue()
+
+
+__all__ = [
+    "MemoryWriteQueue",
+    "MemoryQueueStats",
+    "QueuedMemory",
+    "coalesce_entries",
+    "merge_entries",
+    "memory_queue",
+]
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Inspect the memory write queue spool")
+    parser.add_argument("--dir", default=MEMORY_QUEUE_DIR)
+    args = parser.parse_args()
+
+    spool = Path(args.dir)
+    entries = []
+    for path in sorted(spool.glob("*.json")):
+        try:
+            entries.append(QueuedMemory.from_json(path.read_text()))
+        except (OSError, ValueError, TypeError):
+            continue
+    dead = len(list((spool / "dead").glob("*.json"))) if (spool / "dead").is_dir() else 0
+    now = time.time()
+    print(
+        json.dumps(
+            {
+                "pending": len(entries),
+                "dead": dead,
+                "users": len({e.container_tag for e in entries}),
+                "retrying": sum(1 for e in entries if e.attempts),
+                "oldest_lag_seconds": round(now - min((e.enqueued_at for e in entries), default=now), 1),
+            },
+            indent=2,
+        )
+    )
@@ -10,7 +10,12 @@ Uses the official Supermemory Python SDK for:
 Architecture:
 - BEFORE CALL: get_user_profile() fetches baseline context
 - DURING CALL: LLM uses searchMemories/addMemory tools as needed
-- AFTER CALL: add_call_transcript() stores full conversation
+- AFTER CALL: the full conversation is stored via format_call_transcript()
+
+Writes made during and after calls go through services.memory_queue
+(write-behind), so neither path waits on Supermemory. Everything ingested
+is also mirrored into services.memory_index, which answers searchMemories
+locally and falls back to Supermemory on a miss.
 
 Profile API: POST /v4/profile
 - Returns { static: string[], dynamic: string[] }
@@ -22,13 +27,20 @@ Tool Definitions (OpenAI format):
 - addMemory: Store new information about the user
 """
 
+import asyncio
+import importlib
+import importlib.util
 import os
 from typing import Optional, List, Dict, Any
 from dataclasses import dataclass
 from datetime import datetime
 
-# Import the SDK with alias to avoid collision with our module name
-import supermemory as sm_sdk  # type: ignore[import-not-found]
+from services.memory_queue import memory_queue
+
+# The SDK is imported when the client is first used (slow import). Loaded via
+# importlib because this module shadows the name `supermemory`.
+if importlib.util.find_spec("supermemory") is None:
+    raise ImportError("supermemory SDK not installed")
 
 SUPERMEMORY_API_KEY = os.getenv("SUPERMEMORY_API_KEY")
 
@@ -90,6 +102,7 @@ class SupermemoryService:
     def client(self):  # type: ignore[return]
         """Lazy init the async client."""
         if self._client is None:
+            sm_sdk = importlib.import_module("supermemory")
             self._client = sm_sdk.AsyncSupermemory(api_key=SUPERMEMORY_API_KEY)  # type: ignore[attr-defined]
         return self._client
 
@@ -213,6 +226,49 @@ class SupermemoryService:
             print(f"Supermemory add error: {e}")
             return None
 
+    async def index_locally(
+        self,
+        container_tag: str,
+        content: str,
+        metadata: Optional[Dict[str, Any]] = None,
+    ) -> int:
+        """Mirror a memory into the local index (no-op without NumPy), off the loop."""
+        index = _local_index()
+        if index is None:
+            return 0
+        try:
+            return await asyncio.to_thread(index.add, container_tag, content, metadata)
+        except Exception as e:
+            print(f"Local memory index error: {e}")
+            return 0
+
+    async def _store(
+        self,
+        container_tag: str,
+        content: str,
+        metadata: Optional[Dict[str, Any]] = None,
+    ) -> Optional[str]:
+        """Index locally, then add to Supermemory."""
+        await self.index_locally(container_tag, content, metadata)
+        return await self.add_memory(container_tag, content, metadata)
+
+    async def queue_memory(
+        self,
+        container_tag: str,
+        content: str,
+        metadata: Optional[Dict[str, Any]] = None,
+        coalesce: bool = False,
+    ) -> bool:
+        """
+        Index locally and queue the Supermemory write (no Supermemory wait).
+
+        Without an API key the memory is only indexed locally.
+        """
+        indexed = await self.index_locally(container_tag, content, metadata)
+        if not self.enabled:
+            return indexed > 0
+        return memory_queue.enqueue(container_tag, content, metadata, coalesce=coalesce)
+
     # =========================================================================
     # HIGH-LEVEL METHODS FOR YOU+ SPECIFIC USE CASES
     # =========================================================================
@@ -225,7 +281,7 @@ class SupermemoryService:
         Supermemory will parse this into their User Profile automatically.
         """
         content = self._format_onboarding_profile(data)
-        memory_id = await self.add_memory(
+        memory_id = await self._store(
             container_tag=user_id,
             content=content,
             metadata={
@@ -253,6 +309,24 @@ class SupermemoryService:
         Called after each call completes.
         Supermemory will extract insights and update the user's profile.
         """
+        content, metadata = self.format_call_transcript(
+            call_number, streak_day, call_type, mood, transcript, outcomes
+        )
+        memory_id = await self._store(
+            container_tag=user_id, content=content, metadata=metadata
+        )
+        return memory_id is not None
+
+    def format_call_transcript(
+        self,
+        call_number: int,
+        streak_day: int,
+        call_type: str,
+        mood: str,
+        transcript: List[Dict[str, str]],
+        outcomes: Dict[str, Any],
+    ) -> tuple[str, Dict[str, Any]]:
+        """Content and metadata for a call transcript memory."""
         # Format transcript as readable text
         transcript_text = "\n".join(
             [
@@ -289,23 +363,17 @@ AGENT OBSERVATIONS:
 {outcomes.get("observations", "No additional observations.")}
 """
 
-        memory_id = await self.add_memory(
-            container_tag=user_id,
-            content=content,
-            metadata={
-                "type": "call_transcript",
-                "call_number": call_number,
-                "streak_day": streak_day,
-                "call_type": call_type,
-                "mood": mood,
-                "promise_kept": outcomes.get("promise_kept"),
-                "has_commitment": bool(outcomes.get("tomorrow_commitment")),
-                "excuses_count": len(excuses_list),
-                "timestamp": datetime.now().isoformat(),
-            },
-        )
-
-        return memory_id is not None
+        return content, {
+            "type": "call_transcript",
+            "call_number": call_number,
+            "streak_day": streak_day,
+            "call_type": call_type,
+            "mood": mood,
+            "promise_kept": outcomes.get("promise_kept"),
+            "has_commitment": bool(outcomes.get("tomorrow_commitment")),
+            "excuses_count": len(excuses_list),
+            "timestamp": datetime.now().isoformat(),
+        }
 
     async def add_voice_transcript(
         self, user_id: str, recording_type: str, transcript: str
@@ -334,7 +402,7 @@ This is what the user said when asked about {recording_type.replace("_", " ")}.
 These are their authentic words and emotional expression.
 """
 
-        memory_id = await self.add_memory(
+        memory_id = await self._store(
             container_tag=user_id,
             content=content,
             metadata={
@@ -549,10 +617,29 @@ async def execute_memory_tool(
         return f"Unknown tool: {tool_name}"
 
 
+def _local_index():
+    """The local memory index, or None if NumPy isn't installed (lazy import)."""
+    try:
+        from services.memory_index import memory_index
+    except ImportError:
+        return None
+    return memory_index
+
+
 async def _execute_search_memories(query: str, container_tag: str) -> str:
-    """Execute searchMemories tool."""
+    """Execute searchMemories tool: local index first, Supermemory on a miss."""
+    index = _local_index()
+    if index is not None:
+        hits = index.search(container_tag, query, limit=5)
+        if hits:
+            return "Relevant memories found:\n" + "\n".join(
+                f"- {hit.content}" for hit in hits
+            )
+
     if not supermemory_service.enabled:
-        return "Memory search unavailable."
+        if index is None:
+            return "Memory search unavailable."
+        return "No relevant memories found for this query."
 
     try:
         results = await supermemory_service.client.search.memories(
@@ -582,29 +669,21 @@ async def _execute_add_memory(
     memory_type: str,
     container_tag: str,
 ) -> str:
-    """Execute addMemory tool."""
-    if not supermemory_service.enabled:
+    """Execute addMemory tool (queued - the call doesn't wait for Supermemory)."""
+    if not supermemory_service.enabled and _local_index() is None:
         return "Memory storage unavailable."
 
-    try:
-        memory_id = await supermemory_service.add_memory(
-            container_tag=container_tag,
-            content=content,
-            metadata={
-                "type": memory_type,
-                "source": "live_call",
-                "timestamp": datetime.now().isoformat(),
-            },
-        )
-
-        if memory_id:
-            return f"Memory stored successfully."
-        else:
-            return "Failed to store memory."
-
-    except Exception as e:
-        print(f"Memory add error: {e}")
-        return "Memory storage failed."
+    queued = await supermemory_service.queue_memory(
+        container_tag,
+        content,
+        metadata={
+            "type": memory_type,
+            "source": "live_call",
+            "timestamp": datetime.now().isoformat(),
+        },
+        coalesce=True,
+    )
+    return "Memory stored successfully." if queued else "Failed to store memory."
 
 
 # Singleton instance for easy import
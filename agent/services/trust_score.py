@@ -22,17 +22,12 @@ Trust Deltas:
 
 from dataclasses import dataclass
 from typing import Optional, Dict, List, Tuple, Any
+import importlib.util
 import os
 import logging
 
-try:
-    from supabase import create_client, Client
-
-    HAS_SUPABASE = True
-except ImportError:
-    create_client = None  # type: ignore
-    Client = None  # type: ignore
-    HAS_SUPABASE = False
+# supabase is imported when the first client is created (slow import)
+HAS_SUPABASE = importlib.util.find_spec("supabase") is not None
 
 logger = logging.getLogger(__name__)
 
@@ -88,8 +83,10 @@ class TrustScoreService:
     def _get_client(self) -> Any:
         """Get or create Supabase client."""
         if self._client is None:
-            if SUPABASE_URL and SUPABASE_SERVICE_KEY and create_client:
+            if SUPABASE_URL and SUPABASE_SERVICE_KEY and HAS_SUPABASE:
                 try:
+                    from supabase import create_client
+
                     self._client = create_client(SUPABASE_URL, SUPABASE_SERVICE_KEY)
                 except Exception as e:
                     logger.error(f"Failed to create Supabase client: {e}")
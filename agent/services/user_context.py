@@ -20,6 +20,7 @@ async def fetch_user_context(user_id: str) -> dict:
             "pillars": [],
             "status": {},
             "call_history": [],
+            "accountability_stats": {},
             "users": {},
         }
 
@@ -66,21 +67,32 @@ async def fetch_user_context(user_id: str) -> dict:
                 status_data = await resp.json()
                 status = status_data[0] if status_data else {}
 
-            # Fetch recent call analytics (last 14 days) for pattern recognition
+            # Rolling accountability stats: one small row (see accountability_stats)
             async with session.get(
-                f"{SUPABASE_URL}/rest/v1/call_analytics",
-                params={
-                    "user_id": f"eq.{user_id}",
-                    "select": "promise_kept,tomorrow_commitment,created_at,call_type",
-                    "order": "created_at.desc",
-                    "limit": "14",
-                },
+                f"{SUPABASE_URL}/rest/v1/accountability_stats",
+                params={"user_id": f"eq.{user_id}", "select": "*"},
                 headers=headers,
             ) as resp:
-                call_history = await resp.json() if resp.status == 200 else []
+                stats_data = await resp.json() if resp.status == 200 else []
+                accountability_stats = stats_data[0] if stats_data else {}
+
+            # No stats row yet - fall back to scanning recent call analytics
+            call_history = []
+            if not accountability_stats:
+                async with session.get(
+                    f"{SUPABASE_URL}/rest/v1/call_analytics",
+                    params={
+                        "user_id": f"eq.{user_id}",
+                        "select": "promise_kept,tomorrow_commitment,commitment_is_specific,created_at,call_type",
+                        "order": "created_at.desc",
+                        "limit": "14",
+                    },
+                    headers=headers,
+                ) as resp:
+                    call_history = await resp.json() if resp.status == 200 else []
 
             print(
-                f"📊 Loaded context for {user_id}: future_self={bool(future_self)}, pillars={len(pillars)}, streak={status.get('current_streak_days', 0)}, history={len(call_history)} calls"
+                f"📊 Loaded context for {user_id}: future_self={bool(future_self)}, pillars={len(pillars)}, streak={status.get('current_streak_days', 0)}, stats={'row' if accountability_stats else f'{len(call_history)} history calls'}"
             )
 
             return {
@@ -88,6 +100,7 @@ async def fetch_user_context(user_id: str) -> dict:
                 "pillars": pillars,
                 "status": status,
                 "call_history": call_history if isinstance(call_history, list) else [],
+                "accountability_stats": accountability_stats,
                 "users": users,
             }
     except Exception as e:
@@ -97,6 +110,7 @@ async def fetch_user_context(user_id: str) -> dict:
             "pillars": [],
             "status": {},
             "call_history": [],
+            "accountability_stats": {},
             "users": {},
         }
 
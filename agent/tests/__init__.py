@@ -3,4 +3,6 @@ Test modules for the YOU+ Future Self Agent.
 
 - test_local.py: Interactive local testing script
 - test_scenarios.py: Automated scenario testing (10 scenarios)
+- test_background_agents.py: LLM-powered background agent tests
+- scenario_engine.py: Concurrent, cached runner + JSON reports for the two above
 """
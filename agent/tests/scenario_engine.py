@@ -0,0 +1,556 @@
+"""
+Scenario Engine
+===============
+
+Runs scenario and background-agent tests concurrently, with a shared LLM
+result cache, and writes a machine-readable report plus a diff against
+the previous run, so a prompt change can be checked for behavior and
+cost in one pass.
+
+- Jobs run as asyncio tasks under a concurrency cap (SCENARIO_CONCURRENCY)
+- Every LLM call a job makes is cached on disk, keyed by model + messages +
+  parameters. Unchanged prompts replay from the cache; changed prompts go
+  to the LLM. Concurrent identical calls share one request.
+- Per job the report records latency, LLM calls, cache hits, estimated
+  prompt/completion tokens (same estimate as llm_stats) and pass/fail per
+  expectation. Tokens for cache hits are counted separately.
+- Reports are saved as <run dir>/reports/<timestamp>.json; the newest
+  earlier report is diffed automatically (status flips, latency and token
+  deltas).
+- Event-loop lag is sampled for the whole run (core.loop_monitor, when the
+  agent package imports); the report records lag p99 / max and stalls
+  with their call sites, so a change that blocks the loop - and stalls
+  every concurrent job - shows up in the diff.
+
+Used by test_scenarios.py and test_background_agents.py:
+    uv run python tests/test_scenarios.py --concurrency 5
+    uv run python tests/test_background_agents.py --concurrency 8 --no-cache
+
+Configuration via environment variables:
+- SCENARIO_CONCURRENCY: default concurrency cap (default 4)
+- SCENARIO_RUN_DIR: cache + reports directory (default ./scenario_runs)
+"""
+
+import asyncio
+import contextvars
+import hashlib
+import json
+import os
+import time
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Optional
+
+try:
+    from core.loop_monitor import LoopMonitor
+except ImportError:
+    LoopMonitor = None
+
+SCENARIO_CONCURRENCY = int(os.getenv("SCENARIO_CONCURRENCY", "4"))
+SCENARIO_RUN_DIR = os.getenv("SCENARIO_RUN_DIR", "./scenario_runs")
+
+REPORT_VERSION = 1
+
+# Same ratio as core.llm_client.metrics (kept local so the engine imports
+# without the agent's dependencies)
+CHARS_PER_TOKEN = 4
+
+
+def estimate_tokens(text: str) -> int:
+    return max(1, len(text) // CHARS_PER_TOKEN) if text else 0
+
+
+def _message_text(messages: list[dict]) -> str:
+    """Text of OpenAI-format ({content}) or Gemini-format ({parts}) messages."""
+    texts = []
+    for m in messages:
+        if "parts" in m:
+            texts.extend(str(p.get("text", "")) if isinstance(p, dict) else str(p) for p in m["parts"])
+        else:
+            texts.append(str(m.get("content", "")))
+    return "\n".join(texts)
+
+
+# ============================================================================
+# RESULTS
+# ============================================================================
+
+
+@dataclass
+class Expectation:
+    """One pass/fail check inside a job."""
+
+    name: str
+    passed: bool
+    details: str = ""
+
+
+@dataclass
+class JobResult:
+    """Outcome and cost of one scenario / agent test."""
+
+    name: str
+    kind: str
+    latency_ms: float = 0.0
+    llm_calls: int = 0
+    cache_hits: int = 0
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    cached_tokens: int = 0  # Tokens served from the cache (not paid for)
+    expectations: list[Expectation] = field(default_factory=list)
+    error: Optional[str] = None
+
+    @property
+    def passed(self) -> bool:
+        return self.error is None and all(e.passed for e in self.expectations)
+
+    def to_dict(self) -> dict:
+        data = asdict(self)
+        data["passed"] = self.passed
+        data["latency_ms"] = round(self.latency_ms, 1)
+        return data
+
+
+@dataclass
+class RunReport:
+    """All job results from one run."""
+
+    label: str
+    started_at: str
+    concurrency: int
+    cache_enabled: bool
+    jobs: list[JobResult]
+    wall_ms: float = 0.0
+    loop: dict = field(default_factory=dict)  # LoopMonitor.summary(), if available
+
+    def totals(self) -> dict:
+        expectations = [e for j in self.jobs for e in j.expectations]
+        return {
+            "jobs": len(self.jobs),
+            "jobs_passed": sum(j.passed for j in self.jobs),
+            "expectations": len(expectations),
+            "expectations_passed": sum(e.passed for e in expectations),
+            "errors": sum(1 for j in self.jobs if j.error),
+            "llm_calls": sum(j.llm_calls for j in self.jobs),
+            "cache_hits": sum(j.cache_hits for j in self.jobs),
+            "prompt_tokens": sum(j.prompt_tokens for j in self.jobs),
+            "completion_tokens": sum(j.completion_tokens for j in self.jobs),
+            "cached_tokens": sum(j.cached_tokens for j in self.jobs),
+            "wall_ms": round(self.wall_ms, 1),
+            "job_ms": round(sum(j.latency_ms for j in self.jobs), 1),
+            "loop_lag_p99_ms": self.loop.get("lag_p99_ms") or 0.0,
+            "loop_lag_max_ms": self.loop.get("lag_max_ms") or 0.0,
+            "loop_stalls": self.loop.get("stalls", 0),
+        }
+
+    def to_dict(self) -> dict:
+        return {
+            "version": REPORT_VERSION,
+            "label": self.label,
+            "started_at": self.started_at,
+            "concurrency": self.concurrency,
+            "cache_enabled": self.cache_enabled,
+            "totals": self.totals(),
+            "loop": self.loop,
+            "jobs": [j.to_dict() for j in self.jobs],
+        }
+
+    def save(self, run_dir: str | Path = SCENARIO_RUN_DIR) -> Path:
+        reports = Path(run_dir) / "reports"
+        reports.mkdir(parents=True, exist_ok=True)
+        stamp = datetime.fromisoformat(self.started_at).strftime("%Y%m%d_%H%M%S_%f")[:-3]
+        path = reports / f"{stamp}_{self.label}.json"
+        path.write_text(json.dumps(self.to_dict(), indent=2, default=str))
+        return path
+
+    def print_summary(self) -> None:
+        t = self.totals()
+        print("\n" + "=" * 70)
+        print(f"  RUN REPORT: {self.label}")
+        print("=" * 70)
+        print(f"  {'Job':<32} {'Result':<7} {'Latency':>9} {'Calls':>6} {'Cached':>7} {'Tokens':>8}")
+        print(f"  {'-' * 32} {'-' * 7} {'-' * 9} {'-' * 6} {'-' * 7} {'-' * 8}")
+        for j in self.jobs:
+            result = "PASS" if j.passed else ("ERROR" if j.error else "FAIL")
+            tokens = j.prompt_tokens + j.completion_tokens
+            print(
+                f"  {j.name[:32]:<32} {result:<7} {j.latency_ms / 1000:>8.1f}s "
+                f"{j.llm_calls:>6} {j.cache_hits:>7} {tokens:>8}"
+            )
+            for e in j.expectations:
+                if not e.passed:
+                    print(f"      [FAIL] {e.name}" + (f" - {e.details}" if e.details else ""))
+            if j.error:
+                print(f"      [ERROR] {j.error}")
+        print("-" * 70)
+        print(
+            f"  Jobs: {t['jobs_passed']}/{t['jobs']} passed, "
+            f"expectations: {t['expectations_passed']}/{t['expectations']}"
+        )
+        print(
+            f"  LLM: {t['llm_calls']} calls ({t['cache_hits']} cached), "
+            f"~{t['prompt_tokens'] + t['completion_tokens']} tokens "
+            f"(+{t['cached_tokens']} from cache)"
+        )
+        print(
+            f"  Time: {t['wall_ms'] / 1000:.1f}s wall, {t['job_ms'] / 1000:.1f}s summed "
+            f"(concurrency {self.concurrency})"
+        )
+        if self.loop:
+            print(
+                f"  Loop: lag p99 {t['loop_lag_p99_ms']:.0f}ms, max {t['loop_lag_max_ms']:.0f}ms, "
+                f"{t['loop_stalls']} stalls"
+            )
+            for site, count in self.loop.get("stall_sites", {}).items():
+                print(f"      [STALL] {site} x{count}")
+        print("=" * 70)
+
+
+def load_report(path: str | Path) -> dict:
+    data = json.loads(Path(path).read_text())
+    if data.get("version") != REPORT_VERSION:
+        raise ValueError(f"Unsupported report version {data.get('version')} in {path}")
+    return data
+
+
+def previous_report(
+    label: str, run_dir: str | Path = SCENARIO_RUN_DIR, exclude: Optional[Path] = None
+) -> Optional[Path]:
+    """Newest saved report with this label (other than `exclude`)."""
+    reports = Path(run_dir) / "reports"
+    if not reports.is_dir():
+        return None
+    paths = sorted(p for p in reports.glob(f"*_{label}.json") if p != exclude)
+    return paths[-1] if paths else None
+
+
+def diff_reports(old: dict, new: dict) -> dict:
+    """Per-job status flips and latency / token deltas between two reports."""
+    old_jobs = {j["name"]: j for j in old["jobs"]}
+    new_jobs = {j["name"]: j for j in new["jobs"]}
+    jobs = []
+    for name, job in new_jobs.items():
+        before = old_jobs.get(name)
+        if before is None:
+            jobs.append({"name": name, "change": "added", "passed": job["passed"]})
+            continue
+        old_fails = {e["name"] for e in before["expectations"] if not e["passed"]}
+        new_fails = {e["name"] for e in job["expectations"] if not e["passed"]}
+        if before["passed"] == job["passed"]:
+            change = "unchanged"
+        else:
+            change = "fixed" if job["passed"] else "regressed"
+        jobs.append(
+            {
+                "name": name,
+                "change": change,
+                "newly_failing": sorted(new_fails - old_fails),
+                "newly_passing": sorted(old_fails - new_fails),
+                "latency_ms": round(job["latency_ms"] - before["latency_ms"], 1),
+                "tokens": (job["prompt_tokens"] + job["completion_tokens"])
+                - (before["prompt_tokens"] + before["completion_tokens"]),
+            }
+        )
+    for name in old_jobs.keys() - new_jobs.keys():
+        jobs.append({"name": name, "change": "removed"})
+
+    totals = {
+        key: new["totals"].get(key, 0) - old["totals"].get(key, 0)
+        for key in (
+            "jobs_passed",
+            "expectations_passed",
+            "llm_calls",
+            "prompt_tokens",
+            "completion_tokens",
+            "wall_ms",
+            "loop_lag_p99_ms",
+            "loop_stalls",
+        )
+    }
+    return {"against": old["started_at"], "totals": totals, "jobs": jobs}
+
+
+def print_diff(diff: dict) -> None:
+    print(f"\n  DIFF vs run of {diff['against']}")
+    t = diff["totals"]
+    print(
+        f"    passed jobs {t['jobs_passed']:+d}, expectations {t['expectations_passed']:+d}, "
+        f"tokens {t['prompt_tokens'] + t['completion_tokens']:+d}, "
+        f"wall {t['wall_ms'] / 1000:+.1f}s, "
+        f"loop lag p99 {t['loop_lag_p99_ms']:+.0f}ms, stalls {t['loop_stalls']:+d}"
+    )
+    changed = [j for j in diff["jobs"] if j["change"] != "unchanged" or j.get("newly_failing")]
+    for j in changed:
+        print(f"    {j['change'].upper():<10} {j['name']}")
+        for name in j.get("newly_failing", []):
+            print(f"      - now failing: {name}")
+        for name in j.get("newly_passing", []):
+            print(f"      + now passing: {name}")
+    if not changed:
+        print("    No status changes")
+
+
+# ============================================================================
+# CACHE
+# ============================================================================
+
+
+def cache_key(*parts: Any) -> str:
+    blob = json.dumps(parts, sort_keys=True, default=str)
+    return hashlib.sha256(blob.encode()).hexdigest()
+
+
+class ResultCache:
+    """
+    JSON-file cache of LLM results shared by all jobs in a run.
+
+    Concurrent lookups of a key that's being computed wait for the first
+    request instead of sending their own.
+    """
+
+    def __init__(self, path: str | Path, enabled: bool = True):
+        self.path = Path(path)
+        self.enabled = enabled
+        self._data: dict[str, Any] = {}
+        self._inflight: dict[str, asyncio.Future] = {}
+        self._dirty = False
+        if enabled and self.path.exists():
+            try:
+                self._data = json.loads(self.path.read_text())
+            except ValueError:
+                self._data = {}
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    async def get_or_compute(self, key: str, compute: Callable[[], Awaitable[Any]]) -> tuple[Any, bool]:
+        """(value, was_cached). Failures (exceptions, None) aren't cached."""
+        if not self.enabled:
+            return await compute(), False
+        if key in self._data:
+            return self._data[key], True
+        pending = self._inflight.get(key)
+        if pending is not None:
+            return await asyncio.shield(pending), True
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            value = await compute()
+        except BaseException as e:
+            future.set_exception(e)
+            future.exception()  # Mark retrieved when nobody else is waiting
+            raise
+        finally:
+            self._inflight.pop(key, None)
+        if value is not None:
+            self._data[key] = value
+            self._dirty = True
+        future.set_result(value)
+        return value, False
+
+    def save(self) -> None:
+        if not self.enabled or not self._dirty:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(self._data))
+        os.replace(tmp, self.path)
+        self._dirty = False
+
+
+# ============================================================================
+# ENGINE
+# ============================================================================
+
+# The job whose LLM calls are being accounted (set per task)
+_current_job: contextvars.ContextVar[Optional[JobResult]] = contextvars.ContextVar(
+    "scenario_job", default=None
+)
+
+
+def _account(prompt_text: str, completion: Optional[str], cached: bool) -> None:
+    job = _current_job.get()
+    if job is None:
+        return
+    prompt, completion_tokens = estimate_tokens(prompt_text), estimate_tokens(completion or "")
+    job.llm_calls += 1
+    if cached:
+        job.cache_hits += 1
+        job.cached_tokens += prompt + completion_tokens
+    else:
+        job.prompt_tokens += prompt
+        job.completion_tokens += completion_tokens
+
+
+@dataclass
+class Job:
+    """A named test to run. `run` returns its expectations."""
+
+    name: str
+    kind: str
+    run: Callable[[], Awaitable[list[Expectation]]]
+
+
+class ScenarioEngine:
+    """Runs jobs concurrently with a shared LLM cache and per-job accounting."""
+
+    def __init__(
+        self,
+        label: str,
+        concurrency: int = SCENARIO_CONCURRENCY,
+        use_cache: bool = True,
+        run_dir: str | Path = SCENARIO_RUN_DIR,
+    ):
+        self.label = label
+        self.concurrency = max(1, concurrency)
+        self.run_dir = Path(run_dir)
+        self.cache = ResultCache(self.run_dir / "cache.json", enabled=use_cache)
+
+    # LLM wrappers -------------------------------------------------------------
+
+    def wrap_chat(self, chat_fn: Callable[..., Awaitable[str]], model: str) -> Callable[..., Awaitable[str]]:
+        """Cache + account a `chat_fn(messages) -> str` used by the scenario runner."""
+
+        async def chat(messages: list, **kwargs) -> str:
+            key = cache_key("chat", model, messages, kwargs)
+            value, cached = await self.cache.get_or_compute(key, lambda: chat_fn(messages, **kwargs))
+            _account(_message_text(messages), value, cached)
+            return value
+
+        return chat
+
+    @contextmanager
+    def cached_llm(self):
+        """
+        Route core.llm's call/stream_response (used by the background agents)
+        through the cache for the duration of the block.
+        """
+        import core.llm as llm_module
+        from core.llm_client import BEDROCK_MODEL
+
+        original_call = llm_module.call
+        original_stream = llm_module.stream_response
+
+        def model(kwargs: dict) -> str:
+            # Routed requests carry their model; unrouted ones use the default
+            route = kwargs.get("route")
+            return route.model if route is not None else BEDROCK_MODEL
+
+        async def call(messages: list[dict], **kwargs) -> Optional[str]:
+            key = cache_key("call", model(kwargs), messages, kwargs)
+            value, cached = await self.cache.get_or_compute(key, lambda: original_call(messages, **kwargs))
+            _account(_message_text(messages), value, cached)
+            return value
+
+        async def stream_response(messages: list[dict], **kwargs):
+            key = cache_key("stream", model(kwargs), messages, kwargs)
+
+            async def collect() -> str:
+                # Read the whole stream so the cached value is complete
+                return "".join([chunk async for chunk in original_stream(messages, **kwargs)])
+
+            value, cached = await self.cache.get_or_compute(key, collect)
+            _account(_message_text(messages), value, cached)
+            if value:
+                yield value
+
+        llm_module.call = call
+        llm_module.stream_response = stream_response
+        try:
+            yield
+        finally:
+            llm_module.call = original_call
+            llm_module.stream_response = original_stream
+
+    # Running ------------------------------------------------------------------
+
+    async def _run_job(self, job: Job, semaphore: asyncio.Semaphore) -> JobResult:
+        result = JobResult(name=job.name, kind=job.kind)
+        async with semaphore:
+            _current_job.set(result)
+            start = time.perf_counter()
+            try:
+                result.expectations = list(await job.run())
+            except Exception as e:
+                result.error = f"{type(e).__name__}: {e}"
+            result.latency_ms = (time.perf_counter() - start) * 1000
+        return result
+
+    async def run(self, jobs: list[Job]) -> RunReport:
+        """Run all jobs (at most `concurrency` at a time), save the cache."""
+        started_at = datetime.now().isoformat(timespec="milliseconds")
+        semaphore = asyncio.Semaphore(self.concurrency)
+        monitor = LoopMonitor() if LoopMonitor is not None else None
+        if monitor is not None:
+            monitor.start()
+        start = time.perf_counter()
+        try:
+            results = await asyncio.gather(*(self._run_job(job, semaphore) for job in jobs))
+        finally:
+            self.cache.save()
+            if monitor is not None:
+                await monitor.stop()
+        return RunReport(
+            label=self.label,
+            started_at=started_at,
+            concurrency=self.concurrency,
+            cache_enabled=self.cache.enabled,
+            jobs=list(results),
+            wall_ms=(time.perf_counter() - start) * 1000,
+            loop=monitor.summary() if monitor is not None else {},
+        )
+
+    def finish(self, report: RunReport, diff: bool = True) -> Path:
+        """Print the report, save it and print the diff against the previous run."""
+        report.print_summary()
+        path = report.save(self.run_dir)
+        print(f"  Report saved to: {path}")
+        if diff:
+            previous = previous_report(self.label, self.run_dir, exclude=path)
+            if previous:
+                try:
+                    print_diff(diff_reports(load_report(previous), report.to_dict()))
+                except (ValueError, KeyError) as e:
+                    print(f"  (Couldn't diff against {previous.name}: {e})")
+        return path
+
+
+def add_engine_arguments(parser) -> None:
+    """--concurrency / --no-cache / --run-dir flags shared by the test scripts."""
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=None,
+        help=f"Run concurrently through the scenario engine (default cap {SCENARIO_CONCURRENCY})",
+    )
+    parser.add_argument("--no-cache", action="store_true", help="Don't use the LLM result cache")
+    parser.add_argument("--run-dir", default=SCENARIO_RUN_DIR, help="Cache + report directory")
+    parser.add_argument("--no-diff", action="store_true", help="Don't diff against the previous run")
+
+
+__all__ = [
+    "Expectation",
+    "Job",
+    "JobResult",
+    "RunReport",
+    "ResultCache",
+    "ScenarioEngine",
+    "add_engine_arguments",
+    "cache_key",
+    "diff_reports",
+    "load_report",
+    "previous_report",
+]
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Diff two scenario engine reports")
+    parser.add_argument("old")
+    parser.add_argument("new")
+    args = parser.parse_args()
+    print_diff(diff_reports(load_report(args.old), load_report(args.new)))
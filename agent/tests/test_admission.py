@@ -0,0 +1,123 @@
+"""
+Admission Control Tests
+=======================
+
+AdmissionController.evaluate on synthetic load signals: each signal's
+soft (DEFER) and hard (REJECT / ROUTE_AWAY) threshold, the order in which
+hard limits win, and that a missing reply p95 never refuses a call.
+
+Run with:
+    cd agent && uv run python tests/test_admission.py
+    cd agent && uv run pytest tests/test_admission.py
+"""
+
+import sys
+from pathlib import Path
+from typing import Optional
+
+# Add agent directory to path
+AGENT_DIR = Path(__file__).parent.parent
+if str(AGENT_DIR) not in sys.path:
+    sys.path.insert(0, str(AGENT_DIR))
+
+from core.admission import AdmissionController, AdmissionDecision, LoadSignals
+
+ACCEPT = AdmissionDecision.ACCEPT
+DEFER = AdmissionDecision.DEFER
+REJECT = AdmissionDecision.REJECT
+ROUTE_AWAY = AdmissionDecision.ROUTE_AWAY
+
+
+def controller(route_away_url: Optional[str] = None) -> AdmissionController:
+    return AdmissionController(
+        max_calls=10,
+        soft_calls=8,
+        max_llm_in_flight=20,
+        max_loop_lag_ms=100,
+        max_turn_p95_ms=2000,
+        route_away_url=route_away_url,
+    )
+
+
+def load(
+    active_calls: int = 0,
+    pending_calls: int = 0,
+    llm_in_flight: int = 0,
+    loop_lag_ms: float = 0.0,
+    turn_p95_ms: Optional[float] = None,
+) -> LoadSignals:
+    return LoadSignals(active_calls, pending_calls, llm_in_flight, loop_lag_ms, turn_p95_ms)
+
+
+def test_idle_worker_accepts():
+    assert controller().evaluate(load(active_calls=3, turn_p95_ms=800)) == (ACCEPT, "ok", "")
+
+
+def test_call_cap_counts_pending_calls():
+    decision, reason, signal = controller().evaluate(load(active_calls=7, pending_calls=3))
+    assert (decision, signal) == (REJECT, "calls")
+    assert reason == "calls 10/10"
+
+
+def test_soft_call_limit_defers():
+    decision, _, signal = controller().evaluate(load(active_calls=8))
+    assert (decision, signal) == (DEFER, "calls")
+
+
+def test_loop_lag_defers_then_rejects():
+    assert controller().evaluate(load(loop_lag_ms=150))[0] == DEFER
+    assert controller().evaluate(load(loop_lag_ms=301))[0] == REJECT
+
+
+def test_llm_in_flight_defers():
+    decision, _, signal = controller().evaluate(load(llm_in_flight=20))
+    assert (decision, signal) == (DEFER, "llm_in_flight")
+
+
+def test_slow_replies_reject():
+    decision, _, signal = controller().evaluate(load(turn_p95_ms=2500))
+    assert (decision, signal) == (REJECT, "turn_p95")
+
+
+def test_no_reply_p95_is_not_a_refusal():
+    assert controller().evaluate(load(turn_p95_ms=None))[0] == ACCEPT
+
+
+def test_hard_limit_wins_over_soft():
+    decision, _, signal = controller().evaluate(load(active_calls=10, loop_lag_ms=150))
+    assert (decision, signal) == (REJECT, "calls")
+
+
+def test_route_away_replaces_reject():
+    ctrl = controller(route_away_url="https://overflow.example.com")
+    assert ctrl.evaluate(load(active_calls=10))[0] == ROUTE_AWAY
+    assert ctrl.evaluate(load(active_calls=8))[0] == DEFER
+
+
+TESTS = [
+    test_idle_worker_accepts,
+    test_call_cap_counts_pending_calls,
+    test_soft_call_limit_defers,
+    test_loop_lag_defers_then_rejects,
+    test_llm_in_flight_defers,
+    test_slow_replies_reject,
+    test_no_reply_p95_is_not_a_refusal,
+    test_hard_limit_wins_over_soft,
+    test_route_away_replaces_reject,
+]
+
+
+def main():
+    failed = 0
+    for test in TESTS:
+        try:
+            test()
+            print(f"  [PASS] {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"  [FAIL] {test.__name__}: {e}")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
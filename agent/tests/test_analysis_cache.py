@@ -0,0 +1,120 @@
+"""
+Analysis Cache Tests
+====================
+
+AnalysisCache behavior: entries expire after the TTL, the least recently
+used entry is evicted first, and concurrent misses for one utterance share
+a single compute - unless its owner is cancelled, in which case the
+waiters compute it themselves.
+
+Run with:
+    cd agent && uv run python tests/test_analysis_cache.py
+    cd agent && uv run pytest tests/test_analysis_cache.py
+"""
+
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+# Add agent directory to path
+AGENT_DIR = Path(__file__).parent.parent
+if str(AGENT_DIR) not in sys.path:
+    sys.path.insert(0, str(AGENT_DIR))
+
+from core.analysis_cache import AnalysisCache
+
+
+def test_entry_expires_after_ttl():
+    cache = AnalysisCache(ttl=0.01)
+    key = cache.make_key("sentiment", "v1", "Yes!")
+    cache.put(key, {"sentiment": "positive"})
+    assert cache.get(key) == {"sentiment": "positive"}
+    time.sleep(0.02)
+    assert cache.get(key) is None
+    assert cache.stats.expirations == 1
+
+
+def test_least_recently_used_is_evicted():
+    cache = AnalysisCache(max_entries=2)
+    yes, no, maybe = (cache.make_key("sentiment", "v1", t) for t in ("yes", "no", "maybe"))
+    cache.put(yes, {"n": 1})
+    cache.put(no, {"n": 2})
+    cache.get(yes)  # "no" is now the oldest
+    cache.put(maybe, {"n": 3})
+    assert cache.get(no) is None
+    assert cache.get(yes) == {"n": 1} and cache.get(maybe) == {"n": 3}
+    assert cache.stats.evictions == 1
+
+
+def test_long_utterance_is_not_cached():
+    cache = AnalysisCache(max_words=3)
+    assert cache.make_key("sentiment", "v1", "I went to the gym today") is None
+
+
+def test_concurrent_misses_share_one_compute():
+    cache = AnalysisCache()
+    calls = []
+
+    async def compute():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return {"sentiment": "positive"}
+
+    async def run():
+        return await asyncio.gather(
+            *(cache.get_or_compute("sentiment", "v1", "yeah I did", compute) for _ in range(3))
+        )
+
+    results = asyncio.run(run())
+    assert len(calls) == 1
+    assert results == [{"sentiment": "positive"}] * 3
+    assert results[0] is not results[1]  # Each caller gets its own copy
+    assert cache.stats.misses == 1 and cache.stats.hits == 2
+
+
+def test_waiter_recomputes_when_owner_is_cancelled():
+    cache = AnalysisCache()
+    calls = []
+
+    async def compute():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return {"sentiment": "positive"}
+
+    async def run():
+        owner = asyncio.create_task(cache.get_or_compute("sentiment", "v1", "yes", compute))
+        await asyncio.sleep(0)
+        waiter = asyncio.create_task(cache.get_or_compute("sentiment", "v1", "yes", compute))
+        await asyncio.sleep(0.01)
+        owner.cancel()
+        return await waiter
+
+    assert asyncio.run(run()) == {"sentiment": "positive"}
+    assert len(calls) == 2
+    assert len(cache) == 1
+
+
+TESTS = [
+    test_entry_expires_after_ttl,
+    test_least_recently_used_is_evicted,
+    test_long_utterance_is_not_cached,
+    test_concurrent_misses_share_one_compute,
+    test_waiter_recomputes_when_owner_is_cancelled,
+]
+
+
+def main():
+    failed = 0
+    for test in TESTS:
+        try:
+            test()
+            print(f"  [PASS] {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"  [FAIL] {test.__name__}: {e}")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -6,8 +6,12 @@ Tests each background agent with real LLM calls via Groq GPT-OSS-120B.
 
 Run with:
     cd agent && uv run python tests/test_background_agents.py
+
+    # Concurrently, LLM results cached, JSON report + diff against last run
+    cd agent && uv run python tests/test_background_agents.py --concurrency 8
 """
 
+import argparse
 import asyncio
 import sys
 from pathlib import Path
@@ -42,6 +46,7 @@ from agents.events import (
     ExcuseCallout,
     CallSummary,
 )
+from tests.scenario_engine import Expectation, Job, ScenarioEngine, add_engine_arguments
 
 
 @dataclass
@@ -733,23 +738,58 @@ async def test_call_summary_aggregator():
 # ═══════════════════════════════════════════════════════════════════════════════
 
 
+AGENT_TESTS = [
+    test_excuse_detector,
+    test_sentiment_analyzer,
+    test_commitment_extractor,
+    test_promise_detector,
+    test_excuse_callout,
+    test_pattern_analyzer,
+    test_quote_extractor,
+    test_call_summary_aggregator,
+]
+
+
+async def run_with_engine(args) -> None:
+    """Run the agent tests concurrently through the scenario engine."""
+    engine = ScenarioEngine(
+        label="background_agents",
+        concurrency=args.concurrency,
+        use_cache=not args.no_cache,
+        run_dir=args.run_dir,
+    )
+
+    def make_job(test) -> Job:
+        async def run() -> list[Expectation]:
+            results = await test()
+            return [Expectation(name, passed, details) for name, passed, details in results.tests]
+
+        return Job(name=test.__name__, kind="agent", run=run)
+
+    with engine.cached_llm():
+        report = await engine.run([make_job(test) for test in AGENT_TESTS])
+    engine.finish(report, diff=not args.no_diff)
+
+
 async def main():
+    parser = argparse.ArgumentParser(description="Background agent integration tests")
+    add_engine_arguments(parser)
+    args = parser.parse_args()
+
     print("=" * 60)
     print("BACKGROUND AGENTS INTEGRATION TESTS (LLM-Powered)")
     print("=" * 60)
     print("\nUsing Groq GPT-OSS-120B for LLM calls...")
 
+    if args.concurrency:
+        await run_with_engine(args)
+        return
+
     all_results = []
 
     # Run all tests
-    all_results.append(await test_excuse_detector())
-    all_results.append(await test_sentiment_analyzer())
-    all_results.append(await test_commitment_extractor())
-    all_results.append(await test_promise_detector())
-    all_results.append(await test_excuse_callout())
-    all_results.append(await test_pattern_analyzer())
-    all_results.append(await test_quote_extractor())
-    all_results.append(await test_call_summary_aggregator())
+    for test in AGENT_TESTS:
+        all_results.append(await test())
 
     # Final summary
     total_passed = sum(r.passed for r in all_results)
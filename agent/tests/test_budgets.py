@@ -0,0 +1,124 @@
+"""
+Stage Budget Tests
+==================
+
+SentenceLimiter behavior on streamed replies: where it cuts, what it
+doesn't mistake for a sentence end (decimals, "..." pauses,
+abbreviations), and that a memory tool marker after the last spoken
+sentence still reaches tool detection.
+
+Run with:
+    cd agent && uv run python tests/test_budgets.py
+    cd agent && uv run pytest tests/test_budgets.py
+"""
+
+import sys
+from pathlib import Path
+
+# Add agent directory to path
+AGENT_DIR = Path(__file__).parent.parent
+if str(AGENT_DIR) not in sys.path:
+    sys.path.insert(0, str(AGENT_DIR))
+
+from conversation.stages.budgets import SentenceLimiter
+
+
+def stream(limiter: SentenceLimiter, chunks: list[str]) -> str:
+    """Feed chunks until the limiter says stop; returns the spoken text."""
+    spoken = ""
+    for chunk in chunks:
+        spoken += limiter.feed(chunk)
+        if limiter.done:
+            break
+    return spoken
+
+
+def test_cuts_after_limit():
+    limiter = SentenceLimiter(2)
+    spoken = stream(limiter, ["One thing. ", "Two things. ", "Three things. ", "Four."])
+    assert spoken == "One thing. Two things."
+    assert limiter.limited and limiter.done
+
+
+def test_terminator_confirmed_by_next_chunk():
+    limiter = SentenceLimiter(1)
+    spoken = stream(limiter, ["You ran 3.", "5 miles. ", "Nice."])
+    assert spoken == "You ran 3.5 miles."
+
+
+def test_ellipsis_is_a_pause_not_an_end():
+    limiter = SentenceLimiter(2)
+    spoken = stream(limiter, ["So... ", "day 12. ", "Did you show up? ", "Be honest."])
+    assert spoken == "So... day 12. Did you show up?"
+
+
+def test_ellipsis_mid_sentence_in_one_chunk():
+    limiter = SentenceLimiter(1)
+    spoken = stream(limiter, ["It was just... who I was. And then it wasn't."])
+    assert spoken == "It was just... who I was."
+
+
+def test_abbreviations_are_not_cut():
+    limiter = SentenceLimiter(1)
+    spoken = stream(limiter, ["Dr. Patel said rest, e.g. ", "a full day off. ", "Did you?"])
+    assert spoken == "Dr. Patel said rest, e.g. a full day off."
+
+
+def test_question_and_exclamation_end_sentences():
+    limiter = SentenceLimiter(2)
+    spoken = stream(limiter, ["You did it! ", "Every day?! ", "Wow."])
+    assert spoken == "You did it! Every day?!"
+
+
+def test_short_reply_is_not_limited():
+    limiter = SentenceLimiter(2)
+    spoken = stream(limiter, ["Just one sentence."])
+    assert spoken == "Just one sentence."
+    assert not limiter.limited
+
+
+def test_marker_after_limit_reaches_tool_detection():
+    limiter = SentenceLimiter(2, markers=True)
+    chunks = ["Sentence one. ", "Sentence two. ", "[SEARCH_MEMORY: ", "last week's gym excuse]"]
+    spoken = stream(limiter, chunks)
+    assert spoken == "Sentence one. Sentence two."
+    assert limiter.limited and not limiter.done
+    assert limiter.text.endswith("[SEARCH_MEMORY: last week's gym excuse]")
+
+
+def test_marker_is_detected_from_limiter_text():
+    from core.chat_node import FutureYouNode
+
+    limiter = SentenceLimiter(2, markers=True)
+    stream(limiter, ["Sentence one. Sentence two. ", "[SEARCH_MEMORY: gym excuses]"])
+    tool_call = FutureYouNode._detect_tool_call_request(None, limiter.text)
+    assert tool_call is not None and tool_call.tool_args == {"query": "gym excuses"}
+
+
+TESTS = [
+    test_cuts_after_limit,
+    test_terminator_confirmed_by_next_chunk,
+    test_ellipsis_is_a_pause_not_an_end,
+    test_ellipsis_mid_sentence_in_one_chunk,
+    test_abbreviations_are_not_cut,
+    test_question_and_exclamation_end_sentences,
+    test_short_reply_is_not_limited,
+    test_marker_after_limit_reaches_tool_detection,
+    test_marker_is_detected_from_limiter_text,
+]
+
+
+def main():
+    failed = 0
+    for test in TESTS:
+        try:
+            test()
+            print(f"  [PASS] {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"  [FAIL] {test.__name__}: {e}")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
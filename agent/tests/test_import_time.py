@@ -0,0 +1,137 @@
+"""
+Import-Time Budget Test
+=======================
+
+Fails when cold start regresses: imports main.py in a fresh interpreter
+with `-X importtime` and checks
+- the lazily-loaded SDKs (openai, supabase, supermemory) are not imported
+- total import time stays under IMPORT_TIME_BUDGET_MS - wall-clock time
+  depends on the host, so this is only enforced when the budget is set or
+  on CI (the CI variable set); otherwise it is skipped
+
+A discarded warm-up import runs first, so bytecode is compiled and the
+files are in the OS cache - the budget is for a deployed process start,
+not for compiling a fresh checkout.
+
+Prints the slowest imports so a regression points at its cause.
+
+Run with:
+    cd agent && uv run python tests/test_import_time.py
+    cd agent && uv run pytest tests/test_import_time.py
+
+Configuration via environment variables:
+- IMPORT_TIME_BUDGET_MS: budget for `import main` (default 1500 on CI, else unset)
+- IMPORT_TIME_RUNS: runs to take the best of (default 3)
+"""
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add agent directory to path
+AGENT_DIR = Path(__file__).parent.parent
+if str(AGENT_DIR) not in sys.path:
+    sys.path.insert(0, str(AGENT_DIR))
+
+from core.startup import OPTIONAL_SUBSYSTEMS
+
+IMPORT_TIME_BUDGET_MS = float(
+    os.getenv("IMPORT_TIME_BUDGET_MS") or ("1500" if os.getenv("CI") else "0")
+)
+IMPORT_TIME_RUNS = int(os.getenv("IMPORT_TIME_RUNS", "3"))
+
+
+def warm_up(module: str = "main") -> None:
+    """Import `module` once untimed, writing its bytecode."""
+    result = subprocess.run(
+        [sys.executable, "-c", f"import {module}"],
+        cwd=AGENT_DIR,
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{result.stderr[-2000:]}")
+
+
+def measure_import(module: str = "main") -> tuple[float, dict[str, float]]:
+    """
+    Import `module` in a fresh interpreter with -X importtime.
+
+    Returns (total ms, {imported module: cumulative ms}).
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=AGENT_DIR,
+        capture_output=True,
+        text=True,
+        env={**os.environ, "PYTHONDONTWRITEBYTECODE": "1"},
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{result.stderr[-2000:]}")
+
+    total_us = 0
+    cumulative: dict[str, float] = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:") :].split("|")
+        total_us += int(self_us)
+        cumulative[name.strip()] = int(cumulative_us) / 1000
+    return total_us / 1000, cumulative
+
+
+def best_of(runs: int = IMPORT_TIME_RUNS) -> tuple[float, dict[str, float]]:
+    """Fastest of several warm runs."""
+    warm_up()
+    return min((measure_import() for _ in range(runs)), key=lambda r: r[0])
+
+
+def test_import_time_budget():
+    if not IMPORT_TIME_BUDGET_MS:
+        pytest.skip("host-dependent - set IMPORT_TIME_BUDGET_MS (or CI) to enforce")
+    total_ms, modules = best_of()
+    slowest = sorted(modules.items(), key=lambda m: m[1], reverse=True)[:10]
+    report = "\n".join(f"  {ms:8.1f}ms  {name}" for name, ms in slowest)
+    assert total_ms <= IMPORT_TIME_BUDGET_MS, (
+        f"import main took {total_ms:.0f}ms (budget {IMPORT_TIME_BUDGET_MS:.0f}ms). "
+        f"Slowest imports:\n{report}"
+    )
+
+
+def test_optional_subsystems_are_lazy():
+    _, modules = measure_import()
+    eager = [
+        name
+        for name in modules
+        if name in OPTIONAL_SUBSYSTEMS or name.split(".")[0] in OPTIONAL_SUBSYSTEMS
+    ]
+    assert not eager, f"Imported at startup (should be lazy): {sorted(set(eager))[:10]}"
+
+
+def main():
+    total_ms, modules = best_of()
+    print("=" * 60)
+    budget = f"{IMPORT_TIME_BUDGET_MS:.0f}ms" if IMPORT_TIME_BUDGET_MS else "not enforced"
+    print(f"import main: {total_ms:.0f}ms (budget {budget})")
+    print("=" * 60)
+    for name, ms in sorted(modules.items(), key=lambda m: m[1], reverse=True)[:20]:
+        print(f"  {ms:8.1f}ms  {name}")
+
+    failed = 0
+    for test in (test_import_time_budget, test_optional_subsystems_are_lazy):
+        try:
+            test()
+            print(f"  [PASS] {test.__name__}")
+        except pytest.skip.Exception as e:
+            print(f"  [SKIP] {test.__name__}: {e}")
+        except AssertionError as e:
+            failed += 1
+            print(f"  [FAIL] {test.__name__}: {e}")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
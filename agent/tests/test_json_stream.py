@@ -0,0 +1,97 @@
+"""
+Incremental JSON Parser Tests
+=============================
+
+IncrementalJSONParser on streamed LLM output: objects split across
+chunks, braces and escaped quotes inside strings, markdown fences and
+prose around the object, and several objects in one stream.
+
+Run with:
+    cd agent && uv run python tests/test_json_stream.py
+    cd agent && uv run pytest tests/test_json_stream.py
+"""
+
+import sys
+from pathlib import Path
+
+# Add agent directory to path
+AGENT_DIR = Path(__file__).parent.parent
+if str(AGENT_DIR) not in sys.path:
+    sys.path.insert(0, str(AGENT_DIR))
+
+from core.llm_client import IncrementalJSONParser, parse_json_object
+
+
+def feed_all(chunks: list[str]) -> list[dict]:
+    parser = IncrementalJSONParser()
+    objects = []
+    for chunk in chunks:
+        objects.extend(parser.feed(chunk))
+    return objects
+
+
+def test_object_split_across_chunks():
+    chunks = ['{"senti', 'ment": "neg', 'ative", "score"', ": 0.2}"]
+    assert feed_all(chunks) == [{"sentiment": "negative", "score": 0.2}]
+
+
+def test_object_completes_on_its_closing_brace():
+    parser = IncrementalJSONParser()
+    assert parser.feed('{"detected": true') == []
+    assert parser.feed('} and some trailing text') == [{"detected": True}]
+
+
+def test_braces_inside_strings():
+    chunks = ['{"quote": "I said {never} ', 'again }}", "n": 1}']
+    assert feed_all(chunks) == [{"quote": "I said {never} again }}", "n": 1}]
+
+
+def test_escaped_quotes_inside_strings():
+    raw = r'{"quote": "she said \"no {way}\"", "n": 2}'
+    assert feed_all([raw[:20], raw[20:]]) == [{"quote": 'she said "no {way}"', "n": 2}]
+
+
+def test_markdown_fence_and_preamble_are_skipped():
+    chunks = ["Here you go:\n```json\n", '{"excuse": ', '{"type": "time"}}', "\n```"]
+    assert feed_all(chunks) == [{"excuse": {"type": "time"}}]
+
+
+def test_several_objects_in_one_stream():
+    assert feed_all(['{"a": 1} {"b": ', "2}"]) == [{"a": 1}, {"b": 2}]
+
+
+def test_invalid_object_is_dropped():
+    assert feed_all(['{"a": nope}', '{"b": 2}']) == [{"b": 2}]
+
+
+def test_parse_json_object_returns_first():
+    assert parse_json_object('```json\n{"a": 1}\n```\n{"b": 2}') == {"a": 1}
+    assert parse_json_object("no json here") is None
+
+
+TESTS = [
+    test_object_split_across_chunks,
+    test_object_completes_on_its_closing_brace,
+    test_braces_inside_strings,
+    test_escaped_quotes_inside_strings,
+    test_markdown_fence_and_preamble_are_skipped,
+    test_several_objects_in_one_stream,
+    test_invalid_object_is_dropped,
+    test_parse_json_object_returns_first,
+]
+
+
+def main():
+    failed = 0
+    for test in TESTS:
+        try:
+            test()
+            print(f"  [PASS] {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"  [FAIL] {test.__name__}: {e}")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+Local Memory Index Tests
+========================
+
+MemoryIndex persistence: adds append to the user's index file instead of
+rewriting it, another process sees appended chunks, the oldest chunks are
+dropped (and the file rewritten) only past the trim slack, and a record
+still being appended is ignored on load.
+
+Run with:
+    cd agent && uv run python tests/test_memory_index.py
+    cd agent && uv run pytest tests/test_memory_index.py
+"""
+
+import sys
+import tempfile
+from pathlib import Path
+
+# Add agent directory to path
+AGENT_DIR = Path(__file__).parent.parent
+if str(AGENT_DIR) not in sys.path:
+    sys.path.insert(0, str(AGENT_DIR))
+
+from services.memory_index import MemoryIndex, UserMemoryIndex
+
+
+def test_add_appends_and_reloads():
+    with tempfile.TemporaryDirectory() as directory:
+        index = MemoryIndex(directory=directory)
+        index.add("user_1", "I skip the gym when work runs late", {"type": "live"})
+        path = Path(directory, "1.idx")
+        size = path.stat().st_size
+        index.add("1", "My sister keeps me honest about running", {"type": "call"})
+        assert path.stat().st_size > size
+
+        other = MemoryIndex(directory=directory)  # e.g. another worker
+        assert other.count("user_1") == 2
+        hit = other.search("user_1", "gym work late")[0]
+        assert hit.content.startswith("I skip the gym") and hit.metadata == {"type": "live"}
+
+
+def test_oldest_chunks_dropped_past_slack():
+    with tempfile.TemporaryDirectory() as directory:
+        index = MemoryIndex(directory=directory, max_chunks=8)
+        for n in range(10):
+            index.add("user_1", f"memory number {n}")
+        assert index.count("user_1") == 10  # Within the slack
+        index.add("user_1", "memory number 10")
+        assert index.count("user_1") == 8
+        reloaded = MemoryIndex(directory=directory, max_chunks=8)
+        assert reloaded.count("user_1") == 8
+        assert reloaded.search("user_1", "memory number 10", limit=1)[0].content == "memory number 10"
+
+
+def test_partial_trailing_record_is_ignored():
+    with tempfile.TemporaryDirectory() as directory:
+        index = MemoryIndex(directory=directory)
+        index.add("user_1", "I run before work on Mondays")
+        path = Path(directory, "1.idx")
+        with open(path, "ab") as f:
+            f.write(b"\x40\x00\x00\x00{\"text\":")  # Another worker mid-append
+        assert len(UserMemoryIndex.load(path)) == 1
+
+
+TESTS = [
+    test_add_appends_and_reloads,
+    test_oldest_chunks_dropped_past_slack,
+    test_partial_trailing_record_is_ignored,
+]
+
+
+def main():
+    failed = 0
+    for test in TESTS:
+        try:
+            test()
+            print(f"  [PASS] {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"  [FAIL] {test.__name__}: {e}")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
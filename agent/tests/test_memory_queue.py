@@ -0,0 +1,77 @@
+"""
+Memory Write Queue Recovery Tests
+=================================
+
+MemoryWriteQueue.recover on a spool directory: entries left by a crashed
+process are picked up - including one that had this process's pid, as
+after a container restart - while this run's own entries and those of a
+live worker are left alone.
+
+Run with:
+    cd agent && uv run python tests/test_memory_queue.py
+    cd agent && uv run pytest tests/test_memory_queue.py
+"""
+
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+# Add agent directory to path
+AGENT_DIR = Path(__file__).parent.parent
+if str(AGENT_DIR) not in sys.path:
+    sys.path.insert(0, str(AGENT_DIR))
+
+from services.memory_queue import MemoryWriteQueue, QueuedMemory
+
+
+def spool(directory: str, entry_id: str) -> None:
+    entry = QueuedMemory(id=entry_id, container_tag="user_1", content="went to the gym", metadata={})
+    Path(directory, f"{entry_id}.json").write_text(entry.to_json())
+
+
+def test_recovers_previous_run_with_same_pid():
+    with tempfile.TemporaryDirectory() as directory:
+        spool(directory, f"{os.getpid()}_0badf00d-1-0")
+        spool(directory, f"{os.getpid()}-2-0")  # Spooled before owners had a nonce
+        queue = MemoryWriteQueue(directory=directory)
+        assert queue.recover() == 2
+        assert len(queue) == 2
+        assert all(name.startswith(f"{queue.owner}-") for name in os.listdir(directory))
+
+
+def test_skips_own_entries():
+    with tempfile.TemporaryDirectory() as directory:
+        queue = MemoryWriteQueue(directory=directory)
+        assert queue.enqueue("user_1", "went to the gym")  # No loop: stays spooled
+        assert queue.recover() == 0
+        assert len(queue) == 1
+
+
+def test_skips_live_worker():
+    with tempfile.TemporaryDirectory() as directory:
+        spool(directory, f"{os.getppid()}_0badf00d-1-0")
+        assert MemoryWriteQueue(directory=directory).recover() == 0
+
+
+TESTS = [
+    test_recovers_previous_run_with_same_pid,
+    test_skips_own_entries,
+    test_skips_live_worker,
+]
+
+
+def main():
+    failed = 0
+    for test in TESTS:
+        try:
+            test()
+            print(f"  [PASS] {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"  [FAIL] {test.__name__}: {e}")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
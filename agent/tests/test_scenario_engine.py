@@ -0,0 +1,89 @@
+"""
+Scenario Engine Cache Test
+==========================
+
+Checks that ScenarioEngine.cached_llm actually caches the background
+agents' LLM calls: two jobs making the same core.llm request produce one
+upstream request and one cache hit, for both call() and stream_response().
+The upstream LLM is a local stand-in, so no API key is needed.
+
+Run with:
+    cd agent && uv run python tests/test_scenario_engine.py
+    cd agent && uv run pytest tests/test_scenario_engine.py
+"""
+
+import asyncio
+import sys
+import tempfile
+from pathlib import Path
+
+# Add agent directory to path
+AGENT_DIR = Path(__file__).parent.parent
+if str(AGENT_DIR) not in sys.path:
+    sys.path.insert(0, str(AGENT_DIR))
+
+import core.llm as llm_module
+from tests.scenario_engine import Expectation, Job, ScenarioEngine
+
+
+def run_cached(use_stream: bool) -> tuple[list, int]:
+    """Run two identical jobs through the engine; (job results, upstream requests)."""
+    upstream = []
+
+    async def fake_call(messages, **kwargs):
+        upstream.append(messages)
+        return "Sounds like a plan."
+
+    async def fake_stream(messages, **kwargs):
+        upstream.append(messages)
+        yield '{"sentiment": "positive"}'
+
+    async def job() -> list[Expectation]:
+        if use_stream:
+            value = await llm_module.llm_json("How did today go?")
+        else:
+            value = await llm_module.llm_analyze("How did today go?")
+        return [Expectation("got a response", value is not None, repr(value))]
+
+    original = llm_module.call, llm_module.stream_response
+    llm_module.call, llm_module.stream_response = fake_call, fake_stream
+    try:
+        with tempfile.TemporaryDirectory() as run_dir:
+            engine = ScenarioEngine("cache_test", concurrency=1, run_dir=run_dir)
+            with engine.cached_llm():
+                report = asyncio.run(
+                    engine.run([Job(name=f"job {i}", kind="agent", run=job) for i in range(2)])
+                )
+    finally:
+        llm_module.call, llm_module.stream_response = original
+    return report.jobs, len(upstream)
+
+
+def test_cached_call_hits_cache():
+    jobs, upstream = run_cached(use_stream=False)
+    assert all(j.passed for j in jobs), [j.to_dict() for j in jobs]
+    assert upstream == 1
+    assert sum(j.cache_hits for j in jobs) == 1
+
+
+def test_cached_stream_hits_cache():
+    jobs, upstream = run_cached(use_stream=True)
+    assert all(j.passed for j in jobs), [j.to_dict() for j in jobs]
+    assert upstream == 1
+    assert sum(j.cache_hits for j in jobs) == 1
+
+
+def main():
+    failed = 0
+    for test in (test_cached_call_hits_cache, test_cached_stream_hits_cache):
+        try:
+            test()
+            print(f"  [PASS] {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"  [FAIL] {test.__name__}: {e}")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
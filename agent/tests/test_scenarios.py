@@ -14,11 +14,13 @@ Usage:
     uv run python test_scenarios.py
     uv run python test_scenarios.py --scenario 3  # Run specific scenario
     uv run python test_scenarios.py --llm gemini  # Use specific LLM
+
+    # All scenarios concurrently, LLM results cached, JSON report + diff
+    uv run python tests/test_scenarios.py --concurrency 5 --evaluate
 """
 
 import argparse
 import asyncio
-import json
 import os
 import sys
 from datetime import datetime
@@ -37,7 +39,7 @@ load_dotenv()
 
 from core.config import (
     fetch_user_context,
-    build_system_prompt,
+    build_system_prompt_v2,
     build_first_message,
 )
 from conversation.call_types import select_call_type, CALL_TYPES
@@ -70,6 +72,8 @@ from agents.events import (
     CallSummary,
     UserFrustrated,
 )
+from core.llm_client.json_stream import parse_json_object
+from tests.scenario_engine import Expectation, Job, ScenarioEngine, add_engine_arguments
 
 # ============================================================================
 # TEST USER ID
@@ -514,7 +518,8 @@ async def chat_gemini(messages: list, model: str = "gemini-2.0-flash-exp") -> st
         raise Exception("GEMINI_API_KEY not set in .env")
 
     client = genai.Client(api_key=gemini_key)
-    response = client.models.generate_content(
+    # Async client so concurrent scenarios don't block each other
+    response = await client.aio.models.generate_content(
         model=model,
         contents=messages,
     )
@@ -708,14 +713,11 @@ Respond in this exact JSON format:
         eval_messages = [{"role": "user", "parts": [{"text": evaluation_prompt}]}]
         response = await chat_fn(eval_messages)
 
-        # Try to parse JSON from response
-        # Handle markdown code blocks
-        if "```json" in response:
-            response = response.split("```json")[1].split("```")[0]
-        elif "```" in response:
-            response = response.split("```")[1].split("```")[0]
-
-        return json.loads(response.strip())
+        # Pull the JSON object out of the response (skips markdown fences)
+        result = parse_json_object(response)
+        if result is None:
+            raise ValueError("no JSON object in evaluation response")
+        return result
     except Exception as e:
         return {
             "criteria_scores": [],
@@ -776,8 +778,11 @@ async def run_scenario(
                 kept_promise_yesterday=scenario.promise_kept_override,
             )
 
-        # Build prompts
-        system_prompt = build_system_prompt(
+        user_id = user_context.get("user", {}).get("id", "test-user")
+
+        # Build prompts (same builder as a live call without a persona)
+        system_prompt = await build_system_prompt_v2(
+            user_id=user_id,
             user_context=user_context,
             call_type=call_type,
             mood=mood,
@@ -798,7 +803,6 @@ async def run_scenario(
         quote_extractor = QuoteExtractorNode()
 
         # Initialize call summary aggregator
-        user_id = user_context.get("user", {}).get("id", "test-user")
         call_aggregator = CallSummaryAggregator(
             user_id=user_id,
             call_type=call_type.name,
@@ -1046,6 +1050,83 @@ async def run_scenario(
     return result
 
 
+# ============================================================================
+# SCENARIO ENGINE (concurrent, cached)
+# ============================================================================
+
+# Evaluation criteria scoring below this (1-5) fail
+MIN_CRITERION_SCORE = 3
+
+
+def scenario_expectations(
+    result: ScenarioResult, evaluation: Optional[dict] = None
+) -> list[Expectation]:
+    """Pass/fail checks for a scenario run (plus its AI evaluation, if any)."""
+    expectations = [
+        Expectation("completed", result.completed, result.error or ""),
+        Expectation(
+            "reached close",
+            result.final_stage == CallStage.CLOSE.value,
+            f"final stage: {result.final_stage}",
+        ),
+    ]
+    scenario = result.scenario
+    summary = result.call_summary
+    if scenario.promise_kept_override is not None and summary is not None:
+        expectations.append(
+            Expectation(
+                "promise outcome detected",
+                summary.promise_kept == scenario.promise_kept_override,
+                f"promise_kept={summary.promise_kept}",
+            )
+        )
+    for criterion in (evaluation or {}).get("criteria_scores", []):
+        score = criterion.get("score") or 0
+        expectations.append(
+            Expectation(
+                f"criterion: {criterion.get('criterion', '?')}",
+                score >= MIN_CRITERION_SCORE,
+                f"{score}/5 - {criterion.get('reason', '')}",
+            )
+        )
+    if evaluation is not None and not evaluation.get("criteria_scores"):
+        expectations.append(
+            Expectation("evaluation", False, "; ".join(evaluation.get("problems", [])))
+        )
+    return expectations
+
+
+async def run_with_engine(args, chat_fn, user_context: dict, scenarios: list[Scenario]):
+    """Run scenarios concurrently through the scenario engine."""
+    import copy
+
+    engine = ScenarioEngine(
+        label=f"scenarios_{args.llm}",
+        concurrency=args.concurrency,
+        use_cache=not args.no_cache,
+        run_dir=args.run_dir,
+    )
+    chat = engine.wrap_chat(chat_fn, model=args.llm)
+
+    def make_job(scenario: Scenario) -> Job:
+        async def run() -> list[Expectation]:
+            result = await run_scenario(
+                scenario=scenario,
+                chat_fn=chat,
+                user_context=copy.deepcopy(user_context),
+                verbose=False,
+            )
+            evaluation = await evaluate_scenario(result, chat) if args.evaluate else None
+            return scenario_expectations(result, evaluation)
+
+        return Job(name=f"{scenario.id}. {scenario.name}", kind="scenario", run=run)
+
+    print(f"[Running {len(scenarios)} scenarios, concurrency {engine.concurrency}]")
+    with engine.cached_llm():
+        report = await engine.run([make_job(s) for s in scenarios])
+    engine.finish(report, diff=not args.no_diff)
+
+
 # ============================================================================
 # MAIN
 # ============================================================================
@@ -1075,6 +1156,7 @@ async def main():
         action="store_true",
         help="Minimal output (just results)",
     )
+    add_engine_arguments(parser)
     args = parser.parse_args()
 
     # Select chat function
@@ -1098,6 +1180,10 @@ async def main():
     else:
         scenarios_to_run = SCENARIOS
 
+    if args.concurrency:
+        await run_with_engine(args, chat_fn, user_context, scenarios_to_run)
+        return
+
     # Run scenarios
     results: list[ScenarioResult] = []
     evaluations: list[dict] = []
@@ -0,0 +1,109 @@
+"""
+Template Responder Tests
+========================
+
+When the speaking node answers from a template instead of the LLM: the
+closing line only on entering CLOSE, never over a question, and a barge-in
+during a template reply keeps only the sentences already spoken.
+
+Run with:
+    cd agent && uv run python tests/test_template_responder.py
+    cd agent && uv run pytest tests/test_template_responder.py
+"""
+
+import asyncio
+import os
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+# Add agent directory to path
+AGENT_DIR = Path(__file__).parent.parent
+if str(AGENT_DIR) not in sys.path:
+    sys.path.insert(0, str(AGENT_DIR))
+
+# process_context answers with an error line when no key is configured
+os.environ.setdefault("BEDROCK_API_KEY", "test")
+
+from line import Message
+from line.events import AgentResponse, UserStartedSpeaking
+
+from conversation.stages import CallStage
+from core.chat_node import FutureYouNode
+from core.replay.replayer import ReplayContext
+from core.template_responder import TemplateResponder
+
+
+def closing_node(turns_in_stage: int = 1) -> FutureYouNode:
+    """Speaking node in CLOSE with a specific commitment locked."""
+    node = FutureYouNode("system", enable_memory_tools=False)
+    node.current_stage = CallStage.CLOSE
+    node.turns_in_stage = turns_in_stage
+    node.tomorrow_commitment = "Gym at 7am"
+    node.commitment_is_specific = True
+    return node
+
+
+def test_close_templated_on_entering_stage():
+    responder = TemplateResponder(closing_node())
+    assert responder.respond("Okay, sounds good") is not None
+    assert responder.stats.served == 1
+
+
+def test_close_later_turns_go_to_llm():
+    # A closing template ends the call; a follow-up needs a real answer
+    responder = TemplateResponder(closing_node(turns_in_stage=2))
+    assert responder.respond("Wait one more thing") is None
+    assert responder.stats.served == 0
+
+
+def test_question_is_never_templated():
+    responder = TemplateResponder(closing_node())
+    assert responder.respond("Wait, can I ask you something?") is None
+
+
+def test_barge_in_keeps_spoken_template_sentences():
+    node = closing_node()
+    node.template_responder = SimpleNamespace(
+        respond=lambda message: "Locked in. Same time tomorrow. Take care."
+    )
+    context = ReplayContext()
+    context.add_transcript("Okay")
+
+    async def run():
+        reply = node.process_context(context)
+        first = await reply.__anext__()
+        assert isinstance(first, AgentResponse) and first.content == "Locked in. "
+        # The SDK cancels generate, then runs the interrupt handler
+        node.on_interrupt_generate(Message(source="test", event=UserStartedSpeaking()))
+        await reply.aclose()
+
+    asyncio.run(run())
+    assert node.messages[-1] == {"role": "assistant", "content": "Locked in. "}
+    assert node.turns.stats.interruptions == 1
+    assert not node.turns.active
+    assert not node.call_ended
+
+
+TESTS = [
+    test_close_templated_on_entering_stage,
+    test_close_later_turns_go_to_llm,
+    test_question_is_never_templated,
+    test_barge_in_keeps_spoken_template_sentences,
+]
+
+
+def main():
+    failed = 0
+    for test in TESTS:
+        try:
+            test()
+            print(f"  [PASS] {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"  [FAIL] {test.__name__}: {e}")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
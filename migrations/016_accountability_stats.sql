@@ -0,0 +1,38 @@
+-- ============================================================================
+-- Migration 016: Rolling Accountability Stats
+-- ============================================================================
+--
+-- One small fixed-size row per user, updated by the agent at the end of
+-- every call (services/accountability_stats.py). Pre-call reads this row
+-- instead of scanning the last 14 call_analytics rows.
+--
+-- recent_outcomes packs the last 14 promise outcomes, 2 bits each, newest
+-- in the lowest bits: 0 = unknown, 1 = kept, 2 = broken.
+--
+-- ============================================================================
+
+CREATE TABLE IF NOT EXISTS accountability_stats (
+  user_id UUID PRIMARY KEY REFERENCES users(id) ON DELETE CASCADE,
+  calls INTEGER NOT NULL DEFAULT 0,
+  kept INTEGER NOT NULL DEFAULT 0,
+  broken INTEGER NOT NULL DEFAULT 0,
+  recent_outcomes INTEGER NOT NULL DEFAULT 0,
+  recent_count SMALLINT NOT NULL DEFAULT 0,
+  commitments INTEGER NOT NULL DEFAULT 0,
+  specific_commitments INTEGER NOT NULL DEFAULT 0,
+  timed_calls INTEGER NOT NULL DEFAULT 0,
+  on_time_calls INTEGER NOT NULL DEFAULT 0,
+  last_promise_kept BOOLEAN,
+  last_call_at TIMESTAMPTZ,
+  updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+
+ALTER TABLE accountability_stats ENABLE ROW LEVEL SECURITY;
+
+CREATE POLICY "Users can view own accountability stats"
+  ON accountability_stats FOR SELECT TO authenticated
+  USING (auth.uid() = user_id);
+
+CREATE POLICY "Service role full access to accountability_stats"
+  ON accountability_stats FOR ALL TO service_role
+  USING (true) WITH CHECK (true);
@@ -0,0 +1,214 @@
+-- ============================================================================
+-- Migration 017: Server-side Check-in Aggregates
+-- ============================================================================
+--
+-- Check-in summaries used to download every pillar_checkins row in the
+-- window and count kept/broken/excuses client-side, so heavy users pulled
+-- a growing history on every call.
+--
+--   1. pillar_checkin_daily - per-user, per-pillar, per-day counters
+--      (kept, broken, excuse counts), maintained by a trigger on
+--      pillar_checkins (covers record_pillar_checkin and direct inserts)
+--   2. get_checkin_summary - one RPC returning the window summary plus
+--      identity alignment, read from the aggregate and future_self_pillars
+--   3. get_pillar_summary - now reads 7-day counts from the aggregate
+--
+-- A window summary reads at most (days x active pillars) small rows.
+-- ============================================================================
+
+-- ============================================================================
+-- 1. PILLAR_CHECKIN_DAILY
+-- ============================================================================
+CREATE TABLE IF NOT EXISTS pillar_checkin_daily (
+  pillar_id uuid NOT NULL REFERENCES future_self_pillars(id) ON DELETE CASCADE,
+  user_id uuid NOT NULL REFERENCES users(id) ON DELETE CASCADE,
+  day date NOT NULL,
+  kept integer NOT NULL DEFAULT 0,
+  broken integer NOT NULL DEFAULT 0,
+  excuses jsonb NOT NULL DEFAULT '{}',              -- {excuse_text: count}
+  PRIMARY KEY (pillar_id, day)
+);
+
+CREATE INDEX IF NOT EXISTS idx_pillar_checkin_daily_user_day
+  ON pillar_checkin_daily(user_id, day DESC);
+
+ALTER TABLE pillar_checkin_daily ENABLE ROW LEVEL SECURITY;
+
+CREATE POLICY "Users can view own checkin aggregates"
+  ON pillar_checkin_daily FOR SELECT TO authenticated
+  USING (auth.uid() = user_id);
+
+CREATE POLICY "Service role full access to pillar_checkin_daily"
+  ON pillar_checkin_daily FOR ALL TO service_role
+  USING (true) WITH CHECK (true);
+
+-- ============================================================================
+-- 2. TRIGGER: fold each new check-in into its daily bucket
+-- ============================================================================
+CREATE OR REPLACE FUNCTION aggregate_pillar_checkin() RETURNS trigger AS $$
+DECLARE
+  v_excuses jsonb := '{}'::jsonb;
+BEGIN
+  IF NEW.excuse_used IS NOT NULL AND NEW.excuse_used <> '' THEN
+    v_excuses := jsonb_build_object(NEW.excuse_used, 1);
+  END IF;
+
+  INSERT INTO pillar_checkin_daily (pillar_id, user_id, day, kept, broken, excuses)
+  VALUES (
+    NEW.pillar_id,
+    NEW.user_id,
+    (NEW.checked_at AT TIME ZONE 'UTC')::date,
+    CASE WHEN NEW.showed_up THEN 1 ELSE 0 END,
+    CASE WHEN NEW.showed_up THEN 0 ELSE 1 END,
+    v_excuses
+  )
+  ON CONFLICT (pillar_id, day) DO UPDATE SET
+    kept = pillar_checkin_daily.kept + EXCLUDED.kept,
+    broken = pillar_checkin_daily.broken + EXCLUDED.broken,
+    excuses = CASE
+      WHEN NEW.excuse_used IS NULL OR NEW.excuse_used = '' THEN pillar_checkin_daily.excuses
+      ELSE jsonb_set(
+        pillar_checkin_daily.excuses,
+        ARRAY[NEW.excuse_used],
+        to_jsonb(COALESCE((pillar_checkin_daily.excuses ->> NEW.excuse_used)::integer, 0) + 1)
+      )
+    END;
+
+  RETURN NEW;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER;
+
+DROP TRIGGER IF EXISTS trigger_aggregate_pillar_checkin ON pillar_checkins;
+CREATE TRIGGER trigger_aggregate_pillar_checkin
+  AFTER INSERT ON pillar_checkins
+  FOR EACH ROW EXECUTE FUNCTION aggregate_pillar_checkin();
+
+-- Backfill from existing check-ins
+INSERT INTO pillar_checkin_daily (pillar_id, user_id, day, kept, broken, excuses)
+SELECT
+  pc.pillar_id,
+  pc.user_id,
+  (pc.checked_at AT TIME ZONE 'UTC')::date AS day,
+  COUNT(*) FILTER (WHERE pc.showed_up)::integer,
+  COUNT(*) FILTER (WHERE NOT pc.showed_up)::integer,
+  COALESCE(
+    (SELECT jsonb_object_agg(e.excuse_used, e.n)
+     FROM (
+       SELECT pc2.excuse_used, COUNT(*) AS n
+       FROM pillar_checkins pc2
+       WHERE pc2.pillar_id = pc.pillar_id
+         AND (pc2.checked_at AT TIME ZONE 'UTC')::date = (pc.checked_at AT TIME ZONE 'UTC')::date
+         AND pc2.excuse_used IS NOT NULL AND pc2.excuse_used <> ''
+       GROUP BY pc2.excuse_used
+     ) e),
+    '{}'::jsonb
+  )
+FROM pillar_checkins pc
+GROUP BY pc.pillar_id, pc.user_id, (pc.checked_at AT TIME ZONE 'UTC')::date
+ON CONFLICT (pillar_id, day) DO NOTHING;
+
+-- ============================================================================
+-- 3. READ API
+-- ============================================================================
+
+-- Check-in summary for the last p_days days plus identity alignment
+CREATE OR REPLACE FUNCTION get_checkin_summary(p_user_id uuid, p_days integer DEFAULT 7)
+RETURNS jsonb AS $$
+DECLARE
+  v_since date := (now() AT TIME ZONE 'UTC')::date - (p_days - 1);
+  v_kept integer;
+  v_broken integer;
+  v_excuses jsonb;
+  v_top_excuse text;
+  v_alignment integer;
+  v_pillars jsonb;
+BEGIN
+  SELECT COALESCE(SUM(kept), 0)::integer, COALESCE(SUM(broken), 0)::integer
+  INTO v_kept, v_broken
+  FROM pillar_checkin_daily
+  WHERE user_id = p_user_id AND day >= v_since;
+
+  SELECT COALESCE(jsonb_object_agg(excuse, n), '{}'::jsonb)
+  INTO v_excuses
+  FROM (
+    SELECT e.key AS excuse, SUM(e.value::integer) AS n
+    FROM pillar_checkin_daily d, jsonb_each_text(d.excuses) e
+    WHERE d.user_id = p_user_id AND d.day >= v_since
+    GROUP BY e.key
+  ) totals;
+
+  SELECT key INTO v_top_excuse
+  FROM jsonb_each_text(v_excuses)
+  ORDER BY value::integer DESC, key
+  LIMIT 1;
+
+  SELECT ROUND(AVG(trust_score))::integer,
+         COALESCE(jsonb_agg(jsonb_build_object(
+           'pillar', pillar,
+           'alignment', trust_score,
+           'trend', CASE
+             WHEN consecutive_kept > 0 THEN 'up'
+             WHEN consecutive_broken > 0 THEN 'down'
+             ELSE 'stable'
+           END
+         )), '[]'::jsonb)
+  INTO v_alignment, v_pillars
+  FROM future_self_pillars
+  WHERE user_id = p_user_id AND status = 'active';
+
+  v_alignment := COALESCE(v_alignment, 50);
+
+  RETURN jsonb_build_object(
+    'total_checkins', v_kept + v_broken,
+    'kept', v_kept,
+    'broken', v_broken,
+    'kept_rate', CASE WHEN v_kept + v_broken > 0
+      THEN ROUND(v_kept * 100.0 / (v_kept + v_broken))::integer ELSE 0 END,
+    'most_common_excuse', v_top_excuse,
+    'excuse_count', (SELECT COUNT(*) FROM jsonb_object_keys(v_excuses)),
+    'overall_alignment', v_alignment,
+    'pillar_alignments', v_pillars,
+    'transformation_status', CASE
+      WHEN v_alignment >= 80 THEN 'becoming'
+      WHEN v_alignment >= 60 THEN 'progressing'
+      WHEN v_alignment >= 40 THEN 'struggling'
+      ELSE 'slipping'
+    END
+  );
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER STABLE;
+
+-- get_pillar_summary: 7-day counts from the aggregate instead of raw check-ins
+CREATE OR REPLACE FUNCTION get_pillar_summary(p_user_id uuid)
+RETURNS TABLE (
+  pillar text,
+  identity_statement text,
+  trust_score integer,
+  consecutive_kept integer,
+  consecutive_broken integer,
+  kept_last_7_days integer,
+  total_last_7_days integer,
+  last_checked_at timestamptz
+) AS $$
+BEGIN
+  RETURN QUERY
+  SELECT
+    fsp.pillar,
+    fsp.identity_statement,
+    fsp.trust_score,
+    fsp.consecutive_kept,
+    fsp.consecutive_broken,
+    COALESCE(SUM(d.kept), 0)::integer AS kept_last_7_days,
+    COALESCE(SUM(d.kept + d.broken), 0)::integer AS total_last_7_days,
+    fsp.last_checked_at
+  FROM future_self_pillars fsp
+  LEFT JOIN pillar_checkin_daily d
+    ON d.pillar_id = fsp.id
+   AND d.day >= (now() AT TIME ZONE 'UTC')::date - 6
+  WHERE fsp.user_id = p_user_id AND fsp.status = 'active'
+  GROUP BY fsp.id
+  ORDER BY fsp.priority DESC;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER;
+
+COMMENT ON TABLE pillar_checkin_daily IS 'Per-pillar daily check-in counters maintained by trigger_aggregate_pillar_checkin. Read via get_checkin_summary.';